@@ -0,0 +1,9 @@
+"""Benchmarks Genshin Impact Characters Analyzer
+
+Scripts measuring the throughput of the performance-critical parts
+of the application.
+
+Every benchmark is a module run from the ``backend`` directory, e.g.::
+
+    python -m benchmarks.rotation --help
+"""
@@ -0,0 +1,139 @@
+import argparse
+import asyncio
+from time import perf_counter
+from uuid import uuid4
+
+import numpy as np
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from characters_analyzer.api.services.artifact_service import (
+    join_sub_stats,
+    scan_sub_stats,
+)
+from characters_analyzer.core.config import get_settings
+from characters_analyzer.database.tables import entities, junctions  # noqa: F401
+from characters_analyzer.database.tables.base import Base
+from characters_analyzer.database.tables.entities import Artifact, Set, Stat, User
+from characters_analyzer.database.tables.junctions import ArtifactSubStat
+from characters_analyzer.engine.artifacts import get_sub_stat_ids
+
+
+async def fill_inventory(session: AsyncSession, artifacts: int, seed: int = 0):
+    """Adds a user holding random artifacts with four sub stats each.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Session bound to an empty schema.
+    artifacts : int
+        The number of artifacts.
+    seed : int
+        Seed of the random generator.
+
+    Returns
+    -------
+    user_id : UUID
+        UUID of the user.
+    """
+    rng = np.random.default_rng(seed)
+    sub_stat_ids = get_sub_stat_ids()
+    user_id, set_id = uuid4(), uuid4()
+
+    await session.execute(insert(User).values(id=user_id, username="scan", password=""))
+    await session.execute(insert(Set).values(id=set_id, title="", description=""))
+    await session.execute(
+        insert(Stat),
+        [{"id": id_, "name": "", "icon_url": ""} for id_ in sub_stat_ids],
+    )
+
+    records, sub_stats = [], []
+
+    for _ in range(artifacts):
+        id_ = uuid4()
+        columns = rng.choice(len(sub_stat_ids), 4, replace=False)
+        values = np.zeros(len(sub_stat_ids))
+        values[columns] = rng.uniform(1, 30, 4).round(1)
+
+        records.append(
+            {
+                "id": id_,
+                "user_id": user_id,
+                "set_id": set_id,
+                "main_stat_id": sub_stat_ids[0],
+                "main_stat_value": 0,
+                "sub_stat_values": values.tolist(),
+            }
+        )
+        sub_stats += [
+            {
+                "artifact_id": id_,
+                "sub_stat_id": sub_stat_ids[column],
+                "sub_stat_value": float(values[column]),
+            }
+            for column in columns.tolist()
+        ]
+
+    await session.execute(insert(Artifact), records)
+    await session.execute(insert(ArtifactSubStat), sub_stats)
+
+    return user_id
+
+
+async def run(artifacts: int, repeat: int):
+    engine = create_async_engine(get_settings().DATABASE_URL, poolclass=NullPool)
+
+    async with engine.connect() as connection:
+        # everything is created in a throwaway schema and rolled back
+        transaction = await connection.begin()
+        schema = f"scan_{uuid4().hex}"
+
+        await connection.execute(text(f"CREATE SCHEMA {schema}"))
+        await connection.execute(text(f"SET LOCAL search_path TO {schema}"))
+        await connection.run_sync(Base.metadata.create_all)
+
+        session = AsyncSession(bind=connection)
+        user_id = await fill_inventory(session, artifacts)
+        await connection.execute(text("ANALYZE"))
+
+        results = {}
+
+        for name, read in (("scan", scan_sub_stats), ("join", join_sub_stats)):
+            started = perf_counter()
+            for _ in range(repeat):
+                ids, values = await read(session, user_id)
+            elapsed = (perf_counter() - started) / repeat
+
+            print(
+                f"{name}: {elapsed * 1000:,.1f} ms, "
+                f"{len(ids) / elapsed:,.0f} artifacts/s"
+            )
+
+            results[name] = dict(zip(ids, values))
+
+        # both paths must read the same values
+        assert all(
+            np.allclose(values, results["join"][id_])
+            for id_, values in results["scan"].items()
+        )
+
+        await session.close()
+        await transaction.rollback()
+
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Reading the sub stats of an inventory into an array."
+    )
+    parser.add_argument("--artifacts", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    arguments = parser.parse_args()
+
+    asyncio.run(run(arguments.artifacts, arguments.repeat))
+
+
+if __name__ == "__main__":
+    main()
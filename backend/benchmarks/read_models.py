@@ -0,0 +1,216 @@
+import argparse
+import asyncio
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Dict
+from uuid import uuid4
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from characters_analyzer.api.read_models import (
+    character_read_model,
+    user_read_model,
+)
+from characters_analyzer.api.services import character_service, user_service
+from characters_analyzer.core.config import get_settings
+from characters_analyzer.database.bootstrap import seed_game_data
+from characters_analyzer.database.game_data import load_game_data
+from characters_analyzer.database.tables import entities, junctions  # noqa: F401
+from characters_analyzer.database.tables.base import Base
+from characters_analyzer.database.tables.entities import User
+from characters_analyzer.database.tables.junctions import UserCharacter
+from characters_analyzer.schemas import FullCharacterSchema, UserCharacterSchema
+from characters_analyzer.schemas.responses import FullCharactersResponse, UserResponse
+
+# the owner of the token and the user whose page is requested
+USERNAME, PERSON = "reader", "person"
+
+# a request handled by one of the layers: the response from a fresh session
+Handler = Callable[[AsyncSession], Awaitable[Any]]
+
+
+async def fill_users(connection: AsyncConnection, characters: int):
+    """Adds the users, the first one holding the given number of characters.
+
+    Parameters
+    ----------
+    connection : AsyncConnection
+        Connection to an empty schema.
+    characters : int
+        The number of characters.
+    """
+    await seed_game_data(connection)
+
+    user_id = await connection.scalar(
+        insert(User).values(username=USERNAME, password="").returning(User.id)
+    )
+    await connection.execute(
+        insert(User).values(username=PERSON, password="", email="person@post.domen")
+    )
+    await connection.execute(
+        insert(UserCharacter),
+        [
+            {
+                "user_id": user_id,
+                "character_id": character["id"],
+                "level": 90,
+                "constellations": 0,
+                "attack_level": 9,
+                "skill_level": 9,
+                "burst_level": 9,
+            }
+            for character in load_game_data()["character"][:characters]
+        ],
+    )
+
+
+async def orm_characters(session: AsyncSession) -> FullCharactersResponse:
+    user = await user_service.get_user_by_username(session, USERNAME)
+    characters = []
+
+    for user_character in await character_service.get_user_characters_by_user(user):
+        character = await user_character.awaitable_attrs.character
+        character_info = UserCharacterSchema.model_validate(user_character).model_dump()
+        character_info.update(
+            {
+                "name": character.name,
+                "legendary": character.legendary,
+                "weapon": (await character.awaitable_attrs.weapon).title,
+                "element": (await character.awaitable_attrs.element).title,
+                "region": (await character.awaitable_attrs.region).title,
+            }
+        )
+        characters.append(FullCharacterSchema(**character_info))
+
+    return FullCharactersResponse(characters=characters)
+
+
+async def orm_person(session: AsyncSession) -> UserResponse:
+    await user_service.get_user_by_username(session, USERNAME)
+    person = await user_service.get_user_by_username(session, PERSON)
+
+    return UserResponse.model_validate(person, from_attributes=True)
+
+
+async def core_characters(session: AsyncSession) -> FullCharactersResponse:
+    user = await user_read_model.get_user_by_username(session, USERNAME)
+
+    return FullCharactersResponse(
+        characters=await character_read_model.get_full_characters(session, user["id"])
+    )
+
+
+async def core_person(session: AsyncSession) -> UserResponse:
+    await user_read_model.get_user_by_username(session, USERNAME)
+
+    return UserResponse(**await user_read_model.get_user_by_username(session, PERSON))
+
+
+def asyncpg_handlers(dialect) -> Dict[str, Handler]:
+    """The same statements as the read models run by the driver itself.
+
+    Parameters
+    ----------
+    dialect : Dialect
+        Dialect of the engine.
+
+    Returns
+    -------
+    handlers : Dict[str, Handler]
+        Handlers of the requests by their name.
+    """
+    user_sql = str(user_read_model._user_statement().compile(dialect=dialect))
+    characters_sql = str(
+        character_read_model._full_characters_statement().compile(dialect=dialect)
+    )
+
+    async def driver(session: AsyncSession):
+        connection = await (await session.connection()).get_raw_connection()
+
+        return connection.driver_connection
+
+    async def characters(session: AsyncSession) -> FullCharactersResponse:
+        connection = await driver(session)
+        user = await connection.fetchrow(user_sql, USERNAME)
+        rows = await connection.fetch(characters_sql, user["id"])
+
+        return FullCharactersResponse(
+            characters=[FullCharacterSchema(**row) for row in rows]
+        )
+
+    async def person(session: AsyncSession) -> UserResponse:
+        connection = await driver(session)
+        await connection.fetchrow(user_sql, USERNAME)
+
+        return UserResponse(**await connection.fetchrow(user_sql, PERSON))
+
+    return {"characters": characters, "person": person}
+
+
+async def run(characters: int, repeat: int):
+    engine = create_async_engine(get_settings().DATABASE_URL, poolclass=NullPool)
+
+    async with engine.connect() as connection:
+        # everything is created in a throwaway schema and rolled back
+        transaction = await connection.begin()
+        schema = f"read_{uuid4().hex}"
+
+        await connection.execute(text(f"CREATE SCHEMA {schema}"))
+        await connection.execute(text(f"SET LOCAL search_path TO {schema}"))
+        await connection.run_sync(Base.metadata.create_all)
+        await fill_users(connection, characters)
+        await connection.execute(text("ANALYZE"))
+
+        layers = {
+            "orm": {"characters": orm_characters, "person": orm_person},
+            "core": {"characters": core_characters, "person": core_person},
+            "asyncpg": asyncpg_handlers(connection.dialect),
+        }
+
+        for request in ("characters", "person"):
+            print(f"{request}:")
+            responses = {}
+
+            for layer, handlers in layers.items():
+                # the first request compiles and prepares the statements
+                for i in range(repeat + 1):
+                    if i == 1:
+                        started = perf_counter()
+
+                    session = AsyncSession(bind=connection)
+                    responses[layer] = await handlers[request](session)
+                    await session.close()
+
+                elapsed = (perf_counter() - started) / repeat
+
+                print(
+                    f"  {layer:>7}: {elapsed * 1000:,.2f} ms, "
+                    f"{1 / elapsed:,.0f} requests/s"
+                )
+
+            # every layer must give the same response
+            assert (
+                len({response.model_dump_json() for response in responses.values()})
+                == 1
+            )
+
+        await transaction.rollback()
+
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Read-only requests served with the ORM, the read models "
+        "and the database driver."
+    )
+    parser.add_argument("--characters", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=200)
+    arguments = parser.parse_args()
+
+    asyncio.run(run(arguments.characters, arguments.repeat))
+
+
+if __name__ == "__main__":
+    main()
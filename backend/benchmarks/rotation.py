@@ -0,0 +1,115 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from time import perf_counter
+from typing import List
+from uuid import UUID
+
+import numpy as np
+
+from characters_analyzer.database.game_data import load_game_data
+from characters_analyzer.engine.rotation import (
+    Action,
+    Buff,
+    Enemy,
+    Member,
+    Simulation,
+    get_character_elements,
+    simulate,
+)
+from characters_analyzer.engine.stats import get_stat_table
+from characters_analyzer.server import cpu_count
+
+
+def make_simulations(count: int, seed: int = 0) -> List[Simulation]:
+    """Random teams of four level 90 characters playing a 20 seconds rotation.
+
+    Parameters
+    ----------
+    count : int
+        The number of simulations.
+    seed : int
+        Seed of the random generator.
+
+    Returns
+    -------
+    simulations : List[Simulation]
+        Distinct simulations.
+    """
+    rng = np.random.default_rng(seed)
+    table = get_stat_table()
+    elements = get_character_elements()
+    characters = [UUID(character["id"]) for character in load_game_data()["character"]]
+
+    rotation = []
+
+    for member in (1, 2, 3):
+        rotation += [
+            Action(member, "skill", 1.0, 2.0, particles=3),
+            Action(
+                member,
+                "burst",
+                1.5,
+                0.8,
+                hits=8,
+                interval=1.0,
+                energy_cost=60,
+                buff=Buff("atk_percent", 0.2, 10, team=True),
+            ),
+        ]
+
+    rotation += [Action(0, "skill", 0.5, 3.0, particles=4)]
+    rotation += [Action(0, "normal", 0.6, 1.2, reaction="vaporize_pyro")] * 15
+
+    simulations = []
+
+    for _ in range(count):
+        team = tuple(
+            Member(
+                character_id=str(character_id),
+                element=elements[character_id],
+                level=90,
+                base=tuple(table.lookup(character_id, 90).values()),
+                bonuses=tuple((rng.random(len(table.stats)) * 0.5).tolist()),
+                weapon_atk=float(rng.integers(400, 700)),
+            )
+            for character_id in rng.choice(characters, 4, replace=False)
+        )
+        simulations.append(Simulation(team, tuple(rotation), Enemy()))
+
+    return simulations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rotation simulations per second.")
+    parser.add_argument("--simulations", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=cpu_count())
+    arguments = parser.parse_args()
+
+    simulations = make_simulations(arguments.simulations)
+
+    started = perf_counter()
+    for simulation in simulations:
+        simulate(simulation)
+    serial = len(simulations) / (perf_counter() - started)
+
+    print(f"1 process: {serial:,.0f} sims/s")
+
+    with ProcessPoolExecutor(
+        arguments.workers, mp_context=get_context("spawn"), initializer=get_stat_table
+    ) as executor:
+        # starts the processes before measuring
+        list(executor.map(simulate, simulations[: arguments.workers]))
+
+        started = perf_counter()
+        list(executor.map(simulate, simulations, chunksize=16))
+        parallel = len(simulations) / (perf_counter() - started)
+
+    print(
+        f"{arguments.workers} processes: {parallel:,.0f} sims/s, "
+        f"{parallel / arguments.workers:,.0f} sims/s/core"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+import argparse
+import asyncio
+from time import perf_counter
+from typing import Awaitable, Callable, List
+from uuid import UUID, uuid4
+
+import numpy as np
+from sqlalchemy import event, insert, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from characters_analyzer.api.services import (
+    artifact_service,
+    character_service,
+    user_service,
+)
+from characters_analyzer.core.config import get_settings
+from characters_analyzer.database import unit_of_work
+from characters_analyzer.database.bootstrap import seed_game_data
+from characters_analyzer.database.game_data import load_game_data
+from characters_analyzer.database.tables import entities, junctions  # noqa: F401
+from characters_analyzer.database.tables.base import Base
+from characters_analyzer.database.tables.entities import User
+from characters_analyzer.database.tables.junctions import UserCharacter
+from characters_analyzer.engine.artifacts import get_sub_stat_ids
+from characters_analyzer.schemas import ArtifactData, CharacterDataSchema
+
+USERNAME = "unit_of_work"
+
+# a call of a service by a request, after the authorization
+Call = Callable[[AsyncSession, User], Awaitable]
+
+
+def make_requests(
+    user_character_id: UUID, count: int, seed: int = 0
+) -> List[List[Call]]:
+    """Requests changing a character, then adding an artifact for it.
+
+    Parameters
+    ----------
+    user_character_id : UUID
+        UUID of the user's character.
+    count : int
+        The number of requests.
+    seed : int
+        Seed of the random generator.
+
+    Returns
+    -------
+    requests : List[List[Call]]
+        Calls of the services by every request.
+    """
+    rng = np.random.default_rng(seed)
+    game_data = load_game_data()
+    set_ids = [row["id"] for row in game_data["set"]]
+    sub_stat_ids = get_sub_stat_ids()
+
+    def request(level: int, artifact: ArtifactData) -> List[Call]:
+        async def update_character(session: AsyncSession, user: User):
+            await character_service.update_user_character(
+                session,
+                await character_service.get_user_character_by_id(
+                    session, user_character_id
+                ),
+                CharacterDataSchema(
+                    level=level,
+                    constellations=0,
+                    attack_level=1,
+                    skill_level=1,
+                    burst_level=1,
+                ),
+            )
+
+        async def add_artifact(session: AsyncSession, user: User):
+            await artifact_service.add_artifact(session, user.id, artifact)
+
+        return [update_character, add_artifact]
+
+    return [
+        request(
+            int(rng.integers(1, 91)),
+            ArtifactData(
+                set_id=set_ids[rng.integers(len(set_ids))],
+                slot="flower",
+                level=int(rng.integers(21)),
+                main_stat_id=sub_stat_ids[0],
+                main_stat_value=4780,
+                sub_stats=[
+                    {
+                        "sub_stat_id": sub_stat_ids[column],
+                        "sub_stat_value": round(float(rng.uniform(1, 30)), 1),
+                    }
+                    for column in rng.choice(
+                        range(1, len(sub_stat_ids)), 4, replace=False
+                    )
+                ],
+            ),
+        )
+        for _ in range(count)
+    ]
+
+
+async def read_characters(session: AsyncSession, user: User):
+    await character_service.get_user_characters_with_artifacts(session, user.id)
+
+
+async def measure(
+    sessions: async_sessionmaker,
+    requests: List[List[Call]],
+    commits: List[int],
+    per_call: bool,
+):
+    """Runs requests one after another, as the application does.
+
+    Parameters
+    ----------
+    sessions : async_sessionmaker
+        Factory of the sessions of the requests.
+    requests : List[List[Call]]
+        Calls of the services by every request.
+    commits : List[int]
+        Counter of the commits of the engine.
+    per_call : bool
+        Whether the authorization and every call commit themselves,
+        instead of the unit of work committing once at the end of the request.
+    """
+    commits[0] = 0
+    latencies = []
+
+    for request in requests:
+        started = perf_counter()
+
+        async with sessions() as session:
+            user = await user_service.get_user_by_username(session, USERNAME)
+
+            if per_call:
+                await session.commit()
+
+            for call in request:
+                await call(session, user)
+
+                # as the services used to, the ones writing anything
+                if per_call and unit_of_work.is_staged(session):
+                    await session.commit()
+
+            if not per_call:
+                await unit_of_work.complete(session)
+
+        latencies.append(perf_counter() - started)
+
+    latencies = np.array(latencies) * 1000
+
+    print(
+        f"  {'commit per call' if per_call else 'unit of work':>15}: "
+        f"{commits[0] / len(requests):.1f} commits/request, "
+        f"{latencies.mean():.2f} ms mean, {np.percentile(latencies, 95):.2f} ms p95"
+    )
+
+
+async def run(count: int):
+    schema = f"uow_{uuid4().hex}"
+    url = get_settings().DATABASE_URL
+
+    await _execute(url, f"CREATE SCHEMA {schema}")
+
+    # the tables are created in a throwaway schema, dropped at the end
+    engine = create_async_engine(
+        url, connect_args={"server_settings": {"search_path": schema}}
+    )
+    sessions = async_sessionmaker(
+        engine,
+        sync_session_class=unit_of_work.UnitOfWorkSession,
+        expire_on_commit=False,
+    )
+    commits = [0]
+
+    @event.listens_for(engine.sync_engine, "commit")
+    def count_commit(connection):
+        commits[0] += 1
+
+    try:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+            await seed_game_data(connection)
+
+            user_id = await connection.scalar(
+                insert(User).values(username=USERNAME, password="").returning(User.id)
+            )
+            user_character_id = await connection.scalar(
+                insert(UserCharacter)
+                .values(
+                    user_id=user_id,
+                    character_id=load_game_data()["character"][0]["id"],
+                    level=90,
+                    constellations=0,
+                    attack_level=1,
+                    skill_level=1,
+                    burst_level=1,
+                )
+                .returning(UserCharacter.id)
+            )
+
+        print("read: the user's characters with their artifacts")
+        for per_call in (True, False):
+            await measure(sessions, [[read_characters]] * count, commits, per_call)
+
+        # the requests of both runs differ, as the same artifact can't be added twice
+        print("write: a character updated and an artifact added")
+        for seed, per_call in enumerate((True, False)):
+            await measure(
+                sessions,
+                make_requests(user_character_id, count, seed),
+                commits,
+                per_call,
+            )
+    finally:
+        await engine.dispose()
+
+        await _execute(url, f"DROP SCHEMA {schema} CASCADE")
+
+
+async def _execute(url: str, statement: str):
+    engine = create_async_engine(url, poolclass=NullPool)
+
+    async with engine.begin() as connection:
+        await connection.execute(text(statement))
+
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Commits and latency of a request with a commit per service call "
+        "and with a single unit of work."
+    )
+    parser.add_argument("--requests", type=int, default=500)
+    arguments = parser.parse_args()
+
+    asyncio.run(run(arguments.requests))
+
+
+if __name__ == "__main__":
+    main()
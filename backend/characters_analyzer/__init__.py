@@ -21,14 +21,20 @@ user-friendly interface for analyzing character builds.
      https://magicstack.github.io/asyncpg/current/
 """
 
-from characters_analyzer.core.config import get_settings as _get_settings
+_METADATA = {
+    "__title__": "APP_NAME",
+    "__summary__": "APP_SUMMARY",
+    "__version__": "APP_VERSION",
+    "__author__": "ADMIN_NAME",
+    "__email__": "ADMIN_EMAIL",
+}
 
-_settings = _get_settings()
 
-__title__ = _settings.APP_NAME
-__summary__ = _settings.APP_SUMMARY
+def __getattr__(name: str):
+    # the settings are read on access, so importing a submodule does not require them
+    if name in _METADATA:
+        from characters_analyzer.core.config import get_settings
 
-__version__ = _settings.APP_VERSION
+        return getattr(get_settings(), _METADATA[name])
 
-__author__ = _settings.ADMIN_NAME
-__email__ = _settings.ADMIN_EMAIL
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,53 +1,75 @@
 from typing import Annotated, AnyStr
 
-from fastapi import Depends, HTTPException, Security, status
+from fastapi import Depends, HTTPException, Request, Security, status
 from fastapi.security import (
     HTTPAuthorizationCredentials,
     HTTPBearer,
     OAuth2PasswordBearer,
 )
 from jose import ExpiredSignatureError, JWTError
-from sqlalchemy.exc import IntegrityError
-from sqlalchemy.ext.asyncio import (
-    AsyncEngine,
-    AsyncSession,
-    async_sessionmaker,
-    create_async_engine,
-)
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from characters_analyzer.api.read_models import user_read_model
 from characters_analyzer.api.services import user_service
-from characters_analyzer.core.config import Settings, get_settings
+from characters_analyzer.core.config import get_settings
 from characters_analyzer.core.jwt import jwt_decode
+from characters_analyzer.database.engine import get_session_maker
 from characters_analyzer.database.tables.entities import User
 
-settings: Settings = get_settings()
-
-engine: AsyncEngine = create_async_engine(
-    url=settings.DATABASE_URL,
-    echo=False,
-    pool_pre_ping=True,
-)
-AsyncSessionMaker: async_sessionmaker = async_sessionmaker(
-    bind=engine, class_=AsyncSession, expire_on_commit=False
-)
 
-
-async def get_session() -> AsyncSession:
+async def get_session(request: Request) -> AsyncSession:
     """Creates a unique request asynchronous session object.
 
     Used to add a database session to the request route using the FastAPI dependency system.
+    The engine is created on the first request (see ``database.engine``).
+
+    The session is the unit of work of the request: the services only stage
+    their changes in it, and the route commits them once, at the end of the request
+    (see ``api.routing.UnitOfWorkRoute``).
+
+    Parameters
+    ----------
+    request : Request
+        The request the session belongs to.
 
     Returns
     -------
     session : AsyncSession
         The asynchronous session object for the unique request.
     """
-    async with AsyncSessionMaker() as session:
+    async with get_session_maker()() as session:
+        request.state.session = session
+
+        yield session
+
+
+async def get_snapshot_session() -> AsyncSession:
+    """Creates a read-only session seeing a single snapshot of the database.
+
+    The transaction of the session is ``REPEATABLE READ``, so every query
+    of the session reads the database as it was at the first one, whatever
+    is committed meanwhile. Used to read several tables consistently,
+    e.g. to export an account while it is being changed.
+
+    Returns
+    -------
+    session : AsyncSession
+        The asynchronous session object in a repeatable-read transaction.
+    """
+    async with get_session_maker()() as session:
+        await session.connection(
+            execution_options={
+                "isolation_level": "REPEATABLE READ",
+                "postgresql_readonly": True,
+            }
+        )
+
         yield session
 
 
 oauth2_scheme = OAuth2PasswordBearer(
-    tokenUrl=f"/{settings.CURRENT_API_URL}/auth/sign_in"
+    tokenUrl=f"/{get_settings().CURRENT_API_URL}/auth/sign_in"
 )
 
 credentials_exception = HTTPException(
@@ -81,6 +103,35 @@ async def validate_access_token(
     return await _get_user_from_token(token, session)
 
 
+async def validate_access_token_record(
+    token: Annotated[AnyStr, Depends(oauth2_scheme)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> RowMapping:
+    """Dependency authorization of the read-only methods.
+
+    Works like ``validate_access_token``, but the user is read
+    as a plain row (see ``api.read_models``), without the ORM.
+
+    Parameters
+    ----------
+    token : AnyStr
+        JSON Web Token, access token.
+    session : AsyncSession
+        Request session object.
+
+    Returns
+    -------
+    user : RowMapping
+        Public data of the user, see ``user_read_model.get_user_by_username``.
+    """
+    user = await user_read_model.get_user_by_username(session, _get_username(token))
+
+    if user is None:
+        raise credentials_exception
+
+    return user
+
+
 async def validate_refresh_token(
     credentials: Annotated[HTTPAuthorizationCredentials, Security(HTTPBearer())],
     session: Annotated[AsyncSession, Depends(get_session)],
@@ -128,6 +179,16 @@ async def _get_user_from_token(token: AnyStr, session: AsyncSession) -> User:
     user : User
         Model of the user record from the database.
     """
+    user = await user_service.get_user_by_username(session, _get_username(token))
+
+    if user is None:
+        raise credentials_exception
+
+    return user
+
+
+def _get_username(token: AnyStr) -> str:
+    """Decodes a JSON Web Token and returns the name of its user."""
     try:
         if (username := jwt_decode(token).get("sub")) is None:
             raise credentials_exception
@@ -140,14 +201,4 @@ async def _get_user_from_token(token: AnyStr, session: AsyncSession) -> User:
     except JWTError:
         raise credentials_exception
 
-    if (user := await user_service.get_user_by_username(session, username)) is None:
-        raise credentials_exception
-
-    try:
-        await session.commit()
-    except IntegrityError:
-        await session.rollback()
-
-        raise credentials_exception
-
-    return user
+    return username
@@ -0,0 +1,13 @@
+"""Genshin Impact Characters Analyzer API read models
+
+Package describing the read models of the hot read-only methods.
+
+Unlike the services, a read model doesn't load ORM objects: it runs
+a Core ``SELECT`` over the tables and returns plain rows, shaped
+right into the response models. Nothing is put into the identity map
+of the session and no relationship is loaded lazily.
+
+Every statement is built once, with bound parameters, so SQLAlchemy
+compiles it on the first execution and takes the compiled form
+from the cache of the engine afterwards.
+"""
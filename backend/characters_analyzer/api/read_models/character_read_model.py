@@ -0,0 +1,74 @@
+from functools import lru_cache
+from typing import List
+from uuid import UUID
+
+from sqlalchemy import Select, bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from characters_analyzer.database.tables.entities import (
+    Character,
+    Element,
+    Region,
+    Weapon,
+)
+from characters_analyzer.database.tables.junctions import UserCharacter
+from characters_analyzer.schemas import FullCharacterSchema
+
+
+async def get_full_characters(
+    session: AsyncSession, user_id: UUID
+) -> List[FullCharacterSchema]:
+    """The function of obtaining all user's characters with their general information.
+
+    The user's characters, their characters, weapon types, elements
+    and regions are read with a single statement.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    user_id : UUID
+        User's UUID.
+
+    Returns
+    -------
+    characters : List[FullCharacterSchema]
+        User's characters.
+    """
+    result = await session.execute(_full_characters_statement(), {"user_id": user_id})
+
+    return [FullCharacterSchema(**row) for row in result.mappings()]
+
+
+@lru_cache
+def _full_characters_statement() -> Select:
+    user_character, character = UserCharacter.__table__, Character.__table__
+    weapon, element, region = Weapon.__table__, Element.__table__, Region.__table__
+
+    return (
+        select(
+            user_character.c.id,
+            user_character.c.user_id,
+            user_character.c.character_id,
+            user_character.c.level,
+            user_character.c.constellations,
+            user_character.c.attack_level,
+            user_character.c.skill_level,
+            user_character.c.burst_level,
+            user_character.c.score_formula,
+            character.c.name,
+            character.c.legendary,
+            weapon.c.title.label("weapon"),
+            element.c.title.label("element"),
+            region.c.title.label("region"),
+        )
+        .select_from(
+            user_character.join(
+                character, character.c.id == user_character.c.character_id
+            )
+            .join(weapon, weapon.c.id == character.c.weapon_id)
+            .join(element, element.c.id == character.c.element_id)
+            .join(region, region.c.id == character.c.region_id)
+        )
+        .where(user_character.c.user_id == bindparam("user_id"))
+    )
@@ -0,0 +1,40 @@
+from functools import lru_cache
+from typing import AnyStr
+
+from sqlalchemy import Select, bindparam, select
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from characters_analyzer.database.tables.entities import User
+
+
+async def get_user_by_username(
+    session: AsyncSession, username: AnyStr
+) -> RowMapping | None:
+    """Returns the public data of a user.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    username : AnyStr
+        User login, unique name.
+
+    Returns
+    -------
+    user : RowMapping | None
+        ``id``, ``username``, ``email`` and ``phone`` of the user,
+        see ``schemas.responses.UserResponse``.
+    """
+    result = await session.execute(_user_statement(), {"username": username})
+
+    return result.mappings().one_or_none()
+
+
+@lru_cache
+def _user_statement() -> Select:
+    user = User.__table__
+
+    return select(user.c.id, user.c.username, user.c.email, user.c.phone).where(
+        user.c.username == bindparam("username")
+    )
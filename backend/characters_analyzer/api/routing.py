@@ -0,0 +1,40 @@
+from typing import Any, Callable, Coroutine
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from characters_analyzer.database import unit_of_work
+
+
+class UnitOfWorkRoute(APIRoute):
+    """Route ending the transaction of its request before the response is sent.
+
+    The session of the request (see ``api.dependencies.get_session``) is shared
+    by the dependencies and the services the endpoint calls, which only stage
+    their changes. Once the endpoint has returned, the transaction is committed,
+    only if anything has been staged (see ``database.unit_of_work.complete``);
+    if the endpoint fails, it is rolled back.
+
+    The exit code of the dependencies runs only after the response has been
+    sent, too late for a client to learn that its changes were not saved,
+    hence a route class.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def unit_of_work_handler(request: Request) -> Response:
+            try:
+                response = await handler(request)
+            except BaseException:
+                if (session := getattr(request.state, "session", None)) is not None:
+                    await session.rollback()
+
+                raise
+
+            if (session := getattr(request.state, "session", None)) is not None:
+                await unit_of_work.complete(session)
+
+            return response
+
+        return unit_of_work_handler
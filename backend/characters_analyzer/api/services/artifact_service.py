@@ -1,8 +1,31 @@
+from functools import lru_cache, partial
+from typing import Any, Dict, Iterable, List, Tuple
 from uuid import UUID
 
+import numpy as np
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
+from characters_analyzer.api.services import (
+    event_service,
+    score_service,
+    similar_service,
+    sketch_service,
+    usage_service,
+)
+from characters_analyzer.core.config import Settings, get_settings
+from characters_analyzer.database import unit_of_work
 from characters_analyzer.database.tables.entities import Artifact
+from characters_analyzer.database.tables.junctions import ArtifactSubStat
+from characters_analyzer.engine.artifacts import (
+    fingerprint_artifact,
+    get_sub_stat_ids,
+    pack_sub_stats,
+)
+from characters_analyzer.engine.facets import FacetCache, FacetIndex
+from characters_analyzer.engine.filters import Filter
+from characters_analyzer.engine.inventory import Inventory, InventoryCache
 from characters_analyzer.schemas import ArtifactData
 
 
@@ -11,6 +34,20 @@ async def add_artifact(
 ):
     """Adds an artifact record to the database.
 
+    The sub stats of the artifact are inserted in the same transaction,
+    along with their copy in the artifact record (``Artifact.sub_stat_values``),
+    its fingerprint (unique per user, see ``engine.artifacts.fingerprint_artifact``)
+    and the scores of the artifact for the user's characters;
+    an equipped artifact takes off the piece its character wore in the same
+    slot and is counted in the global statistics and in the ranking
+    of its character's build.
+    The artifact is also put into the user's inventory snapshot and facet index,
+    if the worker holds them; they are dropped if the transaction is not committed
+    or if a piece has been taken off.
+
+    The character equipping the artifact **must** belong to the user,
+    it is checked beforehand by the endpoint.
+
     Parameters
     ----------
     session : AsyncSession
@@ -20,5 +57,505 @@ async def add_artifact(
     artifact_data : ArtifactData
         Artifact data.
     """
-    session.add(Artifact(user_id=user_id, **artifact_data.model_dump()))
-    await session.commit()
+    equipped = Artifact.user_character_id == artifact_data.user_character_id
+    before = after = {}
+    taken_off = []
+
+    if artifact_data.user_character_id is not None:
+        before = await sketch_service.get_builds(session, equipped)
+        taken_off = await _take_off(
+            session, user_id, artifact_data.user_character_id, artifact_data.slot
+        )
+
+    columns = {
+        **artifact_data.model_dump(exclude={"sub_stats"}),
+        "sub_stat_values": pack_sub_stats(
+            (sub_stat.sub_stat_id, sub_stat.sub_stat_value)
+            for sub_stat in artifact_data.sub_stats
+        ),
+    }
+
+    session.add(
+        artifact := Artifact(
+            user_id=user_id,
+            **columns,
+            stats=[
+                ArtifactSubStat(**sub_stat.model_dump())
+                for sub_stat in artifact_data.sub_stats
+            ],
+            fingerprint=fingerprint_artifact(columns),
+        )
+    )
+    await session.flush()
+
+    await score_service.rescore_artifacts(session, user_id, [artifact.id])
+
+    if artifact.user_character_id is not None:
+        await usage_service.count_sets(session, Artifact.id == artifact.id, 1)
+        after = await sketch_service.get_builds(session, equipped)
+
+    await event_service.publish(session, user_id, "artifact", "created", artifact.id)
+
+    if taken_off:
+        # the snapshot knows the characters wearing the artifacts, not their slots
+        _drop_inventory(user_id)
+    else:
+        # patched before the notification of the commit can reach the worker
+        _patch_inventory(
+            user_id,
+            [artifact.id],
+            _inventory_columns([artifact], np.array([artifact.sub_stat_values])),
+        )
+
+    unit_of_work.on_rollback(session, partial(_drop_inventory, user_id))
+    unit_of_work.on_commit(
+        session, partial(sketch_service.record_builds, before, after)
+    )
+    unit_of_work.on_commit(
+        session, partial(similar_service.record_builds, before, after)
+    )
+
+
+async def get_artifact_with_sub_stats(
+    session: AsyncSession, user_id: UUID, id_: UUID
+) -> Artifact | None:
+    """The function of obtaining a user's artifact with its sub stats.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    user_id : UUID
+        User's UUID.
+    id_ : UUID
+        Artifact's UUID.
+
+    Returns
+    -------
+    artifact : Artifact | None
+        Artifact, None if the user has no such artifact.
+    """
+    return await session.scalar(
+        select(Artifact)
+        .where(Artifact.id == id_, Artifact.user_id == user_id)
+        .options(selectinload(Artifact.stats))
+    )
+
+
+async def get_artifacts(
+    session: AsyncSession,
+    user_id: UUID,
+    filter_: Filter | None = None,
+    limit: int = 100,
+    offset: int = 0,
+) -> List[Artifact]:
+    """The function of obtaining the user's artifacts matching a filter.
+
+    The filter is compiled into the condition of the query
+    (see ``engine.filters``), so the artifacts are filtered by Postgres.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    user_id : UUID
+        User's UUID.
+    filter_ : Filter, optional
+        Compiled filter, all the artifacts by default.
+    limit : int
+        The number of artifacts.
+    offset : int
+        The number of artifacts to skip.
+
+    Returns
+    -------
+    artifacts : List[Artifact]
+        Artifacts with their sub stats, in a stable order.
+    """
+    statement = select(Artifact).where(Artifact.user_id == user_id)
+
+    if filter_ is not None:
+        statement = statement.where(filter_.clause)
+
+    result = await session.scalars(
+        statement.order_by(Artifact.id)
+        .limit(limit)
+        .offset(offset)
+        .options(selectinload(Artifact.stats))
+    )
+
+    return list(result.all())
+
+
+async def get_equipped_artifact(
+    session: AsyncSession, user_id: UUID, user_character_id: UUID, slot: str
+) -> Artifact | None:
+    """The function of obtaining the artifact equipped by a user's character in a slot.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    user_id : UUID
+        User's UUID.
+    user_character_id : UUID
+        UserCharacter's UUID.
+    slot : str
+        Slot of the artifact.
+
+    Returns
+    -------
+    artifact : Artifact | None
+        Equipped artifact with its sub stats, None if the slot is empty.
+    """
+    return await session.scalar(
+        select(Artifact)
+        .where(
+            Artifact.user_id == user_id,
+            Artifact.user_character_id == user_character_id,
+            Artifact.slot == slot,
+        )
+        .options(selectinload(Artifact.stats))
+        .limit(1)
+    )
+
+
+async def scan_sub_stats(
+    session: AsyncSession, user_id: UUID
+) -> Tuple[List[UUID], np.ndarray]:
+    """The function of obtaining the sub stats of all the user's artifacts as an array.
+
+    Reads the denormalized copy of the sub stats: one row per artifact,
+    without joining the sub stats table. The artifacts without the copy,
+    if any, are completed from the sub stats table.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    user_id : UUID
+        User's UUID.
+
+    Returns
+    -------
+    ids : List[UUID]
+        Artifacts' UUIDs.
+    values : np.ndarray
+        Sub stats, shaped ``(artifacts, sub stats)``, in the order
+        of ``engine.artifacts.get_sub_stat_ids``.
+    """
+    result = await session.execute(
+        select(Artifact.id, Artifact.sub_stat_values).where(Artifact.user_id == user_id)
+    )
+    rows = result.tuples().all()
+    ids = [id_ for id_, _ in rows]
+
+    return ids, await _unpack_sub_stats(
+        session, user_id, ids, [packed for _, packed in rows]
+    )
+
+
+async def join_sub_stats(
+    session: AsyncSession, user_id: UUID, ids: List[UUID] | None = None
+) -> Tuple[List[UUID], np.ndarray]:
+    """The function of obtaining the sub stats of the user's artifacts from their table.
+
+    Joins the artifacts with their sub stats and pivots up to four rows
+    per artifact into one. Works like ``scan_sub_stats``.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    user_id : UUID
+        User's UUID.
+    ids : List[UUID], optional
+        Artifacts' UUIDs, all the user's artifacts by default.
+
+    Returns
+    -------
+    ids : List[UUID]
+        Artifacts' UUIDs.
+    values : np.ndarray
+        Sub stats, shaped ``(artifacts, sub stats)``.
+    """
+    statement = (
+        select(Artifact.id, ArtifactSubStat.sub_stat_id, ArtifactSubStat.sub_stat_value)
+        .outerjoin(ArtifactSubStat, ArtifactSubStat.artifact_id == Artifact.id)
+        .where(Artifact.user_id == user_id)
+    )
+
+    if ids is not None:
+        statement = statement.where(Artifact.id.in_(ids))
+
+    rows = (await session.execute(statement)).tuples().all()
+
+    positions = {id_: position for position, id_ in enumerate(get_sub_stat_ids())}
+
+    if ids is None:
+        ids = list(dict.fromkeys(id_ for id_, _, _ in rows))
+
+    rows_of = {id_: row for row, id_ in enumerate(ids)}
+    values = np.zeros((len(ids), len(positions)))
+
+    if cells := [
+        (rows_of[id_], positions[sub_stat_id], value)
+        for id_, sub_stat_id, value in rows
+        if sub_stat_id in positions
+    ]:
+        row, column, value = zip(*cells)
+        values[list(row), list(column)] = value
+
+    return ids, values
+
+
+async def get_inventory(session: AsyncSession, user_id: UUID) -> Inventory:
+    """The function of obtaining the columnar snapshot of the user's inventory.
+
+    The snapshot is read from the database on the first request, one row
+    per artifact like ``scan_sub_stats``, and kept by the worker
+    (see ``get_inventory_cache``); it is patched by the changes
+    of the inventory (see ``add_artifact`` and ``on_inventory_event``).
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    user_id : UUID
+        User's UUID.
+
+    Returns
+    -------
+    inventory : Inventory
+        Snapshot of the user's artifacts.
+    """
+    cache = get_inventory_cache()
+
+    if (inventory := cache.get(user_id)) is not None:
+        return inventory
+
+    result = await session.execute(
+        select(
+            Artifact.id,
+            Artifact.set_id,
+            Artifact.slot,
+            Artifact.main_stat_id,
+            Artifact.main_stat_value,
+            Artifact.user_character_id,
+            Artifact.level,
+            Artifact.rarity,
+            Artifact.sub_stat_values,
+        ).where(Artifact.user_id == user_id)
+    )
+    rows = result.all()
+    ids = [row.id for row in rows]
+
+    sub_stat_values = await _unpack_sub_stats(
+        session, user_id, ids, [row.sub_stat_values for row in rows]
+    )
+
+    inventory = Inventory(ids, _inventory_columns(rows, sub_stat_values))
+    cache.put(user_id, inventory)
+
+    return inventory
+
+
+async def get_facet_index(session: AsyncSession, user_id: UUID) -> FacetIndex:
+    """The function of obtaining the facet index of the user's inventory.
+
+    The index is built from the inventory snapshot (see ``get_inventory``)
+    on the first request and kept by the worker (see ``get_facet_cache``);
+    new artifacts are appended to it by ``add_artifact``, other changes
+    drop it (see ``on_inventory_event``).
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    user_id : UUID
+        User's UUID.
+
+    Returns
+    -------
+    index : FacetIndex
+        Facet index of the user's artifacts.
+    """
+    cache = get_facet_cache()
+
+    if (index := cache.get(user_id)) is None:
+        inventory = await get_inventory(session, user_id)
+
+        index = FacetIndex(inventory.ids, inventory.columns)
+        cache.put(user_id, index)
+
+    return index
+
+
+@lru_cache
+def get_facet_cache() -> FacetCache:
+    """Returns the facet indexes of the worker.
+
+    Returns
+    -------
+    cache : FacetCache
+        Facet indexes of the most recently active users.
+    """
+    settings: Settings = get_settings()
+
+    return FacetCache(settings.FACET_CACHE_SIZE)
+
+
+@lru_cache
+def get_inventory_cache() -> InventoryCache:
+    """Returns the inventory snapshots of the worker.
+
+    Returns
+    -------
+    cache : InventoryCache
+        Inventory snapshots of the most recently active users.
+    """
+    settings: Settings = get_settings()
+
+    return InventoryCache(settings.INVENTORY_CACHE_BYTES)
+
+
+def on_inventory_event(user_id: UUID, message: Dict[str, Any]):
+    """Keeps the inventory snapshots and facet indexes of the worker consistent.
+
+    Receives the change notifications of all the workers (see ``core.events``).
+    Deleted artifacts are removed from the snapshot and the artifacts
+    of a deleted character are unequipped in place; a created artifact
+    unknown to the worker, or any other change of the user's artifacts,
+    drops the snapshot. The facet index is only kept for an artifact
+    it already holds; otherwise it is rebuilt from the snapshot
+    on the next request.
+
+    Parameters
+    ----------
+    user_id : UUID
+        UUID of the user whose data has changed.
+    message : Dict[str, Any]
+        Event payload.
+    """
+    inventory = get_inventory_cache().peek(user_id)
+    index = get_facet_cache().get(user_id)
+
+    match message:
+        case {"entity": "artifact", "action": "created", "id": str(id_)}:
+            # held already by the worker that has created it
+            if any(
+                held is not None and UUID(id_) not in held
+                for held in (inventory, index)
+            ):
+                _drop_inventory(user_id)
+        case {"entity": "artifact", "action": "deleted", "id": str(id_)}:
+            if inventory is not None:
+                inventory.remove([UUID(id_)])
+
+            get_facet_cache().discard(user_id)
+        case {"entity": "character", "action": "deleted", "id": str(id_)}:
+            if inventory is not None:
+                inventory.unequip(UUID(id_))
+
+            get_facet_cache().discard(user_id)
+        case {"entity": "artifact"}:
+            _drop_inventory(user_id)
+
+
+async def _take_off(
+    session: AsyncSession, user_id: UUID, user_character_id: UUID, slot: str
+) -> List[UUID]:
+    """Takes off the pieces a user's character wears in a slot, returns their UUIDs."""
+    result = await session.scalars(
+        select(Artifact.id).where(
+            Artifact.user_id == user_id,
+            Artifact.user_character_id == user_character_id,
+            Artifact.slot == slot,
+        )
+    )
+
+    if not (taken_off := list(result.all())):
+        return taken_off
+
+    # counted while the character still wears them
+    await usage_service.count_sets(session, Artifact.id.in_(taken_off), -1)
+    await session.execute(
+        update(Artifact)
+        .where(Artifact.id.in_(taken_off))
+        .values(user_character_id=None)
+        .execution_options(synchronize_session=False)
+    )
+    await event_service.publish_many(session, user_id, "artifact", "updated", taken_off)
+
+    return taken_off
+
+
+def _patch_inventory(user_id: UUID, ids: List[UUID], columns: Dict[str, np.ndarray]):
+    """Puts artifacts into the user's snapshot and facet index, if the worker holds them."""
+    if (inventory := get_inventory_cache().peek(user_id)) is not None:
+        inventory.put(ids, columns)
+        get_inventory_cache().trim()
+
+    if (index := get_facet_cache().get(user_id)) is not None:
+        index.add(ids, columns)
+
+
+def _drop_inventory(user_id: UUID):
+    """Drops the user's snapshot and facet index, they are rebuilt on the next request."""
+    get_inventory_cache().discard(user_id)
+    get_facet_cache().discard(user_id)
+
+
+async def _unpack_sub_stats(
+    session: AsyncSession,
+    user_id: UUID,
+    ids: List[UUID],
+    packed: List[List[float] | None],
+) -> np.ndarray:
+    """Stacks the copies of the sub stats of the artifacts.
+
+    The artifacts without the copy, if any, are completed from the sub stats table.
+    """
+    values = np.zeros((len(ids), len(get_sub_stat_ids())))
+
+    if missing := [row for row, copy in enumerate(packed) if copy is None]:
+        _, values[missing] = await join_sub_stats(
+            session, user_id, [ids[row] for row in missing]
+        )
+
+    if present := [row for row, copy in enumerate(packed) if copy is not None]:
+        values[present] = [packed[row] for row in present]
+
+    return values
+
+
+def _inventory_columns(
+    artifacts: Iterable[Any], sub_stat_values: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """Columns of the artifacts, see ``engine.filters.Filter.evaluate``, and their main stat values.
+
+    The artifacts are anything with the attributes of ``Artifact``, e.g. rows.
+    """
+    artifacts = list(artifacts)
+
+    def strings(name: str) -> np.ndarray:
+        return np.array(
+            [
+                None if (value := getattr(artifact, name)) is None else str(value)
+                for artifact in artifacts
+            ],
+            dtype=object,
+        )
+
+    return {
+        "set_id": strings("set_id"),
+        "slot": strings("slot"),
+        "main_stat_id": strings("main_stat_id"),
+        "main_stat_value": np.array(
+            [artifact.main_stat_value for artifact in artifacts]
+        ),
+        "user_character_id": strings("user_character_id"),
+        "level": np.array([artifact.level for artifact in artifacts], dtype=int),
+        "rarity": np.array([artifact.rarity for artifact in artifacts], dtype=int),
+        "sub_stat_values": sub_stat_values,
+    }
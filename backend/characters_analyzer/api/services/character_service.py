@@ -1,10 +1,22 @@
-from typing import List
+from functools import partial
+from types import SimpleNamespace
+from typing import Dict, List
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import column, delete, select, update, values
 from sqlalchemy.ext.asyncio import AsyncSession
-
-from characters_analyzer.database.tables.entities import Character, User
+from sqlalchemy.orm import selectinload
+from sqlalchemy.types import Integer, Uuid
+
+from characters_analyzer.api.services import (
+    event_service,
+    score_service,
+    similar_service,
+    sketch_service,
+    usage_service,
+)
+from characters_analyzer.database import unit_of_work
+from characters_analyzer.database.tables.entities import Artifact, Character, User
 from characters_analyzer.database.tables.junctions import UserCharacter
 from characters_analyzer.schemas import CharacterDataSchema, CharacterDataWithIdSchema
 
@@ -31,6 +43,70 @@ async def get_user_character_by_id(
     return await session.get(UserCharacter, {"id": id_})
 
 
+async def get_user_characters_owners(
+    session: AsyncSession, ids: List[UUID]
+) -> Dict[UUID, UUID]:
+    """The function of obtaining owners of several user's characters at once.
+
+    Makes a single query, which selects only identifiers without loading ORMs.
+    Missing records are absent from the result.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    ids : List[UUID]
+        UserCharacters' UUIDs.
+
+    Returns
+    -------
+    owners : Dict[UUID, UUID]
+        Mapping of UserCharacter's UUID to its user's UUID.
+    """
+    result = await session.execute(
+        select(UserCharacter.id, UserCharacter.user_id).where(UserCharacter.id.in_(ids))
+    )
+
+    return dict(result.tuples().all())
+
+
+async def get_user_characters_with_artifacts(
+    session: AsyncSession, user_id: UUID, ids: List[UUID] | None = None
+) -> List[UserCharacter]:
+    """The function of obtaining several user's characters with their artifacts.
+
+    The artifacts and their sub stats are loaded with one additional query
+    each, so the result can be used outside of the session.
+    Records of other users and missing records are absent from the result.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    user_id : UUID
+        User's UUID.
+    ids : List[UUID], optional
+        UserCharacters' UUIDs, all the user's characters by default.
+
+    Returns
+    -------
+    characters : List[UserCharacter]
+        User's characters with their artifacts.
+    """
+    statement = select(UserCharacter).where(UserCharacter.user_id == user_id)
+
+    if ids is not None:
+        statement = statement.where(UserCharacter.id.in_(ids))
+
+    result = await session.scalars(
+        statement.options(
+            selectinload(UserCharacter.artifacts).selectinload(Artifact.stats)
+        )
+    )
+
+    return list(result.all())
+
+
 async def get_user_characters_by_user(user: User) -> List[UserCharacter]:
     """The function of obtaining all user's characters' data.
 
@@ -87,7 +163,9 @@ async def add_character_to_user(
     while user_character contains information about the individual user's
     character leveling.
 
-    This function adds a record of the user's character leveling to the database.
+    This function adds a record of the user's character leveling to the database,
+    scores the user's artifacts for the character and counts the character
+    in the global statistics (see ``usage_service``) in the same transaction.
 
     Parameters
     ----------
@@ -99,12 +177,20 @@ async def add_character_to_user(
         Character's info to add.
     """
     session.add(
-        UserCharacter(
+        user_character := UserCharacter(
             user_id=user_id,
             **data.model_dump(),
         )
     )
-    await session.commit()
+    await session.flush()
+
+    await score_service.rescore_characters(session, user_id, [user_character.id])
+    await usage_service.count_characters(
+        session, usage_service.character_counts([user_character])
+    )
+    await event_service.publish(
+        session, user_id, "character", "created", user_character.id
+    )
 
 
 async def update_user_character(
@@ -113,7 +199,8 @@ async def update_user_character(
     """Updating a character entry.
 
     The function updates the record in the database about
-    the character associated with the user.
+    the character associated with the user, and moves the character
+    between the counters of the global statistics in the same transaction.
 
     Parameters
     ----------
@@ -125,17 +212,54 @@ async def update_user_character(
         Character's info to put.
     """
     character_data = data.model_dump()
+    counts = usage_service.character_counts([user_character], -1)
 
     for key in character_data:
         setattr(user_character, key, character_data.get(key))
 
-    await session.commit()
+    counts.update(usage_service.character_counts([user_character]))
+
+    await usage_service.count_characters(session, counts)
+    await event_service.publish(
+        session, user_character.user_id, "character", "updated", user_character.id
+    )
+    await session.flush()
+
+
+async def update_score_formula(
+    session: AsyncSession, user_character: UserCharacter, formula: str | None
+):
+    """Updating the scoring formula of a character.
+
+    The user's artifacts are rescored for the character
+    in the same transaction.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    user_character : UserCharacter
+        UserCharacter's ORM to update.
+    formula : str | None
+        Valid scoring formula, None for the default one.
+    """
+    user_character.score_formula = formula
+    await session.flush()
+
+    await score_service.rescore_characters(
+        session, user_character.user_id, [user_character.id]
+    )
+    await event_service.publish(
+        session, user_character.user_id, "character", "updated", user_character.id
+    )
 
 
 async def delete_user_character(session: AsyncSession, user_character: UserCharacter):
     """Character removal function.
 
     Removes a character entry from the table containing information about the user's characters.
+    The character and the artifacts it wears are taken out of the global
+    statistics in the same transaction, and its build out of the ranking.
 
     Parameters
     ----------
@@ -144,5 +268,112 @@ async def delete_user_character(session: AsyncSession, user_character: UserChara
     user_character : UserCharacter
         UserCharacter's ORM to delete.
     """
+    equipped = Artifact.user_character_id == user_character.id
+
+    await usage_service.count_characters(
+        session, usage_service.character_counts([user_character], -1)
+    )
+    await usage_service.count_sets(session, equipped, -1)
+    builds = await sketch_service.get_builds(session, equipped)
     await session.delete(user_character)
-    await session.commit()
+
+    await event_service.publish(
+        session, user_character.user_id, "character", "deleted", user_character.id
+    )
+    await session.flush()
+
+    unit_of_work.on_commit(session, partial(sketch_service.record_builds, builds, {}))
+    unit_of_work.on_commit(session, partial(similar_service.record_builds, builds, {}))
+
+
+async def batch_user_characters(
+    session: AsyncSession,
+    user_id: UUID,
+    updates: Dict[UUID, CharacterDataSchema],
+    deletes: List[UUID],
+):
+    """Updating and deleting several character entries in one transaction.
+
+    All updates are applied with a single ``UPDATE ... FROM (VALUES ...)``
+    statement and all deletions with a single ``DELETE``, bypassing the ORM
+    identity map. Ownership of the records **must** be checked beforehand
+    (see ``get_user_characters_owners``); the statements are additionally
+    restricted to the user's records. The global statistics are updated
+    from the previous state of the records, read beforehand.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    user_id : UUID
+        UUID of the user performing the batch.
+    updates : Dict[UUID, CharacterDataSchema]
+        Mapping of UserCharacter's UUID to the character's info to put.
+    deletes : List[UUID]
+        UUIDs of the UserCharacters to delete.
+    """
+    result = await session.execute(
+        select(
+            UserCharacter.id,
+            UserCharacter.character_id,
+            *(getattr(UserCharacter, metric) for metric in usage_service.METRICS),
+        ).where(
+            UserCharacter.id.in_([*updates, *deletes]), UserCharacter.user_id == user_id
+        )
+    )
+    previous = result.all()
+
+    counts = usage_service.character_counts(previous, -1)
+    counts.update(
+        usage_service.character_counts(
+            SimpleNamespace(**{**row._asdict(), **updates[row.id].model_dump()})
+            for row in previous
+            if row.id in updates
+        )
+    )
+    await usage_service.count_characters(session, counts)
+
+    if updates:
+        fields = list(CharacterDataSchema.model_fields)
+
+        rows = values(
+            column("id", Uuid()),
+            *(column(field, Integer()) for field in fields),
+            name="batch",
+        ).data(
+            [
+                (id_, *(getattr(data, field) for field in fields))
+                for id_, data in updates.items()
+            ]
+        )
+
+        await session.execute(
+            update(UserCharacter)
+            .where(UserCharacter.id == rows.c.id, UserCharacter.user_id == user_id)
+            .values({field: rows.c[field] for field in fields})
+            .execution_options(synchronize_session=False)
+        )
+        await event_service.publish_many(
+            session, user_id, "character", "updated", updates
+        )
+
+    builds = {}
+
+    if deletes:
+        equipped = Artifact.user_character_id.in_(deletes) & (
+            UserCharacter.user_id == user_id
+        )
+
+        await usage_service.count_sets(session, equipped, -1)
+        builds = await sketch_service.get_builds(session, equipped)
+        await session.execute(
+            delete(UserCharacter)
+            .where(UserCharacter.id.in_(deletes), UserCharacter.user_id == user_id)
+            .execution_options(synchronize_session=False)
+        )
+        await event_service.publish_many(
+            session, user_id, "character", "deleted", deletes
+        )
+
+    unit_of_work.on_commit(session, partial(sketch_service.record_builds, builds, {}))
+    unit_of_work.on_commit(session, partial(similar_service.record_builds, builds, {}))
@@ -0,0 +1,108 @@
+import json
+from typing import AnyStr, Iterable
+from uuid import UUID
+
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.types import Text
+
+from characters_analyzer.core.events import CHANNEL
+
+
+async def publish(
+    session: AsyncSession,
+    user_id: UUID,
+    entity: AnyStr,
+    action: AnyStr,
+    id_: UUID = None,
+):
+    """Queues a change notification for the user's open clients.
+
+    The notification is sent with ``pg_notify`` inside the current transaction,
+    so Postgres delivers it to every worker only after the transaction is
+    committed and drops it if the transaction is rolled back.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    user_id : UUID
+        UUID of the user whose data has changed.
+    entity : AnyStr
+        Changed entity, e.g. ``"character"`` or ``"artifact"``.
+    action : AnyStr
+        What happened to the entity: ``"created"``, ``"updated"`` or ``"deleted"``.
+    id_ : UUID, optional
+        UUID of the changed record.
+    """
+    await session.execute(
+        select(func.pg_notify(CHANNEL, _payload(user_id, entity, action, id_)))
+    )
+
+
+async def publish_many(
+    session: AsyncSession,
+    user_id: UUID,
+    entity: AnyStr,
+    action: AnyStr,
+    ids: Iterable[UUID],
+):
+    """Queues change notifications for several records in one round trip.
+
+    Works like ``publish``, but sends one notification per record
+    with a single statement.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    user_id : UUID
+        UUID of the user whose data has changed.
+    entity : AnyStr
+        Changed entity, e.g. ``"character"`` or ``"artifact"``.
+    action : AnyStr
+        What happened to the entities: ``"created"``, ``"updated"`` or ``"deleted"``.
+    ids : Iterable[UUID]
+        UUIDs of the changed records.
+    """
+    if not (payloads := [_payload(user_id, entity, action, id_) for id_ in ids]):
+        return
+
+    await session.execute(
+        select(
+            func.pg_notify(
+                CHANNEL,
+                func.unnest(bindparam("payloads", payloads, type_=ARRAY(Text()))),
+            )
+        )
+    )
+
+
+def _payload(user_id: UUID, entity: AnyStr, action: AnyStr, id_: UUID | None) -> str:
+    """Serializes a notification.
+
+    Parameters
+    ----------
+    user_id : UUID
+        UUID of the user whose data has changed.
+    entity : AnyStr
+        Changed entity.
+    action : AnyStr
+        What happened to the entity.
+    id_ : UUID | None
+        UUID of the changed record.
+
+    Returns
+    -------
+    payload : str
+        JSON notification payload.
+    """
+    return json.dumps(
+        {
+            "user_id": str(user_id),
+            "entity": entity,
+            "action": action,
+            "id": None if id_ is None else str(id_),
+        }
+    )
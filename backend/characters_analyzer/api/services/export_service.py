@@ -0,0 +1,172 @@
+from typing import AsyncIterator, List, Tuple
+from uuid import UUID
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from characters_analyzer.database.tables.entities import Artifact
+from characters_analyzer.database.tables.junctions import UserCharacter
+from characters_analyzer.engine.artifacts import get_upgrade_rules
+from characters_analyzer.engine.export import COLUMNAR, ArchiveWriter, ExportWriter
+
+# rows fetched from the server-side cursor at once
+BATCH_SIZE = 5000
+
+# tables of an account, in the order they are exported
+TABLES = ("characters", "artifacts")
+
+# tables of an account with the kinds of their columns
+_CHARACTER_COLUMNS = [
+    ("id", "uuid"),
+    ("character_id", "uuid"),
+    ("level", "int"),
+    ("constellations", "int"),
+    ("attack_level", "int"),
+    ("skill_level", "int"),
+    ("burst_level", "int"),
+    ("score_formula", "str"),
+]
+_ARTIFACT_COLUMNS = [
+    ("id", "uuid"),
+    ("user_character_id", "uuid"),
+    ("set_id", "uuid"),
+    ("slot", "str"),
+    ("rarity", "int"),
+    ("level", "int"),
+    ("main_stat_id", "uuid"),
+    ("main_stat_value", "float"),
+]
+
+
+def get_columns(table: str) -> List[Tuple[str, str]]:
+    """Columns of an exported table.
+
+    The sub stats of the artifacts are a column each,
+    named by the keys of the sub stats.
+
+    Parameters
+    ----------
+    table : str
+        ``characters`` or ``artifacts``.
+
+    Returns
+    -------
+    columns : List[Tuple[str, str]]
+        Names and kinds of the columns, see ``engine.export.ExportWriter``.
+    """
+    if table == "characters":
+        return _CHARACTER_COLUMNS
+
+    return _ARTIFACT_COLUMNS + [(key, "float") for key in get_upgrade_rules().sub_stats]
+
+
+async def export_account(
+    session: AsyncSession, user_id: UUID, format_: str
+) -> AsyncIterator[bytes]:
+    """The function of exporting every table of the user's account.
+
+    The tables are read one after the other in the same session,
+    so it has to see a single snapshot of the database
+    (see ``api.dependencies.get_snapshot_session``) for the tables
+    to agree with each other. The NDJSON lines of all the tables follow
+    each other, every line naming its table in the ``table`` key;
+    the columnar tables are the files of a zip archive, e.g. ``characters.parquet``.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Session seeing a single snapshot of the database.
+    user_id : UUID
+        User's UUID.
+    format_ : str
+        Format of the tables, see ``engine.export.FORMATS``.
+
+    Returns
+    -------
+    chunks : AsyncIterator[bytes]
+        Content of the export.
+    """
+    if format_ not in COLUMNAR:
+        for table in TABLES:
+            async for chunk in export_table(
+                session, user_id, table, format_, tagged=True
+            ):
+                yield chunk
+
+        return
+
+    archive = ArchiveWriter()
+
+    for table in TABLES:
+        yield archive.open(f"{table}.{format_}")
+
+        async for chunk in export_table(session, user_id, table, format_):
+            yield archive.write(chunk)
+
+    yield archive.close()
+
+
+async def export_table(
+    session: AsyncSession,
+    user_id: UUID,
+    table: str,
+    format_: str,
+    tagged: bool = False,
+) -> AsyncIterator[bytes]:
+    """The function of exporting a table of the user's account.
+
+    The rows are read from a server-side cursor, ``BATCH_SIZE`` at a time,
+    and every batch is encoded and sent before the next one is fetched,
+    so the memory doesn't grow with the account. The sub stats of the
+    artifacts are read from their dense copy (``Artifact.sub_stat_values``),
+    without joining ``artifact_sub_stat``.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    user_id : UUID
+        User's UUID.
+    table : str
+        ``characters`` or ``artifacts``.
+    format_ : str
+        Format of the export, see ``engine.export.FORMATS``.
+    tagged : bool
+        Whether every row starts with the name of the table, in the ``table`` column.
+
+    Returns
+    -------
+    chunks : AsyncIterator[bytes]
+        Content of the export.
+    """
+    columns = get_columns(table)
+    writer = ExportWriter(format_, [("table", "str")] + columns if tagged else columns)
+    absent = (0.0,) * len(get_upgrade_rules().sub_stats)
+
+    result = await session.stream(
+        _statement(table, user_id).execution_options(yield_per=BATCH_SIZE)
+    )
+
+    async for rows in result.partitions():
+        if table == "artifacts":
+            rows = [(*row[:-1], *(row[-1] or absent)) for row in rows]
+
+        if tagged:
+            rows = [(table, *row) for row in rows]
+
+        yield writer.write(rows)
+
+    if chunk := writer.close():
+        yield chunk
+
+
+def _statement(table: str, user_id: UUID) -> Select:
+    if table == "characters":
+        return select(
+            *(getattr(UserCharacter, name) for name, _ in _CHARACTER_COLUMNS)
+        ).where(UserCharacter.user_id == user_id)
+
+    return select(
+        *(getattr(Artifact, name) for name, _ in _ARTIFACT_COLUMNS),
+        Artifact.sub_stat_values,
+    ).where(Artifact.user_id == user_id)
@@ -0,0 +1,127 @@
+from functools import lru_cache
+from typing import List
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from characters_analyzer.api.services import character_service, event_service
+from characters_analyzer.core.config import Settings, get_settings
+from characters_analyzer.core.jobs import Debouncer
+from characters_analyzer.database.engine import get_session_maker
+from characters_analyzer.database.tables.entities import FarmRecommendation
+from characters_analyzer.engine.artifacts import DEFAULT_SCORE_FORMULA
+from characters_analyzer.engine.farm import recommend
+from characters_analyzer.engine.formula import compile_formula
+
+
+async def get_recommendations(
+    session: AsyncSession, user_id: UUID
+) -> List[FarmRecommendation]:
+    """The function of obtaining the stored farming recommendations of the user.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    user_id : UUID
+        User's UUID.
+
+    Returns
+    -------
+    recommendations : List[FarmRecommendation]
+        Sets worth farming, from the most useful;
+        empty if they have never been computed.
+    """
+    result = await session.scalars(
+        select(FarmRecommendation)
+        .where(FarmRecommendation.user_id == user_id)
+        .order_by(FarmRecommendation.gain.desc())
+    )
+
+    return list(result.all())
+
+
+async def refresh_recommendations(session: AsyncSession, user_id: UUID):
+    """Recomputes the farming recommendations of the user.
+
+    The whole roster with its artifacts is loaded and ranked at once
+    (see ``engine.farm``); the rows of all the sets are rewritten
+    with a single upsert, so concurrent recomputations do not conflict.
+    The rows are staged in the session's transaction, committed by its owner:
+    the unit of work of the request or the background job.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    user_id : UUID
+        User's UUID.
+    """
+    user_characters = await character_service.get_user_characters_with_artifacts(
+        session, user_id
+    )
+    set_gains = recommend(user_characters, compile_formula(DEFAULT_SCORE_FORMULA))
+
+    if not set_gains:
+        return
+
+    statement = insert(FarmRecommendation).values(
+        [{"user_id": user_id, **set_gain._asdict()} for set_gain in set_gains]
+    )
+    await session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[FarmRecommendation.user_id, FarmRecommendation.set_id],
+            set_={
+                "domain": statement.excluded.domain,
+                "gain": statement.excluded.gain,
+                "user_character_id": statement.excluded.user_character_id,
+                "computed_at": func.now(),
+            },
+        )
+    )
+
+    await event_service.publish(session, user_id, "recommendations", "updated")
+
+
+def schedule_refresh(user_id: UUID):
+    """Requests a background recomputation of the user's recommendations.
+
+    Called after every change of the user's inventory; the changes made
+    within ``FARM_DEBOUNCE_SECONDS`` of each other cause a single run.
+
+    Parameters
+    ----------
+    user_id : UUID
+        User's UUID.
+    """
+    get_farm_jobs().schedule(user_id)
+
+
+@lru_cache
+def get_farm_jobs() -> Debouncer:
+    """Returns the debouncer of the recomputations of the worker.
+
+    Returns
+    -------
+    jobs : Debouncer
+        Debouncer.
+    """
+    settings: Settings = get_settings()
+
+    return Debouncer(_refresh, settings.FARM_DEBOUNCE_SECONDS)
+
+
+async def shutdown_farm_jobs():
+    """Runs the pending recomputations, if the debouncer has been created."""
+    if get_farm_jobs.cache_info().currsize:
+        await get_farm_jobs().shutdown()
+
+    get_farm_jobs.cache_clear()
+
+
+async def _refresh(user_id: UUID):
+    async with get_session_maker()() as session:
+        await refresh_recommendations(session, user_id)
+        await session.commit()
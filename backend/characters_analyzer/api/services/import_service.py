@@ -0,0 +1,421 @@
+from types import SimpleNamespace
+from typing import Any, AsyncIterable, Dict, List, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import ColumnElement, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from characters_analyzer.api.services import (
+    event_service,
+    score_service,
+    similar_service,
+    sketch_service,
+    usage_service,
+)
+from characters_analyzer.database.tables.entities import Artifact
+from characters_analyzer.database.tables.junctions import ArtifactSubStat, UserCharacter
+from characters_analyzer.engine.artifacts import fingerprint_artifact, pack_sub_stats
+from characters_analyzer.engine.good import (
+    GoodError,
+    GoodReader,
+    read_artifact,
+    read_character,
+)
+from characters_analyzer.schemas import ArtifactData, CharacterDataWithIdSchema
+
+# items imported in a single transaction
+BATCH_SIZE = 500
+# errors reported at most, the others are only counted
+MAX_ERRORS = 100
+
+
+async def import_good(
+    session: AsyncSession, user_id: UUID, chunks: AsyncIterable[bytes]
+) -> Dict[str, Any]:
+    """Imports an export in the GOOD format into the account of a user.
+
+    The export is read as it arrives (see ``GoodImport``).
+    If it turns out to be invalid, the batches imported so far are kept.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    user_id : UUID
+        UUID of the importing user.
+    chunks : AsyncIterable[bytes]
+        Content of the export, e.g. the stream of the request body.
+
+    Returns
+    -------
+    report : Dict[str, Any]
+        See ``GoodImport.finish``.
+
+    Raises
+    ------
+    GoodError
+        If the document isn't a valid GOOD export.
+    """
+    reader = GoodReader()
+    good_import = GoodImport(session, user_id)
+
+    async for chunk in chunks:
+        for section, item in reader.feed(chunk):
+            await good_import.add(section, item)
+
+        if reader.format not in (None, "GOOD"):
+            raise GoodError(f"Unsupported format: {reader.format!r}.")
+
+    for section, item in reader.close():
+        await good_import.add(section, item)
+
+    return await good_import.finish()
+
+
+class GoodImport:
+    """Import of an export in the GOOD format into the account of a user.
+
+    The items read from the export (see ``engine.good.GoodReader``) are
+    validated one by one and imported in batches of ``BATCH_SIZE``, each in
+    its own transaction: characters are upserted by their character and
+    artifacts are appended, skipping the ones the user already has (same
+    fingerprint, see ``engine.artifacts.fingerprint_artifact``), so an export
+    can be imported again. The global statistics, scores and rankings
+    are kept up to date as with single changes.
+
+    An artifact is equipped by the user's character of its ``location``;
+    artifacts read before their characters are equipped once the export
+    has been read. A character wears a single piece per slot: the one
+    it wore before is taken off, and of several pieces in the export
+    the last one read is kept.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    user_id : UUID
+        UUID of the importing user.
+    """
+
+    def __init__(self, session: AsyncSession, user_id: UUID):
+        self.session: AsyncSession = session
+        self.user_id: UUID = user_id
+
+        self.counts: Dict[str, int] = {
+            "characters": 0,
+            "artifacts": 0,
+            "duplicates": 0,
+            "errors": 0,
+        }
+        self.errors: List[Dict[str, Any]] = []
+
+        self._read: Dict[str, int] = {"characters": 0, "artifacts": 0}
+        self._characters: Dict[UUID, Dict[str, Any]] = {}
+        self._artifacts: List[Tuple[int, ArtifactData, UUID | None]] = []
+        self._deferred: Dict[UUID, Tuple[int, UUID, str]] = {}
+        self._user_characters: Dict[UUID, UUID] | None = None
+
+    async def add(self, section: str, item: Dict[str, Any]):
+        """Validates an item of the export, importing the batch once it is full.
+
+        Parameters
+        ----------
+        section : str
+            ``characters`` or ``artifacts``.
+        item : Dict[str, Any]
+            Content of the item.
+        """
+        index = self._read[section]
+        self._read[section] += 1
+
+        try:
+            if section == "characters":
+                data = CharacterDataWithIdSchema(**read_character(item))
+                # a character listed twice is imported as its last entry
+                self._characters[data.character_id] = data.model_dump()
+            else:
+                artifact, location = read_artifact(item)
+                self._artifacts.append((index, ArtifactData(**artifact), location))
+        except (ValueError, TypeError) as error:
+            self._error(section, index, error)
+
+        if len(self._characters) >= BATCH_SIZE:
+            await self._import_characters()
+
+        if len(self._artifacts) >= BATCH_SIZE:
+            await self._import_artifacts()
+
+    async def finish(self) -> Dict[str, Any]:
+        """Imports the rest of the export.
+
+        Returns
+        -------
+        report : Dict[str, Any]
+            The numbers of imported characters and artifacts, of skipped
+            duplicates and of errors, and the first ``MAX_ERRORS`` errors.
+        """
+        await self._import_characters()
+        await self._import_artifacts()
+        await self._equip_deferred()
+
+        return {**self.counts, "error_details": self.errors}
+
+    async def _import_characters(self):
+        if not self._characters:
+            return
+
+        characters, self._characters = self._characters, {}
+
+        previous = await self.session.execute(
+            select(
+                UserCharacter.id,
+                UserCharacter.character_id,
+                *(getattr(UserCharacter, metric) for metric in usage_service.METRICS),
+            ).where(
+                UserCharacter.user_id == self.user_id,
+                UserCharacter.character_id.in_(characters),
+            )
+        )
+        previous = {row.character_id: row for row in previous}
+
+        counts = usage_service.character_counts(previous.values(), -1)
+        counts.update(
+            usage_service.character_counts(
+                SimpleNamespace(**data) for data in characters.values()
+            )
+        )
+
+        statement = insert(UserCharacter).values(
+            [{"user_id": self.user_id, **data} for data in characters.values()]
+        )
+        result = await self.session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[UserCharacter.user_id, UserCharacter.character_id],
+                set_={
+                    field: statement.excluded[field]
+                    for field in CharacterDataWithIdSchema.model_fields
+                    if field != "character_id"
+                },
+            ).returning(UserCharacter.id, UserCharacter.character_id)
+        )
+        ids = dict(result.tuples().all())
+        created = [
+            id_ for id_, character_id in ids.items() if character_id not in previous
+        ]
+
+        await score_service.rescore_characters(self.session, self.user_id, created)
+        await usage_service.count_characters(self.session, counts)
+        await event_service.publish_many(
+            self.session, self.user_id, "character", "created", created
+        )
+        await event_service.publish_many(
+            self.session,
+            self.user_id,
+            "character",
+            "updated",
+            [row.id for row in previous.values()],
+        )
+        await self.session.commit()
+
+        self.counts["characters"] += len(ids)
+
+        if self._user_characters is not None:
+            self._user_characters.update(
+                {character_id: id_ for id_, character_id in ids.items()}
+            )
+
+    async def _import_artifacts(self):
+        if not self._artifacts:
+            return
+
+        # the locations refer to the characters read so far
+        await self._import_characters()
+
+        artifacts, self._artifacts = self._artifacts, []
+        user_characters = await self._get_user_characters()
+
+        rows, locations = [], {}
+
+        for index, data, location in artifacts:
+            row = {
+                "id": uuid4(),
+                "user_id": self.user_id,
+                **data.model_dump(exclude={"sub_stats", "user_character_id"}),
+                "user_character_id": user_characters.get(location),
+                "sub_stat_values": pack_sub_stats(
+                    (sub_stat.sub_stat_id, sub_stat.sub_stat_value)
+                    for sub_stat in data.sub_stats
+                ),
+            }
+            row["fingerprint"] = fingerprint_artifact(row)
+
+            if location is not None and row["user_character_id"] is None:
+                locations[row["id"]] = index, location, row["slot"]
+
+            rows.append(row)
+
+        worn: Dict[Tuple[UUID, str], Dict[str, Any]] = {}
+
+        for row in rows:
+            if row["user_character_id"] is not None:
+                slot = row["user_character_id"], row["slot"]
+
+                if (previous := worn.get(slot)) is not None:
+                    previous["user_character_id"] = None
+
+                worn[slot] = row
+
+        equipped = Artifact.user_character_id.in_(
+            {row["user_character_id"] for row in rows} - {None}
+        )
+        before = await sketch_service.get_builds(self.session, equipped)
+
+        # the artifacts the user already has are skipped
+        result = await self.session.execute(
+            insert(Artifact)
+            .on_conflict_do_nothing(
+                index_elements=[Artifact.fingerprint, Artifact.user_id]
+            )
+            .returning(Artifact.id),
+            rows,
+        )
+        ids = result.scalars().all()
+        inserted = set(ids)
+
+        sub_stats = [
+            {"artifact_id": row["id"], **sub_stat.model_dump()}
+            for (_, data, _), row in zip(artifacts, rows)
+            if row["id"] in inserted
+            for sub_stat in data.sub_stats
+        ]
+
+        if sub_stats:
+            await self.session.execute(insert(ArtifactSubStat), sub_stats)
+
+        await self._take_off(ids)
+        await score_service.rescore_artifacts(self.session, self.user_id, ids)
+        await usage_service.count_sets(self.session, Artifact.id.in_(ids), 1)
+        await event_service.publish_many(
+            self.session, self.user_id, "artifact", "created", ids
+        )
+        await self._commit(equipped, before)
+
+        self.counts["artifacts"] += len(ids)
+        self.counts["duplicates"] += len(rows) - len(ids)
+        self._deferred.update(
+            (id_, location) for id_, location in locations.items() if id_ in inserted
+        )
+
+    async def _equip_deferred(self):
+        if not self._deferred:
+            return
+
+        user_characters = await self._get_user_characters()
+        deferred, self._deferred = self._deferred, {}
+        worn: Dict[Tuple[UUID, str], UUID] = {}
+
+        for artifact_id, (index, location, slot) in deferred.items():
+            if (user_character_id := user_characters.get(location)) is None:
+                self._error(
+                    "artifacts", index, "Imported unequipped: no such character."
+                )
+            else:
+                worn[user_character_id, slot] = artifact_id
+
+        if not worn:
+            return
+
+        equipped: Dict[UUID, List[UUID]] = {}
+
+        for (user_character_id, _), artifact_id in worn.items():
+            equipped.setdefault(user_character_id, []).append(artifact_id)
+
+        ids = [id_ for artifact_ids in equipped.values() for id_ in artifact_ids]
+        condition = Artifact.user_character_id.in_(equipped)
+        before = await sketch_service.get_builds(self.session, condition)
+
+        for user_character_id, artifact_ids in equipped.items():
+            await self.session.execute(
+                update(Artifact)
+                .where(Artifact.id.in_(artifact_ids), Artifact.user_id == self.user_id)
+                .values(user_character_id=user_character_id)
+                .execution_options(synchronize_session=False)
+            )
+
+        await self._take_off(ids)
+        await usage_service.count_sets(self.session, Artifact.id.in_(ids), 1)
+        await event_service.publish_many(
+            self.session, self.user_id, "artifact", "updated", ids
+        )
+        await self._commit(condition, before)
+
+    async def _take_off(self, ids: List[UUID]):
+        """Takes off the pieces worn in the slots of the artifacts just equipped."""
+        worn = select(Artifact.user_character_id, Artifact.slot).where(
+            Artifact.id.in_(ids), Artifact.user_character_id.is_not(None)
+        )
+        result = await self.session.scalars(
+            select(Artifact.id).where(
+                Artifact.user_id == self.user_id,
+                tuple_(Artifact.user_character_id, Artifact.slot).in_(worn),
+                Artifact.id.not_in(ids),
+            )
+        )
+
+        if not (taken_off := result.all()):
+            return
+
+        # counted while the characters still wear them
+        await usage_service.count_sets(self.session, Artifact.id.in_(taken_off), -1)
+        await self.session.execute(
+            update(Artifact)
+            .where(Artifact.id.in_(taken_off))
+            .values(user_character_id=None)
+            .execution_options(synchronize_session=False)
+        )
+        await event_service.publish_many(
+            self.session, self.user_id, "artifact", "updated", taken_off
+        )
+
+    async def _commit(
+        self, equipped: ColumnElement[bool], before: Dict[UUID, sketch_service.Build]
+    ):
+        """Commits a batch, then records the builds it has changed."""
+        after = await sketch_service.get_builds(self.session, equipped)
+
+        await self.session.commit()
+
+        sketch_service.record_builds(before, after)
+        similar_service.record_builds(before, after)
+
+    async def _get_user_characters(self) -> Dict[UUID, UUID]:
+        """UUIDs of the user's characters by their character's UUID."""
+        if self._user_characters is None:
+            result = await self.session.execute(
+                select(UserCharacter.character_id, UserCharacter.id).where(
+                    UserCharacter.user_id == self.user_id
+                )
+            )
+            self._user_characters = dict(result.tuples().all())
+
+        return self._user_characters
+
+    def _error(self, section: str, index: int, error: Exception | str):
+        self.counts["errors"] += 1
+
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append(
+                {"section": section, "index": index, "detail": _describe(error)}
+            )
+
+
+def _describe(error: Exception | str) -> str:
+    if isinstance(error, (GoodError, str)):
+        return str(error)
+
+    if errors := getattr(error, "errors", None):
+        # the first problem of a validation error
+        return errors()[0]["msg"]
+
+    return f"Invalid value: {error}."
@@ -0,0 +1,190 @@
+from typing import Dict, Iterable, List, Tuple
+from uuid import UUID
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from characters_analyzer.database.tables.entities import Artifact
+from characters_analyzer.database.tables.junctions import ArtifactScore, UserCharacter
+from characters_analyzer.engine.artifacts import (
+    DEFAULT_SCORE_FORMULA,
+    Piece,
+    score_artifacts,
+)
+from characters_analyzer.engine.formula import compile_formula
+
+
+async def get_top_artifacts(
+    session: AsyncSession,
+    user_character_id: UUID,
+    slot: str | None = None,
+    limit: int = 20,
+) -> List[Tuple[Artifact, float]]:
+    """The function of obtaining the best artifacts for a user's character.
+
+    Reads the stored scores from the most useful, so the query is a range
+    scan of an index of ``artifact_score``. Artifacts and their sub stats
+    are loaded for the returned scores only.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    user_character_id : UUID
+        UserCharacter's UUID.
+    slot : str, optional
+        Slot of the artifacts, all slots by default.
+    limit : int
+        The number of artifacts.
+
+    Returns
+    -------
+    artifacts : List[Tuple[Artifact, float]]
+        Artifacts with their scores, from the best.
+    """
+    statement = (
+        select(Artifact, ArtifactScore.score)
+        .join(ArtifactScore, ArtifactScore.artifact_id == Artifact.id)
+        .where(ArtifactScore.user_character_id == user_character_id)
+        .order_by(ArtifactScore.score.desc())
+        .limit(limit)
+        .options(selectinload(Artifact.stats))
+    )
+
+    if slot is not None:
+        statement = statement.where(ArtifactScore.slot == slot)
+
+    return list((await session.execute(statement)).tuples().all())
+
+
+async def rescore_artifacts(
+    session: AsyncSession, user_id: UUID, artifact_ids: List[UUID]
+):
+    """Recomputes the scores of several artifacts for all the user's characters.
+
+    Called in the transaction changing the artifacts or their sub stats,
+    after it has been flushed; the transaction is not committed.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    user_id : UUID
+        User's UUID.
+    artifact_ids : List[UUID]
+        Artifacts' UUIDs.
+    """
+    user_characters = await session.execute(
+        select(UserCharacter.id, UserCharacter.score_formula).where(
+            UserCharacter.user_id == user_id
+        )
+    )
+    artifacts = await session.scalars(
+        select(Artifact)
+        .where(Artifact.user_id == user_id, Artifact.id.in_(artifact_ids))
+        .options(selectinload(Artifact.stats))
+    )
+
+    await _store_scores(session, user_characters.tuples().all(), artifacts.all())
+
+
+async def rescore_characters(
+    session: AsyncSession, user_id: UUID, user_character_ids: List[UUID]
+):
+    """Recomputes the scores of all the user's artifacts for several characters.
+
+    Called in the transaction creating the characters or changing
+    their formulas, after it has been flushed; the transaction
+    is not committed. The characters are marked as scored, unlike
+    ``rescore_artifacts``, which scores only some of the artifacts.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    user_id : UUID
+        User's UUID.
+    user_character_ids : List[UUID]
+        UserCharacters' UUIDs.
+    """
+    user_characters = await session.execute(
+        select(UserCharacter.id, UserCharacter.score_formula).where(
+            UserCharacter.user_id == user_id, UserCharacter.id.in_(user_character_ids)
+        )
+    )
+    artifacts = await session.scalars(
+        select(Artifact)
+        .where(Artifact.user_id == user_id)
+        .options(selectinload(Artifact.stats))
+    )
+
+    await _store_scores(session, user_characters.tuples().all(), artifacts.all())
+
+    await session.execute(
+        update(UserCharacter)
+        .where(
+            UserCharacter.user_id == user_id, UserCharacter.id.in_(user_character_ids)
+        )
+        .values(artifacts_scored=True)
+    )
+
+
+async def _store_scores(
+    session: AsyncSession,
+    user_characters: Iterable[Tuple[UUID, str | None]],
+    artifacts: Iterable[Artifact],
+):
+    """Scores the artifacts for every character and upserts the scores.
+
+    The artifacts are scored once per distinct formula, so the characters
+    keeping the default one share a single computation.
+    """
+    artifacts = list(artifacts)
+
+    if not artifacts:
+        return
+
+    pieces = [Piece.from_artifact(artifact) for artifact in artifacts]
+    rows = []
+
+    by_formula: Dict[str, List[UUID]] = {}
+
+    for user_character_id, formula in user_characters:
+        by_formula.setdefault(formula or DEFAULT_SCORE_FORMULA, []).append(
+            user_character_id
+        )
+
+    for formula, user_character_ids in by_formula.items():
+        scores = score_artifacts(compile_formula(formula), pieces).tolist()
+
+        for user_character_id in user_character_ids:
+            rows += [
+                {
+                    "user_character_id": user_character_id,
+                    "artifact_id": artifact.id,
+                    "slot": artifact.slot,
+                    "score": score,
+                }
+                for artifact, score in zip(artifacts, scores)
+            ]
+
+    if not rows:
+        return
+
+    # a single cached statement, the driver sends the rows in batches
+    statement = insert(ArtifactScore)
+    await session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[
+                ArtifactScore.user_character_id,
+                ArtifactScore.artifact_id,
+            ],
+            set_={
+                "slot": statement.excluded.slot,
+                "score": statement.excluded.score,
+            },
+        ),
+        rows,
+    )
@@ -0,0 +1,300 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from functools import lru_cache
+from time import monotonic
+from typing import Any, Dict, List, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from characters_analyzer.api.services import sketch_service
+from characters_analyzer.api.services.sketch_service import Build
+from characters_analyzer.core.config import Settings, get_settings
+from characters_analyzer.database.engine import get_session_maker
+from characters_analyzer.database.tables.entities import Artifact
+from characters_analyzer.database.tables.junctions import UserCharacter
+from characters_analyzer.engine.artifacts import get_upgrade_rules
+from characters_analyzer.engine.neighbors import IVFIndex
+
+logger = logging.getLogger(__name__)
+
+
+class BuildIndexes:
+    """The indexes of the builds of the worker, one per character.
+
+    An index is built on the first request for its character, the other
+    requests for it waiting for the same build, and rebuilt in the background
+    once it is older than ``ttl``, the old one being served meanwhile.
+    The builds changed by the worker are put into the indexes right away,
+    including the ones being built.
+
+    Parameters
+    ----------
+    max_size : int
+        The number of indexes kept, the least recently used first to go.
+    ttl : float
+        How long an index is served before it is rebuilt, in seconds.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size: int = max_size
+        self.ttl: float = ttl
+
+        self._indexes: OrderedDict[UUID, Tuple[IVFIndex, float]] = OrderedDict()
+        self._builds: Dict[UUID, asyncio.Task] = {}
+        self._changes: Dict[UUID, List[Tuple[UUID, Build | None]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+    async def get(self, character_id: UUID) -> IVFIndex:
+        """Returns the index of the builds of a character.
+
+        Parameters
+        ----------
+        character_id : UUID
+            Character's UUID.
+
+        Returns
+        -------
+        index : IVFIndex
+            Index of the builds by UserCharacter's UUID (see ``vectorize``).
+        """
+        if (entry := self._indexes.get(character_id)) is None:
+            # a cancelled request must not cancel the build shared with the others
+            return await asyncio.shield(self._build(character_id))
+
+        index, built_at = entry
+        self._indexes.move_to_end(character_id)
+
+        if monotonic() - built_at >= self.ttl:
+            self._build(character_id)
+
+        return index
+
+    def record(self, user_character_id: UUID, character_id: UUID, build: Build | None):
+        """Puts a changed build into the index of its character, if any.
+
+        Parameters
+        ----------
+        user_character_id : UUID
+            UserCharacter's UUID.
+        character_id : UUID
+            Character's UUID.
+        build : Build | None
+            The build, None if it has been taken apart.
+        """
+        if (changes := self._changes.get(character_id)) is not None:
+            changes.append((user_character_id, build))
+
+        if (entry := self._indexes.get(character_id)) is not None:
+            _apply(entry[0], user_character_id, build)
+
+    async def shutdown(self):
+        """Cancels the builds in progress."""
+        for task in self._builds.values():
+            task.cancel()
+
+        await asyncio.gather(*self._builds.values(), return_exceptions=True)
+
+    def _build(self, character_id: UUID) -> asyncio.Task:
+        if (task := self._builds.get(character_id)) is None:
+            self._changes[character_id] = []
+            task = self._builds[character_id] = asyncio.create_task(
+                self._rebuild(character_id)
+            )
+            task.add_done_callback(lambda _: self._finish(character_id))
+
+        return task
+
+    def _finish(self, character_id: UUID):
+        task = self._builds.pop(character_id)
+        self._changes.pop(character_id, None)
+
+        if not task.cancelled() and (error := task.exception()) is not None:
+            logger.error(
+                "Index of the builds of %s failed", character_id, exc_info=error
+            )
+
+    async def _rebuild(self, character_id: UUID) -> IVFIndex:
+        async with get_session_maker()() as session:
+            builds = await sketch_service.get_builds(
+                session, UserCharacter.character_id == character_id
+            )
+
+        index = IVFIndex(len(get_upgrade_rules().sub_stats))
+
+        # training takes a second for a few hundred thousand builds
+        await asyncio.to_thread(
+            index.build,
+            list(builds),
+            np.array([vectorize(build) for build in builds.values()]),
+        )
+
+        for user_character_id, build in self._changes[character_id]:
+            _apply(index, user_character_id, build)
+
+        self._indexes[character_id] = index, monotonic()
+        self._indexes.move_to_end(character_id)
+
+        while len(self._indexes) > self.max_size:
+            self._indexes.popitem(last=False)
+
+        return index
+
+
+def vectorize(build: Build) -> np.ndarray:
+    """Encodes a build as a vector.
+
+    Every sub stat counts in maximal rolls, so the stats weigh
+    the same whatever their units.
+
+    Parameters
+    ----------
+    build : Build
+        Build.
+
+    Returns
+    -------
+    vector : np.ndarray
+        The number of rolls of every sub stat.
+    """
+    return np.asarray(build.stats) / get_upgrade_rules().max_rolls
+
+
+def record_builds(before: Dict[UUID, Build], after: Dict[UUID, Build]):
+    """Puts the changes of builds into the worker's indexes.
+
+    To be called once the changes are committed; the other workers
+    get them when they rebuild their indexes.
+
+    Parameters
+    ----------
+    before : Dict[UUID, Build]
+        Builds before the changes, see ``sketch_service.get_builds``.
+    after : Dict[UUID, Build]
+        The same builds after the changes.
+    """
+    indexes = get_build_indexes()
+
+    for user_character_id in before.keys() | after.keys():
+        old, new = before.get(user_character_id), after.get(user_character_id)
+
+        if old != new:
+            indexes.record(user_character_id, (old or new).character_id, new)
+
+
+async def get_similar_builds(
+    session: AsyncSession, user_character_id: UUID, limit: int
+) -> List[Dict[str, Any]] | None:
+    """The function of finding the builds of other users closest to a build.
+
+    The builds of the same character are searched in the worker's index
+    (see ``engine.neighbors``), then only the builds found are read.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    user_character_id : UUID
+        UserCharacter's UUID.
+    limit : int
+        The number of builds.
+
+    Returns
+    -------
+    builds : List[Dict[str, Any]] | None
+        Similar builds, from the closest, None if the character wears no artifacts.
+    """
+    builds = await sketch_service.get_builds(
+        session, Artifact.user_character_id == user_character_id
+    )
+
+    if (build := builds.get(user_character_id)) is None:
+        return None
+
+    index = await get_build_indexes().get(build.character_id)
+    neighbours = [
+        (key, distance)
+        for key, distance in index.search(vectorize(build), limit + 1)
+        if key != user_character_id
+    ][:limit]
+
+    keys = [key for key, _ in neighbours]
+    found = await sketch_service.get_builds(
+        session, Artifact.user_character_id.in_(keys)
+    )
+    details = await _get_details(session, keys)
+
+    rules = get_upgrade_rules()
+
+    # builds taken apart since the index was built are skipped
+    return [
+        {
+            "distance": distance,
+            "stats": dict(zip(rules.sub_stats, found[key].stats)),
+            **details[key],
+        }
+        for key, distance in neighbours
+        if key in found and key in details
+    ]
+
+
+@lru_cache
+def get_build_indexes() -> BuildIndexes:
+    """Returns the indexes of the builds of the worker.
+
+    Returns
+    -------
+    indexes : BuildIndexes
+        Indexes of ``SIMILAR_INDEX_SIZE`` characters,
+        rebuilt every ``SIMILAR_REBUILD_SECONDS``.
+    """
+    settings: Settings = get_settings()
+
+    return BuildIndexes(settings.SIMILAR_INDEX_SIZE, settings.SIMILAR_REBUILD_SECONDS)
+
+
+async def shutdown_build_indexes():
+    """Cancels the builds of the indexes, if the indexes have been created."""
+    if get_build_indexes.cache_info().currsize:
+        await get_build_indexes().shutdown()
+
+    get_build_indexes.cache_clear()
+
+
+def _apply(index: IVFIndex, user_character_id: UUID, build: Build | None):
+    if build is None:
+        index.remove(user_character_id)
+    else:
+        index.put(user_character_id, vectorize(build))
+
+
+async def _get_details(
+    session: AsyncSession, keys: List[UUID]
+) -> Dict[UUID, Dict[str, Any]]:
+    """Constellations and sets of the builds."""
+    result = await session.execute(
+        select(UserCharacter.id, UserCharacter.constellations).where(
+            UserCharacter.id.in_(keys)
+        )
+    )
+    details = {
+        id_: {"constellations": constellations, "sets": {}}
+        for id_, constellations in result.tuples()
+    }
+
+    sets = await session.execute(
+        select(Artifact.user_character_id, Artifact.set_id, func.count())
+        .where(Artifact.user_character_id.in_(keys))
+        .group_by(Artifact.user_character_id, Artifact.set_id)
+    )
+
+    for id_, set_id, count in sets.tuples():
+        if id_ in details:
+            details[id_]["sets"][set_id] = count
+
+    return details
@@ -0,0 +1,336 @@
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Tuple
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from characters_analyzer.core.config import Settings, get_settings
+from characters_analyzer.core.jobs import Debouncer
+from characters_analyzer.database.engine import get_session_maker
+from characters_analyzer.database.tables.entities import Artifact, BuildSketch
+from characters_analyzer.database.tables.junctions import UserCharacter
+from characters_analyzer.engine.artifacts import get_upgrade_rules
+from characters_analyzer.engine.sketch import Distribution
+
+# metrics of the builds, sums over the equipped artifacts
+METRICS = ("crit_value",)
+
+
+class Build(NamedTuple):
+    """Sub stats of the artifacts equipped by a user's character.
+
+    Attributes
+    ----------
+    character_id : UUID
+        Character's UUID.
+    stats : Tuple[float, ...]
+        Total of every sub stat, in the order of ``Artifact.sub_stat_values``.
+    """
+
+    character_id: UUID
+    stats: Tuple[float, ...]
+
+    @property
+    def metrics(self) -> Dict[str, float]:
+        """Value of every metric (see ``METRICS``)."""
+        index = get_upgrade_rules().index
+
+        return {
+            "crit_value": 2 * self.stats[index["crit_rate"]]
+            + self.stats[index["crit_dmg"]]
+        }
+
+
+async def get_builds(
+    session: AsyncSession, condition: ColumnElement[bool]
+) -> Dict[UUID, Build]:
+    """The function of obtaining the builds of users' characters.
+
+    The sub stats are summed up by Postgres from their denormalized copy
+    in the artifacts (``Artifact.sub_stat_values``).
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    condition : ColumnElement[bool]
+        Condition of the equipped artifacts, e.g.
+        ``Artifact.user_character_id == id_``.
+
+    Returns
+    -------
+    builds : Dict[UUID, Build]
+        Builds by UserCharacter's UUID; characters without artifacts are absent.
+    """
+    # arrays of Postgres are indexed from one
+    positions = range(1, len(get_upgrade_rules().sub_stats) + 1)
+
+    result = await session.execute(
+        select(
+            Artifact.user_character_id,
+            UserCharacter.character_id,
+            *(func.sum(Artifact.sub_stat_values[position]) for position in positions),
+        )
+        .join(UserCharacter, UserCharacter.id == Artifact.user_character_id)
+        .where(condition)
+        .group_by(Artifact.user_character_id, UserCharacter.character_id)
+    )
+
+    return {
+        user_character_id: Build(character_id, tuple(float(v or 0) for v in stats))
+        for user_character_id, character_id, *stats in result.tuples()
+    }
+
+
+def record_builds(before: Dict[UUID, Build], after: Dict[UUID, Build]):
+    """Records the changes of builds to be merged into the sketches.
+
+    To be called once the changes are committed. The changes are kept
+    by the worker and merged into the stored sketches every
+    ``SKETCH_FLUSH_SECONDS`` (see ``merge_changes``).
+
+    Parameters
+    ----------
+    before : Dict[UUID, Build]
+        Builds before the changes, see ``get_builds``.
+    after : Dict[UUID, Build]
+        The same builds after the changes.
+    """
+    changes = get_sketch_changes()
+
+    for user_character_id in before.keys() | after.keys():
+        old, new = before.get(user_character_id), after.get(user_character_id)
+
+        if old == new:
+            continue
+
+        character_id = (old or new).character_id
+        pending = changes.setdefault(character_id, {})
+
+        for metric in METRICS:
+            pending.setdefault(metric, Distribution()).update(
+                added=[new.metrics[metric]] if new else [],
+                removed=[old.metrics[metric]] if old else [],
+            )
+
+        get_sketch_jobs().schedule(character_id)
+
+
+async def merge_changes(
+    session: AsyncSession, character_id: UUID, changes: Dict[str, Distribution]
+):
+    """Merges changes of the builds of a character into the stored sketches.
+
+    The sketches are locked until the transaction is committed by the caller,
+    so the changes of concurrent workers are all kept. Sketches not built yet
+    are left alone: they will be built from the records, changes included.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    character_id : UUID
+        Character's UUID.
+    changes : Dict[str, Distribution]
+        Changes by metric.
+    """
+    sketches = await session.scalars(
+        select(BuildSketch)
+        .where(
+            BuildSketch.character_id == character_id,
+            BuildSketch.metric.in_(changes),
+        )
+        .with_for_update()
+    )
+
+    for sketch in sketches:
+        distribution = Distribution.from_dict(sketch.sketch)
+
+        sketch.sketch = distribution.merge(changes[sketch.metric]).to_dict()
+        sketch.updated_at = func.now()
+
+
+async def get_distributions(
+    session: AsyncSession, character_id: UUID
+) -> Dict[str, Distribution]:
+    """The function of obtaining the distributions of the builds of a character.
+
+    The stored sketches are completed with the changes the worker has not
+    merged yet. On the first request for a character, its sketches
+    are built from the builds of all the users.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    character_id : UUID
+        Character's UUID.
+
+    Returns
+    -------
+    distributions : Dict[str, Distribution]
+        Distribution of every metric (see ``METRICS``).
+    """
+    statement = select(BuildSketch).where(BuildSketch.character_id == character_id)
+
+    if not (sketches := list((await session.scalars(statement)).all())):
+        await build_sketches(session, character_id)
+        sketches = list((await session.scalars(statement)).all())
+
+    pending = get_sketch_changes().get(character_id, {})
+
+    return {
+        sketch.metric: Distribution.from_dict(sketch.sketch).merge(
+            pending.get(sketch.metric, Distribution())
+        )
+        for sketch in sketches
+    }
+
+
+async def get_ranks(
+    session: AsyncSession, user_character_id: UUID
+) -> List[Dict[str, Any]] | None:
+    """The function of ranking the build of a user's character among all the users.
+
+    Reads the build and a couple of sketches, whatever the number of builds.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    user_character_id : UUID
+        UserCharacter's UUID.
+
+    Returns
+    -------
+    ranks : List[Dict[str, Any]] | None
+        Rank of the build by every metric, None if the character
+        wears no artifacts.
+    """
+    builds = await get_builds(session, Artifact.user_character_id == user_character_id)
+
+    if (build := builds.get(user_character_id)) is None:
+        return None
+
+    distributions = await get_distributions(session, build.character_id)
+
+    ranks = []
+
+    for metric, distribution in distributions.items():
+        value = build.metrics[metric]
+        count = max(round(distribution.count), 1)
+        # the build itself is at least as high as itself
+        above = max(1 - distribution.share_below(value), 1 / count)
+
+        ranks.append(
+            {"metric": metric, "value": value, "builds": count, "top": 100 * above}
+        )
+
+    return ranks
+
+
+async def build_sketches(session: AsyncSession, character_id: UUID):
+    """Builds the sketches of a character from the builds of all the users.
+
+    The worker's pending changes of the character are dropped,
+    as the records already include them. Sketches built concurrently
+    by another worker are kept; the changes other workers have not merged
+    yet may be counted twice, which the approximation absorbs.
+    The sketches are staged in the session's transaction, e.g. committed
+    by the unit of work of the request ranking a build.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    character_id : UUID
+        Character's UUID.
+    """
+    builds = await get_builds(session, UserCharacter.character_id == character_id)
+
+    get_sketch_changes().pop(character_id, None)
+
+    distributions = {metric: Distribution() for metric in METRICS}
+
+    for metric, distribution in distributions.items():
+        distribution.update(added=[build.metrics[metric] for build in builds.values()])
+
+    await session.execute(
+        insert(BuildSketch)
+        .values(
+            [
+                {
+                    "character_id": character_id,
+                    "metric": metric,
+                    "sketch": distribution.to_dict(),
+                }
+                for metric, distribution in distributions.items()
+            ]
+        )
+        .on_conflict_do_nothing()
+    )
+
+
+@lru_cache
+def get_sketch_changes() -> Dict[UUID, Dict[str, Distribution]]:
+    """Returns the changes of the builds the worker has not merged yet.
+
+    Returns
+    -------
+    changes : Dict[UUID, Dict[str, Distribution]]
+        Changes by character's UUID and metric.
+    """
+    return {}
+
+
+@lru_cache
+def get_sketch_jobs() -> Debouncer:
+    """Returns the periodic merges of the changes of the worker.
+
+    Returns
+    -------
+    jobs : Debouncer
+        Debouncer running without postponing.
+    """
+    settings: Settings = get_settings()
+
+    return Debouncer(_merge, settings.SKETCH_FLUSH_SECONDS, postpone=False)
+
+
+async def shutdown_sketch_jobs():
+    """Merges the pending changes, if the debouncer has been created."""
+    if get_sketch_jobs.cache_info().currsize:
+        await get_sketch_jobs().shutdown()
+
+    get_sketch_jobs.cache_clear()
+
+
+async def _merge(character_id: UUID):
+    if not (changes := get_sketch_changes().pop(character_id, None)):
+        return
+
+    try:
+        async with get_session_maker()() as session:
+            await merge_changes(session, character_id, changes)
+            await session.commit()
+    except Exception:
+        _restore_changes(character_id, changes)
+
+        raise
+
+
+def _restore_changes(character_id: UUID, changes: Dict[str, Distribution]):
+    # put back before the changes recorded during the failed merge, retried later
+    pending = get_sketch_changes()
+
+    for metric, distribution in pending.pop(character_id, {}).items():
+        if metric in changes:
+            distribution = changes[metric].merge(distribution)
+
+        changes[metric] = distribution
+
+    pending[character_id] = changes
+
+    get_sketch_jobs().schedule(character_id)
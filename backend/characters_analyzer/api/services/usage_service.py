@@ -0,0 +1,271 @@
+import asyncio
+from collections import Counter
+from datetime import datetime, timezone
+from functools import lru_cache
+from time import monotonic
+from typing import Any, Dict, Iterable, List, Tuple
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from characters_analyzer.core.config import Settings, get_settings
+from characters_analyzer.database.tables.entities import (
+    Artifact,
+    CharacterSetUsage,
+    CharacterUsage,
+    User,
+)
+from characters_analyzer.database.tables.junctions import UserCharacter
+
+# counted attributes of the users' characters
+METRICS = ("constellations", "attack_level", "skill_level", "burst_level")
+# the number of the most worn sets reported for every character
+TOP_SETS = 5
+
+
+class UsageCache:
+    """The global statistics of the worker, recomputed once they expire.
+
+    Concurrent requests for expired statistics wait for a single recomputation.
+
+    Parameters
+    ----------
+    ttl : float
+        How long the statistics are served, in seconds.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl: float = ttl
+
+        self._usage: Dict[str, Any] | None = None
+        self._expires: float = 0
+        self._lock: asyncio.Lock = asyncio.Lock()
+
+    async def get(self, session: AsyncSession) -> Dict[str, Any]:
+        """Returns the statistics, recomputed if they have expired.
+
+        Parameters
+        ----------
+        session : AsyncSession
+            Request session object.
+
+        Returns
+        -------
+        usage : Dict[str, Any]
+            See ``get_usage``.
+        """
+        async with self._lock:
+            if self._usage is None or monotonic() >= self._expires:
+                self._usage = await get_usage(session)
+                self._expires = monotonic() + self.ttl
+
+        return self._usage
+
+
+def character_counts(user_characters: Iterable[Any], sign: int = 1) -> Counter:
+    """Changes of the character counters made by users' characters.
+
+    Parameters
+    ----------
+    user_characters : Iterable[Any]
+        Anything with the attributes of ``UserCharacter``, e.g. rows.
+    sign : int
+        1 for the characters being added, -1 for the ones being removed.
+
+    Returns
+    -------
+    counts : Counter
+        Change of every counter by its character's UUID, metric and value.
+    """
+    counts = Counter()
+
+    for user_character in user_characters:
+        for metric in METRICS:
+            value = getattr(user_character, metric)
+            counts[user_character.character_id, metric, value] += sign
+
+    return counts
+
+
+async def count_characters(session: AsyncSession, counts: Counter):
+    """Applies changes to the character counters in the session's transaction.
+
+    The counters are upserted in the order of their keys, so concurrent
+    transactions lock the rows in the same order and never deadlock.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    counts : Counter
+        Changes, see ``character_counts``.
+    """
+    rows = [
+        {"character_id": character_id, "metric": metric, "value": value, "count": count}
+        for (character_id, metric, value), count in sorted(counts.items())
+        if count
+    ]
+
+    if not rows:
+        return
+
+    statement = insert(CharacterUsage).values(rows)
+    await session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[
+                CharacterUsage.character_id,
+                CharacterUsage.metric,
+                CharacterUsage.value,
+            ],
+            set_={"count": CharacterUsage.count + statement.excluded.count},
+        )
+    )
+
+
+async def count_sets(session: AsyncSession, condition: ColumnElement[bool], sign: int):
+    """Counts equipped artifacts in the set counters in the session's transaction.
+
+    The artifacts are grouped by their sets and the characters wearing them
+    in the database, so the counters are changed with a single statement.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    condition : ColumnElement[bool]
+        Condition of the artifacts, e.g. ``Artifact.id == id_``;
+        unequipped ones are ignored.
+    sign : int
+        1 for the artifacts being equipped, -1 for the ones being taken off.
+    """
+    statement = insert(CharacterSetUsage).from_select(
+        ["character_id", "set_id", "count"],
+        select(UserCharacter.character_id, Artifact.set_id, sign * func.count())
+        .select_from(Artifact)
+        .join(UserCharacter, UserCharacter.id == Artifact.user_character_id)
+        .where(condition)
+        .group_by(UserCharacter.character_id, Artifact.set_id)
+        # the same order of the locks as in count_characters
+        .order_by(UserCharacter.character_id, Artifact.set_id),
+    )
+    await session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[CharacterSetUsage.character_id, CharacterSetUsage.set_id],
+            set_={"count": CharacterSetUsage.count + statement.excluded.count},
+        )
+    )
+
+
+async def get_usage(session: AsyncSession) -> Dict[str, Any]:
+    """The function of obtaining the global usage statistics of the characters.
+
+    Reads the counters only, a few dozen rows per character,
+    whatever the number of users.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+
+    Returns
+    -------
+    usage : Dict[str, Any]
+        The number of users, the statistics of every owned character,
+        from the most owned, and when they have been computed.
+    """
+    users = await session.scalar(select(func.count()).select_from(User))
+
+    counters = await session.execute(
+        select(
+            CharacterUsage.character_id,
+            CharacterUsage.metric,
+            CharacterUsage.value,
+            CharacterUsage.count,
+        )
+        .where(CharacterUsage.count > 0)
+        .order_by(
+            CharacterUsage.character_id, CharacterUsage.metric, CharacterUsage.value
+        )
+    )
+
+    characters = {}
+
+    for character_id, metric, value, count in counters.tuples():
+        character = characters.setdefault(
+            character_id,
+            {
+                "character_id": character_id,
+                "owners": 0,
+                "ownership_rate": 0.0,
+                "constellations": {},
+                "talents": {talent: {} for talent in METRICS[1:]},
+                "sets": [],
+            },
+        )
+
+        if metric == "constellations":
+            # every owned character has a single number of constellations
+            character["owners"] += count
+            character["constellations"][value] = count
+        else:
+            character["talents"][metric][value] = count
+
+    for character_id, set_id, count in await _top_sets(session):
+        if (character := characters.get(character_id)) is not None:
+            character["sets"].append({"set_id": set_id, "count": count})
+
+    for character in characters.values():
+        character["ownership_rate"] = character["owners"] / users if users else 0.0
+
+    return {
+        "users": users,
+        "characters": sorted(
+            characters.values(), key=lambda character: -character["owners"]
+        ),
+        "computed_at": datetime.now(timezone.utc),
+    }
+
+
+async def _top_sets(session: AsyncSession) -> List[Tuple[UUID, UUID, int]]:
+    """The most worn sets of every character, from the most worn."""
+    rank = (
+        func.row_number()
+        .over(
+            partition_by=CharacterSetUsage.character_id,
+            order_by=CharacterSetUsage.count.desc(),
+        )
+        .label("rank")
+    )
+    ranked = (
+        select(
+            CharacterSetUsage.character_id,
+            CharacterSetUsage.set_id,
+            CharacterSetUsage.count,
+            rank,
+        )
+        .where(CharacterSetUsage.count > 0)
+        .subquery()
+    )
+    result = await session.execute(
+        select(ranked.c.character_id, ranked.c.set_id, ranked.c.count)
+        .where(ranked.c.rank <= TOP_SETS)
+        .order_by(ranked.c.character_id, ranked.c.rank)
+    )
+
+    return list(result.tuples().all())
+
+
+@lru_cache
+def get_usage_cache() -> UsageCache:
+    """Returns the global statistics of the worker.
+
+    Returns
+    -------
+    cache : UsageCache
+        Statistics served for ``USAGE_CACHE_SECONDS``.
+    """
+    settings: Settings = get_settings()
+
+    return UsageCache(settings.USAGE_CACHE_SECONDS)
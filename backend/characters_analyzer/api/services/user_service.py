@@ -33,8 +33,9 @@ async def update_refresh_token(
     Note
     ----
     In this case, the SQLAlchemy ORM features are used, which allow you
-    to change the attribute value of the user record object,
-    and at the next session commit, these changes will be saved in the database.
+    to change the attribute value of the user record object;
+    the change is flushed here and committed with the unit of work
+    of the request (see ``database.unit_of_work``).
 
     Parameters
     ----------
@@ -46,12 +47,15 @@ async def update_refresh_token(
         New refresh token.
     """
     user.refresh_token = refresh_token
-    await session.commit()
+    await session.flush()
 
 
 async def add_user(session: AsyncSession, user_info: UserWithPasswordSchema):
     """Adds a user record to the database.
 
+    The record is flushed, so a taken username fails here,
+    and committed with the unit of work of the request.
+
     Parameters
     ----------
     session : AsyncSession
@@ -60,4 +64,4 @@ async def add_user(session: AsyncSession, user_info: UserWithPasswordSchema):
         Schema of a user object with a password.
     """
     session.add(User(**user_info.model_dump()))
-    await session.commit()
+    await session.flush()
@@ -11,7 +11,11 @@ from characters_analyzer.api.v1.endpoints import (
     artifacts_router,
     auth_router,
     characters_router,
+    events_router,
+    health_router,
     root_router,
+    simulations_router,
+    usage_router,
     users_router,
 )
 
@@ -21,5 +25,9 @@ api_v1_router = APIRouter(
 api_v1_router.include_router(artifacts_router)
 api_v1_router.include_router(auth_router)
 api_v1_router.include_router(characters_router)
+api_v1_router.include_router(events_router)
+api_v1_router.include_router(health_router)
 api_v1_router.include_router(root_router)
+api_v1_router.include_router(simulations_router)
+api_v1_router.include_router(usage_router)
 api_v1_router.include_router(users_router)
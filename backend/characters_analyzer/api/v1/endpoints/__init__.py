@@ -16,5 +16,9 @@ because for convenience [1]_ each router is called ``router`` in separate module
 from .artifacts import router as artifacts_router
 from .auth import router as auth_router
 from .characters import router as characters_router
+from .events import router as events_router
+from .health import router as health_router
 from .root import router as root_router
+from .simulations import router as simulations_router
+from .usage import router as usage_router
 from .users import router as users_router
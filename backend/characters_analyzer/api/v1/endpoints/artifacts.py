@@ -1,19 +1,44 @@
+import asyncio
 import re
-from typing import Annotated
+from typing import Annotated, Any, Dict, Literal
+from uuid import UUID
 
-from fastapi import APIRouter, Body, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query, status
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from characters_analyzer.api.dependencies import get_session, validate_access_token
-from characters_analyzer.api.services import artifact_service
-from characters_analyzer.database.tables.entities import User
+from characters_analyzer.api.routing import UnitOfWorkRoute
+from characters_analyzer.api.services import (
+    artifact_service,
+    character_service,
+    farm_service,
+    score_service,
+)
+from characters_analyzer.database.tables.entities import Artifact, User
+from characters_analyzer.database.tables.junctions import UserCharacter
+from characters_analyzer.engine.artifacts import (
+    DEFAULT_SCORE_FORMULA,
+    Piece,
+    estimate_upgrade,
+)
+from characters_analyzer.engine.farm import domain_gains
+from characters_analyzer.engine.filters import FilterError, parse_filter
+from characters_analyzer.engine.formula import FormulaError, compile_formula
 from characters_analyzer.schemas import ArtifactData
-from characters_analyzer.schemas.responses import StandardResponse
+from characters_analyzer.schemas.responses import (
+    ArtifactsResponse,
+    FacetsResponse,
+    FarmResponse,
+    StandardResponse,
+    TopArtifactsResponse,
+    UpgradeResponse,
+)
 
 router = APIRouter(
     prefix="/artifacts",
     tags=["artifacts"],
+    route_class=UnitOfWorkRoute,
 )
 
 
@@ -28,6 +53,9 @@ async def append_artifact(
     user: Annotated[User, Depends(validate_access_token)],
     session: Annotated[AsyncSession, Depends(get_session)],
 ):
+    if artifact_data.user_character_id is not None:
+        await _check_user_character(session, user, artifact_data.user_character_id)
+
     try:
         await artifact_service.add_artifact(session, user.id, artifact_data)
     except IntegrityError as integrity_error:
@@ -38,6 +66,11 @@ async def append_artifact(
         ).group(1)
 
         match error_class:
+            case "UniqueViolationError":
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="The same artifact is already in the inventory.",
+                )
             case "ForeignKeyViolationError":
                 # if a user isn't found, then 401 Error is raised by ``validate_access_token``
                 raise HTTPException(
@@ -50,7 +83,417 @@ async def append_artifact(
                     detail="Incorrect request.",
                 )
 
+    farm_service.schedule_refresh(user.id)
+
     return {
         "code": status.HTTP_201_CREATED,
         "message": "Artifact appended successfully.",
     }
+
+
+@router.get(
+    "/get",
+    response_model=ArtifactsResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Returns user's artifacts matching a filter.",
+)
+async def get_artifacts(
+    user: Annotated[User, Depends(validate_access_token)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    filter_: Annotated[
+        str,
+        Query(
+            alias="filter",
+            max_length=512,
+            description='Filter, e.g. set:"emblem" main:er sub.crit_rate>=7 unequipped.',
+        ),
+    ] = "",
+    limit: Annotated[
+        int, Query(ge=1, le=1000, description="The number of artifacts.")
+    ] = 100,
+    offset: Annotated[
+        int, Query(ge=0, description="The number of artifacts to skip.")
+    ] = 0,
+):
+    """Method for obtaining the user's artifacts matching a filter.
+
+    The filter is a list of terms, all of which must hold
+    (see ``engine.filters.Filter``), e.g.
+    ``set:"emblem" main:er sub.crit_rate>=7 level>=16 unequipped``.
+    It is compiled into the condition of the query, so the artifacts
+    are filtered by the database; compiled filters are cached
+    by their normalized text.
+
+    For an invalid filter, the method returns HTTP code 422.
+
+    Parameters
+    ----------
+    user : User
+        The user is received from dependence on authorization.
+    session : AsyncSession
+        Request session object.
+    filter_ : str
+        Filter, all the artifacts if empty.
+    limit : int
+        The number of artifacts.
+    offset : int
+        The number of artifacts to skip.
+
+    Returns
+    -------
+    response : ArtifactsResponse
+        Normalized filter and the artifacts matching it.
+    """
+    try:
+        compiled = parse_filter(filter_)
+    except FilterError as error:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(error)
+        )
+
+    artifacts = await artifact_service.get_artifacts(
+        session, user.id, compiled, limit, offset
+    )
+
+    return {
+        "filter": compiled.source,
+        "artifacts": [_artifact_record(artifact) for artifact in artifacts],
+    }
+
+
+@router.get(
+    "/facets",
+    response_model=FacetsResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Counts user's artifacts matching a filter by set, main stat and slot.",
+)
+async def get_facets(
+    user: Annotated[User, Depends(validate_access_token)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    filter_: Annotated[
+        str,
+        Query(
+            alias="filter",
+            max_length=512,
+            description='Filter, e.g. set:"emblem" main:er sub.crit_rate>=7 unequipped.',
+        ),
+    ] = "",
+):
+    """Method for obtaining the facet counts of the user's artifacts.
+
+    Counts the artifacts matching the filter (see ``get_artifacts``)
+    with every set, main stat, slot, equipped or not. The counts are
+    computed from a bitmap index of the inventory held by the worker
+    (see ``engine.facets``), so the database is only queried
+    to build the index.
+
+    For an invalid filter, the method returns HTTP code 422.
+
+    Parameters
+    ----------
+    user : User
+        The user is received from dependence on authorization.
+    session : AsyncSession
+        Request session object.
+    filter_ : str
+        Filter, all the artifacts if empty.
+
+    Returns
+    -------
+    response : FacetsResponse
+        Normalized filter and the counts.
+    """
+    try:
+        compiled = parse_filter(filter_)
+    except FilterError as error:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(error)
+        )
+
+    index = await artifact_service.get_facet_index(session, user.id)
+    facets = index.counts(compiled)
+
+    return {
+        "filter": compiled.source,
+        # every artifact is either equipped or not
+        "total": sum(facets["equipped"].values()),
+        "facets": facets,
+    }
+
+
+@router.get(
+    "/farm",
+    response_model=FarmResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Ranks the domains and sets worth farming.",
+)
+async def get_farm_recommendations(
+    user: Annotated[User, Depends(validate_access_token)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+):
+    """Method for obtaining the artifact sets and domains worth farming.
+
+    Sets are ranked by the expected improvement of the user's whole roster
+    from one drop (see ``engine.farm``). The ranking is recomputed
+    in the background after the inventory changes, so this method only
+    reads the stored result; it is computed on the spot only the first time.
+
+    Parameters
+    ----------
+    user : User
+        The user is received from dependence on authorization.
+    session : AsyncSession
+        Request session object.
+
+    Returns
+    -------
+    response : FarmResponse
+        Sets and domains, from the most useful.
+    """
+    if not (
+        recommendations := await farm_service.get_recommendations(session, user.id)
+    ):
+        await farm_service.refresh_recommendations(session, user.id)
+        recommendations = await farm_service.get_recommendations(session, user.id)
+
+    domains = domain_gains(recommendations)
+
+    return {
+        "sets": recommendations,
+        "domains": [
+            {"domain": domain, "gain": gain} for domain, gain in domains.items()
+        ],
+    }
+
+
+@router.get(
+    "/top/{user_character_id}",
+    response_model=TopArtifactsResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Returns the best artifacts for a character.",
+)
+async def get_top_artifacts(
+    user_character_id: Annotated[
+        UUID, Path(description="The UUID of the user character.")
+    ],
+    user: Annotated[User, Depends(validate_access_token)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    slot: Annotated[
+        Literal["flower", "plume", "sands", "goblet", "circlet"] | None,
+        Query(description="Slot of the artifacts, all slots by default."),
+    ] = None,
+    limit: Annotated[
+        int, Query(ge=1, le=100, description="The number of artifacts.")
+    ] = 20,
+):
+    """Method for obtaining the user's artifacts sorted by their use for a character.
+
+    The artifacts are scored by the character's formula (see
+    ``/characters/formula/{user_character_id}``) whenever an artifact
+    or the formula changes, so this method reads the stored scores
+    with an index range scan. A character created before the scores
+    were stored has its artifacts scored on the first request.
+
+    If the user character is not found, the method returns HTTP code 404;
+    if it belongs to another user, 403.
+
+    Parameters
+    ----------
+    user_character_id : UUID
+        User's character.
+    user : User
+        The user is received from dependence on authorization.
+    session : AsyncSession
+        Request session object.
+    slot : Literal["flower", "plume", "sands", "goblet", "circlet"], optional
+        Slot of the artifacts.
+    limit : int
+        The number of artifacts.
+
+    Returns
+    -------
+    response : TopArtifactsResponse
+        Artifacts with their scores, from the best.
+    """
+    user_character = await _check_user_character(session, user, user_character_id)
+
+    # characters created before the scores were stored are scored on the first request
+    if not user_character.artifacts_scored:
+        await score_service.rescore_characters(session, user.id, [user_character_id])
+
+    top = await score_service.get_top_artifacts(session, user_character_id, slot, limit)
+
+    return {
+        "artifacts": [
+            {**_artifact_record(artifact), "score": score} for artifact, score in top
+        ]
+    }
+
+
+@router.get(
+    "/upgrade/{artifact_id}",
+    response_model=UpgradeResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Estimates an artifact at its maximal level.",
+)
+async def estimate_artifact_upgrade(
+    artifact_id: Annotated[UUID, Path(description="The UUID of the artifact.")],
+    user: Annotated[User, Depends(validate_access_token)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    user_character_id: Annotated[
+        UUID | None,
+        Query(description="The UUID of the user character to compare with."),
+    ] = None,
+    trials: Annotated[
+        int, Query(ge=1000, le=100000, description="The number of trials.")
+    ] = 100000,
+    seed: Annotated[int, Query(ge=0, description="Seed of the random generator.")] = 0,
+    formula: Annotated[
+        str, Query(max_length=1024, description="Scoring formula of the stats.")
+    ] = DEFAULT_SCORE_FORMULA,
+):
+    """Method for estimating an artifact leveled up to its maximal level.
+
+    The remaining upgrades of the artifact are simulated many times
+    at once (see ``engine.artifacts``): the result holds the distribution
+    of its sub stats and of its score, and the probability that it scores
+    higher than the artifact in the same slot of the user's character.
+    The same seed gives the same result, identical estimates are cached
+    by the content of the artifacts. The simulation runs in a thread,
+    up to 100 000 trials.
+
+    If the artifact is not found, the method returns HTTP code 404;
+    for an invalid formula, 422. If the character has no artifact
+    in the slot, there is no probability to beat it.
+
+    Parameters
+    ----------
+    artifact_id : UUID
+        Artifact's UUID.
+    user : User
+        The user is received from dependence on authorization.
+    session : AsyncSession
+        Request session object.
+    user_character_id : UUID, optional
+        User's character whose equipped artifact is compared.
+    trials : int
+        The number of simulated upgrades.
+    seed : int
+        Seed of the random generator.
+    formula : str
+        Scoring formula, crit value by default.
+
+    Returns
+    -------
+    response : UpgradeResponse
+        Distribution of the artifact at its maximal level.
+    """
+    try:
+        compiled = compile_formula(formula)
+    except FormulaError as error:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(error)
+        )
+
+    artifact = await artifact_service.get_artifact_with_sub_stats(
+        session, user.id, artifact_id
+    )
+
+    if artifact is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Artifact with uuid={artifact_id} not found.",
+        )
+
+    compared = None
+
+    if user_character_id is not None:
+        equipped = await artifact_service.get_equipped_artifact(
+            session, user.id, user_character_id, artifact.slot
+        )
+
+        if equipped is not None and equipped.id != artifact.id:
+            compared = Piece.from_artifact(equipped)
+
+    piece = Piece.from_artifact(artifact)
+    # NumPy releases the GIL, so a simulation doesn't block the event loop of the worker
+    estimate = await asyncio.to_thread(
+        estimate_upgrade, piece, compiled, trials, seed, compared
+    )
+
+    return {
+        "fingerprint": piece.fingerprint(),
+        "trials": estimate.trials,
+        "seed": estimate.seed,
+        "formula": compiled.source,
+        "sub_stats": estimate.sub_stats,
+        "score": estimate.score,
+        "beat_probability": estimate.beat_probability,
+    }
+
+
+async def _check_user_character(
+    session: AsyncSession, user: User, id_: UUID
+) -> UserCharacter:
+    """A function to validate a UserCharacter record the artifacts are used for.
+
+    If the record is not found, raises HTTP code 404;
+    if it belongs to another user, 403.
+
+    Returns user_character entry.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    user : User
+        The user performing action.
+    id_ : UUID
+        The UUID of the user_character entry being acted upon.
+
+    Returns
+    -------
+    user_character: UserCharacter
+        UserCharacter's ORM.
+    """
+    user_character = await character_service.get_user_character_by_id(session, id_)
+
+    if user_character is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User character with uuid={id_} not found.",
+        )
+
+    if user_character.user_id != user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Your uuid and the uuid on the user character entry do not match.",
+        )
+
+    return user_character
+
+
+def _artifact_record(artifact: Artifact) -> Dict[str, Any]:
+    """A function to represent a stored artifact as a ``StoredArtifactSchema``.
+
+    Parameters
+    ----------
+    artifact : Artifact
+        Artifact's ORM with its sub stats.
+
+    Returns
+    -------
+    record : Dict[str, Any]
+        Fields of the schema.
+    """
+    return {
+        "id": artifact.id,
+        "set_id": artifact.set_id,
+        "slot": artifact.slot,
+        "rarity": artifact.rarity,
+        "level": artifact.level,
+        "main_stat_id": artifact.main_stat_id,
+        "main_stat_value": artifact.main_stat_value,
+        "user_character_id": artifact.user_character_id,
+        "sub_stats": artifact.stats,
+    }
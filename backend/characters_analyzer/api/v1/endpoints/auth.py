@@ -7,6 +7,7 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from characters_analyzer.api.dependencies import get_session, validate_refresh_token
+from characters_analyzer.api.routing import UnitOfWorkRoute
 from characters_analyzer.api.services import user_service
 from characters_analyzer.core.jwt import create_jwt_pair
 from characters_analyzer.core.security import hash_, verify
@@ -17,6 +18,7 @@ from characters_analyzer.schemas.responses import StandardResponse, TokenRespons
 router = APIRouter(
     prefix="/auth",
     tags=["authorization"],
+    route_class=UnitOfWorkRoute,
 )
 
 
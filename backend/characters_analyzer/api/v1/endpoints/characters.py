@@ -1,29 +1,46 @@
 import re
-from typing import Annotated
+from typing import Annotated, List
 from uuid import UUID
 
-from fastapi import APIRouter, Body, Depends, HTTPException, Path, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query, status
+from sqlalchemy.engine import RowMapping
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from characters_analyzer.api.dependencies import get_session, validate_access_token
-from characters_analyzer.api.services import character_service
-from characters_analyzer.database.tables.entities import Character, User
+from characters_analyzer.api.dependencies import (
+    get_session,
+    validate_access_token,
+    validate_access_token_record,
+)
+from characters_analyzer.api.read_models import character_read_model
+from characters_analyzer.api.routing import UnitOfWorkRoute
+from characters_analyzer.api.services import (
+    character_service,
+    farm_service,
+    similar_service,
+    sketch_service,
+)
+from characters_analyzer.database.tables.entities import User
 from characters_analyzer.database.tables.junctions import UserCharacter
+from characters_analyzer.engine.formula import FormulaError, compile_formula
+from characters_analyzer.engine.stats import StatTable, get_stat_table
 from characters_analyzer.schemas import (
+    CharacterBatchSchema,
     CharacterDataSchema,
     CharacterDataWithIdSchema,
-    FullCharacterSchema,
-    UserCharacterSchema,
+    ScoreFormulaSchema,
 )
 from characters_analyzer.schemas.responses import (
     FullCharactersResponse,
+    RankResponse,
+    SimilarBuildsResponse,
     StandardResponse,
 )
 
 router = APIRouter(
     prefix="/characters",
     tags=["characters"],
+    route_class=UnitOfWorkRoute,
 )
 
 
@@ -33,45 +50,48 @@ router = APIRouter(
     status_code=status.HTTP_200_OK,
     summary="Returns user's characters.",
 )
-async def get_characters(user: Annotated[User, Depends(validate_access_token)]):
+async def get_characters(
+    user: Annotated[RowMapping, Depends(validate_access_token_record)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    with_stats: Annotated[
+        bool, Query(description="Whether to add the stats of the characters.")
+    ] = False,
+):
     """A method for obtaining information about the user's characters.
 
-    The method gets the user's ORM from the dependency on authorization,
-    after which it makes a request to get information about users
-    associated with characters.
+    The user's characters are read together with the general information
+    about their characters (name, weapon type, element and region)
+    by a single statement, without the ORM (see ``api.read_models``),
+    and shaped right into FullCharacterSchema.
 
-    Further, general information about the attached characters is
-    obtained and combined into FullCharacterSchema.
+    If requested, the stats of all the characters at their levels
+    are looked up in the precomputed stat table with a single call.
 
     Parameters
     ----------
-    user : User
+    user : RowMapping
         The user is received from dependence on authorization.
+    session : AsyncSession
+        Request session object.
+    with_stats : bool
+        Whether to add the stats of the characters.
 
     Returns
     -------
     response : FullCharactersResponse
         In development.
     """
-    characters = []
-
-    for user_character in await character_service.get_user_characters_by_user(user):
-        # get character's ORM
-        character: Character = await user_character.awaitable_attrs.character
-
-        # compose argument-value pairs for FullCharacterSchema
-        character_info = UserCharacterSchema.model_validate(user_character).model_dump()
-        character_info.update(
-            {
-                "name": character.name,
-                "legendary": character.legendary,
-                "weapon": (await character.awaitable_attrs.weapon).title,
-                "element": (await character.awaitable_attrs.element).title,
-                "region": (await character.awaitable_attrs.region).title,
-            }
+    characters = await character_read_model.get_full_characters(session, user["id"])
+
+    if with_stats:
+        table: StatTable = get_stat_table()
+        stats = table.compute(
+            (character.character_id for character in characters),
+            (character.level for character in characters),
         )
 
-        characters.append(FullCharacterSchema(**character_info))
+        for character, character_stats in zip(characters, table.to_dicts(stats)):
+            character.stats = character_stats
 
     return {"characters": characters}
 
@@ -131,6 +151,8 @@ async def append_character(
                     detail="Incorrect request.",
                 )
 
+    farm_service.schedule_refresh(user.id)
+
     return {"message": "Character appended successfully."}
 
 
@@ -183,6 +205,165 @@ async def put_character(
     return {"message": "Data updated successfully."}
 
 
+@router.put(
+    "/formula/{user_character_id}",
+    response_model=StandardResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Update character's scoring formula of the artifacts.",
+)
+async def put_score_formula(
+    user_character_id: Annotated[
+        UUID, Path(description="The UUID of the user character to update.")
+    ],
+    formula_data: Annotated[ScoreFormulaSchema, Body()],
+    user: Annotated[User, Depends(validate_access_token)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+):
+    """Method for updating the formula scoring the artifacts for a character.
+
+    The formula weighs the stats of the artifacts (see ``engine.formula``);
+    it is stored normalized and all the user's artifacts are rescored
+    for the character at once, so the best artifacts are read
+    from the stored scores (see ``/artifacts/top/{user_character_id}``).
+
+    For an invalid formula, the method returns HTTP code 422.
+
+    Parameters
+    ----------
+    user_character_id : UUID
+        The UUID of the user character to update.
+    formula_data : ScoreFormulaSchema
+        Scoring formula, None for the default one.
+    user : User
+        The user is received from dependence on authorization.
+    session : AsyncSession
+        Request session object.
+
+    Returns
+    -------
+    response : StandardResponse
+        Positive feedback about character's formula updating.
+    """
+    formula = formula_data.formula
+
+    if formula is not None:
+        try:
+            formula = compile_formula(formula).source
+        except FormulaError as error:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(error)
+            )
+
+    user_character: UserCharacter = await _get_user_character(
+        session, user, user_character_id
+    )
+
+    await character_service.update_score_formula(session, user_character, formula)
+
+    return {"message": "Scoring formula updated successfully."}
+
+
+@router.get(
+    "/rank/{user_character_id}",
+    response_model=RankResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Ranks character's build among all the users.",
+)
+async def get_rank(
+    user_character_id: Annotated[
+        UUID, Path(description="The UUID of the user character to rank.")
+    ],
+    user: Annotated[User, Depends(validate_access_token)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+):
+    """Method for ranking the build of a character among all the users.
+
+    The build, the sub stats of the artifacts the character wears,
+    is placed within a sketch of the distribution of the builds
+    of the same character (see ``engine.sketch``), so the rank is
+    approximate and takes the same time whatever the number of builds.
+
+    If the character wears no artifacts, the method returns HTTP code 404.
+
+    Parameters
+    ----------
+    user_character_id : UUID
+        The UUID of the user character to rank.
+    user : User
+        The user is received from dependence on authorization.
+    session : AsyncSession
+        Request session object.
+
+    Returns
+    -------
+    response : RankResponse
+        Ranks of the build.
+    """
+    await _get_user_character(session, user, user_character_id)
+
+    ranks = await sketch_service.get_ranks(session, user_character_id)
+
+    if ranks is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User character with uuid={user_character_id} wears no artifacts.",
+        )
+
+    return {"ranks": ranks}
+
+
+@router.get(
+    "/similar/{user_character_id}",
+    response_model=SimilarBuildsResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Finds builds of other users similar to character's build.",
+)
+async def get_similar(
+    user_character_id: Annotated[
+        UUID, Path(description="The UUID of the user character to compare.")
+    ],
+    user: Annotated[User, Depends(validate_access_token)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    limit: Annotated[int, Query(ge=1, le=50, description="The number of builds.")] = 10,
+):
+    """Method for finding the builds of the same character closest to a build.
+
+    The builds are compared by the sub stats of the equipped artifacts
+    and searched in an approximate nearest neighbours index of the builds
+    of the character (see ``engine.neighbors``), so the closest builds
+    may occasionally be missed.
+
+    If the character wears no artifacts, the method returns HTTP code 404.
+
+    Parameters
+    ----------
+    user_character_id : UUID
+        The UUID of the user character to compare.
+    user : User
+        The user is received from dependence on authorization.
+    session : AsyncSession
+        Request session object.
+    limit : int
+        The number of builds.
+
+    Returns
+    -------
+    response : SimilarBuildsResponse
+        Similar builds, from the closest.
+    """
+    await _get_user_character(session, user, user_character_id)
+
+    builds = await similar_service.get_similar_builds(session, user_character_id, limit)
+
+    if builds is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User character with uuid={user_character_id} wears no artifacts.",
+        )
+
+    return {"builds": builds}
+
+
 @router.delete(
     "/delete/{user_character_id}",
     response_model=StandardResponse,
@@ -219,9 +400,99 @@ async def delete_character(
         session, await _get_user_character(session, user, user_character_id)
     )
 
+    farm_service.schedule_refresh(user.id)
+
     return {"message": "User character deleted successfully."}
 
 
+@router.post(
+    "/batch",
+    response_model=StandardResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Update and delete several characters at once.",
+)
+async def batch_characters(
+    batch: Annotated[CharacterBatchSchema, Body()],
+    user: Annotated[User, Depends(validate_access_token)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+):
+    """Method for batch updating and deleting of user's characters.
+
+    Receives a list of operations keyed by the user character's UUID.
+    Ownership of all the records is checked with a single query,
+    then all the changes are applied in one transaction: either every
+    operation succeeds, or none of them does.
+
+    Parameters
+    ----------
+    batch : CharacterBatchSchema
+        Operations to apply.
+    user : User
+        The user is received from dependence on authorization.
+    session : AsyncSession
+        Request session object.
+
+    Returns
+    -------
+    response : StandardResponse
+        Positive feedback about characters' data updating.
+    """
+    await _check_user_characters(
+        session, user, [operation.user_character_id for operation in batch.operations]
+    )
+
+    updates = {
+        operation.user_character_id: operation.data
+        for operation in batch.operations
+        if operation.action == "update"
+    }
+    deletes = [
+        operation.user_character_id
+        for operation in batch.operations
+        if operation.action == "delete"
+    ]
+
+    await character_service.batch_user_characters(session, user.id, updates, deletes)
+
+    if deletes:
+        farm_service.schedule_refresh(user.id)
+
+    return {
+        "message": f"{len(updates)} characters updated, {len(deletes)} deleted successfully."
+    }
+
+
+async def _check_user_characters(session: AsyncSession, user: User, ids: List[UUID]):
+    """A function to validate several UserCharacter records at once.
+
+    Works like ``_get_user_character``, but checks the presence
+    and the ownership of all the records with one query
+    and does not load them.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Request session object.
+    user : User
+        The user performing action.
+    ids : List[UUID]
+        The UUIDs of the user_character entries being acted upon.
+    """
+    owners = await character_service.get_user_characters_owners(session, ids)
+
+    if missing := [str(id_) for id_ in ids if id_ not in owners]:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User characters with uuid={', '.join(missing)} not found.",
+        )
+
+    if any(user_id != user.id for user_id in owners.values()):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Your uuid and the uuid on the user character entry do not match.",
+        )
+
+
 async def _get_user_character(
     session: AsyncSession, user: User, id_: UUID
 ) -> UserCharacter:
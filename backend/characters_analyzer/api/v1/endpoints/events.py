@@ -0,0 +1,102 @@
+import json
+from typing import Annotated, AsyncIterator
+
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import StreamingResponse
+
+from characters_analyzer.api.dependencies import validate_access_token
+from characters_analyzer.api.routing import UnitOfWorkRoute
+from characters_analyzer.core.config import Settings, get_settings
+from characters_analyzer.core.events import hub
+from characters_analyzer.core.lifecycle import lifecycle
+from characters_analyzer.database.tables.entities import User
+
+router = APIRouter(
+    prefix="/events",
+    tags=["events"],
+    route_class=UnitOfWorkRoute,
+)
+
+
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Stream of changes in the user's account.",
+)
+async def stream_events(
+    user: Annotated[User, Depends(validate_access_token)],
+    settings: Annotated[Settings, Depends(get_settings)],
+):
+    """Server-sent events stream of the user's account changes.
+
+    Instead of polling ``/characters/get``, a client keeps this stream open
+    and receives a message every time one of its characters or artifacts
+    is created, updated or deleted, on whichever worker it happened.
+
+    Each message has the ``event`` field set to the changed entity and a JSON
+    ``data`` field with the ``action`` and the ``id`` of the record.
+    While nothing happens, a keep-alive comment is sent periodically.
+
+    The transaction of the authorization ends before the stream is sent
+    (see ``api.routing.UnitOfWorkRoute``), so an open stream does not hold
+    a database connection.
+
+    When the worker is stopping, the stream ends, and the client
+    reconnects to another worker after the ``retry`` interval.
+
+    Parameters
+    ----------
+    user : User
+        The user is received from dependence on authorization.
+    settings : Settings
+        Application settings.
+
+    Returns
+    -------
+    response : StreamingResponse
+        ``text/event-stream`` response.
+    """
+    return StreamingResponse(
+        _event_stream(user, settings),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _event_stream(user: User, settings: Settings) -> AsyncIterator[str]:
+    """Generator of server-sent events for one connection.
+
+    Parameters
+    ----------
+    user : User
+        The user the stream belongs to.
+    settings : Settings
+        Application settings.
+
+    Returns
+    -------
+    events : AsyncIterator[str]
+        Formatted server-sent events.
+    """
+    yield f"retry: {settings.EVENTS_KEEPALIVE_SECONDS * 1000}\n\n"
+
+    if lifecycle.draining:
+        return
+
+    subscription = hub.subscribe(user.id, settings.EVENTS_QUEUE_SIZE)
+
+    try:
+        while True:
+            message = await subscription.get(settings.EVENTS_KEEPALIVE_SECONDS)
+
+            if message is None:
+                if subscription.closed:
+                    break
+
+                yield ": keep-alive\n\n"
+                continue
+
+            yield f"event: {message['entity']}\ndata: {json.dumps(message)}\n\n"
+    finally:
+        hub.unsubscribe(subscription)
@@ -0,0 +1,113 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Response, status
+
+from characters_analyzer.api.dependencies import validate_access_token
+from characters_analyzer.api.services import artifact_service
+from characters_analyzer.core.lifecycle import lifecycle
+from characters_analyzer.database.tables.entities import User
+from characters_analyzer.schemas.responses import CachesResponse, HealthResponse
+
+router = APIRouter(
+    prefix="/health",
+    tags=["health"],
+)
+
+
+@router.get(
+    "/live",
+    response_model=HealthResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Liveness probe.",
+)
+async def live():
+    """Path for the liveness probe of the worker.
+
+    Answers as long as the worker's event loop is responsive,
+    whatever phase the worker is in.
+
+    Returns
+    -------
+    response : HealthResponse
+        Phase of the worker.
+    """
+    return {
+        "message": "Worker is alive.",
+        "phase": lifecycle.phase,
+        "in_flight": lifecycle.in_flight,
+    }
+
+
+@router.get(
+    "/ready",
+    response_model=HealthResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_503_SERVICE_UNAVAILABLE: {
+            "model": HealthResponse,
+            "description": "The worker is starting or stopping.",
+        },
+    },
+    summary="Readiness probe.",
+)
+async def ready(response: Response):
+    """Path for the readiness probe of the worker.
+
+    The worker is ready once it has warmed up its connections and caches
+    and until it is told to stop. While it is not, the load balancer
+    should not send it any requests.
+
+    Parameters
+    ----------
+    response : Response
+        Response to set the status code of.
+
+    Returns
+    -------
+    response : HealthResponse
+        Phase of the worker.
+    """
+    if not lifecycle.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+        return {
+            "code": status.HTTP_503_SERVICE_UNAVAILABLE,
+            "message": "Worker is not ready.",
+            "phase": lifecycle.phase,
+            "in_flight": lifecycle.in_flight,
+        }
+
+    return {
+        "message": "Worker is ready.",
+        "phase": lifecycle.phase,
+        "in_flight": lifecycle.in_flight,
+    }
+
+
+@router.get(
+    "/caches",
+    response_model=CachesResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Usage of the worker's caches.",
+)
+async def caches(user: Annotated[User, Depends(validate_access_token)]):
+    """Path for the usage of the caches of the worker.
+
+    Reports the memory taken by the inventory snapshots of the worker
+    and how often they are found in the cache, to tune ``INVENTORY_CACHE_BYTES``.
+    Unlike the probes, it's only answered to an authorized user.
+
+    Parameters
+    ----------
+    user : User
+        The user is received from dependence on authorization.
+
+    Returns
+    -------
+    response : CachesResponse
+        Usage of the caches.
+    """
+    return {
+        "message": "Caches usage.",
+        "inventory": artifact_service.get_inventory_cache().stats(),
+    }
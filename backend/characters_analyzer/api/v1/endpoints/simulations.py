@@ -0,0 +1,170 @@
+from concurrent.futures.process import BrokenProcessPool
+from typing import Annotated, List
+
+from fastapi import APIRouter, Body, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from characters_analyzer.api.dependencies import get_session, validate_access_token
+from characters_analyzer.api.routing import UnitOfWorkRoute
+from characters_analyzer.api.services import character_service
+from characters_analyzer.core.config import Settings, get_settings
+from characters_analyzer.database.tables.entities import User
+from characters_analyzer.database.tables.junctions import UserCharacter
+from characters_analyzer.engine.damage import artifact_bonuses
+from characters_analyzer.engine.pool import get_simulation_pool
+from characters_analyzer.engine.rotation import (
+    Action,
+    Buff,
+    Enemy,
+    Member,
+    Simulation,
+    SimulationTimeout,
+    get_character_elements,
+)
+from characters_analyzer.engine.stats import get_stat_table
+from characters_analyzer.schemas import RotationSchema
+from characters_analyzer.schemas.responses import SimulationResponse
+
+router = APIRouter(
+    prefix="/simulations",
+    tags=["simulations"],
+    route_class=UnitOfWorkRoute,
+)
+
+
+@router.post(
+    "/rotation",
+    response_model=SimulationResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Simulates a rotation of a team.",
+)
+async def simulate_rotation(
+    rotation: Annotated[RotationSchema, Body()],
+    user: Annotated[User, Depends(validate_access_token)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+):
+    """Method for simulating a rotation of a team of the user's characters.
+
+    The characters are loaded with their equipped artifacts and turned
+    into a compact input, which is simulated in a separate process
+    (see ``engine.pool``), so the server keeps answering other requests.
+    Identical simulations are answered from the cache.
+
+    If the simulation does not finish within the time budget,
+    the method returns HTTP code 504; the result of the simulation
+    is still cached when it finishes. If a simulation process dies,
+    the method returns HTTP code 503.
+
+    Parameters
+    ----------
+    rotation : RotationSchema
+        Team, actions and enemy.
+    user : User
+        The user is received from dependence on authorization.
+    session : AsyncSession
+        Request session object.
+
+    Returns
+    -------
+    response : SimulationResponse
+        Damage over the rotation.
+    """
+    settings: Settings = get_settings()
+
+    ids = [member.user_character_id for member in rotation.team]
+    user_characters = {
+        user_character.id: user_character
+        for user_character in await character_service.get_user_characters_with_artifacts(
+            session, user.id, ids
+        )
+    }
+
+    if missing := [str(id_) for id_ in ids if id_ not in user_characters]:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User characters with uuid={', '.join(missing)} not found.",
+        )
+
+    simulation = _build_simulation(rotation, [user_characters[id_] for id_ in ids])
+
+    try:
+        result = await get_simulation_pool().run(
+            simulation, settings.SIMULATION_TIMEOUT_SECONDS
+        )
+    except (TimeoutError, SimulationTimeout):
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="The simulation did not finish in "
+            f"{settings.SIMULATION_TIMEOUT_SECONDS} seconds.",
+        )
+    except BrokenProcessPool:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="The simulation failed, try again.",
+        )
+
+    return {
+        "damage": result.damage,
+        "duration": result.duration,
+        "dps": result.dps,
+        "member_damage": result.member_damage,
+        "energy": result.energy,
+        "missing_energy": result.missing_energy,
+    }
+
+
+def _build_simulation(
+    rotation: RotationSchema, user_characters: List[UserCharacter]
+) -> Simulation:
+    """A function to compose the input of a simulation.
+
+    Replaces the user's characters with their stats at their levels
+    and the bonuses of their equipped artifacts.
+
+    Parameters
+    ----------
+    rotation : RotationSchema
+        Team, actions and enemy.
+    user_characters : List[UserCharacter]
+        User's characters in the order of the team, with their artifacts loaded.
+
+    Returns
+    -------
+    simulation : Simulation
+        Input of the simulation.
+    """
+    table = get_stat_table()
+    elements = get_character_elements()
+
+    if missing := [
+        str(user_character.character_id)
+        for user_character in user_characters
+        if user_character.character_id not in table.index
+    ]:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"No game data for characters with uuid={', '.join(missing)}.",
+        )
+
+    team = tuple(
+        Member(
+            character_id=str(user_character.character_id),
+            element=elements[user_character.character_id],
+            level=user_character.level,
+            base=tuple(
+                table.lookup(user_character.character_id, user_character.level).values()
+            ),
+            bonuses=tuple(artifact_bonuses(user_character.artifacts).tolist()),
+            weapon_atk=member.weapon_atk,
+        )
+        for member, user_character in zip(rotation.team, user_characters)
+    )
+    actions = tuple(
+        Action(
+            **action.model_dump(exclude={"buff"}),
+            buff=Buff(**action.buff.model_dump()) if action.buff else None,
+        )
+        for action in rotation.rotation
+    )
+
+    return Simulation(team, actions, Enemy(**rotation.enemy.model_dump()))
@@ -0,0 +1,59 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from characters_analyzer.api.dependencies import get_session, validate_access_token
+from characters_analyzer.api.routing import UnitOfWorkRoute
+from characters_analyzer.api.services import usage_service
+from characters_analyzer.database.tables.entities import User
+from characters_analyzer.schemas.responses import UsageResponse
+
+router = APIRouter(
+    prefix="/usage",
+    tags=["usage"],
+    route_class=UnitOfWorkRoute,
+)
+
+
+@router.get(
+    "/characters",
+    response_model=UsageResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Returns the global usage statistics of the characters.",
+)
+async def get_characters_usage(
+    user: Annotated[User, Depends(validate_access_token)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    response: Response,
+):
+    """Method for obtaining the usage statistics of the characters across all users.
+
+    The ownership rate, the distributions of constellations and talent levels
+    and the most worn artifact sets of every character are read from counters
+    maintained as the users' characters and artifacts change
+    (see ``usage_service``). Every worker serves the same statistics
+    for ``USAGE_CACHE_SECONDS``, and so may the client.
+
+    Parameters
+    ----------
+    user : User
+        The user is received from dependence on authorization.
+    session : AsyncSession
+        Request session object.
+    response : Response
+        Response to set the caching headers of.
+
+    Returns
+    -------
+    response : UsageResponse
+        Global usage statistics.
+    """
+    cache = usage_service.get_usage_cache()
+
+    response.headers["Cache-Control"] = f"private, max-age={int(cache.ttl)}"
+
+    return {
+        "message": "Usage statistics.",
+        **await cache.get(session),
+    }
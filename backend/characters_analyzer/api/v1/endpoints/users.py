@@ -1,18 +1,33 @@
-from typing import Annotated, AnyStr
+from typing import Annotated, AnyStr, Literal
 
-from fastapi import APIRouter, Depends, Path, status
+from fastapi import APIRouter, Depends, Path, Query, Request, status
 from fastapi.exceptions import HTTPException
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, StreamingResponse
+from sqlalchemy.engine import RowMapping
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from characters_analyzer.api.dependencies import get_session, validate_access_token
-from characters_analyzer.api.services import user_service
+from characters_analyzer.api.dependencies import (
+    get_session,
+    get_snapshot_session,
+    validate_access_token,
+    validate_access_token_record,
+)
+from characters_analyzer.api.read_models import user_read_model
+from characters_analyzer.api.routing import UnitOfWorkRoute
+from characters_analyzer.api.services import (
+    export_service,
+    farm_service,
+    import_service,
+)
 from characters_analyzer.database.tables.entities import User
-from characters_analyzer.schemas.responses import UserResponse
+from characters_analyzer.engine import export
+from characters_analyzer.engine.good import GoodError
+from characters_analyzer.schemas.responses import ImportResponse, UserResponse
 
 router = APIRouter(
     prefix="/users",
     tags=["users"],
+    route_class=UnitOfWorkRoute,
 )
 
 
@@ -22,14 +37,15 @@ router = APIRouter(
     status_code=status.HTTP_200_OK,
     summary="Personal page.",
 )
-async def get_me(user: Annotated[User, Depends(validate_access_token)]):
+async def get_me(user: Annotated[RowMapping, Depends(validate_access_token_record)]):
     """User's personal page method.
 
-    Returns information about the owner of the token.
+    Returns information about the owner of the token,
+    read without the ORM (see ``api.read_models``).
 
     Parameters
     ----------
-    user : User
+    user : RowMapping
         The user is received from dependence on authorization.
 
     Returns
@@ -40,6 +56,130 @@ async def get_me(user: Annotated[User, Depends(validate_access_token)]):
     return user
 
 
+@router.post(
+    "/me/import",
+    response_model=ImportResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Imports characters and artifacts from a GOOD export.",
+)
+async def import_good(
+    request: Request,
+    user: Annotated[User, Depends(validate_access_token)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+):
+    """Method for importing an export of an artifact scanner.
+
+    The body is a JSON document in the GOOD format, read as it arrives,
+    so exports of any size take little memory. Characters are matched
+    by their GOOD keys and updated if the user already has them;
+    artifacts are added, equipped by the character of their ``location``
+    in place of the artifact it wore in the same slot, unless the user
+    already has the same artifact.
+    Items that can't be imported are reported without failing the import.
+
+    If the body isn't a valid GOOD document, the method returns HTTP code 422;
+    the items imported before the error was found are kept.
+
+    Parameters
+    ----------
+    request : Request
+        Request, the body of which is the export.
+    user : User
+        The user is received from dependence on authorization.
+    session : AsyncSession
+        Request session object.
+
+    Returns
+    -------
+    response : ImportResponse
+        Report of the import.
+    """
+    try:
+        report = await import_service.import_good(session, user.id, request.stream())
+    except GoodError as error:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(error)
+        )
+    finally:
+        farm_service.schedule_refresh(user.id)
+
+    return report
+
+
+@router.get(
+    "/me/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Exports the account of the user.",
+)
+async def export_account(
+    user: Annotated[User, Depends(validate_access_token)],
+    session: Annotated[AsyncSession, Depends(get_snapshot_session)],
+    table: Annotated[
+        Literal["characters", "artifacts"] | None,
+        Query(description="Exported table, every table of the account if not given."),
+    ] = None,
+    format_: Annotated[
+        Literal["ndjson", "arrow", "parquet"],
+        Query(alias="format", description="Format of the export."),
+    ] = "ndjson",
+):
+    """Method for exporting the user's account.
+
+    The tables are streamed as they are read from the database, in batches,
+    so accounts of any size are exported with little memory: as
+    newline-delimited JSON, as Arrow IPC streams or as Parquet files.
+    Every artifact is a row with its sub stats as columns, named by their keys.
+
+    Every table of the account is exported by default, all of them read
+    in one repeatable-read transaction, so the characters and the artifacts
+    agree with each other even if the account changes during the export.
+    The NDJSON lines of the tables follow each other, every line naming
+    its table in the ``table`` key; the columnar tables are the files
+    of a zip archive. A single table is exported with ``table``.
+
+    If the worker can't write the columnar formats (``pyarrow`` isn't
+    installed), the method returns HTTP code 501.
+
+    Parameters
+    ----------
+    user : User
+        The user is received from dependence on authorization.
+    session : AsyncSession
+        Session seeing a single snapshot of the database.
+    table : Literal["characters", "artifacts"] | None
+        Exported table.
+    format_ : Literal["ndjson", "arrow", "parquet"]
+        Format of the export.
+
+    Returns
+    -------
+    response : StreamingResponse
+        Content of the account.
+    """
+    if not export.is_available(format_):
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=f"The {format_} format isn't available.",
+        )
+
+    if table is not None:
+        content = export_service.export_table(session, user.id, table, format_)
+        media_type, filename = export.FORMATS[format_], f"{table}.{format_}"
+    elif format_ in export.COLUMNAR:
+        content = export_service.export_account(session, user.id, format_)
+        media_type, filename = export.ARCHIVE, "account.zip"
+    else:
+        content = export_service.export_account(session, user.id, format_)
+        media_type, filename = export.FORMATS[format_], f"account.{format_}"
+
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.get(
     "/{username}",
     response_model=UserResponse,
@@ -51,20 +191,21 @@ async def get_person(
         AnyStr,
         Path(description="Login of the user whose personal page you want to go to."),
     ],
-    user: Annotated[User, Depends(validate_access_token)],
+    user: Annotated[RowMapping, Depends(validate_access_token_record)],
     session: Annotated[AsyncSession, Depends(get_session)],
 ):
     """User's page method.
 
     If the owner of the token sends a request to this method,
     then a redirect to the personal page is returned.
-    In another case, the page of the requested user is returned.
+    In another case, the page of the requested user is returned,
+    read without the ORM (see ``api.read_models``).
 
     Parameters
     ----------
     username : AnyStr
         The name of the user whose page is being requested.
-    user : User
+    user : RowMapping
         The user is received from dependence on authorization.
     session : AsyncSession
         Request session object.
@@ -74,10 +215,12 @@ async def get_person(
     user : UserResponse
         Response with user's info.
     """
-    if user.username == username:
+    if user["username"] == username:
         return RedirectResponse("/api/v1/users/me")
 
-    if (result := await user_service.get_user_by_username(session, username)) is None:
+    if (
+        result := await user_read_model.get_user_by_username(session, username)
+    ) is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f'User "{username}" not found.',
@@ -35,15 +35,32 @@ class Settings(BaseSettings):
     ADMIN_EMAIL : EmailStr
         Email address to contact the person in charge.
     DEV_MODE : bool
-        Development mode.
+        Development mode: a single auto-reloading process.
+        Otherwise, the production server is started (see ``server``).
     INITIALIZE_DB : bool
         Recreate the DB.
+    MIGRATE_DB : bool
+        Create missing tables and apply pending migrations on startup.
+    SEED_DB : bool
+        Load the bundled game data on startup.
     BACKEND_CORS_ORIGINS : List[AnyHttpUrl]
         List of sources for CORS Middleware.
     DOMAIN : str` | `IPvAnyAddress
         The IP of the domain where the application is located.
     BACKEND_PORT : int
         Application port.
+    WORKERS : int
+        The number of worker processes in production, 0 for one per CPU core.
+    BACKLOG : int
+        Maximum number of pending connections.
+    KEEPALIVE_SECONDS : int
+        How long to wait for the next request on a keep-alive connection.
+    WORKER_TIMEOUT_SECONDS : int
+        Silent workers are restarted after this period.
+    DRAIN_DELAY_SECONDS : int
+        How long a stopping worker keeps serving while reporting it is not ready.
+    GRACEFUL_TIMEOUT_SECONDS : int
+        How long a stopping worker waits for the requests in flight.
     DATABASE_USER : str
         The database user to connect to.
     DATABASE_PASSWORD : str
@@ -64,6 +81,32 @@ class Settings(BaseSettings):
         Access token lifetime in minutes.
     REFRESH_TOKEN_LIFETIME_DAYS : int
         Refresh token lifetime in days.
+    EVENTS_QUEUE_SIZE : int
+        How many undelivered events are kept per client connection.
+    EVENTS_KEEPALIVE_SECONDS : int
+        Interval of keep-alive messages on an idle events stream.
+    SIMULATION_WORKERS : int
+        The number of simulation processes of every worker.
+    SIMULATION_TIMEOUT_SECONDS : float
+        Time budget of a simulation request.
+    SIMULATION_CACHE_SIZE : int
+        How many simulation results every worker keeps.
+    FARM_DEBOUNCE_SECONDS : float
+        Quiet period after a change of the inventory before the farming
+        recommendations are recomputed.
+    FACET_CACHE_SIZE : int
+        How many facet indexes of the users' inventories every worker keeps.
+    INVENTORY_CACHE_BYTES : int
+        Memory budget of the inventory snapshots of every worker, in bytes.
+    USAGE_CACHE_SECONDS : float
+        How long every worker serves the global usage statistics.
+    SKETCH_FLUSH_SECONDS : float
+        How often every worker merges the changes of the builds
+        into the stored sketches.
+    SIMILAR_INDEX_SIZE : int
+        For how many characters every worker keeps an index of the builds.
+    SIMILAR_REBUILD_SECONDS : float
+        How old an index of the builds gets before it is rebuilt in the background.
     """
 
     APP_NAME: str
@@ -77,6 +120,8 @@ class Settings(BaseSettings):
     DEV_MODE: bool
 
     INITIALIZE_DB: bool
+    MIGRATE_DB: bool = True
+    SEED_DB: bool = True
 
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl]
 
@@ -95,6 +140,13 @@ class Settings(BaseSettings):
 
     BACKEND_PORT: int
 
+    WORKERS: int = 0
+    BACKLOG: int = 2048
+    KEEPALIVE_SECONDS: int = 5
+    WORKER_TIMEOUT_SECONDS: int = 60
+    DRAIN_DELAY_SECONDS: int = 5
+    GRACEFUL_TIMEOUT_SECONDS: int = 30
+
     CURRENT_API_URL: str
 
     DATABASE_USER: str
@@ -109,6 +161,23 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_LIFETIME_MINUTES: int
     REFRESH_TOKEN_LIFETIME_DAYS: int
 
+    EVENTS_QUEUE_SIZE: int = 64
+    EVENTS_KEEPALIVE_SECONDS: int = 15
+
+    SIMULATION_WORKERS: int = 1
+    SIMULATION_TIMEOUT_SECONDS: float = 10
+    SIMULATION_CACHE_SIZE: int = 1024
+
+    FARM_DEBOUNCE_SECONDS: float = 5
+
+    FACET_CACHE_SIZE: int = 256
+    INVENTORY_CACHE_BYTES: int = 64 * 1024 * 1024
+
+    USAGE_CACHE_SECONDS: float = 60
+    SKETCH_FLUSH_SECONDS: float = 30
+    SIMILAR_INDEX_SIZE: int = 32
+    SIMILAR_REBUILD_SECONDS: float = 600
+
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
 
 
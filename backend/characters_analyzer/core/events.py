@@ -0,0 +1,253 @@
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Set
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "characters_analyzer_events"
+
+
+class Subscription:
+    """A single client's view of the event stream.
+
+    Holds a bounded buffer of pending messages. When the client cannot keep up,
+    the oldest message is dropped to make room for the new one, so a slow
+    connection never blocks publishers and never grows without limit.
+
+    An idle subscription is just a small deque and an event, so holding
+    thousands of them per worker costs next to nothing.
+
+    Attributes
+    ----------
+    user_id : UUID
+        UUID of the user the subscription belongs to.
+    dropped : int
+        The number of messages discarded because of back-pressure.
+    closed : bool
+        Whether the subscription has been closed by the server.
+    """
+
+    __slots__ = ("user_id", "dropped", "closed", "_buffer", "_ready")
+
+    def __init__(self, user_id: UUID, maxsize: int):
+        self.user_id: UUID = user_id
+        self.dropped: int = 0
+        self.closed: bool = False
+
+        self._buffer: Deque[Dict[str, Any]] = deque(maxlen=maxsize)
+        self._ready: asyncio.Event = asyncio.Event()
+
+    def put(self, message: Dict[str, Any]):
+        """Buffers the message, dropping the oldest one if the buffer is full.
+
+        Parameters
+        ----------
+        message : Dict[str, Any]
+            Event payload.
+        """
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1
+
+        self._buffer.append(message)
+        self._ready.set()
+
+    async def get(self, timeout: float) -> Dict[str, Any] | None:
+        """Waits for the next message.
+
+        Parameters
+        ----------
+        timeout : float
+            How long to wait for a message, in seconds.
+
+        Returns
+        -------
+        message : Dict[str, Any] | None
+            Event payload or ``None`` if nothing has arrived in time
+            or the subscription has been closed.
+        """
+        if not self._buffer and not self.closed:
+            self._ready.clear()
+
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+
+        return self._buffer.popleft() if self._buffer else None
+
+    def close(self):
+        """Wakes the client up, so it can finish the stream."""
+        self.closed = True
+        self._ready.set()
+
+
+class Hub:
+    """In-process fan-out of events to the connected clients.
+
+    Events are addressed to a user; every open subscription of that user
+    receives its own copy. Listeners receive every event, e.g. to drop
+    the caches of the worker holding the changed data.
+    """
+
+    def __init__(self):
+        self._subscriptions: Dict[UUID, Set[Subscription]] = {}
+        self._listeners: List[Callable[[UUID, Dict[str, Any]], None]] = []
+
+    def add_listener(self, listener: Callable[[UUID, Dict[str, Any]], None]):
+        """Registers a function called with every event.
+
+        Parameters
+        ----------
+        listener : Callable[[UUID, Dict[str, Any]], None]
+            Function taking the user's UUID and the event payload;
+            it must be fast and must not raise.
+        """
+        self._listeners.append(listener)
+
+    def subscribe(self, user_id: UUID, maxsize: int) -> Subscription:
+        """Opens a new subscription for the user.
+
+        Parameters
+        ----------
+        user_id : UUID
+            User's UUID.
+        maxsize : int
+            Size of the subscription buffer.
+
+        Returns
+        -------
+        subscription : Subscription
+            New subscription.
+        """
+        subscription = Subscription(user_id, maxsize)
+        self._subscriptions.setdefault(user_id, set()).add(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Closes the subscription.
+
+        Parameters
+        ----------
+        subscription : Subscription
+            Subscription to close.
+        """
+        subscriptions = self._subscriptions.get(subscription.user_id)
+
+        if subscriptions is None:
+            return
+
+        subscriptions.discard(subscription)
+
+        if not subscriptions:
+            del self._subscriptions[subscription.user_id]
+
+    def publish(self, user_id: UUID, message: Dict[str, Any]):
+        """Delivers the message to every subscription of the user.
+
+        Parameters
+        ----------
+        user_id : UUID
+            User's UUID.
+        message : Dict[str, Any]
+            Event payload.
+        """
+        for listener in self._listeners:
+            listener(user_id, message)
+
+        for subscription in self._subscriptions.get(user_id, ()):
+            subscription.put(message)
+
+    def close(self):
+        """Closes every subscription, e.g. when the worker is stopping."""
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                subscription.close()
+
+    @property
+    def connections(self) -> int:
+        """The number of open subscriptions."""
+        return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+
+class PostgresBridge:
+    """Carries events between workers over Postgres ``LISTEN``/``NOTIFY``.
+
+    Services send notifications inside their own transaction (see
+    ``api.services.event_service``), so an event is only delivered once the
+    change is committed. Every worker keeps one dedicated connection that
+    listens on the channel and hands the received events to its ``Hub``.
+
+    If the connection is lost, the bridge reconnects with a growing delay.
+    """
+
+    def __init__(self, hub: Hub):
+        self._hub: Hub = hub
+        self._task: asyncio.Task | None = None
+
+    async def start(self, engine: AsyncEngine):
+        """Starts listening in the background.
+
+        Parameters
+        ----------
+        engine : AsyncEngine
+            Engine to take the listening connection from.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen(engine))
+
+    async def stop(self):
+        """Stops listening and releases the connection."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+        self._task = None
+
+    async def _listen(self, engine: AsyncEngine):
+        delay = 1
+
+        while True:
+            try:
+                async with engine.connect() as connection:
+                    raw_connection = await connection.get_raw_connection()
+                    driver_connection = raw_connection.driver_connection
+
+                    lost = asyncio.Event()
+
+                    driver_connection.add_termination_listener(lambda _: lost.set())
+                    await driver_connection.add_listener(CHANNEL, self._on_notify)
+
+                    delay = 1
+
+                    try:
+                        await lost.wait()
+                    finally:
+                        if not driver_connection.is_closed():
+                            await driver_connection.remove_listener(
+                                CHANNEL, self._on_notify
+                            )
+            except Exception:  # the bridge must outlive any connection failure
+                logger.exception("Events bridge disconnected")
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30)
+
+    def _on_notify(self, _connection, _pid: int, _channel: str, payload: str):
+        message = json.loads(payload)
+        self._hub.publish(UUID(message["user_id"]), message)
+
+
+hub = Hub()
+bridge = PostgresBridge(hub)
@@ -0,0 +1,107 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Hashable, Set
+
+logger = logging.getLogger(__name__)
+
+
+class Debouncer:
+    """Runs a background job once after a burst of requests for the same key.
+
+    Every request postpones the job of its key by ``delay`` seconds, so
+    a series of changes, e.g. an import of a whole inventory, is followed
+    by a single run. A request arriving while the job is running schedules
+    one more run, which starts after the current one has finished.
+
+    Without postponing, a request only schedules a run if none is pending,
+    so a steady stream of requests is followed by a run every ``delay``
+    seconds instead of none at all.
+
+    Failures of the job are reported and do not affect the other keys.
+
+    Parameters
+    ----------
+    job : Callable[[Hashable], Awaitable]
+        Coroutine function taking the key.
+    delay : float
+        Quiet period, in seconds.
+    postpone : bool
+        Whether a request postpones the pending run.
+    """
+
+    def __init__(
+        self, job: Callable[[Hashable], Awaitable], delay: float, postpone: bool = True
+    ):
+        self.job: Callable[[Hashable], Awaitable] = job
+        self.delay: float = delay
+        self.postpone: bool = postpone
+
+        self._timers: Dict[Hashable, asyncio.Task] = {}
+        self._running: Dict[Hashable, asyncio.Task] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    def schedule(self, key: Hashable):
+        """Requests a run of the job for the key.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key, e.g. a user's UUID.
+        """
+        if key in self._timers and not self.postpone:
+            return
+
+        if (timer := self._timers.pop(key, None)) is not None:
+            timer.cancel()
+
+        self._timers[key] = self._spawn(self._run_later(key))
+
+    @property
+    def pending(self) -> int:
+        """The number of keys waiting for a run."""
+        return len(self._timers)
+
+    async def shutdown(self):
+        """Runs the pending jobs right away and waits for the running ones."""
+        timers = self._timers
+        self._timers = {}
+
+        for timer in timers.values():
+            timer.cancel()
+
+        await asyncio.gather(
+            *(self._tasks - set(timers.values())),
+            *(self._run(key) for key in timers),
+            return_exceptions=True,
+        )
+
+    def _spawn(self, coroutine: Awaitable) -> asyncio.Task:
+        # the loop only keeps weak references to its tasks
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+        return task
+
+    async def _run_later(self, key: Hashable):
+        await asyncio.sleep(self.delay)
+
+        # from now on, a new request schedules a new timer instead of cancelling
+        self._timers.pop(key, None)
+
+        if (running := self._running.get(key)) is not None:
+            await asyncio.wait([running])
+
+        self._running[key] = asyncio.current_task()
+
+        try:
+            await self._run(key)
+        finally:
+            if self._running.get(key) is asyncio.current_task():
+                del self._running[key]
+
+    async def _run(self, key: Hashable):
+        try:
+            await self.job(key)
+        except Exception:  # a failed job must not break the next ones
+            logger.exception("Background job for %r failed", key)
@@ -1,11 +1,7 @@
 from datetime import datetime, timedelta
 from typing import AnyStr, Dict
 
-from jose import jwt
-
-from characters_analyzer.core.config import get_settings
-
-settings = get_settings()
+from characters_analyzer.core.config import Settings, get_settings
 
 
 def jwt_encode(to_encode: Dict) -> AnyStr:
@@ -21,6 +17,10 @@ def jwt_encode(to_encode: Dict) -> AnyStr:
     token : AnyStr
         JSON Web Token.
     """
+    from jose import jwt  # loads the cryptography backend, so not at import time
+
+    settings: Settings = get_settings()
+
     return jwt.encode(
         to_encode, key=settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
     )
@@ -39,6 +39,10 @@ def jwt_decode(token: AnyStr) -> Dict:
     dictionary : Dict
         Dictionary with information from JWT.
     """
+    from jose import jwt
+
+    settings: Settings = get_settings()
+
     return jwt.decode(
         token, key=settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
     )
@@ -70,10 +74,8 @@ def create_jwt(data: Dict, expires_delta: timedelta) -> AnyStr:
 def create_jwt_pair(
     access_token_data: Dict,
     refresh_token_data: Dict = None,
-    at_expires_delta: timedelta = timedelta(
-        minutes=settings.ACCESS_TOKEN_LIFETIME_MINUTES
-    ),
-    rt_expires_delta: timedelta = timedelta(days=settings.REFRESH_TOKEN_LIFETIME_DAYS),
+    at_expires_delta: timedelta = None,
+    rt_expires_delta: timedelta = None,
 ) -> Dict[AnyStr, AnyStr]:
     """Creates a JWT pair consisting of an access token and a refresh token.
 
@@ -83,19 +85,29 @@ def create_jwt_pair(
         The information to be encoded into the access token.
     refresh_token_data : Dict
         The information to be encoded into the refresh token.
-    at_expires_delta : timedelta
+    at_expires_delta : timedelta, optional
         The lifetime of the access token.
-    rt_expires_delta : timedelta
+        If not passed, ``ACCESS_TOKEN_LIFETIME_MINUTES`` setting is used.
+    rt_expires_delta : timedelta, optional
         Refresh token lifetime.
+        If not passed, ``REFRESH_TOKEN_LIFETIME_DAYS`` setting is used.
 
     Returns
     -------
     tokens : Dict[AnyStr, AnyStr]
         JWT pair (access_token + refresh_token).
     """
+    settings: Settings = get_settings()
+
     if refresh_token_data is None:
         refresh_token_data = access_token_data
 
+    if at_expires_delta is None:
+        at_expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_LIFETIME_MINUTES)
+
+    if rt_expires_delta is None:
+        rt_expires_delta = timedelta(days=settings.REFRESH_TOKEN_LIFETIME_DAYS)
+
     return {
         "access_token": create_jwt(access_token_data, at_expires_delta),
         "refresh_token": create_jwt(refresh_token_data, rt_expires_delta),
@@ -0,0 +1,193 @@
+import asyncio
+import logging
+from contextlib import contextmanager
+from enum import Enum
+from typing import Awaitable, Callable, Iterator, List
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+DRAIN_POLL_SECONDS = 0.05
+
+
+class Phase(str, Enum):
+    """Phases of a worker's life."""
+
+    STARTING = "starting"
+    READY = "ready"
+    DRAINING = "draining"
+    STOPPED = "stopped"
+
+
+class Lifecycle:
+    """State of the worker shared by the lifespan, the server and the health checks.
+
+    A worker is ``starting`` until the lifespan has warmed it up, then ``ready``.
+    When it is told to stop, it becomes ``draining``: it is no longer ready,
+    asks clients to close their connections and waits for the requests
+    in flight. Once the shutdown hooks have flushed whatever they buffer,
+    it is ``stopped``.
+
+    Attributes
+    ----------
+    phase : Phase
+        Current phase.
+    in_flight : int
+        The number of HTTP requests being processed.
+    """
+
+    def __init__(self):
+        self.phase: Phase = Phase.STARTING
+        self.in_flight: int = 0
+
+        self._drain_callbacks: List[Callable[[], None]] = []
+        self._shutdown_hooks: List[Callable[[], Awaitable]] = []
+
+    @property
+    def ready(self) -> bool:
+        """Whether the worker should receive new requests."""
+        return self.phase is Phase.READY
+
+    @property
+    def draining(self) -> bool:
+        """Whether the worker is stopping."""
+        return self.phase in (Phase.DRAINING, Phase.STOPPED)
+
+    def on_drain(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Registers a callback called when draining starts.
+
+        Used to end long-lived requests, e.g. event streams,
+        so they do not hold the worker until the deadline.
+
+        Parameters
+        ----------
+        callback : Callable[[], None]
+            Callback.
+
+        Returns
+        -------
+        callback : Callable[[], None]
+            The same callback, so the method can be used as a decorator.
+        """
+        self._drain_callbacks.append(callback)
+
+        return callback
+
+    def on_shutdown(self, hook: Callable[[], Awaitable]) -> Callable[[], Awaitable]:
+        """Registers a coroutine function called after the requests are drained.
+
+        Used to flush buffered writes and metrics while the database
+        is still available.
+
+        Parameters
+        ----------
+        hook : Callable[[], Awaitable]
+            Coroutine function.
+
+        Returns
+        -------
+        hook : Callable[[], Awaitable]
+            The same function, so the method can be used as a decorator.
+        """
+        self._shutdown_hooks.append(hook)
+
+        return hook
+
+    def set_ready(self):
+        """Marks the worker as ready after the warm-up."""
+        self.phase = Phase.READY
+
+    def start_draining(self):
+        """Stops reporting readiness and ends long-lived requests."""
+        if self.draining:
+            return
+
+        self.phase = Phase.DRAINING
+
+        for callback in self._drain_callbacks:
+            callback()
+
+    async def drain(self, timeout: float) -> bool:
+        """Waits for the requests in flight to finish.
+
+        Parameters
+        ----------
+        timeout : float
+            Deadline, in seconds.
+
+        Returns
+        -------
+        drained : bool
+            ``False`` if some requests were still running at the deadline.
+        """
+        self.start_draining()
+
+        deadline = asyncio.get_running_loop().time() + timeout
+
+        while self.in_flight and asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(DRAIN_POLL_SECONDS)
+
+        return not self.in_flight
+
+    async def shutdown(self):
+        """Runs the shutdown hooks.
+
+        A failing hook is reported and does not prevent the others from running.
+        """
+        for hook in self._shutdown_hooks:
+            try:
+                await hook()
+            except Exception:  # the remaining hooks must still run
+                logger.exception("Shutdown hook %s failed", hook.__qualname__)
+
+    def set_stopped(self):
+        """Marks the worker as stopped."""
+        self.phase = Phase.STOPPED
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        """Counts a request in flight for the duration of the block."""
+        self.in_flight += 1
+
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+
+
+class InFlightMiddleware:
+    """ASGI middleware counting the requests in flight.
+
+    While the worker is draining, every response carries ``Connection: close``,
+    so keep-alive clients reconnect to another worker.
+
+    Parameters
+    ----------
+    app : ASGIApp
+        Wrapped application.
+    lifecycle : Lifecycle
+        Worker state.
+    """
+
+    def __init__(self, app: ASGIApp, lifecycle: Lifecycle):
+        self.app: ASGIApp = app
+        self.lifecycle: Lifecycle = lifecycle
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start" and self.lifecycle.draining:
+                MutableHeaders(scope=message)["Connection"] = "close"
+
+            await send(message)
+
+        with self.lifecycle.track():
+            await self.app(scope, receive, send_wrapper)
+
+
+lifecycle = Lifecycle()
@@ -1,6 +1,25 @@
-from passlib.context import CryptContext
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+if TYPE_CHECKING:  # only processed by mypy
+    from passlib.context import CryptContext
+
+
+@lru_cache
+def get_pwd_context() -> "CryptContext":
+    """Returns the password hashing context.
+
+    passlib and its bcrypt backend are loaded on the first call,
+    not when the application is imported.
+
+    Returns
+    -------
+    pwd_context : CryptContext
+        Password hashing context.
+    """
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def hash_(
@@ -29,7 +48,7 @@ def hash_(
     hashed : str or bytes
         Password hashed according to the established scheme and settings.
     """
-    return pwd_context.hash(secret, scheme, category, **kwargs)
+    return get_pwd_context().hash(secret, scheme, category, **kwargs)
 
 
 def verify(
@@ -64,4 +83,4 @@ def verify(
     equality : bool
         ``True`` if the password hash matches the one passed, ``False`` otherwise.
     """
-    return pwd_context.verify(secret, hashed, scheme, category, **kwargs)
+    return get_pwd_context().verify(secret, hashed, scheme, category, **kwargs)
@@ -9,8 +9,22 @@ This package contains a description of the dependency on getting
 asynchronous session for executing SQL queries and record model
 entities in the database (see database.tables).
 
+The engine is created lazily (see database.engine), and ``initialize``,
+which pulls in the migrations machinery, is only imported when accessed,
+so importing the models stays cheap.
+
 .. _`here`:
      https://www.sqlalchemy.org
 """
 
-from .initialize import initialize
+
+def __getattr__(name: str):
+    if name == "initialize":
+        from .initialize import initialize
+
+        # replaces the submodule bound to the same name by the import
+        globals()[name] = initialize
+
+        return initialize
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,215 @@
+import asyncio
+import hashlib
+import json
+from itertools import islice
+from time import perf_counter
+from typing import Any, Dict, List
+
+from sqlalchemy import Table, func, inspect, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from characters_analyzer.core.config import Settings, get_settings
+from characters_analyzer.database.game_data import load_game_data
+from characters_analyzer.database.migrations import migrate, stamp
+from characters_analyzer.database.tables import entities, junctions  # noqa: F401
+from characters_analyzer.database.tables.base import Base
+from characters_analyzer.database.tables.entities import GameData
+
+# reference tables in the order of their foreign keys
+DATASETS = ("element", "region", "weapon", "character", "stat", "set")
+
+# keeps every statement well below the limit of 32767 bind parameters
+CHUNK_SIZE = 1000
+
+# any constant shared by the bootstrapping processes
+LOCK_KEY = 0x6769636861
+
+
+async def bootstrap(seed: bool = True):
+    """Brings the database up to date without losing any data.
+
+    Unlike ``database.initialize``, it asks nothing and drops nothing,
+    so it can run on every start of every container:
+
+    * missing tables are created from the models, the existing ones
+      are left as they are;
+    * if the database was empty, it is marked as migrated,
+      otherwise pending migrations are applied;
+    * the bundled game data is loaded into the reference tables.
+
+    Concurrent bootstraps are serialized with a session-level advisory lock,
+    taken outside of any transaction.
+
+    Parameters
+    ----------
+    seed : bool
+        Whether to load the game data.
+    """
+    settings: Settings = get_settings()
+
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+
+    started = perf_counter()
+
+    try:
+        # the lock belongs to the session, not to a transaction: an open transaction
+        # would hold its snapshot, which every index built concurrently waits for
+        async with engine.connect() as lock:
+            await lock.execution_options(isolation_level="AUTOCOMMIT")
+            await lock.execute(select(func.pg_advisory_lock(LOCK_KEY)))
+
+            async with engine.begin() as connection:
+                empty = await connection.run_sync(create_missing)
+
+                if empty:
+                    await connection.run_sync(stamp)
+
+            if not empty:
+                await asyncio.to_thread(migrate)
+
+            if seed:
+                async with engine.begin() as connection:
+                    loaded = await seed_game_data(connection)
+            else:
+                loaded = []
+
+            await lock.execute(select(func.pg_advisory_unlock(LOCK_KEY)))
+    finally:
+        await engine.dispose()
+
+    print(
+        f"\n\033[92mDatabase bootstrapped in {perf_counter() - started:.3f}s, "
+        f"game data loaded: {', '.join(loaded) or 'up to date'}.\033[0m\n"
+    )
+
+
+def create_missing(connection: Connection) -> bool:
+    """Creates the tables and indexes that do not exist yet.
+
+    Parameters
+    ----------
+    connection : Connection
+        Database connection.
+
+    Returns
+    -------
+    empty : bool
+        ``True`` if none of the tables existed before.
+    """
+    existing = set(inspect(connection).get_table_names())
+
+    Base.metadata.create_all(connection, checkfirst=True)
+
+    return existing.isdisjoint(Base.metadata.tables)
+
+
+async def seed_game_data(connection: AsyncConnection) -> List[str]:
+    """Loads the bundled game data into the reference tables.
+
+    Every dataset is hashed, and the ones whose hash matches the one recorded
+    in ``game_data`` are skipped without touching their tables. A changed dataset
+    is upserted with multi-row ``INSERT ... ON CONFLICT`` statements, which
+    leave the rows that have not changed as they are.
+
+    Rows are never deleted: they may be referenced by users' data.
+
+    Parameters
+    ----------
+    connection : AsyncConnection
+        Database connection with an open transaction.
+
+    Returns
+    -------
+    datasets : List[str]
+        Names of the datasets that have been loaded.
+    """
+    game_data = load_game_data()
+
+    result = await connection.execute(select(GameData.dataset, GameData.content_hash))
+    hashes: Dict[str, str] = dict(result.all())
+
+    loaded = []
+
+    for dataset in DATASETS:
+        content_hash = _content_hash(game_data[dataset])
+
+        if hashes.get(dataset) == content_hash:
+            continue
+
+        table: Table = Base.metadata.tables[dataset]
+        rows = (
+            {column.name: record[column.name] for column in table.columns}
+            for record in game_data[dataset]
+        )
+
+        while chunk := list(islice(rows, CHUNK_SIZE)):
+            await connection.execute(_upsert(table, chunk))
+
+        record = {
+            "dataset": dataset,
+            "version": game_data["version"],
+            "content_hash": content_hash,
+        }
+        statement = insert(GameData).values(record)
+        await connection.execute(
+            statement.on_conflict_do_update(
+                index_elements=[GameData.dataset],
+                set_={**record, "loaded_at": func.now()},
+            )
+        )
+
+        loaded.append(dataset)
+
+    return loaded
+
+
+def _upsert(table: Table, rows: List[Dict[str, Any]]):
+    """Builds a multi-row upsert that only rewrites the changed rows.
+
+    Parameters
+    ----------
+    table : Table
+        Reference table.
+    rows : List[Dict[str, Any]]
+        Rows to load.
+
+    Returns
+    -------
+    statement : Insert
+        ``INSERT ... ON CONFLICT DO UPDATE`` statement.
+    """
+    statement = insert(table).values(rows)
+    columns = [column for column in table.columns if not column.primary_key]
+
+    return statement.on_conflict_do_update(
+        index_elements=table.primary_key.columns,
+        set_={column.name: statement.excluded[column.name] for column in columns},
+        where=tuple_(*columns).is_distinct_from(
+            tuple_(*(statement.excluded[column.name] for column in columns))
+        ),
+    )
+
+
+def _content_hash(records: List[Dict[str, Any]]) -> str:
+    """SHA-256 of the dataset in canonical form.
+
+    Parameters
+    ----------
+    records : List[Dict[str, Any]]
+        Dataset records.
+
+    Returns
+    -------
+    content_hash : str
+        Hex digest.
+    """
+    content = json.dumps(records, ensure_ascii=False, sort_keys=True)
+
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+if __name__ == "__main__":
+    asyncio.run(bootstrap())
@@ -0,0 +1,88 @@
+import asyncio
+import logging
+from functools import lru_cache
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from characters_analyzer.core.config import Settings, get_settings
+from characters_analyzer.database.unit_of_work import UnitOfWorkSession
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache
+def get_engine() -> AsyncEngine:
+    """Returns the engine of the application database.
+
+    The engine, and with it the database driver, is created on the first call,
+    so importing the application does not open a connection pool.
+
+    Returns
+    -------
+    engine : AsyncEngine
+        Asynchronous engine.
+    """
+    settings: Settings = get_settings()
+
+    return create_async_engine(
+        url=settings.DATABASE_URL,
+        echo=False,
+        pool_pre_ping=True,
+    )
+
+
+@lru_cache
+def get_session_maker() -> async_sessionmaker:
+    """Returns the factory of the sessions bound to the application engine.
+
+    The sessions keep track of the changes staged in their transactions
+    (see ``database.unit_of_work``).
+
+    Returns
+    -------
+    session_maker : async_sessionmaker
+        Asynchronous session factory.
+    """
+    return async_sessionmaker(
+        bind=get_engine(),
+        class_=AsyncSession,
+        sync_session_class=UnitOfWorkSession,
+        expire_on_commit=False,
+    )
+
+
+async def dispose_engine():
+    """Closes the connections of the engine, if it has been created.
+
+    The next ``get_engine()`` call creates a new engine.
+    """
+    if get_engine.cache_info().currsize:
+        await get_engine().dispose()
+
+    get_session_maker.cache_clear()
+    get_engine.cache_clear()
+
+
+async def warm_up():
+    """Opens the connections of the pool in advance.
+
+    The first requests of a worker then do not wait for connecting to the database.
+    A failure is only reported: the connections will be opened on demand.
+    """
+    engine = get_engine()
+
+    async def ping():
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    try:
+        await asyncio.gather(*(ping() for _ in range(engine.pool.size())))
+    except (OSError, DBAPIError):
+        logger.exception("Database connection pool warm-up failed")
@@ -0,0 +1,25 @@
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict
+
+GAME_DATA_PATH = Path(__file__).parent / "data" / "game_data.json"
+
+
+@lru_cache
+def load_game_data() -> Dict[str, Any]:
+    """Reads the bundled game data.
+
+    Besides the columns of the reference tables, the records contain keys
+    used to match them with external data, e.g. ``good_key``, and the data
+    of the engine, e.g. the ``base`` stats and the ``ascension`` bonuses
+    of the characters.
+
+    Returns
+    -------
+    game_data : Dict[str, Any]
+        ``version`` of the data, a list of records for every dataset
+        and the ``growth`` curves of the stats.
+    """
+    with open(GAME_DATA_PATH, encoding="utf-8") as file:
+        return json.load(file)
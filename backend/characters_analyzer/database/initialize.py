@@ -6,17 +6,21 @@ from sqlalchemy.ext.asyncio import (
 )
 
 from characters_analyzer.core.config import Settings, get_settings
+from characters_analyzer.database.migrations import stamp
 from characters_analyzer.database.tables.base import Base
 
 
 async def initialize():
     """Initializing a database.
 
-    Drops all tables, then recreates all the ones.
+    Drops all tables, then recreates all the ones and marks
+    the schema as up-to-date with the latest migration.
     This will delete all the info from existing tables, so
     this is a very unsafe operation.
 
     That's why this function requires confirmation of superuser.
+    To create the missing tables and load the game data without
+    losing anything, use ``database.bootstrap`` instead.
     """
     settings: Settings = get_settings()
 
@@ -43,6 +47,7 @@ async def initialize():
 
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(stamp)
     except ConnectionDoesNotExistError:
         print(
             error.format(
@@ -0,0 +1,70 @@
+"""Database Genshin Impact Characters Analyzer Migrations
+
+Versioned schema migrations managed by `Alembic`_.
+
+Unlike ``database.initialize``, migrations never drop data and are safe to run
+against a live database: each revision is applied in its own transaction,
+statements give up quickly instead of queueing behind long-running
+transactions (``lock_timeout``), indexes are built concurrently,
+without locking writes, and existing rows are backfilled in batches,
+each committed on its own (see ``migrations.operations``).
+
+Migrations are applied by ``database.bootstrap`` when the server starts
+and may also be managed with the ``alembic`` command line tool
+(see ``alembic.ini``). The bootstrap creates missing tables from
+the models before migrating, so every migration must tolerate
+the objects it adds being already there
+(see ``migrations.operations``).
+
+.. _`Alembic`:
+     https://alembic.sqlalchemy.org
+"""
+
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy.engine import Connection
+
+
+def get_config() -> Config:
+    """Builds the Alembic configuration of the application.
+
+    Returns
+    -------
+    config : Config
+        Alembic configuration pointing at this package.
+    """
+    config = Config()
+    config.set_main_option("script_location", str(Path(__file__).parent))
+
+    return config
+
+
+def migrate(revision: str = "head"):
+    """Upgrades the database schema.
+
+    Parameters
+    ----------
+    revision : str
+        Target revision, the latest one by default.
+    """
+    command.upgrade(get_config(), revision)
+
+
+def stamp(connection: Connection, revision: str = "head"):
+    """Marks the database as migrated without running the migrations.
+
+    Used after the schema has been created from the models directly.
+
+    Parameters
+    ----------
+    connection : Connection
+        Connection the schema has been created with.
+    revision : str
+        Revision to mark, the latest one by default.
+    """
+    config = get_config()
+    config.attributes["connection"] = connection
+
+    command.stamp(config, revision)
@@ -0,0 +1,67 @@
+import asyncio
+
+from alembic import context
+from sqlalchemy import pool
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from characters_analyzer.core.config import get_settings
+from characters_analyzer.database.tables import entities, junctions  # noqa: F401
+from characters_analyzer.database.tables.base import Base
+
+LOCK_TIMEOUT = "5s"
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline():
+    """Renders the migrations as an SQL script without connecting to the database."""
+    context.configure(
+        url=get_settings().DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        transaction_per_migration=True,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection: Connection):
+    """Applies the migrations using the given connection.
+
+    Parameters
+    ----------
+    connection : Connection
+        Database connection.
+    """
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        transaction_per_migration=True,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_migrations_online():
+    """Applies the migrations to the database of the application."""
+    engine = create_async_engine(
+        url=get_settings().DATABASE_URL,
+        poolclass=pool.NullPool,
+        connect_args={"server_settings": {"lock_timeout": LOCK_TIMEOUT}},
+    )
+
+    async with engine.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+elif (connection := context.config.attributes.get("connection")) is not None:
+    do_run_migrations(connection)
+else:
+    asyncio.run(run_migrations_online())
@@ -0,0 +1,186 @@
+from typing import AnyStr, List
+
+from alembic import context, op
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import Column, SchemaItem
+
+# rows updated by a statement of a backfill, each batch in its own transaction
+BATCH_SIZE = 10000
+
+
+def create_index_concurrently(
+    name: AnyStr, table_name: AnyStr, columns: List[AnyStr], **kwargs
+):
+    """Builds an index without blocking writes to the table.
+
+    The index is created with ``CREATE INDEX CONCURRENTLY IF NOT EXISTS``
+    outside the migration transaction. If a previous attempt has been
+    interrupted, it leaves an invalid index behind, which is dropped
+    and rebuilt.
+
+    Parameters
+    ----------
+    name : AnyStr
+        Index name.
+    table_name : AnyStr
+        Indexed table.
+    columns : List[AnyStr]
+        Indexed columns.
+    **kwargs
+        Additional ``op.create_index`` arguments, e.g. ``postgresql_include``.
+    """
+    with op.get_context().autocommit_block():
+        if not context.is_offline_mode() and _is_invalid_index(name):
+            op.drop_index(name, table_name=table_name, postgresql_concurrently=True)
+
+        op.create_index(
+            name,
+            table_name,
+            columns,
+            if_not_exists=True,
+            postgresql_concurrently=True,
+            **kwargs,
+        )
+
+
+def drop_index_concurrently(name: AnyStr, table_name: AnyStr):
+    """Drops an index without blocking access to the table.
+
+    Parameters
+    ----------
+    name : AnyStr
+        Index name.
+    table_name : AnyStr
+        Indexed table.
+    """
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            name, table_name=table_name, if_exists=True, postgresql_concurrently=True
+        )
+
+
+def create_table_if_missing(table_name: AnyStr, *columns: SchemaItem, **kwargs):
+    """Creates a table unless it already exists.
+
+    A new table may have already been created from the models
+    by ``database.bootstrap``, so the migration adding it must not fail.
+
+    Parameters
+    ----------
+    table_name : AnyStr
+        Table name.
+    *columns : SchemaItem
+        Columns and constraints of the table.
+    **kwargs
+        Additional ``op.create_table`` arguments, e.g. ``comment``.
+    """
+    if not context.is_offline_mode() and inspect(op.get_bind()).has_table(table_name):
+        return
+
+    op.create_table(table_name, *columns, **kwargs)
+
+
+def add_column_if_missing(table_name: AnyStr, column: Column):
+    """Adds a column to a table unless it already has one with the same name.
+
+    A table created from the models by ``database.bootstrap``
+    already has the new column, so the migration adding it must not fail.
+
+    Parameters
+    ----------
+    table_name : AnyStr
+        Table name.
+    column : Column
+        Column to add.
+    """
+    if not context.is_offline_mode() and column.name in {
+        existing["name"] for existing in inspect(op.get_bind()).get_columns(table_name)
+    }:
+        return
+
+    op.add_column(table_name, column)
+
+
+def update_in_batches(
+    table_name: AnyStr, statement: AnyStr, batch_size: int = BATCH_SIZE
+):
+    """Backfills a table in batches of rows, each committed on its own.
+
+    The transaction of the migration is committed first, so the locks it holds,
+    e.g. the ``ACCESS EXCLUSIVE`` lock of ``ADD COLUMN``, are released before
+    the backfill starts. The rows are then updated in batches of consecutive
+    ``id``s outside of any transaction, so every batch locks only its own rows
+    and only while it is updated.
+
+    An interrupted backfill is resumed by the next run of the migration,
+    so the statement must skip the rows it has already updated.
+
+    Parameters
+    ----------
+    table_name : AnyStr
+        Backfilled table, with an ``id`` primary key.
+    statement : AnyStr
+        ``UPDATE`` statement; ``{batch}`` in it is replaced with
+        the condition selecting the rows of the batch.
+    batch_size : int
+        The number of rows in a batch.
+    """
+    if context.is_offline_mode():
+        op.execute(statement.format(batch="TRUE"))
+        return
+
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        parameters = {"limit": batch_size}
+
+        while True:
+            after = "WHERE id > :after " if "after" in parameters else ""
+            last = connection.scalar(
+                text(
+                    f"SELECT id FROM (SELECT id FROM {table_name} {after}"
+                    "ORDER BY id LIMIT :limit) AS batch ORDER BY id DESC LIMIT 1"
+                ),
+                parameters,
+            )
+
+            if last is None:
+                break
+
+            batch = f"{table_name}.id <= :last"
+
+            if after:
+                batch = f"{table_name}.id > :after AND {batch}"
+
+            connection.execute(
+                text(statement.format(batch=batch)),
+                {key: value for key, value in parameters.items() if key != "limit"}
+                | {"last": last},
+            )
+
+            parameters["after"] = last
+
+
+def _is_invalid_index(name: AnyStr) -> bool:
+    """Checks whether the index exists, but its build has not been completed.
+
+    Parameters
+    ----------
+    name : AnyStr
+        Index name.
+
+    Returns
+    -------
+    invalid : bool
+        ``True`` if the index is invalid, ``False`` otherwise.
+    """
+    return bool(
+        op.get_bind().scalar(
+            text(
+                "SELECT NOT index.indisvalid "
+                "FROM pg_index AS index "
+                "JOIN pg_class AS class ON class.oid = index.indexrelid "
+                "WHERE class.relname = :name AND pg_table_is_visible(class.oid)"
+            ),
+            {"name": name},
+        )
+    )
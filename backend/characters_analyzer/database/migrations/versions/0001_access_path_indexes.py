@@ -0,0 +1,63 @@
+"""Indexes for the hot access paths
+
+Adds the indexes behind the per-user inventory and roster queries and
+behind the foreign keys, so cascaded updates and deletes no longer scan
+the referencing tables.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from characters_analyzer.database.migrations.operations import (
+    create_index_concurrently,
+    drop_index_concurrently,
+)
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    # user's inventory; set and main stat are included for index-only counts
+    (
+        "artifact_user_id_idx",
+        "artifact",
+        ["user_id"],
+        {"postgresql_include": ["set_id", "main_stat_id"]},
+    ),
+    # artifacts equipped by a character and ``ON DELETE SET NULL`` of user_character
+    (
+        "artifact_user_character_id_idx",
+        "artifact",
+        ["user_character_id"],
+        {"postgresql_where": sa.text("user_character_id IS NOT NULL")},
+    ),
+    ("artifact_set_id_idx", "artifact", ["set_id"], {}),
+    ("artifact_main_stat_id_idx", "artifact", ["main_stat_id"], {}),
+    # sub-stat filters, e.g. "crit rate >= 7", and cascades from stat
+    (
+        "artifact_sub_stat_sub_stat_id_idx",
+        "artifact_sub_stat",
+        ["sub_stat_id", "sub_stat_value"],
+        {},
+    ),
+    # cascades from character and per-character analytics
+    ("user_character_character_id_idx", "user_character", ["character_id"], {}),
+)
+
+
+def upgrade() -> None:
+    for name, table_name, columns, kwargs in INDEXES:
+        create_index_concurrently(name, table_name, columns, **kwargs)
+
+
+def downgrade() -> None:
+    for name, table_name, _, _ in reversed(INDEXES):
+        drop_index_concurrently(name, table_name)
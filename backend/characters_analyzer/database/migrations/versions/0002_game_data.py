@@ -0,0 +1,53 @@
+"""Versions of the loaded game data
+
+Adds the table where ``database.bootstrap`` records which version
+of the bundled game data has been loaded into each reference table.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from characters_analyzer.database.migrations.operations import create_table_if_missing
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    create_table_if_missing(
+        "game_data",
+        sa.Column(
+            "dataset",
+            sa.String(64),
+            nullable=False,
+            comment="Name of the reference table the data is loaded into.",
+        ),
+        sa.Column("version", sa.String(32), nullable=False),
+        sa.Column(
+            "content_hash",
+            sa.String(64),
+            nullable=False,
+            comment="SHA-256 of the loaded rows.",
+        ),
+        sa.Column(
+            "loaded_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("dataset", name="game_data_pkey"),
+        comment="Versions of the game data loaded into the reference tables.",
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("game_data")
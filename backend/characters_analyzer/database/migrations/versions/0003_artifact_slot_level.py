@@ -0,0 +1,42 @@
+"""Slot, level and rarity of the artifacts
+
+Needed to tell which pieces can replace each other and how many
+upgrades an artifact has left. The slot of the existing artifacts
+is unknown, so it stays empty; their level and rarity default to a new
+five-star piece.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from characters_analyzer.database.migrations.operations import add_column_if_missing
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    add_column_if_missing("artifact", sa.Column("slot", sa.String(16), nullable=True))
+    add_column_if_missing(
+        "artifact",
+        sa.Column("level", sa.Integer(), server_default=sa.text("0"), nullable=False),
+    )
+    add_column_if_missing(
+        "artifact",
+        sa.Column("rarity", sa.Integer(), server_default=sa.text("5"), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("artifact", "rarity")
+    op.drop_column("artifact", "level")
+    op.drop_column("artifact", "slot")
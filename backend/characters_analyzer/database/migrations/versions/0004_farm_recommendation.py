@@ -0,0 +1,70 @@
+"""Artifact farming recommendations
+
+Adds the table where the background job of ``api.services.farm_service``
+stores the sets worth farming for every user, so they are read instantly.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from characters_analyzer.database.migrations.operations import create_table_if_missing
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    create_table_if_missing(
+        "farm_recommendation",
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("set_id", sa.Uuid(), nullable=False),
+        sa.Column("domain", sa.String(64), nullable=False),
+        sa.Column(
+            "gain",
+            sa.Float(),
+            nullable=False,
+            comment="Expected score gained by the roster with one drop.",
+        ),
+        sa.Column(
+            "user_character_id",
+            sa.Uuid(),
+            nullable=True,
+            comment="User's character gaining the most, as of the computation.",
+        ),
+        sa.Column(
+            "computed_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("user_id", "set_id", name="farm_recommendation_pkey"),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["user.id"],
+            name="farm_recommendation_user_id_fk",
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["set_id"],
+            ["set.id"],
+            name="farm_recommendation_set_id_fk",
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        comment="Artifact sets worth farming for the users, "
+        "recomputed in the background after their inventory changes.",
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("farm_recommendation")
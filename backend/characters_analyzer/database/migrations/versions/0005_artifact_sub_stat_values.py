@@ -0,0 +1,87 @@
+"""Denormalized sub stats of the artifacts
+
+Adds a copy of the sub stats of every artifact to its record: an array
+with the value of every sub stat in the canonical order of
+``engine.artifacts.get_sub_stat_ids``, zero for an absent one. Scans of
+an inventory then read one row per artifact instead of joining and
+pivoting up to four rows of ``artifact_sub_stat``.
+
+The copy of the existing artifacts is filled in from the sub stats table,
+in batches committed one by one, after the column has been added.
+The order of the sub stats is frozen in the revision, so the result
+doesn't depend on the game data of the application being migrated.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+from characters_analyzer.database.migrations.operations import (
+    add_column_if_missing,
+    update_in_batches,
+)
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# the canonical order of the sub stats as of this revision,
+# the order of engine.artifacts.get_sub_stat_ids
+SUB_STAT_IDS = (
+    "59d464f7-d9b8-5866-a1e2-fe6f144dfc54",  # hp
+    "87d27004-3558-5eae-ba6c-b2c6092aeccd",  # atk
+    "2f153b7a-6c91-5c56-b2d9-c00438841859",  # def
+    "59e608ca-bae0-5bb8-97ef-df18b2a45337",  # hp_percent
+    "ddf275f1-8df5-53c6-ba7e-5d3f227396e8",  # atk_percent
+    "c80d9208-4d79-5843-97d7-e5edfea3a162",  # def_percent
+    "4dba3502-452c-52a3-ba78-d99991f2ff31",  # energy_recharge
+    "7a57e421-a38d-52a7-8d9b-997cf55f7722",  # elemental_mastery
+    "317ec1bd-cc27-5cd6-8aef-d3aa6f6c99f7",  # crit_rate
+    "f33a646a-2d56-59b6-a94c-d7593f3e2de8",  # crit_dmg
+)
+
+
+def upgrade() -> None:
+    add_column_if_missing(
+        "artifact",
+        sa.Column(
+            "sub_stat_values",
+            postgresql.ARRAY(sa.Float()),
+            nullable=True,
+            comment="Copy of the sub stats in the order of "
+            "engine.artifacts.get_sub_stat_ids, zero for an absent one.",
+        ),
+    )
+
+    canonical = ", ".join(
+        f"('{id_}'::uuid, {position})" for position, id_ in enumerate(SUB_STAT_IDS)
+    )
+
+    update_in_batches(
+        "artifact",
+        "UPDATE artifact SET sub_stat_values = packed.sub_stat_values "
+        "FROM ("
+        "SELECT artifact.id, array_agg("
+        "coalesce(artifact_sub_stat.sub_stat_value, 0) ORDER BY canonical.position"
+        ") AS sub_stat_values "
+        f"FROM artifact CROSS JOIN (VALUES {canonical}) AS canonical(stat_id, position) "
+        "LEFT JOIN artifact_sub_stat "
+        "ON artifact_sub_stat.artifact_id = artifact.id "
+        "AND artifact_sub_stat.sub_stat_id = canonical.stat_id "
+        "WHERE artifact.sub_stat_values IS NULL AND {batch} "
+        "GROUP BY artifact.id"
+        ") AS packed "
+        "WHERE artifact.id = packed.id",
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("artifact", "sub_stat_values")
@@ -0,0 +1,96 @@
+"""Persisted artifact scores
+
+Adds the scoring formula of the user's characters and the table of
+the scores of the artifacts by these formulas, so an inventory sorted
+by the score for a character is read with an index range scan.
+
+The scores are computed by ``api.services.score_service`` on every change
+of an artifact or of a formula; the existing ones are computed on the first
+request of the character's best artifacts (see revision 0010 for the mark
+of the scored characters).
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from characters_analyzer.database.migrations.operations import (
+    add_column_if_missing,
+    create_index_concurrently,
+    create_table_if_missing,
+)
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    (
+        "artifact_score_user_character_id_score_idx",
+        ["user_character_id", sa.text("score DESC")],
+    ),
+    (
+        "artifact_score_user_character_id_slot_score_idx",
+        ["user_character_id", "slot", sa.text("score DESC")],
+    ),
+    ("artifact_score_artifact_id_idx", ["artifact_id"]),
+)
+
+
+def upgrade() -> None:
+    add_column_if_missing(
+        "user_character",
+        sa.Column(
+            "score_formula",
+            sa.String(1024),
+            nullable=True,
+            comment="Scoring formula of the artifacts, the default one if empty.",
+        ),
+    )
+
+    create_table_if_missing(
+        "artifact_score",
+        sa.Column("user_character_id", sa.Uuid(), nullable=False),
+        sa.Column("artifact_id", sa.Uuid(), nullable=False),
+        sa.Column(
+            "slot",
+            sa.String(16),
+            nullable=True,
+            comment="Copy of the slot of the artifact.",
+        ),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "user_character_id", "artifact_id", name="artifact_score_pkey"
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_character_id"],
+            ["user_character.id"],
+            name="artifact_score_user_character_id_fk",
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["artifact_id"],
+            ["artifact.id"],
+            name="artifact_score_artifact_id_fk",
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        comment="Scores of the artifacts by the formulas of the characters "
+        "of their owners, recomputed on every change of either.",
+    )
+
+    for name, columns in INDEXES:
+        create_index_concurrently(name, "artifact_score", columns)
+
+
+def downgrade() -> None:
+    op.drop_table("artifact_score")
+    op.drop_column("user_character", "score_formula")
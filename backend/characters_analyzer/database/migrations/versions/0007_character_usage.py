@@ -0,0 +1,112 @@
+"""Global usage counters
+
+Adds the tables counting how many users own every character at every
+constellation and talent level and how many artifacts of every set
+the characters wear. The counters are updated by ``api.services.usage_service``
+in the transactions changing the users' characters and artifacts,
+so the global statistics never scan the junction tables.
+
+The counters are filled in from the existing records.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from characters_analyzer.database.migrations.operations import create_table_if_missing
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, Sequence[str], None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+METRICS = ("constellations", "attack_level", "skill_level", "burst_level")
+
+
+def upgrade() -> None:
+    create_table_if_missing(
+        "character_usage",
+        sa.Column("character_id", sa.Uuid(), nullable=False),
+        sa.Column(
+            "metric",
+            sa.String(32),
+            nullable=False,
+            comment="constellations, attack_level, skill_level or burst_level.",
+        ),
+        sa.Column("value", sa.Integer(), nullable=False),
+        sa.Column(
+            "count", sa.BigInteger(), server_default=sa.text("0"), nullable=False
+        ),
+        sa.PrimaryKeyConstraint(
+            "character_id", "metric", "value", name="character_usage_pkey"
+        ),
+        sa.ForeignKeyConstraint(
+            ["character_id"],
+            ["character.id"],
+            name="character_usage_character_id_fk",
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        comment="How many users own the characters at every constellation "
+        "and talent level, counted as the users' characters change.",
+    )
+
+    create_table_if_missing(
+        "character_set_usage",
+        sa.Column("character_id", sa.Uuid(), nullable=False),
+        sa.Column("set_id", sa.Uuid(), nullable=False),
+        sa.Column(
+            "count", sa.BigInteger(), server_default=sa.text("0"), nullable=False
+        ),
+        sa.PrimaryKeyConstraint(
+            "character_id", "set_id", name="character_set_usage_pkey"
+        ),
+        sa.ForeignKeyConstraint(
+            ["character_id"],
+            ["character.id"],
+            name="character_set_usage_character_id_fk",
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["set_id"],
+            ["set.id"],
+            name="character_set_usage_set_id_fk",
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        comment="How many artifacts of every set the users' characters wear, "
+        "counted as the artifacts are equipped and the characters deleted.",
+    )
+
+    # the tables may have been created empty from the models
+    metrics = ", ".join(f"('{metric}', user_character.{metric})" for metric in METRICS)
+
+    op.execute("DELETE FROM character_usage")
+    op.execute(
+        "INSERT INTO character_usage (character_id, metric, value, count) "
+        "SELECT user_character.character_id, metrics.metric, metrics.value, count(*) "
+        f"FROM user_character CROSS JOIN LATERAL (VALUES {metrics}) "
+        "AS metrics(metric, value) "
+        "GROUP BY user_character.character_id, metrics.metric, metrics.value"
+    )
+
+    op.execute("DELETE FROM character_set_usage")
+    op.execute(
+        "INSERT INTO character_set_usage (character_id, set_id, count) "
+        "SELECT user_character.character_id, artifact.set_id, count(*) "
+        "FROM artifact JOIN user_character "
+        "ON user_character.id = artifact.user_character_id "
+        "GROUP BY user_character.character_id, artifact.set_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("character_set_usage")
+    op.drop_table("character_usage")
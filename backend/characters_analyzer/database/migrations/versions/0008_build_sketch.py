@@ -0,0 +1,62 @@
+"""Build metrics sketches
+
+Adds the table of the sketches of the distributions of the metrics
+of the builds (e.g. the crit value of the equipped artifacts) of every
+character across all users, so a build is ranked without sorting
+all the others.
+
+The sketches are built on the first ranking of a character and then
+merged with the changes seen by the workers, see ``api.services.sketch_service``.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+from characters_analyzer.database.migrations.operations import create_table_if_missing
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, Sequence[str], None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    create_table_if_missing(
+        "build_sketch",
+        sa.Column("character_id", sa.Uuid(), nullable=False),
+        sa.Column("metric", sa.String(32), nullable=False),
+        sa.Column(
+            "sketch",
+            postgresql.JSONB(),
+            nullable=False,
+            comment="See engine.sketch.Distribution.to_dict.",
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("character_id", "metric", name="build_sketch_pkey"),
+        sa.ForeignKeyConstraint(
+            ["character_id"],
+            ["character.id"],
+            name="build_sketch_character_id_fk",
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        comment="Sketches of the distributions of the metrics of the builds "
+        "of the characters across all users, merged from the workers' changes.",
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("build_sketch")
@@ -0,0 +1,108 @@
+"""Fingerprints of the artifacts
+
+Adds the fingerprint of the content of every artifact (a SHA-256 over its set,
+slot, rarity, level and stats, see ``engine.artifacts.fingerprint_artifact``)
+with a unique index per user, so an import skips the artifacts the user
+already has in a single ``ON CONFLICT`` pass.
+
+The fingerprints of the existing artifacts are computed in batches, once
+the new column is committed, and every batch is committed on its own (see
+``migrations.operations.update_in_batches``), so the table isn't locked
+for the whole backfill.
+Of the artifacts of a user with the same content, only the first one
+gets a fingerprint; the copies are kept, without one.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from characters_analyzer.database.migrations.operations import (
+    add_column_if_missing,
+    create_index_concurrently,
+    drop_index_concurrently,
+)
+from characters_analyzer.engine.artifacts import fingerprint_artifact
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, Sequence[str], None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 10000
+
+
+def upgrade() -> None:
+    add_column_if_missing(
+        "artifact",
+        sa.Column(
+            "fingerprint",
+            sa.String(64),
+            nullable=True,
+            comment="SHA-256 of the content, see engine.artifacts.fingerprint_artifact; "
+            "unique per user.",
+        ),
+    )
+
+    # the ADD COLUMN is committed first, then every batch is committed on its own
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        last = None
+        seen = set()
+
+        while True:
+            rows = connection.execute(
+                sa.text(
+                    "SELECT id, user_id, set_id, slot, rarity, level, main_stat_id, "
+                    "main_stat_value, sub_stat_values, fingerprint FROM artifact "
+                    + ("WHERE (user_id, id) > (:user_id, :id) " if last else "")
+                    + "ORDER BY user_id, id LIMIT :limit"
+                ),
+                {"limit": BATCH_SIZE, **(last or {})},
+            ).all()
+
+            if not rows:
+                break
+
+            fingerprints = []
+
+            for row in rows:
+                if last is None or row.user_id != last["user_id"]:
+                    seen.clear()
+
+                last = {"user_id": row.user_id, "id": row.id}
+
+                if row.fingerprint is not None:
+                    seen.add(row.fingerprint)
+                elif row.sub_stat_values is not None:
+                    fingerprint = fingerprint_artifact(row._mapping)
+
+                    if fingerprint not in seen:
+                        seen.add(fingerprint)
+                        fingerprints.append({"id": row.id, "fingerprint": fingerprint})
+
+            if fingerprints:
+                connection.execute(
+                    sa.text(
+                        "UPDATE artifact SET fingerprint = :fingerprint WHERE id = :id"
+                    ),
+                    fingerprints,
+                )
+
+    create_index_concurrently(
+        "artifact_fingerprint_user_id_idx",
+        "artifact",
+        ["fingerprint", "user_id"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    drop_index_concurrently("artifact_fingerprint_user_id_idx", "artifact")
+    op.drop_column("artifact", "fingerprint")
@@ -0,0 +1,45 @@
+"""Scored characters
+
+Adds the mark of the user's characters all the artifacts have been scored for.
+Before, the best artifacts of a character were scored on the first request
+only if none had a score yet, so an artifact added before that request got
+the only score of the character and the older ones were never scored.
+
+Every existing character is unmarked and scored on the first request
+of its best artifacts, see ``api.v1.endpoints.artifacts.get_top_artifacts``.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from characters_analyzer.database.migrations.operations import add_column_if_missing
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, Sequence[str], None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # a constant default doesn't rewrite the table
+    add_column_if_missing(
+        "user_character",
+        sa.Column(
+            "artifacts_scored",
+            sa.Boolean(),
+            server_default=sa.false(),
+            nullable=False,
+            comment="Whether all the artifacts of the user have been scored for it.",
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("user_character", "artifacts_scored")
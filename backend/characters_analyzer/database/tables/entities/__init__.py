@@ -6,5 +6,9 @@ It describes the tables of the database used and the interfaces for interacting
 """
 
 from .artifact import Artifact, Set, Stat
+from .build_sketch import BuildSketch
 from .character import Character, Element, Region, Weapon
+from .farm_recommendation import FarmRecommendation
+from .game_data import GameData
+from .usage import CharacterSetUsage, CharacterUsage
 from .user import User
@@ -1,13 +1,14 @@
 from uuid import UUID
 from typing import List, TYPE_CHECKING
 
-from sqlalchemy import ForeignKeyConstraint, PrimaryKeyConstraint, func
+from sqlalchemy import ForeignKeyConstraint, Index, PrimaryKeyConstraint, func, text
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import (
     Mapped,
     mapped_column,
     relationship,
 )
-from sqlalchemy.types import Float, String, Text, Uuid
+from sqlalchemy.types import Float, Integer, String, Text, Uuid
 
 from characters_analyzer.database.tables.base import Base
 
@@ -52,6 +53,21 @@ class Artifact(Base):
             onupdate="CASCADE",
             ondelete="SET NULL",
         ),
+        Index(
+            "artifact_user_id_idx",
+            "user_id",
+            postgresql_include=["set_id", "main_stat_id"],
+        ),
+        Index(
+            "artifact_user_character_id_idx",
+            "user_character_id",
+            postgresql_where=text("user_character_id IS NOT NULL"),
+        ),
+        Index(
+            "artifact_fingerprint_user_id_idx", "fingerprint", "user_id", unique=True
+        ),
+        Index("artifact_set_id_idx", "set_id"),
+        Index("artifact_main_stat_id_idx", "main_stat_id"),
         {
             "comment": "Table for Genshin Impact artifacts.",
         },
@@ -61,6 +77,21 @@ class Artifact(Base):
     set_id: Mapped[UUID] = mapped_column(Uuid())
     main_stat_id: Mapped[UUID] = mapped_column(Uuid())
     main_stat_value: Mapped[float] = mapped_column(Float())
+    slot: Mapped[str] = mapped_column(String(16), nullable=True)
+    level: Mapped[int] = mapped_column(Integer(), server_default=text("0"))
+    rarity: Mapped[int] = mapped_column(Integer(), server_default=text("5"))
+    sub_stat_values: Mapped[List[float]] = mapped_column(
+        ARRAY(Float()),
+        nullable=True,
+        comment="Copy of the sub stats in the order of engine.artifacts.get_sub_stat_ids, "
+        "zero for an absent one.",
+    )
+    fingerprint: Mapped[str] = mapped_column(
+        String(64),
+        nullable=True,
+        comment="SHA-256 of the content, see engine.artifacts.fingerprint_artifact; "
+        "unique per user.",
+    )
     user_id: Mapped[UUID] = mapped_column(Uuid())
     user_character_id: Mapped[UUID] = mapped_column(Uuid(), nullable=True)
 
@@ -68,7 +99,7 @@ class Artifact(Base):
     main_stat: Mapped["Stat"] = relationship(
         "Stat", back_populates="main_stat_artifacts"
     )
-    stats: Mapped["ArtifactSubStat"] = relationship(
+    stats: Mapped[List["ArtifactSubStat"]] = relationship(
         "ArtifactSubStat", back_populates="artifact"
     )
     user: Mapped["User"] = relationship("User", back_populates="artifacts")
@@ -82,7 +113,10 @@ class Artifact(Base):
             f"id={self.id!r}, "
             f"set_id={self.set_id!r}, "
             f"main_stat_id={self.main_stat_id!r}, "
-            f"main_stat_value={self.main_stat_value!r}"
+            f"main_stat_value={self.main_stat_value!r}, "
+            f"slot={self.slot!r}, "
+            f"level={self.level!r}, "
+            f"rarity={self.rarity!r}"
             f")>"
         )
 
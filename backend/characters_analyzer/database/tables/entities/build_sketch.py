@@ -0,0 +1,47 @@
+from datetime import datetime
+from typing import Any, Dict
+from uuid import UUID
+
+from sqlalchemy import ForeignKeyConstraint, PrimaryKeyConstraint, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.types import DateTime, String, Uuid
+
+from characters_analyzer.database.tables.base import Base
+
+
+class BuildSketch(Base):
+    __tablename__ = "build_sketch"
+
+    __table_args__ = (
+        PrimaryKeyConstraint("character_id", "metric", name="build_sketch_pkey"),
+        ForeignKeyConstraint(
+            ["character_id"],
+            ["character.id"],
+            name="build_sketch_character_id_fk",
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        {
+            "comment": "Sketches of the distributions of the metrics of the builds "
+            "of the characters across all users, merged from the workers' changes.",
+        },
+    )
+
+    character_id: Mapped[UUID] = mapped_column(Uuid())
+    metric: Mapped[str] = mapped_column(String(32))
+    sketch: Mapped[Dict[str, Any]] = mapped_column(
+        JSONB(), comment="See engine.sketch.Distribution.to_dict."
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__}("
+            f"character_id={self.character_id!r}, "
+            f"metric={self.metric!r}, "
+            f"updated_at={self.updated_at!r}"
+            f")>"
+        )
@@ -0,0 +1,59 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import ForeignKeyConstraint, PrimaryKeyConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.types import DateTime, Float, String, Uuid
+
+from characters_analyzer.database.tables.base import Base
+
+
+class FarmRecommendation(Base):
+    __tablename__ = "farm_recommendation"
+
+    __table_args__ = (
+        PrimaryKeyConstraint("user_id", "set_id", name="farm_recommendation_pkey"),
+        ForeignKeyConstraint(
+            ["user_id"],
+            ["user.id"],
+            name="farm_recommendation_user_id_fk",
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        ForeignKeyConstraint(
+            ["set_id"],
+            ["set.id"],
+            name="farm_recommendation_set_id_fk",
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        {
+            "comment": "Artifact sets worth farming for the users, "
+            "recomputed in the background after their inventory changes.",
+        },
+    )
+
+    user_id: Mapped[UUID] = mapped_column(Uuid())
+    set_id: Mapped[UUID] = mapped_column(Uuid())
+    domain: Mapped[str] = mapped_column(String(64))
+    gain: Mapped[float] = mapped_column(
+        Float(), comment="Expected score gained by the roster with one drop."
+    )
+    user_character_id: Mapped[UUID] = mapped_column(
+        Uuid(),
+        nullable=True,
+        comment="User's character gaining the most, as of the computation.",
+    )
+    computed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__}("
+            f"user_id={self.user_id!r}, "
+            f"set_id={self.set_id!r}, "
+            f"domain={self.domain!r}, "
+            f"gain={self.gain!r}"
+            f")>"
+        )
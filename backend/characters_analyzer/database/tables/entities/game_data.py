@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from sqlalchemy import PrimaryKeyConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.types import DateTime, String
+
+from characters_analyzer.database.tables.base import Base
+
+
+class GameData(Base):
+    __tablename__ = "game_data"
+
+    __table_args__ = (
+        PrimaryKeyConstraint("dataset", name="game_data_pkey"),
+        {
+            "comment": "Versions of the game data loaded into the reference tables.",
+        },
+    )
+
+    dataset: Mapped[str] = mapped_column(
+        String(64), comment="Name of the reference table the data is loaded into."
+    )
+    version: Mapped[str] = mapped_column(String(32))
+    content_hash: Mapped[str] = mapped_column(
+        String(64), comment="SHA-256 of the loaded rows."
+    )
+    loaded_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__}("
+            f"dataset={self.dataset!r}, "
+            f"version={self.version!r}, "
+            f"content_hash={self.content_hash!r}"
+            f")>"
+        )
@@ -0,0 +1,84 @@
+from uuid import UUID
+
+from sqlalchemy import ForeignKeyConstraint, PrimaryKeyConstraint, text
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.types import BigInteger, Integer, String, Uuid
+
+from characters_analyzer.database.tables.base import Base
+
+
+class CharacterUsage(Base):
+    __tablename__ = "character_usage"
+
+    __table_args__ = (
+        PrimaryKeyConstraint(
+            "character_id", "metric", "value", name="character_usage_pkey"
+        ),
+        ForeignKeyConstraint(
+            ["character_id"],
+            ["character.id"],
+            name="character_usage_character_id_fk",
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        {
+            "comment": "How many users own the characters at every constellation "
+            "and talent level, counted as the users' characters change.",
+        },
+    )
+
+    character_id: Mapped[UUID] = mapped_column(Uuid())
+    metric: Mapped[str] = mapped_column(
+        String(32), comment="constellations, attack_level, skill_level or burst_level."
+    )
+    value: Mapped[int] = mapped_column(Integer())
+    count: Mapped[int] = mapped_column(BigInteger(), server_default=text("0"))
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__}("
+            f"character_id={self.character_id!r}, "
+            f"metric={self.metric!r}, "
+            f"value={self.value!r}, "
+            f"count={self.count!r}"
+            f")>"
+        )
+
+
+class CharacterSetUsage(Base):
+    __tablename__ = "character_set_usage"
+
+    __table_args__ = (
+        PrimaryKeyConstraint("character_id", "set_id", name="character_set_usage_pkey"),
+        ForeignKeyConstraint(
+            ["character_id"],
+            ["character.id"],
+            name="character_set_usage_character_id_fk",
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        ForeignKeyConstraint(
+            ["set_id"],
+            ["set.id"],
+            name="character_set_usage_set_id_fk",
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        {
+            "comment": "How many artifacts of every set the users' characters wear, "
+            "counted as the artifacts are equipped and the characters deleted.",
+        },
+    )
+
+    character_id: Mapped[UUID] = mapped_column(Uuid())
+    set_id: Mapped[UUID] = mapped_column(Uuid())
+    count: Mapped[int] = mapped_column(BigInteger(), server_default=text("0"))
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__}("
+            f"character_id={self.character_id!r}, "
+            f"set_id={self.set_id!r}, "
+            f"count={self.count!r}"
+            f")>"
+        )
@@ -5,5 +5,6 @@ A package with descriptions of database junction tables.
 It describes the junction tables of the database used and the interfaces for interacting with them.
 """
 
+from .artifact_score import ArtifactScore
 from .artifact_sub_stat import ArtifactSubStat
 from .user_character import UserCharacter
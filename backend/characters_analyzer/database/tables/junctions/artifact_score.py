@@ -0,0 +1,66 @@
+from uuid import UUID
+
+from sqlalchemy import ForeignKeyConstraint, Index, PrimaryKeyConstraint, text
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.types import Float, String, Uuid
+
+from characters_analyzer.database.tables.base import Base
+
+
+class ArtifactScore(Base):
+    __tablename__ = "artifact_score"
+
+    __table_args__ = (
+        PrimaryKeyConstraint(
+            "user_character_id", "artifact_id", name="artifact_score_pkey"
+        ),
+        ForeignKeyConstraint(
+            ["user_character_id"],
+            ["user_character.id"],
+            name="artifact_score_user_character_id_fk",
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        ForeignKeyConstraint(
+            ["artifact_id"],
+            ["artifact.id"],
+            name="artifact_score_artifact_id_fk",
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        # the best artifacts of a character, in all slots or in one of them
+        Index(
+            "artifact_score_user_character_id_score_idx",
+            "user_character_id",
+            text("score DESC"),
+        ),
+        Index(
+            "artifact_score_user_character_id_slot_score_idx",
+            "user_character_id",
+            "slot",
+            text("score DESC"),
+        ),
+        # rescoring of an artifact and cascades from artifact
+        Index("artifact_score_artifact_id_idx", "artifact_id"),
+        {
+            "comment": "Scores of the artifacts by the formulas of the characters "
+            "of their owners, recomputed on every change of either.",
+        },
+    )
+
+    user_character_id: Mapped[UUID] = mapped_column(Uuid())
+    artifact_id: Mapped[UUID] = mapped_column(Uuid())
+    slot: Mapped[str] = mapped_column(
+        String(16), nullable=True, comment="Copy of the slot of the artifact."
+    )
+    score: Mapped[float] = mapped_column(Float())
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__}("
+            f"user_character_id={self.user_character_id!r}, "
+            f"artifact_id={self.artifact_id!r}, "
+            f"slot={self.slot!r}, "
+            f"score={self.score!r}"
+            f")>"
+        )
@@ -1,7 +1,7 @@
 from uuid import UUID
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKeyConstraint, PrimaryKeyConstraint
+from sqlalchemy import ForeignKeyConstraint, Index, PrimaryKeyConstraint
 from sqlalchemy.orm import (
     Mapped,
     mapped_column,
@@ -34,6 +34,11 @@ class ArtifactSubStat(Base):
             onupdate="CASCADE",
             ondelete="CASCADE",
         ),
+        Index(
+            "artifact_sub_stat_sub_stat_id_idx",
+            "sub_stat_id",
+            "sub_stat_value",
+        ),
         {
             "comment": "Table representing many-to-many "
             "relation between artifact and stat tables.",
@@ -3,8 +3,10 @@ from typing import List, TYPE_CHECKING
 
 from sqlalchemy import (
     ForeignKeyConstraint,
+    Index,
     PrimaryKeyConstraint,
     UniqueConstraint,
+    false,
     func,
 )
 from sqlalchemy.orm import (
@@ -12,7 +14,7 @@ from sqlalchemy.orm import (
     mapped_column,
     relationship,
 )
-from sqlalchemy.types import Integer, Uuid
+from sqlalchemy.types import Boolean, Integer, String, Uuid
 
 from characters_analyzer.database.tables.base import Base
 
@@ -40,6 +42,7 @@ class UserCharacter(Base):
             onupdate="CASCADE",
             ondelete="CASCADE",
         ),
+        Index("user_character_character_id_idx", "character_id"),
         {
             "comment": "Table representing many-to-many "
             "relation between user and character tables.",
@@ -54,6 +57,16 @@ class UserCharacter(Base):
     attack_level: Mapped[int] = mapped_column(Integer())
     skill_level: Mapped[int] = mapped_column(Integer())
     burst_level: Mapped[int] = mapped_column(Integer())
+    score_formula: Mapped[str] = mapped_column(
+        String(1024),
+        nullable=True,
+        comment="Scoring formula of the artifacts, the default one if empty.",
+    )
+    artifacts_scored: Mapped[bool] = mapped_column(
+        Boolean(),
+        server_default=false(),
+        comment="Whether all the artifacts of the user have been scored for it.",
+    )
 
     user: Mapped["User"] = relationship("User", back_populates="characters")
     character: Mapped["Character"] = relationship("Character", back_populates="users")
@@ -0,0 +1,116 @@
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session, SessionTransaction
+
+
+class UnitOfWorkSession(Session):
+    """Session keeping track of the changes staged in its transaction.
+
+    The services only stage changes: they add, modify and delete records,
+    flush them or execute DML statements, but never commit. The transaction
+    is committed once by whoever owns the session, for a request at its end
+    (see ``complete``), and what has to happen only once the changes are
+    committed, or only if they are not, is registered with ``on_commit``
+    and ``on_rollback``.
+    """
+
+
+def on_commit(session: AsyncSession | Session, callback: Callable[[], None]):
+    """Registers a function to be called once the transaction is committed.
+
+    The function is dropped if the transaction is rolled back.
+
+    Parameters
+    ----------
+    session : AsyncSession | Session
+        Session of the transaction.
+    callback : Callable[[], None]
+        Function without arguments; it must not use the session.
+    """
+    session.info.setdefault("on_commit", []).append(callback)
+
+
+def on_rollback(session: AsyncSession | Session, callback: Callable[[], None]):
+    """Registers a function to be called if the transaction is not committed.
+
+    Parameters
+    ----------
+    session : AsyncSession | Session
+        Session of the transaction.
+    callback : Callable[[], None]
+        Function without arguments; it must not use the session.
+    """
+    session.info.setdefault("on_rollback", []).append(callback)
+
+
+def is_staged(session: AsyncSession | Session) -> bool:
+    """Whether the transaction of the session has any changes to commit.
+
+    Parameters
+    ----------
+    session : AsyncSession | Session
+        Session of the transaction.
+
+    Returns
+    -------
+    staged : bool
+        ``True`` if anything has been flushed or written by a statement
+        in the transaction, or is pending to be flushed.
+    """
+    return bool(
+        session.info.get("staged") or session.new or session.dirty or session.deleted
+    )
+
+
+async def complete(session: AsyncSession):
+    """Ends the unit of work of a request.
+
+    The transaction is committed if it has staged any changes. Otherwise,
+    for a read-only request, there is nothing to commit: the session is
+    closed, which returns its connection to the pool without a round trip
+    to the database. Either way, the records loaded by the session stay
+    usable, and the session can start another transaction.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Session of the request.
+    """
+    if is_staged(session):
+        await session.commit()
+    else:
+        await session.close()
+
+
+@event.listens_for(UnitOfWorkSession, "after_flush")
+def _after_flush(session: Session, flush_context):
+    session.info["staged"] = True
+
+
+@event.listens_for(UnitOfWorkSession, "do_orm_execute")
+def _do_orm_execute(state: ORMExecuteState):
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info["staged"] = True
+
+
+@event.listens_for(UnitOfWorkSession, "after_commit")
+def _after_commit(session: Session):
+    session.info.pop("on_rollback", None)
+
+    for callback in session.info.pop("on_commit", []):
+        callback()
+
+
+@event.listens_for(UnitOfWorkSession, "after_transaction_end")
+def _after_transaction_end(session: Session, transaction: SessionTransaction):
+    if transaction.parent is not None:
+        return
+
+    session.info.pop("staged", None)
+    session.info.pop("on_commit", None)
+
+    # still there unless the transaction has been committed
+    for callback in session.info.pop("on_rollback", []):
+        callback()
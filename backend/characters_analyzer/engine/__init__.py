@@ -0,0 +1,15 @@
+"""Engine Genshin Impact Characters Analyzer
+
+Calculation package.
+
+It contains the game mechanics the analysis is built on: the stats
+of the characters (see engine.stats), the damage formula (see engine.damage)
+and the scoring formulas compiled from text (see engine.formula).
+
+The calculations are vectorized with ``NumPy`` (whose documentation can be
+found `here`_): tables are precomputed from the game data once per process,
+and many builds are evaluated with a few array operations.
+
+.. _`here`:
+     https://numpy.org/doc/stable/
+"""
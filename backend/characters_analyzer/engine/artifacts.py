@@ -0,0 +1,630 @@
+import hashlib
+import json
+from collections import OrderedDict
+from functools import lru_cache
+from threading import Lock
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Sequence,
+    Tuple,
+)
+from uuid import UUID
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from characters_analyzer.database.game_data import load_game_data
+from characters_analyzer.engine.damage import FLAT_STATS
+from characters_analyzer.engine.formula import Formula
+
+if TYPE_CHECKING:  # only processed by mypy
+    from characters_analyzer.database.tables.entities import Artifact
+
+MAX_SUB_STATS = 4
+PERCENTILES = (5, 25, 50, 75, 95)
+ESTIMATES_CACHE_SIZE = 4096
+# crit value, the usual measure of damage dealer artifacts
+DEFAULT_SCORE_FORMULA = "100 * (2 * crit_rate + crit_dmg)"
+
+
+class Piece(NamedTuple):
+    """Content of an artifact, with the stats referred to by their keys.
+
+    Attributes
+    ----------
+    set_id : str
+        UUID of the set.
+    slot : str
+        ``flower``, ``plume``, ``sands``, ``goblet`` or ``circlet``.
+    rarity : int
+        Rarity (4-5).
+    level : int
+        Level (0-20).
+    main_stat : str
+        Key of the main stat.
+    main_stat_value : float
+        Value of the main stat.
+    sub_stats : Tuple[Tuple[str, float], ...]
+        Keys and values of the sub stats, sorted by key.
+    """
+
+    set_id: str
+    slot: str | None
+    rarity: int
+    level: int
+    main_stat: str
+    main_stat_value: float
+    sub_stats: Tuple[Tuple[str, float], ...]
+
+    @classmethod
+    def from_artifact(cls, artifact: "Artifact") -> "Piece":
+        """Builds the content of an artifact record.
+
+        The sub stats of the artifact (``Artifact.stats``) must be loaded.
+
+        Parameters
+        ----------
+        artifact : Artifact
+            Artifact's ORM.
+
+        Returns
+        -------
+        piece : Piece
+            Content of the artifact.
+        """
+        keys = get_stat_keys()
+
+        return cls(
+            set_id=str(artifact.set_id),
+            slot=artifact.slot,
+            rarity=artifact.rarity,
+            level=artifact.level,
+            main_stat=keys[artifact.main_stat_id],
+            main_stat_value=artifact.main_stat_value,
+            sub_stats=tuple(
+                sorted(
+                    (keys[sub_stat.sub_stat_id], sub_stat.sub_stat_value)
+                    for sub_stat in artifact.stats
+                )
+            ),
+        )
+
+    def fingerprint(self) -> str:
+        """SHA-256 of the content in canonical form.
+
+        Two artifacts with the same set, slot, rarity, level and stats
+        have the same fingerprint, wherever they come from.
+
+        Returns
+        -------
+        fingerprint : str
+            Hex digest.
+        """
+        content = [
+            self.set_id,
+            self.slot,
+            self.rarity,
+            self.level,
+            self.main_stat,
+            round(self.main_stat_value, 2),
+            [[key, round(value, 2)] for key, value in sorted(self.sub_stats)],
+        ]
+
+        return hashlib.sha256(json.dumps(content).encode()).hexdigest()
+
+
+class UpgradeRules:
+    """How the sub stats of the artifacts grow.
+
+    Every ``roll_interval`` levels an artifact either gets a new sub stat,
+    until it has four, drawn by the weights of the stats, or increases one
+    of its four sub stats chosen uniformly by a fraction of its maximal roll.
+
+    Parameters
+    ----------
+    rules : Dict[str, Any]
+        ``artifacts`` section of the game data.
+    """
+
+    def __init__(self, rules: Dict[str, Any]):
+        self.roll_interval: int = rules["roll_interval"]
+        self.tiers: np.ndarray = np.array(rules["roll_tiers"])
+        self.rarities: Dict[str, Dict[str, float]] = rules["rarities"]
+        self.main_stats: Dict[str, float] = rules["main_stats"]
+        self.slots: Dict[str, Dict[str, float]] = rules["slots"]
+        self.four_sub_stats_chance: float = rules["four_sub_stats_chance"]
+
+        self.sub_stats: Tuple[str, ...] = tuple(rules["sub_stats"])
+        self.index: Dict[str, int] = {key: i for i, key in enumerate(self.sub_stats)}
+        self.max_rolls: np.ndarray = np.array(
+            [stat["max_roll"] for stat in rules["sub_stats"].values()]
+        )
+        self.weights: np.ndarray = np.array(
+            [stat["weight"] for stat in rules["sub_stats"].values()], dtype=float
+        )
+
+    def rolls_left(self, piece: Piece) -> int:
+        """The number of upgrades of the artifact until its maximal level.
+
+        Parameters
+        ----------
+        piece : Piece
+            Artifact.
+
+        Returns
+        -------
+        rolls : int
+            Upgrades left.
+        """
+        max_level = self.rarities[str(piece.rarity)]["max_level"]
+
+        return max(
+            max_level // self.roll_interval - piece.level // self.roll_interval, 0
+        )
+
+    def main_stat_value(self, piece: Piece) -> float:
+        """Value of the main stat of the artifact at its maximal level.
+
+        Parameters
+        ----------
+        piece : Piece
+            Artifact.
+
+        Returns
+        -------
+        value : float
+            Main stat value.
+        """
+        return (
+            self.main_stats[piece.main_stat]
+            * self.rarities[str(piece.rarity)]["main_scale"]
+        )
+
+    def main_stat_value_at_level(self, piece: Piece) -> float:
+        """Value of the main stat of the artifact at its current level.
+
+        The main stat grows linearly from ``main_start`` of its final value.
+
+        Parameters
+        ----------
+        piece : Piece
+            Artifact.
+
+        Returns
+        -------
+        value : float
+            Main stat value.
+        """
+        rarity = self.rarities[str(piece.rarity)]
+        start = rarity["main_start"]
+
+        return self.main_stat_value(piece) * (
+            start + (1 - start) * piece.level / rarity["max_level"]
+        )
+
+
+class UpgradeEstimate(NamedTuple):
+    """Distribution of an artifact at its maximal level.
+
+    Attributes
+    ----------
+    trials : int
+        The number of simulated upgrades.
+    seed : int
+        Seed of the random generator.
+    sub_stats : Dict[str, Dict[str, float]]
+        Expected value and percentiles of the existing sub stats;
+        expected value and chance of the sub stats it may get.
+    score : Dict[str, float]
+        Expected value and percentiles of the score.
+    beat_probability : float | None
+        Probability of scoring higher than the compared artifact, if any.
+    """
+
+    trials: int
+    seed: int
+    sub_stats: Dict[str, Dict[str, float]]
+    score: Dict[str, float]
+    beat_probability: float | None
+
+
+@lru_cache
+def get_upgrade_rules() -> UpgradeRules:
+    """The upgrade rules of the bundled game data.
+
+    Returns
+    -------
+    rules : UpgradeRules
+        Upgrade rules.
+    """
+    return UpgradeRules(load_game_data()["artifacts"])
+
+
+@lru_cache
+def get_stat_keys() -> Dict[UUID, str]:
+    """Keys of the stats by their UUIDs.
+
+    Returns
+    -------
+    keys : Dict[UUID, str]
+        Key of every stat of the game data.
+    """
+    return {UUID(stat["id"]): stat["key"] for stat in load_game_data()["stat"]}
+
+
+@lru_cache
+def get_sub_stat_ids() -> Tuple[UUID, ...]:
+    """UUIDs of the sub stats in the canonical order of ``UpgradeRules.sub_stats``.
+
+    The order of the denormalized sub stats of the artifacts
+    (``Artifact.sub_stat_values``).
+
+    Returns
+    -------
+    ids : Tuple[UUID, ...]
+        UUIDs of the sub stats.
+    """
+    ids = {key: id_ for id_, key in get_stat_keys().items()}
+
+    return tuple(ids[key] for key in get_upgrade_rules().sub_stats)
+
+
+def pack_sub_stats(sub_stats: Iterable[Tuple[UUID, float]]) -> List[float]:
+    """Lays the sub stats of an artifact out in the canonical order.
+
+    Parameters
+    ----------
+    sub_stats : Iterable[Tuple[UUID, float]]
+        UUIDs and values of the sub stats.
+
+    Returns
+    -------
+    values : List[float]
+        Value of every sub stat (see ``get_sub_stat_ids``), zero if absent.
+
+    Raises
+    ------
+    KeyError
+        If a stat can't be a sub stat.
+    """
+    positions = {id_: position for position, id_ in enumerate(get_sub_stat_ids())}
+
+    values = [0.0] * len(positions)
+
+    for id_, value in sub_stats:
+        values[positions[id_]] = value
+
+    return values
+
+
+def fingerprint_artifact(artifact: Mapping[str, Any]) -> str:
+    """Fingerprint of an artifact record (see ``Piece.fingerprint``).
+
+    Computed from the denormalized sub stats, so a new record
+    and a stored one give the same fingerprint.
+
+    Parameters
+    ----------
+    artifact : Mapping[str, Any]
+        Columns of the record: ``set_id``, ``slot``, ``rarity``, ``level``,
+        ``main_stat_id``, ``main_stat_value`` and ``sub_stat_values``
+        (see ``pack_sub_stats``).
+
+    Returns
+    -------
+    fingerprint : str
+        Hex digest.
+    """
+    piece = Piece(
+        set_id=str(artifact["set_id"]),
+        slot=artifact["slot"],
+        rarity=artifact["rarity"],
+        level=artifact["level"],
+        main_stat=get_stat_keys()[artifact["main_stat_id"]],
+        main_stat_value=artifact["main_stat_value"],
+        sub_stats=tuple(
+            sorted(
+                (key, value)
+                for key, value in zip(
+                    get_upgrade_rules().sub_stats, artifact["sub_stat_values"]
+                )
+                if value
+            )
+        ),
+    )
+
+    return piece.fingerprint()
+
+
+def simulate_upgrades(
+    piece: Piece, trials: int, seed: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Levels the artifact up to its maximal level many times at once.
+
+    Every trial is a row of the result; the rolls of all the trials
+    are drawn with a few array operations per upgrade.
+
+    Parameters
+    ----------
+    piece : Piece
+        Artifact.
+    trials : int
+        The number of trials.
+    seed : int
+        Seed of the random generator, the same seed gives the same result.
+
+    Returns
+    -------
+    indices : np.ndarray
+        Sub stats of every trial (see ``UpgradeRules.sub_stats``),
+        shaped ``(trials, 4)``, -1 for a missing sub stat.
+    values : np.ndarray
+        Values of the sub stats, shaped ``(trials, 4)``.
+    """
+    rules = get_upgrade_rules()
+    rng = np.random.default_rng(seed)
+
+    max_rolls = rules.max_rolls * rules.rarities[str(piece.rarity)]["roll_scale"]
+    rolls = rules.rolls_left(piece)
+
+    indices = np.full((trials, MAX_SUB_STATS), -1, dtype=np.intp)
+    values = np.zeros((trials, MAX_SUB_STATS))
+
+    existing = [rules.index[key] for key, _ in piece.sub_stats]
+    indices[:, : len(existing)] = existing
+    values[:, : len(existing)] = [value for _, value in piece.sub_stats]
+
+    if new := min(MAX_SUB_STATS - len(existing), rolls):
+        candidates = np.array(
+            [
+                index
+                for index, key in enumerate(rules.sub_stats)
+                if index not in existing and key != piece.main_stat
+            ]
+        )
+        drawn = candidates[
+            _draw_without_repetition(rng, rules.weights[candidates], trials, new)
+        ]
+
+        positions = slice(len(existing), len(existing) + new)
+        indices[:, positions] = drawn
+        values[:, positions] = max_rolls[drawn] * _draw_tiers(rng, rules, (trials, new))
+
+        rolls -= new
+
+    if rolls:
+        # the rolls of every trial are summed up by the position they hit
+        targets = rng.integers(0, MAX_SUB_STATS, size=(trials, rolls), dtype=np.intp)
+        targets += np.arange(0, trials * MAX_SUB_STATS, MAX_SUB_STATS)[:, None]
+        sums = np.bincount(
+            targets.ravel(),
+            weights=_draw_tiers(rng, rules, (trials, rolls)).ravel(),
+            minlength=trials * MAX_SUB_STATS,
+        )
+
+        values += max_rolls[indices] * sums.reshape(trials, MAX_SUB_STATS)
+
+    return indices, values
+
+
+def score_pieces(
+    formula: Formula, piece: Piece, indices: np.ndarray, values: np.ndarray
+) -> np.ndarray:
+    """Scores the outcomes of an artifact with its main stat at the maximal level.
+
+    Parameters
+    ----------
+    formula : Formula
+        Scoring formula of the stats (see ``engine.formula``).
+    piece : Piece
+        Artifact.
+    indices : np.ndarray
+        Sub stats of every outcome, shaped ``(outcomes, 4)``.
+    values : np.ndarray
+        Values of the sub stats, shaped ``(outcomes, 4)``.
+
+    Returns
+    -------
+    scores : np.ndarray
+        Scores, shaped ``(outcomes,)``.
+    """
+    return _score(
+        formula,
+        indices,
+        values,
+        np.array([piece.main_stat]),
+        get_upgrade_rules().main_stat_value(piece),
+    )
+
+
+def score_artifacts(formula: Formula, pieces: Sequence[Piece]) -> np.ndarray:
+    """Scores artifacts as they are, with their main stats at the maximal level.
+
+    Parameters
+    ----------
+    formula : Formula
+        Scoring formula of the stats (see ``engine.formula``).
+    pieces : Sequence[Piece]
+        Artifacts.
+
+    Returns
+    -------
+    scores : np.ndarray
+        Scores, shaped ``(pieces,)``.
+    """
+    rules = get_upgrade_rules()
+
+    indices = np.full((len(pieces), MAX_SUB_STATS), -1, dtype=np.intp)
+    values = np.zeros((len(pieces), MAX_SUB_STATS))
+
+    for row, piece in enumerate(pieces):
+        for position, (key, value) in enumerate(piece.sub_stats[:MAX_SUB_STATS]):
+            indices[row, position] = rules.index.get(key, -1)
+            values[row, position] = value
+
+    return _score(
+        formula,
+        indices,
+        values,
+        np.array([piece.main_stat for piece in pieces]),
+        np.array([rules.main_stat_value(piece) for piece in pieces]),
+    )
+
+
+_estimates: OrderedDict[Tuple, UpgradeEstimate] = OrderedDict()
+_estimates_lock = Lock()
+
+
+def estimate_upgrade(
+    piece: Piece,
+    formula: Formula,
+    trials: int,
+    seed: int,
+    compared: Piece | None = None,
+) -> UpgradeEstimate:
+    """Estimates the distribution of an artifact at its maximal level.
+
+    Estimates are cached by the fingerprints of the artifacts and the
+    parameters, so the same question about the same piece is simulated once.
+    The function may be called from several threads at once.
+
+    Parameters
+    ----------
+    piece : Piece
+        Artifact.
+    formula : Formula
+        Scoring formula.
+    trials : int
+        The number of trials.
+    seed : int
+        Seed of the random generator.
+    compared : Piece, optional
+        Artifact to beat, e.g. the one equipped in the same slot;
+        its main stat is considered at the maximal level.
+
+    Returns
+    -------
+    estimate : UpgradeEstimate
+        Expected values, percentiles and the probability to beat ``compared``.
+    """
+    key = (
+        piece.fingerprint(),
+        formula.digest,
+        trials,
+        seed,
+        compared.fingerprint() if compared else None,
+    )
+
+    with _estimates_lock:
+        if (estimate := _estimates.get(key)) is not None:
+            _estimates.move_to_end(key)
+
+            return estimate
+
+    rules = get_upgrade_rules()
+    indices, values = simulate_upgrades(piece, trials, seed)
+    scores = score_pieces(formula, piece, indices, values)
+
+    sub_stats = {}
+
+    for position, (key_, _) in enumerate(piece.sub_stats):
+        sub_stats[key_] = _distribution(values[:, position])
+
+    for position in range(len(piece.sub_stats), MAX_SUB_STATS):
+        column = indices[:, position]
+
+        for index in np.unique(column[column >= 0]).tolist():
+            hits = column == index
+            sub_stats[rules.sub_stats[index]] = {
+                "expected": float(values[hits, position].mean()),
+                "chance": float(hits.mean()),
+            }
+
+    if compared is not None:
+        compared_score = score_artifacts(formula, [compared])[0]
+        beat_probability = float((scores > compared_score).mean())
+    else:
+        beat_probability = None
+
+    estimate = UpgradeEstimate(
+        trials=trials,
+        seed=seed,
+        sub_stats=sub_stats,
+        score=_distribution(scores),
+        beat_probability=beat_probability,
+    )
+
+    with _estimates_lock:
+        _estimates[key] = estimate
+
+        while len(_estimates) > ESTIMATES_CACHE_SIZE:
+            _estimates.popitem(last=False)
+
+    return estimate
+
+
+def _score(
+    formula: Formula,
+    indices: np.ndarray,
+    values: np.ndarray,
+    main_stats: np.ndarray,
+    main_values: ArrayLike,
+) -> np.ndarray:
+    """Scores sub stats and main stats, one row per artifact."""
+    rules = get_upgrade_rules()
+
+    variables = {}
+
+    for name in formula.variables:
+        value = np.zeros(len(values))
+
+        if name in rules.index:
+            value = np.where(indices == rules.index[name], values, 0).sum(axis=1)
+
+        value = value + np.where(main_stats == name, main_values, 0)
+
+        # artifacts store percentages, formulas use fractions (see engine.stats)
+        variables[name] = value if name in FLAT_STATS else value / 100
+
+    return np.broadcast_to(formula(variables), (len(values),))
+
+
+def _draw_without_repetition(
+    rng: np.random.Generator, weights: np.ndarray, trials: int, draws: int
+) -> np.ndarray:
+    """Draws distinct items by their weights for every trial, shaped ``(trials, draws)``."""
+    weights = np.tile(weights, (trials, 1))
+    drawn = np.empty((trials, draws), dtype=np.intp)
+
+    for draw in range(draws):
+        cumulative = weights.cumsum(axis=1)
+        thresholds = rng.random((trials, 1)) * cumulative[:, -1:]
+        drawn[:, draw] = (cumulative <= thresholds).sum(axis=1)
+
+        # a drawn item gets no weight, so it can't be drawn again
+        weights[np.arange(trials), drawn[:, draw]] = 0
+
+    return drawn
+
+
+def _draw_tiers(
+    rng: np.random.Generator, rules: UpgradeRules, shape: Tuple[int, int]
+) -> np.ndarray:
+    """Draws the fractions of the maximal roll of the rolls."""
+    return rules.tiers[rng.integers(0, len(rules.tiers), size=shape, dtype=np.int8)]
+
+
+def _distribution(values: np.ndarray) -> Dict[str, float]:
+    """Expected value and percentiles of the samples."""
+    percentiles = np.percentile(values, PERCENTILES).tolist()
+
+    return {
+        "expected": float(values.mean()),
+        **{f"p{q}": value for q, value in zip(PERCENTILES, percentiles)},
+    }
@@ -0,0 +1,322 @@
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Iterable, Sequence
+from uuid import UUID
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from characters_analyzer.database.game_data import load_game_data
+from characters_analyzer.engine.stats import get_stat_table
+
+if TYPE_CHECKING:  # only processed by mypy
+    from characters_analyzer.database.tables.entities import Artifact
+
+# stats that artifacts store as they are, the others are stored in percent
+FLAT_STATS = ("hp", "atk", "def", "elemental_mastery")
+
+# base multipliers of the amplifying reactions by the triggering element
+REACTIONS = {
+    "vaporize_hydro": 2.0,
+    "vaporize_pyro": 1.5,
+    "melt_pyro": 2.0,
+    "melt_cryo": 1.5,
+}
+
+
+@lru_cache
+def get_stat_columns() -> Dict[UUID, int]:
+    """Columns of the stat table by the UUIDs of the stats.
+
+    Returns
+    -------
+    columns : Dict[UUID, int]
+        Column of every stat of the game data.
+    """
+    columns = get_stat_table().columns
+
+    return {UUID(stat["id"]): columns[stat["key"]] for stat in load_game_data()["stat"]}
+
+
+def artifact_bonuses(artifacts: Iterable["Artifact"]) -> np.ndarray:
+    """Sums the main and the sub stats of the artifacts.
+
+    The sub stats of the artifacts (``Artifact.stats``) must be loaded.
+
+    Parameters
+    ----------
+    artifacts : Iterable[Artifact]
+        Equipped artifacts.
+
+    Returns
+    -------
+    bonuses : np.ndarray
+        Bonuses, shaped ``(stats,)``, percentages as fractions.
+    """
+    columns = get_stat_columns()
+    bonuses = np.zeros(len(get_stat_table().stats))
+
+    for artifact in artifacts:
+        bonuses[columns[artifact.main_stat_id]] += artifact.main_stat_value
+
+        for sub_stat in artifact.stats:
+            bonuses[columns[sub_stat.sub_stat_id]] += sub_stat.sub_stat_value
+
+    return bonuses * _scale()
+
+
+def build_bonuses(builds: Sequence[Iterable["Artifact"]]) -> np.ndarray:
+    """Bonuses of several sets of artifacts at once.
+
+    Parameters
+    ----------
+    builds : Sequence[Iterable[Artifact]]
+        Sets of equipped artifacts.
+
+    Returns
+    -------
+    bonuses : np.ndarray
+        Bonuses, shaped ``(builds, stats)``.
+    """
+    if not builds:
+        return np.zeros((0, len(get_stat_table().stats)))
+
+    return np.stack([artifact_bonuses(artifacts) for artifacts in builds])
+
+
+def final_stats(
+    base: ArrayLike, bonuses: ArrayLike, weapon_atk: ArrayLike = 0.0
+) -> np.ndarray:
+    """Final stats of a character with its equipment.
+
+    HP, ATK and DEF are ``base * (1 + percent) + flat``, where the base ATK
+    includes the one of the weapon; the other stats are summed up.
+
+    Parameters
+    ----------
+    base : ArrayLike
+        Stats of the character (see ``engine.stats``), shaped ``(..., stats)``.
+    bonuses : ArrayLike
+        Bonuses of the equipment, shaped ``(..., stats)``.
+    weapon_atk : ArrayLike
+        Base ATK of the weapon.
+
+    Returns
+    -------
+    stats : np.ndarray
+        Final stats, shaped as ``base`` and ``bonuses`` broadcast together.
+    """
+    columns = get_stat_table().columns
+    base, bonuses = np.asarray(base, dtype=float), np.asarray(bonuses, dtype=float)
+
+    stats = base + bonuses
+
+    for key, extra in (("hp", 0.0), ("atk", weapon_atk), ("def", 0.0)):
+        column, percent = columns[key], columns[f"{key}_percent"]
+
+        stats[..., column] = (base[..., column] + extra) * (
+            1 + stats[..., percent]
+        ) + bonuses[..., column]
+
+    return stats
+
+
+def crit_multiplier(crit_rate: ArrayLike, crit_dmg: ArrayLike) -> np.ndarray:
+    """Average multiplier of the critical hits.
+
+    Parameters
+    ----------
+    crit_rate : ArrayLike
+        CRIT Rate, clipped to ``[0, 1]``.
+    crit_dmg : ArrayLike
+        CRIT DMG.
+
+    Returns
+    -------
+    multiplier : np.ndarray
+        ``1 + crit_rate * crit_dmg``.
+    """
+    return 1 + np.clip(crit_rate, 0, 1) * np.asarray(crit_dmg)
+
+
+def defense_multiplier(
+    character_level: ArrayLike,
+    enemy_level: ArrayLike,
+    defense_reduction: ArrayLike = 0.0,
+    defense_ignore: ArrayLike = 0.0,
+) -> np.ndarray:
+    """Share of the damage left after the defense of the enemy.
+
+    Parameters
+    ----------
+    character_level : ArrayLike
+        Character's level.
+    enemy_level : ArrayLike
+        Enemy's level.
+    defense_reduction : ArrayLike
+        DEF reduction of the enemy.
+    defense_ignore : ArrayLike
+        DEF ignored by the attack.
+
+    Returns
+    -------
+    multiplier : np.ndarray
+        Defense multiplier.
+    """
+    character = np.asarray(character_level) + 100
+    enemy = (
+        (np.asarray(enemy_level) + 100)
+        * (1 - np.asarray(defense_reduction))
+        * (1 - np.asarray(defense_ignore))
+    )
+
+    return character / (character + enemy)
+
+
+def resistance_multiplier(resistance: ArrayLike) -> np.ndarray:
+    """Share of the damage left after the resistance of the enemy.
+
+    Negative resistance is halved, resistance above 75% is diminished.
+
+    Parameters
+    ----------
+    resistance : ArrayLike
+        Enemy's resistance to the element of the attack.
+
+    Returns
+    -------
+    multiplier : np.ndarray
+        Resistance multiplier.
+    """
+    resistance = np.asarray(resistance, dtype=float)
+
+    return np.select(
+        [resistance < 0, resistance < 0.75],
+        [1 - resistance / 2, 1 - resistance],
+        1 / (4 * resistance + 1),
+    )
+
+
+def amplifying_multiplier(
+    reaction: str | None,
+    elemental_mastery: ArrayLike,
+    reaction_bonus: ArrayLike = 0.0,
+) -> np.ndarray:
+    """Multiplier of an amplifying reaction (vaporize or melt).
+
+    Parameters
+    ----------
+    reaction : str | None
+        One of ``REACTIONS``, ``None`` if the attack does not react.
+    elemental_mastery : ArrayLike
+        Elemental Mastery.
+    reaction_bonus : ArrayLike
+        Bonus to the reaction damage, e.g. of artifact sets.
+
+    Returns
+    -------
+    multiplier : np.ndarray
+        Reaction multiplier.
+
+    Raises
+    ------
+    ValueError
+        If the reaction is unknown.
+    """
+    elemental_mastery = np.asarray(elemental_mastery, dtype=float)
+
+    if reaction is None:
+        return np.ones_like(elemental_mastery)
+
+    if reaction not in REACTIONS:
+        raise ValueError(f"Unknown amplifying reaction: {reaction!r}.")
+
+    return REACTIONS[reaction] * (
+        1
+        + 2.78 * elemental_mastery / (elemental_mastery + 1400)
+        + np.asarray(reaction_bonus)
+    )
+
+
+def expected_damage(
+    stats: ArrayLike,
+    multiplier: ArrayLike,
+    *,
+    scaling: str = "atk",
+    element: str = "physical",
+    flat_damage: ArrayLike = 0.0,
+    dmg_bonus: ArrayLike = 0.0,
+    character_level: ArrayLike = 90,
+    enemy_level: ArrayLike = 90,
+    enemy_resistance: ArrayLike = 0.1,
+    defense_reduction: ArrayLike = 0.0,
+    defense_ignore: ArrayLike = 0.0,
+    reaction: str | None = None,
+    reaction_bonus: ArrayLike = 0.0,
+) -> np.ndarray:
+    """Average damage of a hit.
+
+    ``(multiplier * stat + flat) * (1 + DMG bonus) * crit * defense
+    * resistance * reaction``, computed for every row of the stats at once.
+
+    Parameters
+    ----------
+    stats : ArrayLike
+        Final stats (see ``final_stats``), shaped ``(..., stats)``.
+    multiplier : ArrayLike
+        Talent multiplier, e.g. ``1.5`` for 150%.
+    scaling : str
+        Stat the talent scales with: ``hp``, ``atk``, ``def`` or ``elemental_mastery``.
+    element : str
+        Element of the hit, e.g. ``pyro``, or ``physical``.
+    flat_damage : ArrayLike
+        Damage added to the base damage.
+    dmg_bonus : ArrayLike
+        DMG bonus besides the elemental one, e.g. of talents.
+    character_level : ArrayLike
+        Character's level.
+    enemy_level : ArrayLike
+        Enemy's level.
+    enemy_resistance : ArrayLike
+        Enemy's resistance to the element.
+    defense_reduction : ArrayLike
+        DEF reduction of the enemy.
+    defense_ignore : ArrayLike
+        DEF ignored by the attack.
+    reaction : str | None
+        Amplifying reaction, see ``REACTIONS``.
+    reaction_bonus : ArrayLike
+        Bonus to the reaction damage.
+
+    Returns
+    -------
+    damage : np.ndarray
+        Damage, shaped ``(...)``.
+    """
+    columns = get_stat_table().columns
+    stats = np.asarray(stats, dtype=float)
+
+    return (
+        (np.asarray(multiplier) * stats[..., columns[scaling]] + flat_damage)
+        * (1 + stats[..., columns[f"{element}_dmg_bonus"]] + dmg_bonus)
+        * crit_multiplier(
+            stats[..., columns["crit_rate"]], stats[..., columns["crit_dmg"]]
+        )
+        * defense_multiplier(
+            character_level, enemy_level, defense_reduction, defense_ignore
+        )
+        * resistance_multiplier(enemy_resistance)
+        * amplifying_multiplier(
+            reaction, stats[..., columns["elemental_mastery"]], reaction_bonus
+        )
+    )
+
+
+@lru_cache
+def _scale() -> np.ndarray:
+    """Factors converting the values stored in artifacts to the ones of the stat table."""
+    stats = get_stat_table().stats
+
+    scale = np.array([1.0 if key in FLAT_STATS else 0.01 for key in stats])
+    scale.flags.writeable = False
+
+    return scale
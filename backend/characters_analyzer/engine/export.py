@@ -0,0 +1,255 @@
+import json
+import zipfile
+from importlib import import_module
+from importlib.util import find_spec
+from typing import Any, List, Sequence, Tuple
+
+# formats of the exports by their media types
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+# formats written by pyarrow, an optional dependency
+COLUMNAR = ("arrow", "parquet")
+# media type of several columnar tables, a file each
+ARCHIVE = "application/zip"
+
+# faster NDJSON, if installed
+orjson = import_module("orjson") if find_spec("orjson") else None
+
+
+def is_available(format_: str) -> bool:
+    """Whether the worker can write an export in the format.
+
+    Parameters
+    ----------
+    format_ : str
+        One of ``FORMATS``.
+
+    Returns
+    -------
+    available : bool
+        False for the columnar formats without ``pyarrow``.
+    """
+    return format_ not in COLUMNAR or find_spec("pyarrow") is not None
+
+
+class ExportWriter:
+    """Encoder of a table exported batch by batch.
+
+    Every batch of rows is encoded into a chunk of the document at once,
+    so a table of any size is written with the memory of a batch.
+    NDJSON lines are encoded by ``orjson`` if installed; Arrow IPC streams
+    and Parquet files, compressed with zstd, are written by ``pyarrow``,
+    a record batch or a row group per batch.
+
+    Parameters
+    ----------
+    format_ : str
+        One of ``FORMATS``, see ``is_available``.
+    columns : Sequence[Tuple[str, str]]
+        Names and kinds of the columns: ``uuid``, ``str``, ``int`` or ``float``.
+    """
+
+    def __init__(self, format_: str, columns: Sequence[Tuple[str, str]]):
+        self.format: str = format_
+        self.names: List[str] = [name for name, _ in columns]
+        self.kinds: List[str] = [kind for _, kind in columns]
+
+        self._sink: _Sink = _Sink()
+        self._schema = None
+        self._writer = None
+
+        if format_ in COLUMNAR:
+            self._open()
+
+    def write(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        """Encodes a batch of rows.
+
+        Parameters
+        ----------
+        rows : Sequence[Sequence[Any]]
+            Rows, one value per column.
+
+        Returns
+        -------
+        chunk : bytes
+            The next chunk of the document.
+        """
+        if not rows:
+            return b""
+
+        if self._writer is None:
+            return _dump_lines(self.names, rows)
+
+        pa = import_module("pyarrow")
+
+        self._writer.write_batch(
+            pa.record_batch(
+                [
+                    _arrow_array(pa, kind, values)
+                    for kind, values in zip(self.kinds, zip(*rows))
+                ],
+                schema=self._schema,
+            )
+        )
+
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        """Ends the document.
+
+        Returns
+        -------
+        chunk : bytes
+            The last chunk of the document, e.g. the footer of a Parquet file.
+        """
+        if self._writer is not None:
+            self._writer.close()
+
+        return self._sink.drain()
+
+    def _open(self):
+        pa = import_module("pyarrow")
+
+        self._schema = pa.schema(
+            [
+                (name, _arrow_type(pa, kind))
+                for name, kind in zip(self.names, self.kinds)
+            ]
+        )
+
+        if self.format == "parquet":
+            self._writer = import_module("pyarrow.parquet").ParquetWriter(
+                self._sink, self._schema, compression="zstd"
+            )
+        else:
+            self._writer = pa.ipc.new_stream(
+                self._sink,
+                self._schema,
+                options=pa.ipc.IpcWriteOptions(compression="zstd"),
+            )
+
+
+class ArchiveWriter:
+    """Zip archive of exported tables, written file by file.
+
+    The archive is written as it goes, without seeking back, so every file
+    is sent chunk by chunk like the table it holds. The files are stored
+    as they are, the columnar formats being compressed already.
+    """
+
+    def __init__(self):
+        self._sink: _Sink = _Sink()
+        self._archive = zipfile.ZipFile(self._sink, "w", zipfile.ZIP_STORED)
+        self._file = None
+
+    def open(self, name: str) -> bytes:
+        """Ends the current file of the archive and starts the next one.
+
+        Parameters
+        ----------
+        name : str
+            Name of the file.
+
+        Returns
+        -------
+        chunk : bytes
+            The next chunk of the archive.
+        """
+        self._close_file()
+        # the size of a file isn't known before it's written
+        self._file = self._archive.open(name, "w", force_zip64=True)
+
+        return self._sink.drain()
+
+    def write(self, data: bytes) -> bytes:
+        """Adds a chunk of the current file.
+
+        Parameters
+        ----------
+        data : bytes
+            Chunk of the file, e.g. written by ``ExportWriter``.
+
+        Returns
+        -------
+        chunk : bytes
+            The next chunk of the archive.
+        """
+        if data:
+            self._file.write(data)
+
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        """Ends the archive.
+
+        Returns
+        -------
+        chunk : bytes
+            The last chunk of the archive, its central directory.
+        """
+        self._close_file()
+        self._archive.close()
+
+        return self._sink.drain()
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class _Sink:
+    """File written by pyarrow or zipfile, keeping the buffers until they are drained."""
+
+    closed = False
+
+    def __init__(self):
+        self._buffers: List[Any] = []
+
+    def write(self, data: Any) -> int:
+        self._buffers.append(data)
+
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        # the buffers are copied once, into the chunk sent
+        chunk = b"".join(self._buffers)
+        self._buffers.clear()
+
+        return chunk
+
+
+def _dump_lines(names: List[str], rows: Sequence[Sequence[Any]]) -> bytes:
+    if orjson is not None:
+        lines = [orjson.dumps(dict(zip(names, row)), default=str) for row in rows]
+    else:
+        lines = [
+            json.dumps(dict(zip(names, row)), default=str).encode() for row in rows
+        ]
+
+    # every line ends with a newline
+    lines.append(b"")
+
+    return b"\n".join(lines)
+
+
+def _arrow_type(pa, kind: str):
+    return {
+        "uuid": pa.string(),
+        "str": pa.string(),
+        "int": pa.int16(),
+        "float": pa.float32(),
+    }[kind]
+
+
+def _arrow_array(pa, kind: str, values: Sequence[Any]):
+    if kind == "uuid":
+        values = [None if value is None else str(value) for value in values]
+
+    return pa.array(values, type=_arrow_type(pa, kind))
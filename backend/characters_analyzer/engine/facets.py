@@ -0,0 +1,223 @@
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Mapping, Sequence
+from uuid import UUID
+
+import numpy as np
+
+from characters_analyzer.engine.filters import Filter
+
+# facets by name, with the column they are read from
+FACETS = {
+    "set": "set_id",
+    "main": "main_stat_id",
+    "slot": "slot",
+    "equipped": "user_character_id",
+}
+
+
+class FacetIndex:
+    """Bitmap index of the facets of a user's inventory.
+
+    Every value of every facet (a set, a main stat, a slot, equipped or not)
+    has a bitmap over the artifacts, so the counts of all the values of
+    a facet within a filter are a single ``AND`` and a population count
+    of a boolean matrix. The index also keeps the columns read by the filters
+    (see ``engine.filters.Filter.evaluate``), so a filter is evaluated
+    in memory as well.
+
+    Artifacts are appended in place; the arrays grow by doubling.
+
+    Parameters
+    ----------
+    ids : Sequence[UUID]
+        Artifacts' UUIDs.
+    columns : Mapping[str, np.ndarray]
+        Columns of the artifacts, see ``engine.filters.Filter.evaluate``.
+    """
+
+    def __init__(self, ids: Sequence[UUID], columns: Mapping[str, np.ndarray]):
+        self._positions: Dict[UUID, int] = {}
+        self._size: int = 0
+
+        self._columns: Dict[str, np.ndarray] = {
+            name: np.empty((0, *np.shape(column)[1:]), dtype=np.asarray(column).dtype)
+            for name, column in columns.items()
+        }
+        self._values: Dict[str, List[str]] = {facet: [] for facet in FACETS}
+        self._rows: Dict[str, Dict[str, int]] = {facet: {} for facet in FACETS}
+        self._bitmaps: Dict[str, np.ndarray] = {
+            facet: np.zeros((0, 0), dtype=bool) for facet in FACETS
+        }
+
+        self.add(ids, columns)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, id_: UUID) -> bool:
+        return id_ in self._positions
+
+    @property
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Columns of the artifacts, views of the arrays of the index."""
+        return {name: column[: self._size] for name, column in self._columns.items()}
+
+    def add(self, ids: Sequence[UUID], columns: Mapping[str, np.ndarray]):
+        """Appends artifacts to the index.
+
+        Parameters
+        ----------
+        ids : Sequence[UUID]
+            New artifacts' UUIDs.
+        columns : Mapping[str, np.ndarray]
+            Columns of the new artifacts.
+        """
+        start, count = self._size, len(ids)
+
+        if not count:
+            return
+
+        self._reserve(start + count)
+        new = slice(start, start + count)
+
+        for name, column in columns.items():
+            self._columns[name][new] = column
+
+        for facet, name in FACETS.items():
+            values = np.asarray(columns[name], dtype=object)
+
+            if facet == "equipped":
+                values = np.where(np.equal(values, None), "unequipped", "equipped")
+
+            present = np.flatnonzero(~np.equal(values, None))
+            keys, inverse = np.unique(values[present].astype(str), return_inverse=True)
+            rows = np.array([self._row(facet, key) for key in keys.tolist()], dtype=int)
+
+            self._bitmaps[facet][rows[inverse], start + present] = True
+
+        self._positions.update((id_, start + offset) for offset, id_ in enumerate(ids))
+        self._size += count
+
+    def counts(self, filter_: Filter | None = None) -> Dict[str, Dict[str, int]]:
+        """Counts the artifacts with every value of every facet.
+
+        Parameters
+        ----------
+        filter_ : Filter, optional
+            Filter of the artifacts, all of them by default.
+
+        Returns
+        -------
+        counts : Dict[str, Dict[str, int]]
+            The number of matching artifacts by facet and value.
+        """
+        mask = None if filter_ is None else filter_.evaluate(self.columns)
+        counts = {}
+
+        for facet, values in self._values.items():
+            bitmap = self._bitmaps[facet][: len(values), : self._size]
+
+            if mask is not None:
+                bitmap = bitmap & mask
+
+            counts[facet] = dict(zip(values, np.count_nonzero(bitmap, axis=1).tolist()))
+
+        return counts
+
+    def _row(self, facet: str, value: str) -> int:
+        """Row of the bitmap of a value, added if it is new."""
+        if (row := self._rows[facet].get(value)) is not None:
+            return row
+
+        row = self._rows[facet][value] = len(self._values[facet])
+        self._values[facet].append(value)
+
+        bitmap = self._bitmaps[facet]
+
+        if row == bitmap.shape[0]:
+            self._bitmaps[facet] = np.concatenate(
+                [bitmap, np.zeros((max(row, 4), bitmap.shape[1]), dtype=bool)]
+            )
+
+        return row
+
+    def _reserve(self, size: int):
+        """Grows the arrays to hold at least ``size`` artifacts."""
+        capacity = len(next(iter(self._columns.values()), ()))
+
+        if size <= capacity:
+            return
+
+        capacity = max(2 * capacity, size, 64)
+
+        for name, column in self._columns.items():
+            grown = np.empty((capacity, *column.shape[1:]), dtype=column.dtype)
+            grown[: self._size] = column[: self._size]
+            self._columns[name] = grown
+
+        for facet, bitmap in self._bitmaps.items():
+            grown = np.zeros((bitmap.shape[0], capacity), dtype=bool)
+            grown[:, : self._size] = bitmap[:, : self._size]
+            self._bitmaps[facet] = grown
+
+
+class FacetCache:
+    """The most recently used facet indexes of the users.
+
+    Parameters
+    ----------
+    maxsize : int
+        The number of indexes kept; the least recently used one is evicted.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize: int = maxsize
+
+        self._indexes: OrderedDict[Hashable, FacetIndex] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+    def get(self, key: Hashable) -> FacetIndex | None:
+        """Returns the index of the key, if it is cached.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key, e.g. a user's UUID.
+
+        Returns
+        -------
+        index : FacetIndex | None
+            Index, None if it is not cached.
+        """
+        if (index := self._indexes.get(key)) is not None:
+            self._indexes.move_to_end(key)
+
+        return index
+
+    def put(self, key: Hashable, index: FacetIndex):
+        """Caches the index of the key.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key, e.g. a user's UUID.
+        index : FacetIndex
+            Index.
+        """
+        self._indexes[key] = index
+        self._indexes.move_to_end(key)
+
+        while len(self._indexes) > self.maxsize:
+            self._indexes.popitem(last=False)
+
+    def discard(self, key: Hashable):
+        """Drops the index of the key, if it is cached.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key, e.g. a user's UUID.
+        """
+        self._indexes.pop(key, None)
@@ -0,0 +1,252 @@
+from collections import Counter
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Iterable, List, NamedTuple, Tuple
+
+import numpy as np
+
+from characters_analyzer.database.game_data import load_game_data
+from characters_analyzer.engine.artifacts import (
+    Piece,
+    get_upgrade_rules,
+    score_artifacts,
+    score_pieces,
+    simulate_upgrades,
+)
+from characters_analyzer.engine.formula import Formula
+
+if TYPE_CHECKING:  # only processed by mypy
+    from characters_analyzer.database.tables.junctions import UserCharacter
+
+SLOTS = ("flower", "plume", "sands", "goblet", "circlet")
+DROP_SAMPLES = 4096
+
+
+class SetGain(NamedTuple):
+    """Expected improvement of the roster from one drop of a set.
+
+    Attributes
+    ----------
+    set_id : str
+        UUID of the set.
+    domain : str
+        Domain dropping the set.
+    gain : float
+        Expected score gained with one drop, in the units of the formula.
+    user_character_id : str | None
+        User's character gaining the most from the set, if any.
+    """
+
+    set_id: str
+    domain: str
+    gain: float
+    user_character_id: str | None
+
+
+@lru_cache
+def get_domain_sets() -> Tuple[Tuple[str, str], ...]:
+    """Sets dropped in the domains.
+
+    Returns
+    -------
+    sets : Tuple[Tuple[str, str], ...]
+        UUID of every set and its domain.
+    """
+    return tuple(
+        (set_["id"], set_["domain"])
+        for set_ in load_game_data()["set"]
+        if set_["domain"] is not None
+    )
+
+
+@lru_cache(maxsize=16)
+def drop_scores(formula: Formula, samples: int = DROP_SAMPLES) -> np.ndarray:
+    """Scores of new five-star artifacts leveled up to the maximal level.
+
+    Main stats are drawn by their drop rates for every slot. A new artifact
+    rolls its three or four initial sub stats like the upgrades adding
+    new sub stats, so it is simulated as an artifact with no sub stats
+    and as many levels below zero as it has initial sub stats.
+
+    The distribution does not depend on the set; it is computed once
+    for every formula with a fixed seed.
+
+    Parameters
+    ----------
+    formula : Formula
+        Scoring formula.
+    samples : int
+        The number of drops per slot.
+
+    Returns
+    -------
+    scores : np.ndarray
+        Sorted scores, shaped ``(slots, samples)``.
+    """
+    rules = get_upgrade_rules()
+    rng = np.random.default_rng(0)
+
+    scores = np.empty((len(SLOTS), samples))
+
+    for row, slot in enumerate(SLOTS):
+        main_stats = list(rules.slots[slot])
+        weights = np.array([rules.slots[slot][key] for key in main_stats])
+
+        drops = []
+        counts = rng.multinomial(samples, weights / weights.sum())
+
+        for main_stat, count in zip(main_stats, counts.tolist()):
+            four = int(rng.binomial(count, rules.four_sub_stats_chance))
+
+            for initial, trials in ((3, count - four), (4, four)):
+                if not trials:
+                    continue
+
+                piece = Piece(
+                    "", slot, 5, -initial * rules.roll_interval, main_stat, 0, ()
+                )
+                drops.append(
+                    score_pieces(
+                        formula,
+                        piece,
+                        *simulate_upgrades(piece, trials, int(rng.integers(2**32))),
+                    )
+                )
+
+        scores[row] = np.sort(np.concatenate(drops))
+
+    return scores
+
+
+def recommend(
+    user_characters: Iterable["UserCharacter"], formula: Formula
+) -> List[SetGain]:
+    """Ranks the sets dropped in the domains by the improvement of the roster.
+
+    A drop of a set can replace the artifact in its slot of the characters
+    wearing the set already, or of the characters wearing no artifacts at all.
+    A drop goes to the character it improves the most, so the gain of a set
+    is the expected excess of a drop over the weakest artifact among
+    the eligible characters, averaged over the slots.
+
+    The artifacts of all characters and slots are scored at once,
+    and the gains of all sets, characters and slots are computed
+    with array operations over the sampled drops (see ``drop_scores``).
+    The artifacts of the characters (``UserCharacter.artifacts``)
+    and their sub stats must be loaded.
+
+    Parameters
+    ----------
+    user_characters : Iterable[UserCharacter]
+        User's characters with their artifacts.
+    formula : Formula
+        Scoring formula.
+
+    Returns
+    -------
+    gains : List[SetGain]
+        Gains of the sets, from the largest.
+    """
+    user_characters = list(user_characters)
+    sets = get_domain_sets()
+    columns = {set_id: column for column, (set_id, _) in enumerate(sets)}
+
+    current, eligible = _current_scores(user_characters, formula, columns)
+
+    # expected excess of a drop over every artifact: (characters, slots)
+    drops = drop_scores(formula)
+    excess = np.clip(drops[None] - current[..., None], 0, None).mean(axis=2)
+    gains = np.where(eligible, excess.mean(axis=1)[:, None], 0)
+
+    # the weakest artifacts of the eligible characters: (sets, slots)
+    weakest = np.where(eligible.T[..., None], current[None], np.inf).min(
+        axis=1, initial=np.inf
+    )
+    set_gains = np.clip(drops[None] - weakest[..., None], 0, None).mean(axis=(1, 2))
+
+    best = _best_characters(user_characters, gains)
+
+    return sorted(
+        (
+            SetGain(set_id, domain, float(set_gains[column]), best[column])
+            for column, (set_id, domain) in enumerate(sets)
+        ),
+        key=lambda set_gain: -set_gain.gain,
+    )
+
+
+def domain_gains(set_gains: Iterable[SetGain]) -> Dict[str, float]:
+    """Expected improvement of the roster from one run of every domain.
+
+    A domain drops one of its sets with equal chances.
+
+    Parameters
+    ----------
+    set_gains : Iterable[SetGain]
+        Gains of the sets, or anything with their ``domain`` and ``gain``.
+
+    Returns
+    -------
+    gains : Dict[str, float]
+        Gains of the domains, from the largest.
+    """
+    totals, counts = Counter(), Counter()
+
+    for set_gain in set_gains:
+        totals[set_gain.domain] += set_gain.gain
+        counts[set_gain.domain] += 1
+
+    return dict(
+        sorted(
+            ((domain, totals[domain] / counts[domain]) for domain in totals),
+            key=lambda item: -item[1],
+        )
+    )
+
+
+def _current_scores(
+    user_characters: List["UserCharacter"],
+    formula: Formula,
+    columns: Dict[str, int],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Scores of the equipped artifacts and the sets fitting the characters.
+
+    Returns the best score in every slot of every character, shaped
+    ``(characters, slots)``, zero for an empty slot, and whether a set fits
+    a character, shaped ``(characters, sets)``.
+    """
+    pieces, rows = [], []
+
+    for row, user_character in enumerate(user_characters):
+        for artifact in user_character.artifacts:
+            if artifact.slot in SLOTS:
+                pieces.append(Piece.from_artifact(artifact))
+                rows.append(row)
+
+    current = np.zeros((len(user_characters), len(SLOTS)))
+    eligible = np.zeros((len(user_characters), len(columns)), dtype=bool)
+
+    if pieces:
+        rows = np.array(rows)
+        slots = [SLOTS.index(piece.slot) for piece in pieces]
+        np.maximum.at(current, (rows, slots), score_artifacts(formula, pieces))
+
+        worn = np.array([columns.get(piece.set_id, -1) for piece in pieces])
+        eligible[rows[worn >= 0], worn[worn >= 0]] = True
+
+    # characters without artifacts can wear any set
+    eligible[np.setdiff1d(np.arange(len(user_characters)), rows)] = True
+
+    return current, eligible
+
+
+def _best_characters(
+    user_characters: List["UserCharacter"], gains: np.ndarray
+) -> List[str | None]:
+    """UUIDs of the characters gaining the most from every set, if any gains."""
+    if not user_characters:
+        return [None] * gains.shape[1]
+
+    return [
+        str(user_characters[row].id) if gains[row, column] > 0 else None
+        for column, row in enumerate(gains.argmax(axis=0).tolist())
+    ]
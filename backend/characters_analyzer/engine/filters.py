@@ -0,0 +1,420 @@
+import hashlib
+import operator
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, Mapping, NamedTuple, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import ColumnElement, Float, and_, exists, literal, not_, true
+
+from characters_analyzer.database.game_data import load_game_data
+from characters_analyzer.database.tables.entities import Artifact
+from characters_analyzer.database.tables.junctions import ArtifactSubStat
+from characters_analyzer.engine.artifacts import get_stat_keys, get_upgrade_rules
+from characters_analyzer.engine.farm import SLOTS
+
+MAX_FILTER_LENGTH = 512
+MAX_FILTER_TERMS = 32
+FILTER_CACHE_SIZE = 1024
+
+# ``:`` matches a value, the others compare numbers
+OPERATORS = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+    "=": operator.eq,
+}
+MATCHED_FIELDS = ("set", "slot", "main", "sub")
+NUMERIC_FIELDS = ("level", "rarity")
+FLAGS = ("equipped", "unequipped")
+# short names of the stats, besides their keys, GOOD keys and names
+STAT_ALIASES = {
+    "hp%": "hp_percent",
+    "atk%": "atk_percent",
+    "def%": "def_percent",
+    "em": "elemental_mastery",
+    "er": "energy_recharge",
+    "cr": "crit_rate",
+    "cd": "crit_dmg",
+}
+
+TERM = re.compile(r'\s*(-?)([\w.%]+)(?:(>=|<=|!=|:|>|<|=)("[^"]*"|[^\s"]+))?(?:\s+|$)')
+
+Predicate = Callable[[Mapping[str, np.ndarray]], np.ndarray]
+
+
+class FilterError(ValueError):
+    """The filter is not a valid query of the artifacts."""
+
+
+class Condition(NamedTuple):
+    """A single term of a filter.
+
+    Attributes
+    ----------
+    field : str
+        ``set``, ``slot``, ``main``, ``sub``, ``level``, ``rarity``,
+        ``sub.<stat>`` for the value of a sub stat, or a flag.
+    operator : str
+        ``:`` for the matched fields, a key of ``OPERATORS``
+        for the numeric ones, empty for the flags.
+    value : str | float
+        Lowercase name, stat key or number; empty for the flags.
+    negated : bool
+        Whether the term is negated with ``-``.
+    """
+
+    field: str
+    operator: str
+    value: str | float
+    negated: bool = False
+
+    def __str__(self) -> str:
+        match self.value:
+            case float() as number:
+                value = format(number, "g")
+            case str() as text if re.fullmatch(r"[^\s\"]*", text):
+                value = text
+            case text:
+                value = f'"{text}"'
+
+        return f"{'-' if self.negated else ''}{self.field}{self.operator}{value}"
+
+
+class Filter:
+    """Artifact filter compiled into an SQL condition and a vectorized predicate.
+
+    A filter is a list of terms, all of which must hold, e.g.
+    ``set:"emblem" main:er sub.crit_rate>=7 level>=16 unequipped``:
+
+    * ``set:<name>`` - the set's GOOD key or title contains the name;
+    * ``slot:<slot>``, ``main:<stat>`` - the slot or the main stat;
+    * ``sub:<stat>`` - the artifact has the sub stat;
+    * ``sub.<stat><op><number>``, ``level<op><number>``,
+      ``rarity<op><number>`` - comparisons, ``<op>`` is one of ``OPERATORS``;
+      an absent sub stat counts as zero;
+    * ``equipped``, ``unequipped``.
+
+    A term is negated with a leading ``-``. Stats are named by their keys,
+    GOOD keys, names or ``STAT_ALIASES``.
+
+    The SQL condition is built over ``artifact`` and ``artifact_sub_stat``
+    with ``EXISTS`` subqueries, so Postgres filters the sub stats with their
+    index. The predicate evaluates the same terms over the columns
+    of an inventory (see ``evaluate``).
+
+    Parameters
+    ----------
+    source : str
+        Normalized text of the filter.
+    conditions : Tuple[Condition, ...]
+        Terms of the filter.
+    clause : ColumnElement[bool]
+        SQL condition.
+    predicates : List[Predicate]
+        Vectorized predicates of the terms.
+
+    Attributes
+    ----------
+    digest : str
+        SHA-256 of the normalized text, identifies the filter.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        conditions: Tuple[Condition, ...],
+        clause: ColumnElement[bool],
+        predicates: List[Predicate],
+    ):
+        self.source: str = source
+        self.conditions: Tuple[Condition, ...] = conditions
+        self.clause: ColumnElement[bool] = clause
+        self.digest: str = hashlib.sha256(source.encode()).hexdigest()
+
+        self._predicates: List[Predicate] = predicates
+
+    def evaluate(self, columns: Mapping[str, np.ndarray]) -> np.ndarray:
+        """Evaluates the filter over the columns of an inventory.
+
+        Parameters
+        ----------
+        columns : Mapping[str, np.ndarray]
+            ``set_id``, ``main_stat_id`` and ``user_character_id`` as strings,
+            None for an unequipped artifact; ``slot``, ``level``, ``rarity``;
+            ``sub_stat_values`` shaped ``(artifacts, sub stats)`` in the order
+            of ``engine.artifacts.get_sub_stat_ids``.
+
+        Returns
+        -------
+        mask : np.ndarray
+            Whether each artifact matches the filter.
+        """
+        mask = np.ones(len(columns["level"]), dtype=bool)
+
+        for predicate in self._predicates:
+            mask &= predicate(columns)
+
+        return mask
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}(source={self.source!r})>"
+
+
+def parse_filter(text: str) -> Filter:
+    """Parses and compiles a filter.
+
+    Filters are cached by their normalized text, so the same filter written
+    with different spacing, case, stat names or order of the terms
+    is compiled once.
+
+    Parameters
+    ----------
+    text : str
+        Filter.
+
+    Returns
+    -------
+    filter_ : Filter
+        Compiled filter.
+
+    Raises
+    ------
+    FilterError
+        If the filter is too long, is not a valid query
+        or names unknown fields, stats, sets or slots.
+    """
+    if len(text) > MAX_FILTER_LENGTH:
+        raise FilterError(f"Filter is longer than {MAX_FILTER_LENGTH} characters.")
+
+    conditions = _parse(text)
+
+    if len(conditions) > MAX_FILTER_TERMS:
+        raise FilterError(f"Filter has more than {MAX_FILTER_TERMS} terms.")
+
+    return _compile(" ".join(sorted(map(str, conditions))))
+
+
+@lru_cache(maxsize=FILTER_CACHE_SIZE)
+def _compile(source: str) -> Filter:
+    conditions = tuple(_parse(source))
+
+    clauses = [_clause(condition) for condition in conditions]
+    predicates = [_predicate(condition) for condition in conditions]
+
+    return Filter(source, conditions, and_(*clauses) if clauses else true(), predicates)
+
+
+def _parse(text: str) -> List[Condition]:
+    """Splits a filter into its terms."""
+    conditions, position, text = [], 0, text.strip()
+
+    while position < len(text):
+        if (match := TERM.match(text, position)) is None:
+            raise FilterError(f"Invalid filter near: {text[position:position + 16]}.")
+
+        conditions.append(_condition(*match.groups()))
+        position = match.end()
+
+    return conditions
+
+
+def _condition(
+    negation: str, field: str, operator_: str | None, value: str | None
+) -> Condition:
+    """Validates a term and resolves the names used in it."""
+    negated, field = bool(negation), field.lower()
+
+    if operator_ is None:
+        if field not in FLAGS:
+            raise FilterError(f"Unknown flag: {field}.")
+
+        return Condition(field, "", "", negated)
+
+    value = value.strip('"').lower()
+
+    if field in MATCHED_FIELDS:
+        if operator_ != ":":
+            raise FilterError(f"Use {field}:<value>.")
+
+        match field:
+            case "set":
+                _match_sets(value)
+            case "slot" if value not in SLOTS:
+                raise FilterError(f"Unknown slot: {value}.")
+            case "main":
+                value = _stat_key(value)
+            case "sub":
+                value = _sub_stat_key(value)
+
+        return Condition(field, ":", value, negated)
+
+    if field.startswith("sub."):
+        field = f"sub.{_sub_stat_key(field[4:])}"
+    elif field not in NUMERIC_FIELDS:
+        raise FilterError(f"Unknown field: {field}.")
+
+    try:
+        number = float(value)
+    except ValueError:
+        raise FilterError(f"Not a number: {value}.") from None
+
+    return Condition(field, "=" if operator_ == ":" else operator_, number, negated)
+
+
+def _clause(condition: Condition) -> ColumnElement[bool]:
+    """Builds the SQL condition of a term."""
+    stat_ids = _stat_ids()
+
+    match condition:
+        case Condition(field="set", value=name):
+            clause = Artifact.set_id.in_([UUID(id_) for id_ in _match_sets(name)])
+        case Condition(field="slot", value=slot):
+            # NULL for the artifacts stored before the slots were recorded
+            clause = Artifact.slot.is_not_distinct_from(slot)
+        case Condition(field="main", value=key):
+            clause = Artifact.main_stat_id == stat_ids[key]
+        case Condition(field="sub", value=key):
+            clause = _has_sub_stat(stat_ids[key])
+        case Condition(field="level" | "rarity" as field, operator=operator_):
+            clause = OPERATORS[operator_](
+                getattr(Artifact, field), literal(condition.value, Float())
+            )
+        case Condition(field="equipped"):
+            clause = Artifact.user_character_id.is_not(None)
+        case Condition(field="unequipped"):
+            clause = Artifact.user_character_id.is_(None)
+        case Condition(field=field, operator=operator_, value=number):
+            compare = OPERATORS[operator_]
+            sub_stat_id = stat_ids[field[4:]]
+
+            # absent sub stats count as zero, the index is used either way
+            if compare(0.0, number):
+                clause = not_(
+                    _has_sub_stat(
+                        sub_stat_id,
+                        not_(compare(ArtifactSubStat.sub_stat_value, number)),
+                    )
+                )
+            else:
+                clause = _has_sub_stat(
+                    sub_stat_id, compare(ArtifactSubStat.sub_stat_value, number)
+                )
+
+    return not_(clause) if condition.negated else clause
+
+
+def _predicate(condition: Condition) -> Predicate:
+    """Builds the vectorized predicate of a term."""
+    stat_ids = {key: str(id_) for key, id_ in _stat_ids().items()}
+    index = get_upgrade_rules().index
+
+    match condition:
+        case Condition(field="set", value=name):
+            set_ids = list(_match_sets(name))
+
+            def predicate(columns):
+                return np.isin(columns["set_id"], set_ids)
+
+        case Condition(field="slot", value=slot):
+
+            def predicate(columns):
+                return np.asarray(columns["slot"]) == slot
+
+        case Condition(field="main", value=key):
+
+            def predicate(columns):
+                return np.asarray(columns["main_stat_id"]) == stat_ids[key]
+
+        case Condition(field="sub", value=key):
+
+            def predicate(columns):
+                return columns["sub_stat_values"][:, index[key]] > 0
+
+        case Condition(field="level" | "rarity" as field, operator=operator_):
+
+            def predicate(columns):
+                return OPERATORS[operator_](columns[field], condition.value)
+
+        case Condition(field="equipped" | "unequipped" as field):
+
+            def predicate(columns):
+                unequipped = np.equal(columns["user_character_id"], None)
+
+                return ~unequipped if field == "equipped" else unequipped
+
+        case Condition(field=field, operator=operator_, value=number):
+
+            def predicate(columns):
+                return OPERATORS[operator_](
+                    columns["sub_stat_values"][:, index[field[4:]]], number
+                )
+
+    if condition.negated:
+        return lambda columns: ~predicate(columns)
+
+    return predicate
+
+
+def _has_sub_stat(
+    sub_stat_id: UUID, *criteria: ColumnElement[bool]
+) -> ColumnElement[bool]:
+    return (
+        exists()
+        .where(
+            ArtifactSubStat.artifact_id == Artifact.id,
+            ArtifactSubStat.sub_stat_id == sub_stat_id,
+            *criteria,
+        )
+        .correlate(Artifact)
+    )
+
+
+@lru_cache
+def _stat_ids() -> Dict[str, UUID]:
+    """UUIDs of the stats by their keys."""
+    return {key: id_ for id_, key in get_stat_keys().items()}
+
+
+@lru_cache
+def _stat_names() -> Dict[str, str]:
+    """Keys of the stats by their lowercase keys, GOOD keys, names and aliases."""
+    names = dict(STAT_ALIASES)
+
+    for stat in load_game_data()["stat"]:
+        for name in (stat["key"], stat["good_key"], stat["name"]):
+            names.setdefault(name.lower(), stat["key"])
+
+    return names
+
+
+def _stat_key(name: str) -> str:
+    if (key := _stat_names().get(name)) is None:
+        raise FilterError(f"Unknown stat: {name}.")
+
+    return key
+
+
+def _sub_stat_key(name: str) -> str:
+    if (key := _stat_key(name)) not in get_upgrade_rules().index:
+        raise FilterError(f"Not a sub stat: {name}.")
+
+    return key
+
+
+@lru_cache(maxsize=FILTER_CACHE_SIZE)
+def _match_sets(name: str) -> Tuple[str, ...]:
+    """UUIDs of the sets whose GOOD key or title contains the name."""
+    set_ids = tuple(
+        set_["id"]
+        for set_ in load_game_data()["set"]
+        if name in set_["good_key"].lower() or name in set_["title"].lower()
+    )
+
+    if not set_ids:
+        raise FilterError(f"Unknown set: {name}.")
+
+    return set_ids
@@ -0,0 +1,288 @@
+import ast
+import hashlib
+import operator
+from functools import lru_cache
+from typing import Callable, FrozenSet, Iterable, Mapping
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from characters_analyzer.engine.stats import get_stat_table
+
+MAX_FORMULA_LENGTH = 1024
+MAX_FORMULA_NODES = 256
+FORMULA_CACHE_SIZE = 1024
+
+BINARY_OPERATORS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.divide,
+    ast.Pow: np.power,
+}
+UNARY_OPERATORS = {
+    ast.UAdd: np.positive,
+    ast.USub: np.negative,
+}
+COMPARISONS = {
+    ast.Lt: np.less,
+    ast.LtE: np.less_equal,
+    ast.Gt: np.greater,
+    ast.GtE: np.greater_equal,
+    ast.Eq: np.equal,
+    ast.NotEq: np.not_equal,
+}
+# functions by name, with the number of their arguments
+FUNCTIONS = {
+    "abs": (np.abs, 1),
+    "min": (np.minimum, 2),
+    "max": (np.maximum, 2),
+    "sqrt": (np.sqrt, 1),
+    "log": (np.log, 1),
+    "exp": (np.exp, 1),
+    "clip": (np.clip, 3),
+}
+
+Evaluator = Callable[[Mapping[str, np.ndarray]], np.ndarray]
+
+
+class FormulaError(ValueError):
+    """The formula is not a valid expression of the allowed variables."""
+
+
+class Formula:
+    """Scoring formula compiled into a vectorized evaluator.
+
+    A formula is an arithmetic expression of the stats, e.g.
+    ``atk * (1 + crit_rate * crit_dmg)``. It may use ``+ - * / **``,
+    comparisons inside ``a if condition else b``, numbers and the functions
+    of ``FUNCTIONS``; anything else, e.g. attributes, subscripts or names
+    other than the variables, is rejected before compilation, so the formula
+    cannot reach any Python object.
+
+    The evaluator is a tree of closures calling NumPy ufuncs, so scoring
+    any number of builds is a few array operations.
+
+    Parameters
+    ----------
+    source : str
+        Normalized text of the formula.
+    variables : FrozenSet[str]
+        Names used by the formula.
+    evaluator : Evaluator
+        Compiled evaluator.
+
+    Attributes
+    ----------
+    digest : str
+        SHA-256 of the normalized text, identifies the formula.
+    """
+
+    def __init__(self, source: str, variables: FrozenSet[str], evaluator: Evaluator):
+        self.source: str = source
+        self.variables: FrozenSet[str] = variables
+        self.digest: str = hashlib.sha256(source.encode()).hexdigest()
+
+        self._evaluator: Evaluator = evaluator
+
+    def __call__(self, values: Mapping[str, ArrayLike]) -> np.ndarray:
+        """Evaluates the formula.
+
+        Parameters
+        ----------
+        values : Mapping[str, ArrayLike]
+            Values of the variables, broadcast together.
+
+        Returns
+        -------
+        result : np.ndarray
+            Result; invalid operations, e.g. division by zero, give ``inf`` or NaN.
+        """
+        with np.errstate(all="ignore"):
+            return np.asarray(
+                self._evaluator(
+                    {name: np.asarray(values[name]) for name in self.variables}
+                ),
+                dtype=float,
+            )
+
+    def evaluate(self, stats: ArrayLike) -> np.ndarray:
+        """Evaluates the formula over the columns of the stats.
+
+        Parameters
+        ----------
+        stats : ArrayLike
+            Stats in the order of the stat table, shaped ``(..., stats)``.
+
+        Returns
+        -------
+        result : np.ndarray
+            Result, shaped ``(...)``.
+        """
+        columns = get_stat_table().columns
+        stats = np.asarray(stats, dtype=float)
+
+        return np.broadcast_to(
+            self({name: stats[..., columns[name]] for name in self.variables}),
+            stats.shape[:-1],
+        )
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}(source={self.source!r})>"
+
+
+def compile_formula(text: str, variables: Iterable[str] | None = None) -> Formula:
+    """Parses and compiles a formula.
+
+    Formulas are cached by their normalized text, so the same formula written
+    with different spacing or parentheses is compiled once.
+
+    Parameters
+    ----------
+    text : str
+        Formula.
+    variables : Iterable[str], optional
+        Allowed names, the keys of the stats by default.
+
+    Returns
+    -------
+    formula : Formula
+        Compiled formula.
+
+    Raises
+    ------
+    FormulaError
+        If the formula is too long, is not a valid expression
+        or uses anything not allowed.
+    """
+    if len(text) > MAX_FORMULA_LENGTH:
+        raise FormulaError(f"Formula is longer than {MAX_FORMULA_LENGTH} characters.")
+
+    try:
+        tree = ast.parse(text.strip(), mode="eval")
+    except SyntaxError as error:
+        raise FormulaError(f"Invalid formula: {error.msg}.") from error
+
+    # checked before anything walks the tree recursively
+    if sum(1 for _ in ast.walk(tree)) > MAX_FORMULA_NODES:
+        raise FormulaError(f"Formula has more than {MAX_FORMULA_NODES} nodes.")
+
+    allowed = frozenset(get_stat_table().stats if variables is None else variables)
+
+    return _compile(ast.unparse(tree), allowed)
+
+
+@lru_cache(maxsize=FORMULA_CACHE_SIZE)
+def _compile(source: str, allowed: FrozenSet[str]) -> Formula:
+    variables = set()
+    evaluator = _build(ast.parse(source, mode="eval").body, allowed, variables)
+
+    return Formula(source, frozenset(variables), evaluator)
+
+
+def _build(node: ast.AST, allowed: FrozenSet[str], variables: set) -> Evaluator:
+    """Compiles a node of the expression tree into a closure.
+
+    Parameters
+    ----------
+    node : ast.AST
+        Node.
+    allowed : FrozenSet[str]
+        Allowed names.
+    variables : set
+        Collects the names used.
+
+    Returns
+    -------
+    evaluator : Evaluator
+        Closure computing the node from the values of the variables.
+    """
+    match node:
+        case ast.Constant(value=int() | float() as value) if not isinstance(
+            value, bool
+        ):
+            value = float(value)
+
+            return lambda _values: value
+        case ast.Name(id=name) if name in allowed:
+            variables.add(name)
+
+            return operator.itemgetter(name)
+        case ast.Name(id=name):
+            raise FormulaError(f"Unknown variable: {name}.")
+        case ast.BinOp(op=op) if type(op) in BINARY_OPERATORS:
+            return _apply(
+                BINARY_OPERATORS[type(op)],
+                _build(node.left, allowed, variables),
+                _build(node.right, allowed, variables),
+            )
+        case ast.UnaryOp(op=op) if type(op) in UNARY_OPERATORS:
+            return _apply(
+                UNARY_OPERATORS[type(op)], _build(node.operand, allowed, variables)
+            )
+        case ast.Compare(ops=[op], comparators=[right]) if type(op) in COMPARISONS:
+            return _apply(
+                COMPARISONS[type(op)],
+                _build(node.left, allowed, variables),
+                _build(right, allowed, variables),
+            )
+        case ast.IfExp():
+            return _apply(
+                np.where,
+                _build(node.test, allowed, variables),
+                _build(node.body, allowed, variables),
+                _build(node.orelse, allowed, variables),
+            )
+        case ast.Call(func=ast.Name(id=name), args=args, keywords=[]) if (
+            name in FUNCTIONS
+        ):
+            function, arity = FUNCTIONS[name]
+
+            if len(args) != arity:
+                raise FormulaError(f"{name}() takes {arity} arguments.")
+
+            return _apply(function, *(_build(arg, allowed, variables) for arg in args))
+
+    raise FormulaError(f"Not allowed in a formula: {ast.unparse(node)}.")
+
+
+def _apply(function: Callable, *arguments: Evaluator) -> Evaluator:
+    """Combines the evaluators of the arguments with a NumPy function.
+
+    Parameters
+    ----------
+    function : Callable
+        NumPy function.
+    *arguments : Evaluator
+        Evaluators of the arguments.
+
+    Returns
+    -------
+    evaluator : Evaluator
+        Evaluator of the call.
+    """
+    match arguments:
+        case (argument,):
+            return lambda values: function(argument(values))
+        case (left, right):
+            return lambda values: function(left(values), right(values))
+
+    return lambda values: function(*(argument(values) for argument in arguments))
+
+
+def score(formula: str, stats: ArrayLike) -> np.ndarray:
+    """Scores the builds with a formula of their stats.
+
+    Parameters
+    ----------
+    formula : str
+        Formula, see ``Formula``.
+    stats : ArrayLike
+        Final stats of the builds, shaped ``(builds, stats)``.
+
+    Returns
+    -------
+    scores : np.ndarray
+        Scores, shaped ``(builds,)``.
+    """
+    return compile_formula(formula).evaluate(stats)
@@ -0,0 +1,213 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+from uuid import UUID
+
+import ijson
+
+from characters_analyzer.database.game_data import load_game_data
+from characters_analyzer.engine.artifacts import Piece, get_stat_keys, get_upgrade_rules
+
+# sections of an export that are imported, the others are skipped
+SECTIONS = ("characters", "artifacts")
+_ITEM_PREFIXES = {f"{section}.item" for section in SECTIONS}
+
+
+class GoodError(ValueError):
+    """An item of the export can't be imported."""
+
+
+class GoodReader:
+    """Incremental reader of an export in the GOOD format.
+
+    The document is fed in chunks of any size and only the items
+    of ``SECTIONS`` being read are held, so the memory doesn't grow
+    with the size of the export. Numbers are read as floats.
+
+    Attributes
+    ----------
+    format : str | None
+        ``format`` of the document, once read.
+    """
+
+    def __init__(self):
+        self.format: str | None = None
+
+        self._events: List[Tuple[str, str, Any]] = ijson.sendable_list()
+        self._parser = ijson.parse_coro(self._events, use_float=True)
+        self._section: str | None = None
+        self._builder: ijson.ObjectBuilder | None = None
+
+    def feed(self, chunk: bytes) -> List[Tuple[str, Dict[str, Any]]]:
+        """Reads a chunk of the document.
+
+        Parameters
+        ----------
+        chunk : bytes
+            Next chunk.
+
+        Returns
+        -------
+        items : List[Tuple[str, Dict[str, Any]]]
+            Section and content of every item completed by the chunk.
+
+        Raises
+        ------
+        GoodError
+            If the document isn't valid JSON.
+        """
+        if not chunk:
+            # the parser takes an empty chunk for the end of the document
+            return []
+
+        try:
+            self._parser.send(chunk)
+        except ijson.JSONError as error:
+            raise GoodError(_describe(error)) from error
+
+        return self._collect()
+
+    def close(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Ends the document, see ``feed``."""
+        try:
+            self._parser.close()
+        except ijson.JSONError as error:
+            raise GoodError(_describe(error)) from error
+
+        return self._collect()
+
+    def _collect(self) -> List[Tuple[str, Dict[str, Any]]]:
+        items = []
+
+        for prefix, event, value in self._events:
+            if self._builder is not None:
+                self._builder.event(event, value)
+
+                if prefix == f"{self._section}.item" and event == "end_map":
+                    items.append((self._section, self._builder.value))
+                    self._builder = None
+            elif event == "start_map" and prefix in _ITEM_PREFIXES:
+                self._section = prefix.split(".")[0]
+                self._builder = ijson.ObjectBuilder()
+                self._builder.event(event, value)
+            elif prefix == "format" and event == "string":
+                self.format = value
+
+        del self._events[:]
+
+        return items
+
+
+def read_character(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Maps a character of the export to the columns of a user's character.
+
+    Parameters
+    ----------
+    item : Dict[str, Any]
+        Item of the ``characters`` section.
+
+    Returns
+    -------
+    character : Dict[str, Any]
+        ``character_id`` and the levels of the character.
+
+    Raises
+    ------
+    GoodError
+        If the character is unknown.
+    """
+    talent = item.get("talent") or {}
+
+    return {
+        "character_id": _resolve("character", item.get("key")),
+        "level": int(item.get("level", 1)),
+        "constellations": int(item.get("constellation", 0)),
+        "attack_level": int(talent.get("auto", 1)),
+        "skill_level": int(talent.get("skill", 1)),
+        "burst_level": int(talent.get("burst", 1)),
+    }
+
+
+def read_artifact(item: Dict[str, Any]) -> Tuple[Dict[str, Any], UUID | None]:
+    """Maps an artifact of the export to the data of an artifact.
+
+    The export has no main stat values, they are computed for the level
+    of the artifact (see ``UpgradeRules.main_stat_value_at_level``).
+
+    Parameters
+    ----------
+    item : Dict[str, Any]
+        Item of the ``artifacts`` section.
+
+    Returns
+    -------
+    artifact : Dict[str, Any]
+        Fields of ``schemas.ArtifactData`` but ``user_character_id``.
+    location : UUID | None
+        UUID of the character wearing the artifact, if any.
+
+    Raises
+    ------
+    GoodError
+        If the set or a stat is unknown.
+    """
+    keys = get_stat_keys()
+
+    main_stat_id = _resolve("stat", item.get("mainStatKey"))
+    sub_stats = [
+        {
+            "sub_stat_id": _resolve("stat", sub_stat.get("key")),
+            "sub_stat_value": float(sub_stat.get("value", 0)),
+        }
+        # the empty sub stats of the scanners are placeholders
+        for sub_stat in item.get("substats") or []
+        if sub_stat.get("key")
+    ]
+    piece = Piece(
+        set_id=str(_resolve("set", item.get("setKey"))),
+        slot=item.get("slotKey"),
+        rarity=int(item.get("rarity", 5)),
+        level=int(item.get("level", 0)),
+        main_stat=keys[main_stat_id],
+        main_stat_value=0.0,
+        sub_stats=(),
+    )
+
+    try:
+        main_stat_value = get_upgrade_rules().main_stat_value_at_level(piece)
+    except KeyError:
+        raise GoodError(f"Main stat doesn't fit a {piece.rarity} stars artifact.")
+
+    artifact = {
+        "set_id": UUID(piece.set_id),
+        "slot": piece.slot,
+        "rarity": piece.rarity,
+        "level": piece.level,
+        "main_stat_id": main_stat_id,
+        "main_stat_value": round(main_stat_value, 1),
+        "sub_stats": sub_stats,
+    }
+
+    if location := item.get("location"):
+        return artifact, _resolve("character", location)
+
+    return artifact, None
+
+
+@lru_cache
+def _good_keys(dataset: str) -> Dict[str, UUID]:
+    """UUIDs of the records of a dataset of the game data by their GOOD keys."""
+    return {
+        record["good_key"]: UUID(record["id"]) for record in load_game_data()[dataset]
+    }
+
+
+def _describe(error: Exception) -> str:
+    # the parser points at the error on the next lines
+    return f"Invalid JSON: {str(error).splitlines()[0]}."
+
+
+def _resolve(dataset: str, key: Any) -> UUID:
+    if (id_ := _good_keys(dataset).get(key)) is None:
+        raise GoodError(f"Unknown {dataset}: {key!r}.")
+
+    return id_
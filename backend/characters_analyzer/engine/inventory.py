@@ -0,0 +1,345 @@
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Mapping, Sequence
+from uuid import UUID
+
+import numpy as np
+
+# columns kept as codes of their values, -1 for None
+CODED = ("set_id", "main_stat_id", "slot", "user_character_id")
+# the other columns with their types
+NUMERIC = {
+    "main_stat_value": np.float32,
+    "level": np.int8,
+    "rarity": np.int8,
+    "sub_stat_values": np.float32,
+}
+
+
+class Inventory:
+    """Columnar snapshot of a user's inventory.
+
+    Every artifact is a row of a few arrays: its UUID, the codes of its set,
+    main stat, slot and character (see ``values``), the value of its main
+    stat, its level, its rarity and its sub stats in single precision.
+    An artifact takes about a hundred bytes, instead of a few ORM objects.
+
+    Artifacts are put and removed in place, so the snapshot is patched
+    by the changes of the inventory instead of being reloaded; the arrays
+    grow by doubling.
+
+    Parameters
+    ----------
+    ids : Sequence[UUID]
+        Artifacts' UUIDs.
+    columns : Mapping[str, np.ndarray]
+        Columns of the artifacts (see ``engine.filters.Filter.evaluate``)
+        and ``main_stat_value``.
+
+    Attributes
+    ----------
+    values : Dict[str, List[str]]
+        Values of the coded columns by their codes.
+    """
+
+    def __init__(self, ids: Sequence[UUID], columns: Mapping[str, np.ndarray]):
+        self.values: Dict[str, List[str]] = {name: [] for name in CODED}
+
+        self._codes: Dict[str, Dict[str, int]] = {name: {} for name in CODED}
+        self._size: int = 0
+        self._ids: np.ndarray = np.empty(0, dtype="V16")
+        self._arrays: Dict[str, np.ndarray] = {
+            name: np.empty(0, dtype=np.int16) for name in CODED
+        }
+
+        for name, type_ in NUMERIC.items():
+            self._arrays[name] = np.empty((0, *np.shape(columns[name])[1:]), type_)
+
+        self.put(ids, columns)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, id_: UUID) -> bool:
+        return bool(np.any(self._ids[: self._size] == np.void(id_.bytes)))
+
+    @property
+    def ids(self) -> List[UUID]:
+        """Artifacts' UUIDs, in the order of the rows."""
+        return [UUID(bytes=id_) for id_ in self._ids[: self._size].tolist()]
+
+    @property
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Columns of the artifacts, see ``engine.filters.Filter.evaluate``.
+
+        The coded columns are decoded, the others are views of the arrays.
+        """
+        columns = {
+            # the code -1 picks the trailing None
+            name: np.array([*self.values[name], None], dtype=object)[
+                self._arrays[name][: self._size]
+            ]
+            for name in CODED
+        }
+
+        for name in NUMERIC:
+            columns[name] = self._arrays[name][: self._size]
+
+        return columns
+
+    @property
+    def nbytes(self) -> int:
+        """Memory taken by the arrays, including their spare rows."""
+        return self._ids.nbytes + sum(array.nbytes for array in self._arrays.values())
+
+    def put(self, ids: Sequence[UUID], columns: Mapping[str, np.ndarray]):
+        """Adds artifacts or overwrites the known ones.
+
+        Parameters
+        ----------
+        ids : Sequence[UUID]
+            Artifacts' UUIDs.
+        columns : Mapping[str, np.ndarray]
+            Columns of the artifacts.
+        """
+        if not len(ids):
+            return
+
+        keys = [id_.bytes for id_ in ids]
+        rows = np.array(self._rows(keys), dtype=int)
+        new = np.flatnonzero(rows < 0)
+
+        self._reserve(self._size + len(new))
+        rows[new] = np.arange(self._size, self._size + len(new))
+
+        for row, position in zip(rows[new].tolist(), new.tolist()):
+            self._ids[row] = np.void(keys[position])
+
+        for name in CODED:
+            self._arrays[name][rows] = self._encode(name, columns[name])
+
+        for name in NUMERIC:
+            self._arrays[name][rows] = columns[name]
+
+        self._size += len(new)
+
+    def remove(self, ids: Sequence[UUID]) -> int:
+        """Removes artifacts, keeping the order of the others.
+
+        Parameters
+        ----------
+        ids : Sequence[UUID]
+            Artifacts' UUIDs, the unknown ones are ignored.
+
+        Returns
+        -------
+        count : int
+            The number of removed artifacts.
+        """
+        rows = [row for row in self._rows([id_.bytes for id_ in ids]) if row >= 0]
+
+        if not rows:
+            return 0
+
+        kept = np.delete(np.arange(self._size), rows)
+
+        for array in (self._ids, *self._arrays.values()):
+            array[: len(kept)] = array[kept]
+
+        self._size = len(kept)
+
+        return len(rows)
+
+    def unequip(self, user_character_id: UUID):
+        """Takes the artifacts off a character, e.g. a deleted one.
+
+        Parameters
+        ----------
+        user_character_id : UUID
+            UserCharacter's UUID.
+        """
+        if (
+            code := self._codes["user_character_id"].get(str(user_character_id))
+        ) is None:
+            return
+
+        column = self._arrays["user_character_id"][: self._size]
+        column[column == code] = -1
+
+    def _rows(self, keys: List[bytes]) -> List[int]:
+        """Rows of the artifacts by the bytes of their UUIDs, -1 for unknown ones."""
+        rows = {key: row for row, key in enumerate(self._ids[: self._size].tolist())}
+
+        return [rows.get(key, -1) for key in keys]
+
+    def _encode(self, name: str, values: np.ndarray) -> np.ndarray:
+        """Codes of the values of a column, new values are given new codes."""
+        values = np.asarray(values, dtype=object)
+        present = np.flatnonzero(~np.equal(values, None))
+        keys, inverse = np.unique(values[present].astype(str), return_inverse=True)
+
+        codes = np.full(len(values), -1, dtype=np.int16)
+        codes[present] = np.array(
+            [self._code(name, key) for key in keys.tolist()], dtype=np.int16
+        )[inverse]
+
+        return codes
+
+    def _code(self, name: str, value: str) -> int:
+        """Code of a value of a column, added if it is new."""
+        if (code := self._codes[name].get(value)) is None:
+            code = self._codes[name][value] = len(self.values[name])
+            self.values[name].append(value)
+
+        return code
+
+    def _reserve(self, size: int):
+        """Grows the arrays to hold at least ``size`` artifacts."""
+        if size <= len(self._ids):
+            return
+
+        capacity = max(2 * len(self._ids), size, 64)
+
+        self._ids = self._grow(self._ids, capacity)
+
+        for name, array in self._arrays.items():
+            self._arrays[name] = self._grow(array, capacity)
+
+    def _grow(self, array: np.ndarray, capacity: int) -> np.ndarray:
+        """Copy of the rows of an array with room for ``capacity`` artifacts."""
+        grown = np.empty((capacity, *array.shape[1:]), dtype=array.dtype)
+        grown[: self._size] = array[: self._size]
+
+        return grown
+
+
+class InventoryCache:
+    """The most recently used inventories of the users, within a memory budget.
+
+    Parameters
+    ----------
+    max_bytes : int
+        Memory budget of the inventories (see ``Inventory.nbytes``);
+        the least recently used ones are evicted to stay within it.
+
+    Attributes
+    ----------
+    hits : int
+        The number of requested inventories found in the cache.
+    misses : int
+        The number of requested inventories not found in the cache.
+    evictions : int
+        The number of inventories evicted to stay within the budget.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes: int = max_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+        self._inventories: OrderedDict[Hashable, Inventory] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._inventories)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory taken by the inventories."""
+        return sum(inventory.nbytes for inventory in self._inventories.values())
+
+    def get(self, key: Hashable) -> Inventory | None:
+        """Returns the inventory of the key, if it is cached.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key, e.g. a user's UUID.
+
+        Returns
+        -------
+        inventory : Inventory | None
+            Inventory, None if it is not cached.
+        """
+        if (inventory := self._inventories.get(key)) is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._inventories.move_to_end(key)
+
+        return inventory
+
+    def peek(self, key: Hashable) -> Inventory | None:
+        """Returns the inventory of the key, like ``get``, without counting it as used.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key, e.g. a user's UUID.
+
+        Returns
+        -------
+        inventory : Inventory | None
+            Inventory, None if it is not cached.
+        """
+        return self._inventories.get(key)
+
+    def put(self, key: Hashable, inventory: Inventory):
+        """Caches the inventory of the key.
+
+        An inventory larger than the whole budget is not kept.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key, e.g. a user's UUID.
+        inventory : Inventory
+            Inventory.
+        """
+        self._inventories[key] = inventory
+        self._inventories.move_to_end(key)
+
+        self.trim()
+
+    def discard(self, key: Hashable):
+        """Drops the inventory of the key, if it is cached.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key, e.g. a user's UUID.
+        """
+        self._inventories.pop(key, None)
+
+    def trim(self):
+        """Evicts the least recently used inventories until the cache fits its budget.
+
+        To be called after an inventory has grown.
+        """
+        nbytes = self.nbytes
+
+        while self._inventories and nbytes > self.max_bytes:
+            _, inventory = self._inventories.popitem(last=False)
+
+            nbytes -= inventory.nbytes
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int | float]:
+        """Usage of the cache.
+
+        Returns
+        -------
+        stats : Dict[str, int | float]
+            The number of inventories, the memory they take, the budget,
+            hits, misses, evictions and the hit rate.
+        """
+        requests = self.hits + self.misses
+
+        return {
+            "entries": len(self),
+            "nbytes": self.nbytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / requests if requests else 0.0,
+        }
@@ -0,0 +1,232 @@
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+import numpy as np
+
+# cells searched by a query, from the closest
+PROBES = 8
+# at most this many vectors train the cells
+TRAINING_SAMPLE = 32768
+# iterations of k-means training the cells
+TRAINING_ITERATIONS = 10
+# vectors assigned to the cells at once, to bound the memory
+CHUNK = 16384
+
+
+class IVFIndex:
+    """Approximate nearest neighbours by an inverted file of k-means cells.
+
+    The vectors are clustered into about ``sqrt(n)`` cells and stored
+    sorted by cell, so a query compares the vector with the centroids
+    and then with the vectors of the ``PROBES`` closest cells only:
+    a few thousand distances instead of ``n``.
+
+    Vectors added afterwards are kept in a tail searched exhaustively
+    and removed ones are masked; both are folded into the cells once
+    the tail grows to an eighth of the index, the cells being trained
+    again only when the index has outgrown them.
+
+    Parameters
+    ----------
+    dimensions : int
+        Length of the vectors.
+    seed : int
+        Seed of the training.
+    """
+
+    def __init__(self, dimensions: int, seed: int = 0):
+        self.dimensions: int = dimensions
+        self.seed: int = seed
+
+        self.centroids: np.ndarray = np.zeros((0, dimensions), dtype=np.float32)
+
+        self._keys: List[Hashable] = []
+        self._vectors: np.ndarray = np.zeros((0, dimensions), dtype=np.float32)
+        self._alive: np.ndarray = np.zeros(0, dtype=bool)
+        # the rows of a cell are _offsets[cell]:_offsets[cell + 1], then the tail
+        self._offsets: np.ndarray = np.zeros(1, dtype=np.int64)
+        self._rows: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._rows
+
+    @property
+    def tail(self) -> int:
+        """The number of vectors added since the cells were last sorted."""
+        return len(self._keys) - int(self._offsets[-1])
+
+    def build(self, keys: Sequence[Hashable], vectors: np.ndarray):
+        """Replaces the content of the index, training new cells.
+
+        Parameters
+        ----------
+        keys : Sequence[Hashable]
+            Unique keys of the vectors.
+        vectors : np.ndarray
+            Vectors, one row per key.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dimensions)
+
+        self.centroids = self._train(vectors)
+        self._sort(list(keys), vectors)
+
+    def put(self, key: Hashable, vector: Sequence[float]):
+        """Adds a vector or replaces the vector of the key.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key of the vector.
+        vector : Sequence[float]
+            Vector.
+        """
+        self.remove(key)
+
+        row = len(self._keys)
+
+        if row == len(self._vectors):
+            # the capacity doubles, so the vectors are copied once in a while
+            vectors = np.zeros((max(2 * row, 64), self.dimensions), dtype=np.float32)
+            vectors[:row] = self._vectors
+            alive = np.zeros(len(vectors), dtype=bool)
+            alive[:row] = self._alive
+
+            self._vectors, self._alive = vectors, alive
+
+        self._vectors[row] = vector
+        self._alive[row] = True
+        self._rows[key] = row
+        self._keys.append(key)
+
+        if self.tail > max(len(self._keys) // 8, 256):
+            # the cells are trained again once they hold four times their number
+            if len(self._rows) > 4 * len(self.centroids) ** 2:
+                self.build(*self._compact())
+            else:
+                self._sort(*self._compact())
+
+    def remove(self, key: Hashable):
+        """Removes the vector of the key, if present.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key of the vector.
+        """
+        if (row := self._rows.pop(key, None)) is not None:
+            self._alive[row] = False
+
+    def search(
+        self, vector: Sequence[float], k: int, probes: int = PROBES
+    ) -> List[Tuple[Hashable, float]]:
+        """Finds the approximate nearest neighbours of a vector.
+
+        Parameters
+        ----------
+        vector : Sequence[float]
+            Vector.
+        k : int
+            The number of neighbours.
+        probes : int
+            The number of cells searched.
+
+        Returns
+        -------
+        neighbours : List[Tuple[Hashable, float]]
+            Keys and euclidean distances of the neighbours, from the closest.
+        """
+        vector = np.asarray(vector, dtype=np.float32)
+
+        cells = _closest(vector, self.centroids, probes)
+        rows = np.concatenate(
+            [
+                *(
+                    np.arange(self._offsets[cell], self._offsets[cell + 1])
+                    for cell in cells
+                ),
+                np.arange(self._offsets[-1], len(self._keys)),
+            ]
+        ).astype(np.int64)
+        rows = rows[self._alive[rows]]
+
+        distances = np.sqrt(((self._vectors[rows] - vector) ** 2).sum(axis=1))
+        nearest = _closest_indices(distances, k)
+
+        return [(self._keys[rows[i]], float(distances[i])) for i in nearest]
+
+    def _train(self, vectors: np.ndarray) -> np.ndarray:
+        """Centroids of the cells, trained by k-means on a sample."""
+        if not len(vectors):
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+
+        rng = np.random.default_rng(self.seed)
+        cells = max(int(np.sqrt(len(vectors))), 1)
+
+        if len(vectors) > TRAINING_SAMPLE:
+            vectors = vectors[rng.choice(len(vectors), TRAINING_SAMPLE, replace=False)]
+
+        centroids = vectors[rng.choice(len(vectors), cells, replace=False)]
+
+        for _ in range(TRAINING_ITERATIONS):
+            assigned = _assign(vectors, centroids)
+            counts = np.bincount(assigned, minlength=cells)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assigned, vectors)
+
+            # empty cells keep their centroids
+            filled = counts > 0
+            centroids[filled] = sums[filled] / counts[filled, None]
+
+        return centroids
+
+    def _compact(self) -> Tuple[List[Hashable], np.ndarray]:
+        """Keys and vectors of the index without the removed ones."""
+        rows = np.flatnonzero(self._alive[: len(self._keys)])
+
+        return [self._keys[row] for row in rows], self._vectors[rows]
+
+    def _sort(self, keys: List[Hashable], vectors: np.ndarray):
+        """Lays the vectors out by cell."""
+        if len(self.centroids):
+            cells = _assign(vectors, self.centroids)
+        else:
+            cells = np.zeros(len(keys), dtype=np.int64)
+
+        order = np.argsort(cells, kind="stable")
+        counts = np.bincount(cells, minlength=max(len(self.centroids), 1))
+
+        self._keys = [keys[row] for row in order]
+        self._vectors = np.ascontiguousarray(vectors[order])
+        self._alive = np.ones(len(keys), dtype=bool)
+        self._offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        self._rows = {key: row for row, key in enumerate(self._keys)}
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """The closest centroid of every vector."""
+    norms = (centroids**2).sum(axis=1)
+    cells = np.zeros(len(vectors), dtype=np.int64)
+
+    for start in range(0, len(vectors), CHUNK):
+        chunk = slice(start, start + CHUNK)
+        # the norms of the vectors don't change the closest centroid
+        cells[chunk] = np.argmin(norms - 2 * vectors[chunk] @ centroids.T, axis=1)
+
+    return cells
+
+
+def _closest(vector: np.ndarray, centroids: np.ndarray, k: int) -> np.ndarray:
+    """The closest centroids of a vector, from the closest."""
+    return _closest_indices(((centroids - vector) ** 2).sum(axis=1), k)
+
+
+def _closest_indices(distances: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` smallest distances, from the smallest."""
+    if k < len(distances):
+        partition = np.argpartition(distances, k)[:k]
+
+        return partition[np.argsort(distances[partition], kind="stable")]
+
+    return np.argsort(distances, kind="stable")
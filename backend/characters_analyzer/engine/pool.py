@@ -0,0 +1,137 @@
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache, partial
+from multiprocessing import get_context
+from typing import Dict
+
+from characters_analyzer.core.config import Settings, get_settings
+from characters_analyzer.engine.rotation import Simulation, SimulationResult, simulate
+from characters_analyzer.engine.stats import get_stat_table
+
+
+class SimulationPool:
+    """Runs simulations in a pool of processes.
+
+    Simulations are CPU-bound, so they are run outside of the event loop
+    of the worker, which keeps serving other requests meanwhile.
+
+    Results are memoized by their input: a repeated simulation is answered
+    from the cache, and concurrent identical ones share a single run.
+    A simulation that outlives the time budget of its request keeps running
+    and is cached when it finishes.
+
+    The processes are spawned on the first simulation, not forked
+    from the worker, and precompute the stat table once.
+
+    Parameters
+    ----------
+    workers : int
+        The number of processes.
+    cache_size : int
+        The number of results to keep.
+    """
+
+    def __init__(self, workers: int, cache_size: int):
+        self.workers: int = workers
+        self.cache_size: int = cache_size
+
+        self._executor: ProcessPoolExecutor | None = None
+        self._cache: OrderedDict[Simulation, SimulationResult] = OrderedDict()
+        self._pending: Dict[Simulation, asyncio.Future] = {}
+
+    async def run(self, simulation: Simulation, timeout: float) -> SimulationResult:
+        """Runs a simulation or returns the memoized result.
+
+        Parameters
+        ----------
+        simulation : Simulation
+            Input of the simulation.
+        timeout : float
+            Time budget, in seconds.
+
+        Returns
+        -------
+        result : SimulationResult
+            Result of the simulation.
+
+        Raises
+        ------
+        TimeoutError
+            If the result is not ready within the budget.
+        SimulationTimeout
+            If the simulation itself has exceeded the budget.
+        BrokenProcessPool
+            If a process has died; the next simulation starts new ones.
+        """
+        if (result := self._cache.get(simulation)) is not None:
+            self._cache.move_to_end(simulation)
+
+            return result
+
+        if (future := self._pending.get(simulation)) is None:
+            future = asyncio.get_running_loop().run_in_executor(
+                self._get_executor(), simulate, simulation, timeout
+            )
+            future.add_done_callback(partial(self._store, simulation))
+
+            self._pending[simulation] = future
+
+        # a request giving up must not cancel the run shared with others
+        return await asyncio.wait_for(asyncio.shield(future), timeout)
+
+    async def shutdown(self):
+        """Stops the processes, cancelling the simulations not started yet."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=get_context("spawn"),
+                initializer=get_stat_table,
+            )
+
+        return self._executor
+
+    def _store(self, simulation: Simulation, future: asyncio.Future):
+        self._pending.pop(simulation, None)
+
+        if future.cancelled():
+            return
+
+        if isinstance(future.exception(), BrokenProcessPool):
+            self._executor = None
+
+        if future.exception() is not None:
+            return
+
+        self._cache[simulation] = future.result()
+
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+
+@lru_cache
+def get_simulation_pool() -> SimulationPool:
+    """Returns the simulation pool of the worker.
+
+    Returns
+    -------
+    pool : SimulationPool
+        Simulation pool.
+    """
+    settings: Settings = get_settings()
+
+    return SimulationPool(settings.SIMULATION_WORKERS, settings.SIMULATION_CACHE_SIZE)
+
+
+async def shutdown_simulation_pool():
+    """Stops the simulation pool, if it has been created."""
+    if get_simulation_pool.cache_info().currsize:
+        await get_simulation_pool().shutdown()
+
+    get_simulation_pool.cache_clear()
@@ -0,0 +1,475 @@
+import heapq
+from functools import lru_cache
+from time import perf_counter
+from typing import Callable, Dict, List, NamedTuple, Tuple
+from uuid import UUID
+
+import numpy as np
+
+from characters_analyzer.database.game_data import load_game_data
+from characters_analyzer.engine.damage import expected_damage, final_stats
+from characters_analyzer.engine.stats import get_stat_table
+
+# time between the hit of a skill and the arrival of its particles
+PARTICLE_DELAY_SECONDS = 1.0
+
+# energy given by a particle to the characters of the same element / off-field ones
+SAME_ELEMENT_ENERGY = 3.0
+OTHER_ELEMENT_ENERGY = 1.0
+OFF_FIELD_ENERGY_FACTOR = 0.6
+
+# kinds of events; at the same moment a buff ends before new actions start
+# and an action applies its buff before its hits land
+BUFF_END, ACTION, HIT, PARTICLES = range(4)
+
+
+class Buff(NamedTuple):
+    """A temporary stat bonus applied when an action starts.
+
+    Attributes
+    ----------
+    stat : str
+        Key of the stat, see ``engine.stats``.
+    value : float
+        Bonus, percentages as fractions.
+    duration : float
+        Duration, in seconds.
+    team : bool
+        Whether the whole team gets the bonus, otherwise only the member.
+    """
+
+    stat: str
+    value: float
+    duration: float
+    team: bool = False
+
+
+class Action(NamedTuple):
+    """A step of a rotation.
+
+    Attributes
+    ----------
+    member : int
+        Position of the acting member in the team.
+    kind : str
+        ``normal``, ``charged``, ``skill`` or ``burst``.
+    duration : float
+        Time until the next action starts, in seconds.
+    multiplier : float
+        Talent multiplier of every hit.
+    hits : int
+        The number of hits.
+    interval : float
+        Time between the hits, e.g. ticks of a burst field.
+    scaling : str
+        Stat the hits scale with.
+    element : str | None
+        Element of the hits, the element of the member by default.
+    reaction : str | None
+        Amplifying reaction of the hits, see ``engine.damage.REACTIONS``.
+    particles : float
+        Elemental particles generated.
+    energy_cost : float
+        Energy consumed, for bursts.
+    buff : Buff | None
+        Bonus applied by the action.
+    """
+
+    member: int
+    kind: str
+    duration: float
+    multiplier: float = 0.0
+    hits: int = 1
+    interval: float = 0.0
+    scaling: str = "atk"
+    element: str | None = None
+    reaction: str | None = None
+    particles: float = 0.0
+    energy_cost: float = 0.0
+    buff: Buff | None = None
+
+
+class Member(NamedTuple):
+    """A character of the team.
+
+    Attributes
+    ----------
+    character_id : str
+        Character's UUID.
+    element : str
+        Character's element, e.g. ``pyro``.
+    level : int
+        Character's level.
+    base : Tuple[float, ...]
+        Stats of the character at its level, see ``engine.stats``.
+    bonuses : Tuple[float, ...]
+        Bonuses of its artifacts, see ``engine.damage.artifact_bonuses``.
+    weapon_atk : float
+        Base ATK of its weapon.
+    """
+
+    character_id: str
+    element: str
+    level: int
+    base: Tuple[float, ...]
+    bonuses: Tuple[float, ...]
+    weapon_atk: float = 0.0
+
+
+class Enemy(NamedTuple):
+    """The target of the rotation.
+
+    Attributes
+    ----------
+    level : int
+        Enemy's level.
+    resistance : float
+        Resistance to every element.
+    defense_reduction : float
+        DEF reduction applied to the enemy.
+    """
+
+    level: int = 90
+    resistance: float = 0.1
+    defense_reduction: float = 0.0
+
+
+class Simulation(NamedTuple):
+    """Input of a simulation.
+
+    Made of tuples of numbers and strings only, so it is compact to send
+    to another process and can be used as a key of a cache.
+
+    Attributes
+    ----------
+    team : Tuple[Member, ...]
+        Up to four characters.
+    rotation : Tuple[Action, ...]
+        Actions, in order.
+    enemy : Enemy
+        Target.
+    """
+
+    team: Tuple[Member, ...]
+    rotation: Tuple[Action, ...]
+    enemy: Enemy = Enemy()
+
+
+class SimulationResult(NamedTuple):
+    """Output of a simulation.
+
+    Attributes
+    ----------
+    damage : float
+        Total damage.
+    duration : float
+        Duration of the rotation, in seconds.
+    dps : float
+        Damage per second.
+    member_damage : Tuple[float, ...]
+        Damage of every member.
+    energy : Tuple[float, ...]
+        Energy of every member at the end.
+    missing_energy : int
+        The number of bursts skipped for lack of energy.
+    events : int
+        The number of events processed.
+    """
+
+    damage: float
+    duration: float
+    dps: float
+    member_damage: Tuple[float, ...]
+    energy: Tuple[float, ...]
+    missing_energy: int
+    events: int
+
+
+class SimulationTimeout(Exception):
+    """The simulation has exceeded its time budget."""
+
+
+@lru_cache
+def get_character_elements() -> Dict[UUID, str]:
+    """Elements of the characters of the game data.
+
+    Returns
+    -------
+    elements : Dict[UUID, str]
+        Element key, e.g. ``pyro``, by the character's UUID.
+    """
+    game_data = load_game_data()
+    elements = {
+        element["id"]: element["key"].lower() for element in game_data["element"]
+    }
+
+    return {
+        UUID(character["id"]): elements[character["element_id"]]
+        for character in game_data["character"]
+    }
+
+
+def simulate(simulation: Simulation, budget: float | None = None) -> SimulationResult:
+    """Simulates a rotation of a team.
+
+    The timeline is a queue of events: actions, the hits they schedule,
+    the ends of their buffs and the arrival of their particles. Every member
+    starts with the energy for its most expensive burst; particles restore
+    energy in proportion to the energy recharge.
+
+    The hits only record the buffs active when they land, the damage
+    of all of them is computed at the end with a few vectorized calls.
+
+    Parameters
+    ----------
+    simulation : Simulation
+        Team, rotation and enemy.
+    budget : float, optional
+        Time budget, in seconds.
+
+    Returns
+    -------
+    result : SimulationResult
+        Damage and energy over the rotation.
+
+    Raises
+    ------
+    SimulationTimeout
+        If the budget is exceeded.
+    """
+    return _Timeline(simulation, budget).run()
+
+
+class _Timeline:
+    """State of a running simulation.
+
+    Parameters
+    ----------
+    simulation : Simulation
+        Team, rotation and enemy.
+    budget : float, optional
+        Time budget, in seconds.
+    """
+
+    def __init__(self, simulation: Simulation, budget: float | None):
+        self.simulation: Simulation = simulation
+        self.budget: float | None = budget
+        self.columns: Dict[str, int] = get_stat_table().columns
+
+        team, rotation = simulation.team, simulation.rotation
+
+        self.base: np.ndarray = np.array([member.base for member in team])
+        self.bonuses: np.ndarray = np.array([member.bonuses for member in team])
+        self.weapon_atk: np.ndarray = np.array([member.weapon_atk for member in team])
+        self.buffs: np.ndarray = np.zeros_like(self.bonuses)
+
+        self.capacity: List[float] = [
+            max(
+                (
+                    action.energy_cost
+                    for action in rotation
+                    if action.member == position and action.kind == "burst"
+                ),
+                default=0.0,
+            )
+            for position in range(len(team))
+        ]
+        self.energy: List[float] = list(self.capacity)
+
+        self.queue: List[Tuple[float, int, int, int | Tuple]] = []
+        self.sequence: int = 0
+
+        self.hits: List[Tuple[int, np.ndarray]] = []
+        self.on_field: int = 0
+        self.end: float = 0.0
+        self.missing_energy: int = 0
+
+        self.handlers: Dict[int, Callable[[float, int | Tuple], None]] = {
+            ACTION: self._action,
+            BUFF_END: self._buff_end,
+            HIT: self._hit,
+            PARTICLES: self._particles,
+        }
+
+    def run(self) -> SimulationResult:
+        deadline = (
+            perf_counter() + self.budget if self.budget is not None else float("inf")
+        )
+        events = 0
+
+        if self.simulation.rotation:
+            self._schedule(0.0, ACTION, 0)
+
+        while self.queue:
+            if perf_counter() > deadline:
+                raise SimulationTimeout(f"Simulation exceeded {self.budget}s.")
+
+            time, kind, _, payload = heapq.heappop(self.queue)
+            events += 1
+
+            self.handlers[kind](time, payload)
+
+        damage = _hits_damage(
+            self.simulation, self.base, self.bonuses, self.weapon_atk, self.hits
+        )
+        member_damage = np.bincount(
+            [self.simulation.rotation[payload].member for payload, _ in self.hits],
+            weights=damage,
+            minlength=len(self.simulation.team),
+        )
+        total = float(damage.sum())
+
+        return SimulationResult(
+            damage=total,
+            duration=self.end,
+            dps=total / self.end if self.end else 0.0,
+            member_damage=tuple(member_damage.tolist()),
+            energy=tuple(self.energy),
+            missing_energy=self.missing_energy,
+            events=events,
+        )
+
+    def _schedule(self, time: float, kind: int, payload: int | Tuple):
+        heapq.heappush(self.queue, (time, kind, self.sequence, payload))
+        self.sequence += 1
+
+    def _action(self, time: float, position: int):
+        rotation = self.simulation.rotation
+        action = rotation[position]
+        member = action.member
+
+        if position + 1 < len(rotation):
+            self._schedule(time + action.duration, ACTION, position + 1)
+
+        self.on_field = member
+        self.end = max(self.end, time + action.duration)
+
+        if action.kind == "burst":
+            if self.energy[member] < action.energy_cost:
+                self.missing_energy += 1
+                return
+
+            self.energy[member] -= action.energy_cost
+
+        if (buff := action.buff) is not None:
+            targets = (
+                tuple(range(len(self.simulation.team))) if buff.team else (member,)
+            )
+            column = self.columns[buff.stat]
+
+            self.buffs[targets, column] += buff.value
+            self._schedule(
+                time + buff.duration, BUFF_END, (targets, column, buff.value)
+            )
+
+        if action.multiplier:
+            for hit in range(action.hits):
+                self._schedule(time + hit * action.interval, HIT, position)
+
+        if action.particles:
+            self._schedule(time + PARTICLE_DELAY_SECONDS, PARTICLES, position)
+
+    def _buff_end(self, _time: float, payload: Tuple):
+        targets, column, value = payload
+
+        self.buffs[targets, column] -= value
+
+    def _hit(self, time: float, position: int):
+        member = self.simulation.rotation[position].member
+
+        self.hits.append((position, self.buffs[member].copy()))
+        self.end = max(self.end, time)
+
+    def _particles(self, _time: float, position: int):
+        team = self.simulation.team
+        action = self.simulation.rotation[position]
+        element = team[action.member].element
+
+        recharge = (self.base + self.bonuses + self.buffs)[
+            :, self.columns["energy_recharge"]
+        ].tolist()
+
+        for teammate, member in enumerate(team):
+            gain = action.particles * (
+                SAME_ELEMENT_ENERGY
+                if member.element == element
+                else OTHER_ELEMENT_ENERGY
+            )
+
+            if teammate != self.on_field:
+                gain *= OFF_FIELD_ENERGY_FACTOR
+
+            self.energy[teammate] = min(
+                self.energy[teammate] + gain * recharge[teammate],
+                self.capacity[teammate] or float("inf"),
+            )
+
+
+def _hits_damage(
+    simulation: Simulation,
+    base: np.ndarray,
+    bonuses: np.ndarray,
+    weapon_atk: np.ndarray,
+    hits: List[Tuple[int, np.ndarray]],
+) -> np.ndarray:
+    """Computes the damage of the recorded hits.
+
+    Parameters
+    ----------
+    simulation : Simulation
+        Team, rotation and enemy.
+    base : np.ndarray
+        Base stats of the members, shaped ``(members, stats)``.
+    bonuses : np.ndarray
+        Bonuses of the artifacts of the members, shaped ``(members, stats)``.
+    weapon_atk : np.ndarray
+        Base ATK of the weapons of the members, shaped ``(members,)``.
+    hits : List[Tuple[int, np.ndarray]]
+        Action of every hit with the buffs active when it landed.
+
+    Returns
+    -------
+    damage : np.ndarray
+        Damage of every hit, shaped ``(hits,)``.
+    """
+    team, rotation, enemy = simulation
+
+    if not hits:
+        return np.zeros(0)
+
+    actions = [rotation[payload] for payload, _ in hits]
+    members = np.array([action.member for action in actions])
+
+    stats = final_stats(
+        base[members],
+        bonuses[members] + np.stack([active for _, active in hits]),
+        weapon_atk[members],
+    )
+    multipliers = np.array([action.multiplier for action in actions])
+    levels = np.array([team[action.member].level for action in actions])
+
+    # hits of the same kind are computed together
+    groups: Dict[Tuple[str, str, str | None], List[int]] = {}
+
+    for position, action in enumerate(actions):
+        element = action.element or team[action.member].element
+        groups.setdefault((action.scaling, element, action.reaction), []).append(
+            position
+        )
+
+    damage = np.empty(len(hits))
+
+    for (scaling, element, reaction), positions in groups.items():
+        damage[positions] = expected_damage(
+            stats[positions],
+            multipliers[positions],
+            scaling=scaling,
+            element=element,
+            character_level=levels[positions],
+            enemy_level=enemy.level,
+            enemy_resistance=enemy.resistance,
+            defense_reduction=enemy.defense_reduction,
+            reaction=reaction,
+        )
+
+    return damage
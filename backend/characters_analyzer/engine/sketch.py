@@ -0,0 +1,232 @@
+from typing import Any, Dict, Iterable
+
+import numpy as np
+
+# a digest keeps about half as many centroids
+COMPRESSION = 100
+
+
+class TDigest:
+    """Mergeable sketch of the distribution of a stream of values.
+
+    Values are summarized by weighted centroids, finer in the tails
+    of the distribution than in its middle (the ``k1`` scale function
+    of the t-digest), so a digest of any number of values takes
+    about a hundred floats and two digests are merged by compressing
+    their centroids together.
+
+    Parameters
+    ----------
+    means : Iterable[float]
+        Means of the centroids.
+    weights : Iterable[float]
+        Weights of the centroids.
+    low : float
+        The smallest value.
+    high : float
+        The largest value.
+    """
+
+    def __init__(
+        self,
+        means: Iterable[float] = (),
+        weights: Iterable[float] = (),
+        low: float = np.inf,
+        high: float = -np.inf,
+    ):
+        self.means: np.ndarray = np.asarray(means, dtype=float)
+        self.weights: np.ndarray = np.asarray(weights, dtype=float)
+        self.low: float = low
+        self.high: float = high
+
+    @property
+    def count(self) -> float:
+        """The number of summarized values."""
+        return float(self.weights.sum())
+
+    def update(self, values: Iterable[float]):
+        """Adds values to the digest.
+
+        Parameters
+        ----------
+        values : Iterable[float]
+            Values.
+        """
+        values = np.asarray(list(values), dtype=float)
+
+        if not len(values):
+            return
+
+        self.low = min(self.low, float(values.min()))
+        self.high = max(self.high, float(values.max()))
+
+        self._compress(
+            np.concatenate([self.means, values]),
+            np.concatenate([self.weights, np.ones(len(values))]),
+        )
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        """Digest of the values of both digests.
+
+        Parameters
+        ----------
+        other : TDigest
+            Another digest.
+
+        Returns
+        -------
+        digest : TDigest
+            New digest.
+        """
+        merged = TDigest(low=min(self.low, other.low), high=max(self.high, other.high))
+        merged._compress(
+            np.concatenate([self.means, other.means]),
+            np.concatenate([self.weights, other.weights]),
+        )
+
+        return merged
+
+    def cdf(self, value: float) -> float:
+        """Share of the values below the value.
+
+        Parameters
+        ----------
+        value : float
+            Value.
+
+        Returns
+        -------
+        share : float
+            Share from 0 to 1, 0 for an empty digest.
+        """
+        if not len(self.means):
+            return 0.0
+
+        # half of a centroid lies below its mean
+        centers = (np.cumsum(self.weights) - self.weights / 2) / self.count
+
+        return float(
+            np.interp(value, [self.low, *self.means, self.high], [0, *centers, 1])
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Content of the digest, e.g. to store it as JSON."""
+        return {
+            "means": self.means.tolist(),
+            "weights": self.weights.tolist(),
+            "low": self.low if len(self.means) else None,
+            "high": self.high if len(self.means) else None,
+        }
+
+    @classmethod
+    def from_dict(cls, content: Dict[str, Any]) -> "TDigest":
+        """Restores a digest from its content (see ``to_dict``)."""
+        if not content["means"]:
+            return cls()
+
+        return cls(
+            content["means"], content["weights"], content["low"], content["high"]
+        )
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray):
+        """Merges the centroids falling into the same unit of the scale."""
+        if not len(means):
+            return
+
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+
+        middles = (np.cumsum(weights) - weights / 2) / weights.sum()
+        units = np.floor(COMPRESSION / (2 * np.pi) * np.arcsin(2 * middles - 1))
+
+        # the scale grows with the values, so the clusters keep their order
+        _, clusters = np.unique(units, return_inverse=True)
+
+        self.weights = np.bincount(clusters, weights)
+        self.means = np.bincount(clusters, weights * means) / self.weights
+
+
+class Distribution:
+    """Sketch of a distribution whose values may be replaced or withdrawn.
+
+    A digest can't forget a value, so withdrawn values are summarized
+    by a second digest and subtracted from the first one.
+
+    Parameters
+    ----------
+    added : TDigest, optional
+        Added values.
+    removed : TDigest, optional
+        Withdrawn values.
+    """
+
+    def __init__(self, added: TDigest | None = None, removed: TDigest | None = None):
+        self.added: TDigest = added or TDigest()
+        self.removed: TDigest = removed or TDigest()
+
+    @property
+    def count(self) -> float:
+        """The number of values."""
+        return self.added.count - self.removed.count
+
+    def update(self, added: Iterable[float] = (), removed: Iterable[float] = ()):
+        """Adds and withdraws values.
+
+        Parameters
+        ----------
+        added : Iterable[float]
+            New values.
+        removed : Iterable[float]
+            Withdrawn values, each added before.
+        """
+        self.added.update(added)
+        self.removed.update(removed)
+
+    def merge(self, other: "Distribution") -> "Distribution":
+        """Distribution of the values of both distributions.
+
+        Parameters
+        ----------
+        other : Distribution
+            Another distribution, e.g. the changes seen by another worker.
+
+        Returns
+        -------
+        distribution : Distribution
+            New distribution.
+        """
+        return Distribution(
+            self.added.merge(other.added), self.removed.merge(other.removed)
+        )
+
+    def share_below(self, value: float) -> float:
+        """Share of the values below the value.
+
+        Parameters
+        ----------
+        value : float
+            Value.
+
+        Returns
+        -------
+        share : float
+            Share from 0 to 1, 0 for an empty distribution.
+        """
+        if self.count <= 0:
+            return 0.0
+
+        below = self.added.count * self.added.cdf(value)
+        below -= self.removed.count * self.removed.cdf(value)
+
+        return float(np.clip(below / self.count, 0, 1))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Content of the distribution, e.g. to store it as JSON."""
+        return {"added": self.added.to_dict(), "removed": self.removed.to_dict()}
+
+    @classmethod
+    def from_dict(cls, content: Dict[str, Any]) -> "Distribution":
+        """Restores a distribution from its content (see ``to_dict``)."""
+        return cls(
+            TDigest.from_dict(content["added"]), TDigest.from_dict(content["removed"])
+        )
@@ -0,0 +1,208 @@
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Tuple
+from uuid import UUID
+
+import numpy as np
+
+from characters_analyzer.database.game_data import load_game_data
+
+MAX_LEVEL = 90
+
+
+class StatTable:
+    """Base stats of every character at every level.
+
+    The table has a row for every character and every level from 0 to 90
+    (row 0 is unused) and a column for every stat of the ``stat`` dataset.
+    ``hp``, ``atk`` and ``def`` hold the base values of the character,
+    the other columns hold the bonuses: the ones every character has
+    (crit, energy recharge) and the one given by the ascensions. Percentage
+    bonuses, e.g. ``atk_percent``, apply to the base value of the character
+    and of the weapon, so they are kept apart from it.
+
+    A character at an ascension cap level (20, 40, ..., 80) is considered
+    not ascended yet, as the level alone does not say otherwise.
+
+    An extra row filled with NaN is used for the characters missing
+    from the game data.
+
+    Parameters
+    ----------
+    stats : Tuple[str, ...]
+        Keys of the stats, in the order of the columns.
+    index : Dict[UUID, int]
+        Positions of the characters in the table.
+    table : np.ndarray
+        Stats, shaped ``(characters + 1, MAX_LEVEL + 1, stats)``.
+    """
+
+    def __init__(
+        self, stats: Tuple[str, ...], index: Dict[UUID, int], table: np.ndarray
+    ):
+        self.stats: Tuple[str, ...] = stats
+        self.columns: Dict[str, int] = {key: column for column, key in enumerate(stats)}
+        self.index: Dict[UUID, int] = index
+        self.table: np.ndarray = table
+
+        self.table.flags.writeable = False
+
+    @classmethod
+    def from_game_data(cls, game_data: Dict[str, Any]) -> "StatTable":
+        """Precomputes the table from the growth curves and the ascension bonuses.
+
+        Parameters
+        ----------
+        game_data : Dict[str, Any]
+            Game data, see ``database.game_data``.
+
+        Returns
+        -------
+        table : StatTable
+            Stat table.
+        """
+        growth = game_data["growth"]
+        characters = game_data["character"]
+
+        stats = tuple(stat["key"] for stat in game_data["stat"])
+        columns = {key: column for column, key in enumerate(stats)}
+
+        levels = np.arange(MAX_LEVEL + 1)
+        curves = {
+            rarity: np.interp(levels, growth["levels"], curve)
+            for rarity, curve in growth["curves"].items()
+        }
+
+        # ascension phase of every level, the phase is raised past the cap
+        phases = np.searchsorted(growth["ascension_caps"], levels, side="left")
+        ascension = np.asarray(growth["ascension_fractions"])[phases]
+        bonus = np.asarray(growth["ascension_stat_fractions"])[phases]
+
+        table = np.zeros((len(characters) + 1, MAX_LEVEL + 1, len(stats)))
+
+        for key, value in growth["base_stats"].items():
+            table[:-1, :, columns[key]] = value
+
+        base = ("hp", "atk", "def")
+        base_columns = [columns[key] for key in base]
+
+        # (characters, levels, base stats)
+        table[:-1, :, base_columns] = (
+            np.array(
+                [[character["base"][key] for key in base] for character in characters]
+            )[:, None, :]
+            * np.array(
+                [
+                    curves["5" if character["legendary"] else "4"]
+                    for character in characters
+                ]
+            )[:, :, None]
+            + np.array(
+                [
+                    [character["ascension"][key] for key in base]
+                    for character in characters
+                ]
+            )[:, None, :]
+            * ascension[None, :, None]
+        )
+
+        # every character has a single ascension stat, so the pairs are unique
+        rows = np.arange(len(characters))
+        bonus_columns = [
+            columns[character["ascension"]["stat"]] for character in characters
+        ]
+        table[rows, :, bonus_columns] += (
+            np.array([character["ascension"]["value"] for character in characters])[
+                :, None
+            ]
+            * bonus[None, :]
+        )
+
+        table[-1] = np.nan
+
+        index = {UUID(character["id"]): row for row, character in enumerate(characters)}
+
+        return cls(stats, index, table)
+
+    def lookup(self, character_id: UUID, level: int) -> Dict[str, float]:
+        """Stats of a character at the level.
+
+        Parameters
+        ----------
+        character_id : UUID
+            Character's UUID.
+        level : int
+            Character's level (1-90).
+
+        Returns
+        -------
+        stats : Dict[str, float]
+            Stats by their keys.
+
+        Raises
+        ------
+        KeyError
+            If the character is missing from the game data.
+        """
+        row = self.table[self.index[character_id], min(max(level, 1), MAX_LEVEL)]
+
+        return dict(zip(self.stats, row.tolist()))
+
+    def compute(
+        self, character_ids: Iterable[UUID], levels: Iterable[int]
+    ) -> np.ndarray:
+        """Stats of several characters at once.
+
+        Parameters
+        ----------
+        character_ids : Iterable[UUID]
+            Characters' UUIDs.
+        levels : Iterable[int]
+            Characters' levels (1-90), in the same order.
+
+        Returns
+        -------
+        stats : np.ndarray
+            Stats, shaped ``(characters, stats)``; the rows of the characters
+            missing from the game data are NaN.
+        """
+        rows = np.fromiter(
+            (self.index.get(character_id, -1) for character_id in character_ids),
+            dtype=np.intp,
+        )
+        levels = np.clip(np.fromiter(levels, dtype=np.intp), 1, MAX_LEVEL)
+
+        return self.table[rows, levels]
+
+    def to_dicts(self, stats: np.ndarray) -> List[Dict[str, float] | None]:
+        """Converts the result of ``compute`` to dictionaries.
+
+        Parameters
+        ----------
+        stats : np.ndarray
+            Stats, shaped ``(characters, stats)``.
+
+        Returns
+        -------
+        stats : List[Dict[str, float] | None]
+            Stats by their keys, ``None`` for the characters missing from the game data.
+        """
+        missing = np.isnan(stats).any(axis=1).tolist()
+
+        return [
+            None if absent else dict(zip(self.stats, row))
+            for absent, row in zip(missing, stats.round(4).tolist())
+        ]
+
+
+@lru_cache
+def get_stat_table() -> StatTable:
+    """The stat table of the bundled game data.
+
+    Computed on the first call, then shared by the whole process.
+
+    Returns
+    -------
+    table : StatTable
+        Stat table.
+    """
+    return StatTable.from_game_data(load_game_data())
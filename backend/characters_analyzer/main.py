@@ -1,8 +1,20 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from characters_analyzer.api.services.artifact_service import on_inventory_event
+from characters_analyzer.api.services.farm_service import shutdown_farm_jobs
+from characters_analyzer.api.services.similar_service import shutdown_build_indexes
+from characters_analyzer.api.services.sketch_service import shutdown_sketch_jobs
 from characters_analyzer.api.v1 import api_v1_router
+from characters_analyzer.core import events
 from characters_analyzer.core.config import get_settings
+from characters_analyzer.core.lifecycle import InFlightMiddleware, lifecycle
+from characters_analyzer.database.engine import dispose_engine, get_engine, warm_up
+from characters_analyzer.database.game_data import load_game_data
+from characters_analyzer.engine.pool import shutdown_simulation_pool
+from characters_analyzer.engine.stats import get_stat_table
 
 settings = get_settings()
 
@@ -27,8 +39,50 @@ tags_metadata = [
         "name": "artifacts",
         "description": "Operations with **artifacts**. _Adding_, _deleting_, _updating_.",
     },
+    {
+        "name": "events",
+        "description": "**Push notifications** about changes in the user's account.",
+    },
+    {
+        "name": "simulations",
+        "description": "**Simulations** of the rotations of the user's teams.",
+    },
+    {
+        "name": "health",
+        "description": "**Liveness** and **readiness** probes of the worker.",
+    },
 ]
 
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """Application lifespan.
+
+    On startup, opens the database connections, loads the game data,
+    precomputes the tables of the engine (see ``engine``) and starts
+    listening to the events of other workers; only then the worker is ready.
+
+    On shutdown, waits for the requests in flight, runs the shutdown hooks
+    (see ``core.lifecycle``), stops listening and closes the connections.
+    """
+    await warm_up()
+    load_game_data()
+    get_stat_table()
+    await events.bridge.start(get_engine())
+
+    lifecycle.set_ready()
+
+    yield
+
+    await lifecycle.drain(settings.GRACEFUL_TIMEOUT_SECONDS)
+    await lifecycle.shutdown()
+
+    await events.bridge.stop()
+    await dispose_engine()
+
+    lifecycle.set_stopped()
+
+
 characters_analyzer = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
@@ -39,6 +93,7 @@ characters_analyzer = FastAPI(
         "email": settings.ADMIN_EMAIL,
     },
     openapi_tags=tags_metadata,
+    lifespan=lifespan,
 )
 
 characters_analyzer.add_middleware(
@@ -49,4 +104,14 @@ characters_analyzer.add_middleware(
     allow_headers=["*"],
 )
 
+characters_analyzer.add_middleware(InFlightMiddleware, lifecycle=lifecycle)
+
+events.hub.add_listener(on_inventory_event)
+
+lifecycle.on_drain(events.hub.close)
+lifecycle.on_shutdown(shutdown_simulation_pool)
+lifecycle.on_shutdown(shutdown_farm_jobs)
+lifecycle.on_shutdown(shutdown_sketch_jobs)
+lifecycle.on_shutdown(shutdown_build_indexes)
+
 characters_analyzer.include_router(api_v1_router)
@@ -13,12 +13,33 @@ have a password record to a schema without a password.
      https://docs.pydantic.dev/
 """
 
-from .artifact import Artifact, ArtifactData
+from .artifact import (
+    Artifact,
+    ArtifactData,
+    ScoredArtifactSchema,
+    StoredArtifactSchema,
+)
+from .cache import CacheStatsSchema
 from .character import (
+    BuildRankSchema,
+    CharacterBatchSchema,
     CharacterDataSchema,
     CharacterDataWithIdSchema,
+    CharacterOperationSchema,
     CharacterSchema,
     FullCharacterSchema,
+    ScoreFormulaSchema,
+    SimilarBuildSchema,
     UserCharacterSchema,
 )
+from .farm import FarmDomainSchema, FarmSetSchema
+from .good import ImportErrorSchema
+from .simulation import (
+    ActionSchema,
+    BuffSchema,
+    EnemySchema,
+    RotationSchema,
+    TeamMemberSchema,
+)
+from .usage import CharacterUsageSchema, SetUsageSchema
 from .user import UserWithPasswordSchema
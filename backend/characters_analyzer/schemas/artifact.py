@@ -1,9 +1,153 @@
-from pydantic import BaseModel
+from typing import List, Literal
+from uuid import UUID
 
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
-class Artifact(BaseModel):
-    pass
+
+class SubStatSchema(BaseModel):
+    """Scheme of an artifact's sub stat.
+
+    Attributes
+    ----------
+    sub_stat_id : UUID
+        Stat's UUID.
+    sub_stat_value : float
+        Value of the stat, percentages as they are shown in the game.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    sub_stat_id: UUID = Field(example="f33a646a-2d56-59b6-a94c-d7593f3e2de8")
+    sub_stat_value: float = Field(gt=0, example=7.8)
 
 
 class ArtifactData(BaseModel):
-    pass
+    """Scheme of the artifact's data object.
+
+    Attributes
+    ----------
+    set_id : UUID
+        Set's UUID.
+    slot : Literal["flower", "plume", "sands", "goblet", "circlet"]
+        Slot of the artifact.
+    rarity : int
+        Artifact's rarity (4-5).
+    level : int
+        Artifact's level (0-20, up to 16 for four stars).
+    main_stat_id : UUID
+        Main stat's UUID, it must fit the slot.
+    main_stat_value : float
+        Value of the main stat.
+    user_character_id : UUID, optional
+        UUID of the user's character that equips the artifact.
+    sub_stats : List[SubStatSchema]
+        Up to four different sub stats.
+    """
+
+    set_id: UUID = Field(example="c753c916-24ba-57fe-ad48-81a03d6a7810")
+    slot: Literal["flower", "plume", "sands", "goblet", "circlet"] = Field(
+        example="circlet"
+    )
+    rarity: int = Field(default=5, ge=4, le=5, example=5)
+    level: int = Field(default=0, ge=0, le=20, example=8)
+    main_stat_id: UUID = Field(example="317ec1bd-cc27-5cd6-8aef-d3aa6f6c99f7")
+    main_stat_value: float = Field(gt=0, example=10.5)
+    user_character_id: UUID | None = Field(default=None)
+    sub_stats: List[SubStatSchema] = Field(default_factory=list, max_length=4)
+
+    @model_validator(mode="after")
+    def check_stats(self) -> "ArtifactData":
+        # the engine loads numpy and the game data, so not at import time
+        from characters_analyzer.engine.artifacts import (
+            get_stat_keys,
+            get_upgrade_rules,
+        )
+
+        rules = get_upgrade_rules()
+        keys = get_stat_keys()
+
+        if self.level > rules.rarities[str(self.rarity)]["max_level"]:
+            raise ValueError(f"Level {self.level} exceeds the maximal level.")
+
+        if keys.get(self.main_stat_id) not in rules.slots[self.slot]:
+            raise ValueError(f"Main stat doesn't fit the {self.slot} slot.")
+
+        sub_stats = [keys.get(sub_stat.sub_stat_id) for sub_stat in self.sub_stats]
+
+        if any(key not in rules.index for key in sub_stats):
+            raise ValueError("Unknown sub stat.")
+
+        if (
+            len(set(sub_stats)) != len(sub_stats)
+            or keys[self.main_stat_id] in sub_stats
+        ):
+            raise ValueError("Sub stats must differ from each other and the main stat.")
+
+        return self
+
+
+class Artifact(ArtifactData):
+    """Scheme of the artifact object.
+
+    See ``ArtifactData`` for information about inherited attributes.
+
+    Attributes
+    ----------
+    id : UUID
+        Artifact's UUID.
+    """
+
+    id: UUID = Field(example="0b0d6f0e-8d6a-4c43-9a6f-0d1c2b7e8a11")
+
+
+class StoredArtifactSchema(BaseModel):
+    """Scheme of a stored artifact.
+
+    Unlike ``Artifact``, it is not validated against the game rules,
+    so it fits the artifacts stored before the slots were recorded.
+
+    Attributes
+    ----------
+    id : UUID
+        Artifact's UUID.
+    set_id : UUID
+        Set's UUID.
+    slot : str, optional
+        Slot of the artifact.
+    rarity : int
+        Artifact's rarity.
+    level : int
+        Artifact's level.
+    main_stat_id : UUID
+        Main stat's UUID.
+    main_stat_value : float
+        Value of the main stat.
+    user_character_id : UUID, optional
+        UUID of the user's character that equips the artifact.
+    sub_stats : List[SubStatSchema]
+        Sub stats.
+    """
+
+    id: UUID = Field(example="0b0d6f0e-8d6a-4c43-9a6f-0d1c2b7e8a11")
+    set_id: UUID = Field(example="c753c916-24ba-57fe-ad48-81a03d6a7810")
+    slot: str | None = Field(default=None, example="sands")
+    rarity: int = Field(example=5)
+    level: int = Field(example=20)
+    main_stat_id: UUID = Field(example="317ec1bd-cc27-5cd6-8aef-d3aa6f6c99f7")
+    main_stat_value: float = Field(example=46.6)
+    user_character_id: UUID | None = Field(default=None)
+    sub_stats: List[SubStatSchema] = Field()
+
+
+class ScoredArtifactSchema(StoredArtifactSchema):
+    """Scheme of a stored artifact with its score for a character.
+
+    See ``StoredArtifactSchema`` for information about inherited attributes.
+
+    Attributes
+    ----------
+    score : float
+        Score of the artifact by the character's formula.
+    """
+
+    score: float = Field(example=42.7)
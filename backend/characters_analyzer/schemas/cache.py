@@ -0,0 +1,31 @@
+from pydantic import BaseModel, Field
+
+
+class CacheStatsSchema(BaseModel):
+    """Scheme of the usage of a worker's cache.
+
+    Attributes
+    ----------
+    entries : int
+        The number of cached entries.
+    nbytes : int
+        Memory taken by the entries, in bytes.
+    max_bytes : int
+        Memory budget of the cache, in bytes.
+    hits : int
+        The number of requested entries found in the cache.
+    misses : int
+        The number of requested entries not found in the cache.
+    evictions : int
+        The number of entries evicted to stay within the budget.
+    hit_rate : float
+        Share of the requested entries found in the cache.
+    """
+
+    entries: int = Field(example=12)
+    nbytes: int = Field(example=2457600)
+    max_bytes: int = Field(example=67108864)
+    hits: int = Field(example=340)
+    misses: int = Field(example=12)
+    evictions: int = Field(example=0)
+    hit_rate: float = Field(example=0.966)
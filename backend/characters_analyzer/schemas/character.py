@@ -1,10 +1,14 @@
+from typing import Dict, List, Literal
 from uuid import UUID
 
 from pydantic import (
     BaseModel,
     ConfigDict,
     Field,
+    SerializerFunctionWrapHandler,
     field_validator,
+    model_serializer,
+    model_validator,
 )
 
 
@@ -128,12 +132,17 @@ class UserCharacterSchema(CharacterDataWithIdSchema):
         User's UUID.
     character_id : UUID
         Character's UUID.
+    score_formula : str, optional
+        Scoring formula of the artifacts, the default one if empty.
     """
 
     model_config = ConfigDict(from_attributes=True)
 
     id: UUID = Field(example="7a0fac1b-0ff6-46ab-906b-a4eb173bce21")
     user_id: UUID = Field(example="7a0fac1b-0ff6-46ab-906b-a4eb173bce21")
+    score_formula: str | None = Field(
+        default=None, example="atk_percent + 2 * crit_rate + crit_dmg"
+    )
 
 
 class FullCharacterSchema(CharacterSchema, UserCharacterSchema):
@@ -145,4 +154,137 @@ class FullCharacterSchema(CharacterSchema, UserCharacterSchema):
     --------
     CharacterSchema
     UserCharacterSchema
+
+    Attributes
+    ----------
+    stats : Dict[str, float], optional
+        Character's base stats at its level (see ``engine.stats``),
+        only present when requested: left out of the representation otherwise.
+    """
+
+    stats: Dict[str, float] | None = Field(
+        default=None,
+        example={"hp": 9461.18, "atk": 223.02, "crit_rate": 0.05, "crit_dmg": 0.5},
+    )
+
+    @model_serializer(mode="wrap")
+    def _omit_absent_stats(self, handler: SerializerFunctionWrapHandler):
+        data = handler(self)
+
+        if self.stats is None:
+            data.pop("stats", None)
+
+        return data
+
+
+class ScoreFormulaSchema(BaseModel):
+    """Scheme of the scoring formula of a user's character.
+
+    The formula weighs the stats of an artifact (see ``engine.formula``),
+    e.g. ``atk_percent + 2 * crit_rate + crit_dmg``.
+
+    Attributes
+    ----------
+    formula : str, optional
+        Scoring formula, None to restore the default one.
+    """
+
+    formula: str | None = Field(
+        max_length=1024, example="atk_percent + 2 * crit_rate + crit_dmg"
+    )
+
+
+class BuildRankSchema(BaseModel):
+    """Scheme of the rank of a character's build among all the users.
+
+    Attributes
+    ----------
+    metric : str
+        Metric of the build, e.g. ``crit_value``: twice the crit rate
+        plus the crit damage of the sub stats of the equipped artifacts.
+    value : float
+        Value of the metric.
+    builds : int
+        The approximate number of ranked builds of the character.
+    top : float
+        Approximate share of the builds with a value at least as high,
+        in percent: 1 means the top 1%.
+    """
+
+    metric: str = Field(example="crit_value")
+    value: float = Field(example=187.4)
+    builds: int = Field(example=5321)
+    top: float = Field(example=7.5)
+
+
+class SimilarBuildSchema(BaseModel):
+    """Scheme of a build of another user similar to a character's build.
+
+    Attributes
+    ----------
+    distance : float
+        Euclidean distance between the builds, the sub stats counted
+        in maximal rolls.
+    constellations : int
+        Constellations of the character.
+    stats : Dict[str, float]
+        Total of every sub stat of the equipped artifacts.
+    sets : Dict[UUID, int]
+        The number of equipped artifacts by set's UUID.
     """
+
+    distance: float = Field(example=1.8)
+    constellations: int = Field(example=2)
+    stats: Dict[str, float] = Field(
+        example={"atk_percent": 24.5, "crit_rate": 38.9, "crit_dmg": 85.5}
+    )
+    sets: Dict[UUID, int] = Field(example={"51d2cbcc-fde1-5208-afac-09a1a5e40f3b": 4})
+
+
+class CharacterOperationSchema(BaseModel):
+    """Scheme of a single operation of a characters' batch.
+
+    Attributes
+    ----------
+    user_character_id : UUID
+        UUID of the user character the operation is applied to.
+    action : Literal["update", "delete"]
+        Operation to perform.
+    data : CharacterDataSchema, optional
+        Character's data to put, required for the ``update`` action.
+    """
+
+    user_character_id: UUID = Field(example="7a0fac1b-0ff6-46ab-906b-a4eb173bce21")
+    action: Literal["update", "delete"] = Field(example="update")
+    data: CharacterDataSchema | None = Field(default=None)
+
+    @model_validator(mode="after")
+    def check_data_presence(self) -> "CharacterOperationSchema":
+        if self.action == "update" and self.data is None:
+            raise ValueError("Update operation requires character's data.")
+
+        return self
+
+
+class CharacterBatchSchema(BaseModel):
+    """Scheme of a characters' batch.
+
+    Used to update and delete several user's characters in one request.
+    Every user character may appear in the batch only once.
+
+    Attributes
+    ----------
+    operations : List[CharacterOperationSchema]
+        Operations to apply.
+    """
+
+    operations: List[CharacterOperationSchema] = Field(min_length=1, max_length=200)
+
+    @model_validator(mode="after")
+    def check_ids_uniqueness(self) -> "CharacterBatchSchema":
+        ids = [operation.user_character_id for operation in self.operations]
+
+        if len(ids) != len(set(ids)):
+            raise ValueError("Each user character may appear in the batch only once.")
+
+        return self
@@ -0,0 +1,47 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class FarmSetSchema(BaseModel):
+    """Scheme of an artifact set worth farming.
+
+    Attributes
+    ----------
+    set_id : UUID
+        Set's UUID.
+    domain : str
+        Domain dropping the set.
+    gain : float
+        Expected score gained by the roster with one drop of the set.
+    user_character_id : UUID, optional
+        User's character gaining the most from the set.
+    computed_at : datetime
+        When the gain has been computed.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    set_id: UUID = Field(example="51d2cbcc-fde1-5208-afac-09a1a5e40f3b")
+    domain: str = Field(example="ClearPoolAndMountainCavern")
+    gain: float = Field(example=11.3)
+    user_character_id: UUID | None = Field(
+        default=None, example="7a0fac1b-0ff6-46ab-906b-a4eb173bce21"
+    )
+    computed_at: datetime = Field(example="2026-10-19T12:00:00+00:00")
+
+
+class FarmDomainSchema(BaseModel):
+    """Scheme of a domain worth farming.
+
+    Attributes
+    ----------
+    domain : str
+        Domain.
+    gain : float
+        Expected score gained by the roster with one run of the domain.
+    """
+
+    domain: str = Field(example="ClearPoolAndMountainCavern")
+    gain: float = Field(example=5.6)
@@ -0,0 +1,21 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class ImportErrorSchema(BaseModel):
+    """Scheme of an item of a GOOD export that hasn't been imported as it is.
+
+    Attributes
+    ----------
+    section : Literal["characters", "artifacts"]
+        Section of the export.
+    index : int
+        Position of the item in the section, from zero.
+    detail : str
+        What is wrong with the item.
+    """
+
+    section: Literal["characters", "artifacts"] = Field(example="artifacts")
+    index: int = Field(example=41)
+    detail: str = Field(example="Unknown set: 'VermillionHereafter'.")
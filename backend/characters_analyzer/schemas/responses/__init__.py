@@ -20,8 +20,23 @@ specify the return type of the server [1]_.
      which will automatically include a schema description.
 """
 
-from .characters import FullCharacterResponse, FullCharactersResponse
+from .artifact import (
+    ArtifactsResponse,
+    FacetsResponse,
+    TopArtifactsResponse,
+    UpgradeResponse,
+)
+from .characters import (
+    FullCharacterResponse,
+    FullCharactersResponse,
+    RankResponse,
+    SimilarBuildsResponse,
+)
+from .farm import FarmResponse
+from .health import CachesResponse, HealthResponse
 from .info import AppInfoResponse
 from .jwt import TokenResponse
+from .simulation import SimulationResponse
 from .standard import StandardResponse
-from .user import UserResponse
+from .usage import UsageResponse
+from .user import ImportResponse, UserResponse
@@ -0,0 +1,139 @@
+from typing import Dict, List
+
+from pydantic import Field
+
+from characters_analyzer.schemas import ScoredArtifactSchema, StoredArtifactSchema
+from .standard import StandardResponse
+
+
+class UpgradeResponse(StandardResponse):
+    """Artifact upgrade estimate response model.
+
+    See ``StandardResponse`` for information about inherited attributes.
+
+    See Also
+    --------
+    .standard.StandardResponse
+
+    Attributes
+    ----------
+    fingerprint : str
+        Fingerprint of the artifact's content.
+    trials : int
+        The number of simulated upgrades.
+    seed : int
+        Seed of the random generator.
+    formula : str
+        Scoring formula.
+    sub_stats : Dict[str, Dict[str, float]]
+        Expected value and percentiles of every sub stat at the maximal level;
+        expected value and chance of the sub stats the artifact may get.
+    score : Dict[str, float]
+        Expected value and percentiles of the score at the maximal level.
+    beat_probability : float | None
+        Probability of scoring higher than the equipped artifact, if any.
+    """
+
+    fingerprint: str = Field(
+        example="5c1e1d0f4f9a3f8e2b7d6c5a4b3e2f1d0c9b8a7f6e5d4c3b2a1f0e9d8c7b6a5f"
+    )
+    trials: int = Field(example=100000)
+    seed: int = Field(example=0)
+    formula: str = Field(example="100 * (2 * crit_rate + crit_dmg)")
+    sub_stats: Dict[str, Dict[str, float]] = Field(
+        example={
+            "crit_dmg": {
+                "expected": 13.3,
+                "p5": 7.0,
+                "p25": 7.8,
+                "p50": 13.2,
+                "p75": 15.5,
+                "p95": 21.8,
+            },
+            "crit_rate": {"expected": 3.1, "chance": 0.12},
+        }
+    )
+    score: Dict[str, float] = Field(
+        example={
+            "expected": 29.5,
+            "p5": 14.0,
+            "p25": 20.2,
+            "p50": 27.2,
+            "p75": 36.5,
+            "p95": 49.0,
+        }
+    )
+    beat_probability: float | None = Field(example=0.42)
+
+
+class TopArtifactsResponse(StandardResponse):
+    """The best artifacts of a character response model.
+
+    See ``StandardResponse`` for information about inherited attributes.
+
+    See Also
+    --------
+    .standard.StandardResponse
+    schemas.artifact.ScoredArtifactSchema
+
+    Attributes
+    ----------
+    artifacts : List[ScoredArtifactSchema]
+        Artifacts, from the best.
+    """
+
+    artifacts: List[ScoredArtifactSchema] = Field()
+
+
+class ArtifactsResponse(StandardResponse):
+    """User's artifacts response model.
+
+    See ``StandardResponse`` for information about inherited attributes.
+
+    See Also
+    --------
+    .standard.StandardResponse
+    schemas.artifact.StoredArtifactSchema
+
+    Attributes
+    ----------
+    filter : str
+        Normalized filter, empty if there is none.
+    artifacts : List[StoredArtifactSchema]
+        Artifacts matching the filter.
+    """
+
+    filter: str = Field(example="level>=16 main:energy_recharge sub.crit_rate>=7")
+    artifacts: List[StoredArtifactSchema] = Field()
+
+
+class FacetsResponse(StandardResponse):
+    """Facet counts of the user's artifacts response model.
+
+    See ``StandardResponse`` for information about inherited attributes.
+
+    See Also
+    --------
+    .standard.StandardResponse
+
+    Attributes
+    ----------
+    filter : str
+        Normalized filter, empty if there is none.
+    total : int
+        The number of artifacts matching the filter.
+    facets : Dict[str, Dict[str, int]]
+        The number of matching artifacts with every set, main stat, slot,
+        equipped or not, by facet and value.
+    """
+
+    filter: str = Field(example="level>=16 sub.crit_rate>=7")
+    total: int = Field(example=42)
+    facets: Dict[str, Dict[str, int]] = Field(
+        example={
+            "set": {"5c2a4578-ecc3-510e-b1a1-e95021239200": 12},
+            "main": {"4dba3502-452c-52a3-ba78-d99991f2ff31": 3},
+            "slot": {"sands": 9, "goblet": 8},
+            "equipped": {"equipped": 30, "unequipped": 12},
+        }
+    )
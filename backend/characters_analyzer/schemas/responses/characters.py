@@ -2,7 +2,11 @@ from typing import List
 
 from pydantic import Field
 
-from schemas import FullCharacterSchema
+from characters_analyzer.schemas import (
+    BuildRankSchema,
+    FullCharacterSchema,
+    SimilarBuildSchema,
+)
 from .standard import StandardResponse
 
 
@@ -30,3 +34,37 @@ class FullCharactersResponse(StandardResponse):
     """
 
     characters: List[FullCharacterSchema] = Field()
+
+
+class RankResponse(StandardResponse):
+    """A response model with the ranks of a character's build.
+
+    See Also
+    --------
+    schemas.responses.standard.StandardResponse
+    schemas.character.BuildRankSchema
+
+    Attributes
+    ----------
+    ranks : List[BuildRankSchema]
+        Rank of the build by every metric.
+    """
+
+    ranks: List[BuildRankSchema] = Field()
+
+
+class SimilarBuildsResponse(StandardResponse):
+    """A response model with the builds of other users similar to a character's build.
+
+    See Also
+    --------
+    schemas.responses.standard.StandardResponse
+    schemas.character.SimilarBuildSchema
+
+    Attributes
+    ----------
+    builds : List[SimilarBuildSchema]
+        Similar builds, from the closest.
+    """
+
+    builds: List[SimilarBuildSchema] = Field()
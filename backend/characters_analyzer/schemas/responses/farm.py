@@ -0,0 +1,29 @@
+from typing import List
+
+from pydantic import Field
+
+from characters_analyzer.schemas import FarmDomainSchema, FarmSetSchema
+from .standard import StandardResponse
+
+
+class FarmResponse(StandardResponse):
+    """Farming recommendations response model.
+
+    See ``StandardResponse`` for information about inherited attributes.
+
+    See Also
+    --------
+    .standard.StandardResponse
+    schemas.farm.FarmSetSchema
+    schemas.farm.FarmDomainSchema
+
+    Attributes
+    ----------
+    sets : List[FarmSetSchema]
+        Sets, from the most useful.
+    domains : List[FarmDomainSchema]
+        Domains, from the most useful.
+    """
+
+    sets: List[FarmSetSchema] = Field()
+    domains: List[FarmDomainSchema] = Field()
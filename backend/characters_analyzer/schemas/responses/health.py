@@ -0,0 +1,44 @@
+from pydantic import Field
+
+from characters_analyzer.schemas import CacheStatsSchema
+from .standard import StandardResponse
+
+
+class HealthResponse(StandardResponse):
+    """Worker health check response model.
+
+    See ``StandardResponse`` for information about inherited attributes.
+
+    See Also
+    --------
+    .standard.StandardResponse
+
+    Attributes
+    ----------
+    phase : str
+        Phase of the worker: ``starting``, ``ready``, ``draining`` or ``stopped``.
+    in_flight : int
+        The number of requests being processed by the worker.
+    """
+
+    phase: str = Field(example="ready")
+    in_flight: int = Field(example=1)
+
+
+class CachesResponse(StandardResponse):
+    """Worker caches usage response model.
+
+    See ``StandardResponse`` for information about inherited attributes.
+
+    See Also
+    --------
+    .standard.StandardResponse
+    schemas.cache.CacheStatsSchema
+
+    Attributes
+    ----------
+    inventory : CacheStatsSchema
+        Usage of the inventory snapshots.
+    """
+
+    inventory: CacheStatsSchema = Field()
@@ -0,0 +1,38 @@
+from typing import List
+
+from pydantic import Field
+
+from .standard import StandardResponse
+
+
+class SimulationResponse(StandardResponse):
+    """Rotation simulation response model.
+
+    See ``StandardResponse`` for information about inherited attributes.
+
+    See Also
+    --------
+    .standard.StandardResponse
+
+    Attributes
+    ----------
+    damage : float
+        Total damage over the rotation.
+    duration : float
+        Duration of the rotation, in seconds.
+    dps : float
+        Damage per second.
+    member_damage : List[float]
+        Damage of every member of the team, in the order of the team.
+    energy : List[float]
+        Energy of every member at the end of the rotation.
+    missing_energy : int
+        The number of bursts skipped for lack of energy.
+    """
+
+    damage: float = Field(example=251382.4)
+    duration: float = Field(example=21.5)
+    dps: float = Field(example=11692.2)
+    member_damage: List[float] = Field(example=[180420.1, 40311.9, 30650.4, 0])
+    energy: List[float] = Field(example=[60, 12.4, 80, 40])
+    missing_energy: int = Field(example=0)
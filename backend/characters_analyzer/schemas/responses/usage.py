@@ -0,0 +1,32 @@
+from datetime import datetime
+from typing import List
+
+from pydantic import Field
+
+from characters_analyzer.schemas import CharacterUsageSchema
+from .standard import StandardResponse
+
+
+class UsageResponse(StandardResponse):
+    """Global usage statistics response model.
+
+    See ``StandardResponse`` for information about inherited attributes.
+
+    See Also
+    --------
+    .standard.StandardResponse
+    schemas.usage.CharacterUsageSchema
+
+    Attributes
+    ----------
+    users : int
+        The number of users.
+    characters : List[CharacterUsageSchema]
+        Statistics of the owned characters, from the most owned.
+    computed_at : datetime
+        When the statistics have been read from the counters.
+    """
+
+    users: int = Field(example=1264)
+    characters: List[CharacterUsageSchema] = Field()
+    computed_at: datetime = Field(example="2026-10-19T12:00:00+00:00")
@@ -1,8 +1,10 @@
+from typing import List
 from uuid import UUID
 
 from pydantic import EmailStr, Field
 from pydantic_extra_types.phone_numbers import PhoneNumber
 
+from characters_analyzer.schemas import ImportErrorSchema
 from .standard import StandardResponse
 
 
@@ -22,13 +24,42 @@ class UserResponse(StandardResponse):
         User's UUID.
     username : str
         User login.
-    email : EmailStr
+    email : EmailStr, optional
         The user's email address.
-    phone : PhoneNumber
+    phone : PhoneNumber, optional
         The user's mobile phone number.
     """
 
     id: UUID = Field(example="7a0fac1b-0ff6-46ab-906b-a4eb173bce21")
     username: str = Field(example="someone")
-    email: EmailStr = Field(default=None, example="someone@post.domen")
-    phone: PhoneNumber = Field(default=None, example="+7 900 000-00-00")
+    email: EmailStr | None = Field(default=None, example="someone@post.domen")
+    phone: PhoneNumber | None = Field(default=None, example="+7 900 000-00-00")
+
+
+class ImportResponse(StandardResponse):
+    """A response model with the report of an import of a GOOD export.
+
+    See Also
+    --------
+    schemas.responses.standard.StandardResponse
+    schemas.good.ImportErrorSchema
+
+    Attributes
+    ----------
+    characters : int
+        The number of imported characters, new or updated.
+    artifacts : int
+        The number of imported artifacts.
+    duplicates : int
+        The number of artifacts skipped as the user already has them.
+    errors : int
+        The number of items that haven't been imported as they are.
+    error_details : List[ImportErrorSchema]
+        The first errors, in the order of the export.
+    """
+
+    characters: int = Field(example=48)
+    artifacts: int = Field(example=1372)
+    duplicates: int = Field(example=0)
+    errors: int = Field(example=1)
+    error_details: List[ImportErrorSchema] = Field()
@@ -0,0 +1,151 @@
+from typing import List, Literal
+from uuid import UUID
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+Element = Literal[
+    "pyro", "hydro", "anemo", "electro", "dendro", "cryo", "geo", "physical"
+]
+
+
+class BuffSchema(BaseModel):
+    """Scheme of a temporary stat bonus.
+
+    Attributes
+    ----------
+    stat : str
+        Key of the stat, e.g. ``atk_percent``.
+    value : float
+        Bonus, percentages as fractions.
+    duration : float
+        Duration, in seconds.
+    team : bool
+        Whether the whole team gets the bonus, otherwise only the acting member.
+    """
+
+    stat: str = Field(example="atk_percent")
+    value: float = Field(example=0.2)
+    duration: float = Field(gt=0, le=600, example=10)
+    team: bool = Field(default=False, example=True)
+
+    @field_validator("stat")
+    @classmethod
+    def check_stat(cls, value: str) -> str:
+        from characters_analyzer.engine.stats import get_stat_table
+
+        if value in get_stat_table().columns:
+            return value
+
+        raise ValueError(f"Unknown stat: {value}.")
+
+
+class ActionSchema(BaseModel):
+    """Scheme of a step of a rotation.
+
+    Attributes
+    ----------
+    member : int
+        Position of the acting member in the team (0-3).
+    kind : Literal["normal", "charged", "skill", "burst"]
+        Kind of the action.
+    duration : float
+        Time until the next action starts, in seconds.
+    multiplier : float
+        Talent multiplier of every hit, e.g. ``1.5`` for 150%.
+    hits : int
+        The number of hits (1-100).
+    interval : float
+        Time between the hits, in seconds.
+    scaling : Literal["hp", "atk", "def", "elemental_mastery"]
+        Stat the hits scale with.
+    element : Element, optional
+        Element of the hits, the element of the character by default.
+    reaction : Literal["vaporize_hydro", "vaporize_pyro", "melt_pyro", "melt_cryo"], optional
+        Amplifying reaction of the hits.
+    particles : float
+        Elemental particles generated.
+    energy_cost : float
+        Energy consumed by a burst.
+    buff : BuffSchema, optional
+        Bonus applied by the action.
+    """
+
+    member: int = Field(ge=0, le=3, example=0)
+    kind: Literal["normal", "charged", "skill", "burst"] = Field(example="skill")
+    duration: float = Field(ge=0, le=60, example=1.5)
+    multiplier: float = Field(default=0, ge=0, example=1.5)
+    hits: int = Field(default=1, ge=1, le=100, example=1)
+    interval: float = Field(default=0, ge=0, le=60, example=0)
+    scaling: Literal["hp", "atk", "def", "elemental_mastery"] = Field(
+        default="atk", example="atk"
+    )
+    element: Element | None = Field(default=None, example="pyro")
+    reaction: Literal[
+        "vaporize_hydro", "vaporize_pyro", "melt_pyro", "melt_cryo"
+    ] | None = Field(default=None, example="vaporize_pyro")
+    particles: float = Field(default=0, ge=0, le=10, example=3)
+    energy_cost: float = Field(default=0, ge=0, le=100, example=0)
+    buff: BuffSchema | None = Field(default=None)
+
+
+class TeamMemberSchema(BaseModel):
+    """Scheme of a character of the team.
+
+    Attributes
+    ----------
+    user_character_id : UUID
+        UUID of the user's character; its level and equipped artifacts are used.
+    weapon_atk : float
+        Base ATK of the character's weapon.
+    """
+
+    user_character_id: UUID = Field(example="7a0fac1b-0ff6-46ab-906b-a4eb173bce21")
+    weapon_atk: float = Field(default=0, ge=0, le=1000, example=608)
+
+
+class EnemySchema(BaseModel):
+    """Scheme of the target of a rotation.
+
+    Attributes
+    ----------
+    level : int
+        Enemy's level (1-200).
+    resistance : float
+        Resistance to every element.
+    defense_reduction : float
+        DEF reduction applied to the enemy.
+    """
+
+    level: int = Field(default=90, ge=1, le=200, example=90)
+    resistance: float = Field(default=0.1, ge=-10, le=10, example=0.1)
+    defense_reduction: float = Field(default=0, ge=0, le=1, example=0)
+
+
+class RotationSchema(BaseModel):
+    """Scheme of a rotation to simulate.
+
+    Attributes
+    ----------
+    team : List[TeamMemberSchema]
+        Up to four user's characters.
+    rotation : List[ActionSchema]
+        Actions of the members, in order.
+    enemy : EnemySchema
+        Target.
+    """
+
+    team: List[TeamMemberSchema] = Field(min_length=1, max_length=4)
+    rotation: List[ActionSchema] = Field(min_length=1, max_length=200)
+    enemy: EnemySchema = Field(default_factory=EnemySchema)
+
+    @model_validator(mode="after")
+    def check_members(self) -> "RotationSchema":
+        ids = [member.user_character_id for member in self.team]
+
+        if len(ids) != len(set(ids)):
+            raise ValueError("Each user character may appear in the team only once.")
+
+        if any(action.member >= len(self.team) for action in self.rotation):
+            raise ValueError("Actions must refer to members of the team.")
+
+        return self
@@ -0,0 +1,53 @@
+from typing import Dict, List
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class SetUsageSchema(BaseModel):
+    """Scheme of an artifact set worn by a character.
+
+    Attributes
+    ----------
+    set_id : UUID
+        Set's UUID.
+    count : int
+        The number of the set's artifacts worn by the character, all users together.
+    """
+
+    set_id: UUID = Field(example="51d2cbcc-fde1-5208-afac-09a1a5e40f3b")
+    count: int = Field(example=1204)
+
+
+class CharacterUsageSchema(BaseModel):
+    """Scheme of the global usage statistics of a character.
+
+    Attributes
+    ----------
+    character_id : UUID
+        Character's UUID.
+    owners : int
+        The number of users owning the character.
+    ownership_rate : float
+        Share of the users owning the character.
+    constellations : Dict[int, int]
+        The number of owners by the number of constellations.
+    talents : Dict[str, Dict[int, int]]
+        The number of owners by the level of every talent:
+        ``attack_level``, ``skill_level`` and ``burst_level``.
+    sets : List[SetUsageSchema]
+        The most worn sets, from the most worn.
+    """
+
+    character_id: UUID = Field(example="23a3f6fb-6ab5-4a72-9ad9-bda4ea1ca80f")
+    owners: int = Field(example=531)
+    ownership_rate: float = Field(example=0.42)
+    constellations: Dict[int, int] = Field(example={0: 402, 1: 97, 6: 32})
+    talents: Dict[str, Dict[int, int]] = Field(
+        example={
+            "attack_level": {1: 310, 10: 221},
+            "skill_level": {9: 531},
+            "burst_level": {10: 500, 13: 31},
+        }
+    )
+    sets: List[SetUsageSchema] = Field()
@@ -0,0 +1,196 @@
+import asyncio
+import gc
+import os
+import sys
+from importlib.util import find_spec
+from types import FrameType
+from typing import Any, Callable, Dict, Optional
+
+from gunicorn.app.base import BaseApplication
+from gunicorn.arbiter import Arbiter
+from uvicorn import Server as UvicornServer
+from uvicorn.workers import UvicornWorker
+
+from characters_analyzer.core.config import Settings, get_settings
+from characters_analyzer.core.lifecycle import lifecycle
+
+# time left to the lifespan shutdown (flushing, closing connections)
+# after the requests in flight have been given their deadline
+SHUTDOWN_MARGIN_SECONDS = 10
+
+
+class DrainingServer(UvicornServer):
+    """Uvicorn server that leaves the load balancer before it stops listening.
+
+    On the first ``SIGTERM`` or ``SIGINT`` the worker starts draining: it reports
+    that it is not ready, closes keep-alive connections after their current
+    response and ends event streams, but keeps serving for ``drain_delay``
+    seconds while the load balancer notices it. Then it stops accepting
+    connections and gives the requests in flight up to
+    ``timeout_graceful_shutdown`` seconds to finish. A second signal stops
+    the server at once.
+
+    Parameters
+    ----------
+    drain_delay : float
+        How long to keep serving after the signal, in seconds.
+    **kwargs
+        ``uvicorn.Server`` arguments.
+    """
+
+    def __init__(self, drain_delay: float, **kwargs):
+        super().__init__(**kwargs)
+
+        self.drain_delay: float = drain_delay
+
+    def handle_exit(self, sig: int, frame: Optional[FrameType]):
+        if lifecycle.draining or not self.started or self.drain_delay <= 0:
+            super().handle_exit(sig, frame)
+            return
+
+        lifecycle.start_draining()
+
+        asyncio.get_event_loop().call_later(
+            self.drain_delay, super().handle_exit, sig, frame
+        )
+
+
+class Worker(UvicornWorker):
+    """Uvicorn worker using the fastest event loop and HTTP parser installed.
+
+    uvloop and httptools come with the ``speedups`` extra;
+    without them the worker falls back to asyncio and h11.
+
+    The worker is served by ``DrainingServer``, so a restart
+    or a shutdown does not drop any request.
+    """
+
+    CONFIG_KWARGS = {
+        "loop": "uvloop" if find_spec("uvloop") else "asyncio",
+        "http": "httptools" if find_spec("httptools") else "h11",
+    }
+
+    async def _serve(self):
+        settings: Settings = get_settings()
+
+        self.config.app = self.wsgi
+        self.config.timeout_graceful_shutdown = settings.GRACEFUL_TIMEOUT_SECONDS
+
+        server = DrainingServer(
+            drain_delay=settings.DRAIN_DELAY_SECONDS, config=self.config
+        )
+        self._install_sigquit_handler()
+
+        await server.serve(sockets=self.sockets)
+
+        if not server.started:
+            sys.exit(Arbiter.WORKER_BOOT_ERROR)
+
+
+class Server(BaseApplication):
+    """Production server: a gunicorn master process with uvicorn workers.
+
+    The application and the game data are loaded once in the master
+    and shared with the forked workers copy-on-write. Every worker opens
+    its own database connections in the application lifespan.
+
+    The master handles the usual gunicorn signals:
+
+    * ``HUP`` - rolling restart: new workers are forked from the master,
+      then the old ones finish their requests and exit. The application
+      is preloaded, so the new workers run the code and the settings
+      the master has loaded;
+    * ``TTIN`` / ``TTOU`` - add or remove a worker;
+    * ``USR2`` - start a new master, which loads the updated code and
+      settings, next to the old one, which is then stopped with ``TERM``;
+    * ``TERM`` - graceful shutdown: workers drain (see ``DrainingServer``)
+      and are killed if they are still running after
+      ``DRAIN_DELAY_SECONDS + GRACEFUL_TIMEOUT_SECONDS``
+      and a margin for the lifespan shutdown.
+
+    Parameters
+    ----------
+    settings : Settings
+        Application settings.
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings: Settings = settings
+
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options().items():
+            self.cfg.set(key, value)
+
+    def options(self) -> Dict[str, Any]:
+        """Gunicorn settings derived from the application settings.
+
+        Returns
+        -------
+        options : Dict[str, Any]
+            Gunicorn settings.
+        """
+        settings = self.settings
+
+        return {
+            "bind": f"{settings.DOMAIN}:{settings.BACKEND_PORT}",
+            "workers": settings.WORKERS or cpu_count(),
+            "worker_class": f"{Worker.__module__}.{Worker.__qualname__}",
+            "preload_app": True,
+            "backlog": settings.BACKLOG,
+            "keepalive": settings.KEEPALIVE_SECONDS,
+            "timeout": settings.WORKER_TIMEOUT_SECONDS,
+            "graceful_timeout": settings.DRAIN_DELAY_SECONDS
+            + settings.GRACEFUL_TIMEOUT_SECONDS
+            + SHUTDOWN_MARGIN_SECONDS,
+            "proc_name": settings.APP_NAME,
+        }
+
+    def load(self) -> Callable:
+        from characters_analyzer.database.game_data import load_game_data
+        from characters_analyzer.engine.stats import get_stat_table
+        from characters_analyzer.main import characters_analyzer
+
+        load_game_data()
+        get_stat_table()
+
+        # objects loaded so far live as long as the process, so the collector
+        # of a worker does not need to touch (and copy) their memory pages
+        gc.freeze()
+
+        return characters_analyzer
+
+
+def cpu_count() -> int:
+    """The number of CPU cores available to the process.
+
+    Takes into account CPU affinity and the cgroup quota,
+    so a container limited to two cores gets two workers.
+
+    Returns
+    -------
+    count : int
+        CPU cores, at least one.
+    """
+    count = (
+        len(os.sched_getaffinity(0))
+        if hasattr(os, "sched_getaffinity")
+        else os.cpu_count()
+    )
+
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as file:
+            quota, period = file.read().split()
+    except (OSError, ValueError):
+        pass
+    else:
+        if quota != "max":
+            count = min(count, -(-int(quota) // int(period)))
+
+    return max(count or 1, 1)
+
+
+def run():
+    """Starts the production server and blocks until it stops."""
+    Server(get_settings()).run()
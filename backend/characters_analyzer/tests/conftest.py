@@ -0,0 +1,148 @@
+from datetime import timedelta
+from typing import AnyStr, Dict
+from uuid import uuid4
+
+import pytest
+from fastapi import Request
+from httpx import AsyncClient
+from sqlalchemy import insert, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from characters_analyzer.api.dependencies import get_session, get_snapshot_session
+from characters_analyzer.api.services import farm_service
+from characters_analyzer.core.config import Settings, get_settings
+from characters_analyzer.core.jwt import create_jwt
+from characters_analyzer.database.bootstrap import seed_game_data
+from characters_analyzer.database.tables import entities, junctions  # noqa: F401
+from characters_analyzer.database.tables.base import Base
+from characters_analyzer.database.tables.entities import User
+from characters_analyzer.database.unit_of_work import UnitOfWorkSession
+from characters_analyzer.main import characters_analyzer
+
+settings: Settings = get_settings()
+
+api_url = f"http://{settings.DOMAIN}:{settings.BACKEND_PORT}/{settings.CURRENT_API_URL}"
+
+
+@pytest.fixture
+async def database():
+    """Connection to a copy of the schema filled with the game data.
+
+    The schema is created in a separate namespace inside a transaction,
+    which is rolled back afterwards.
+    """
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+
+    try:
+        connection = await engine.connect()
+    except (OSError, DBAPIError) as error:
+        pytest.skip(f"Database is unavailable: {error}")
+
+    try:
+        transaction = await connection.begin()
+
+        schema = f"test_{uuid4().hex}"
+
+        await connection.execute(text(f"CREATE SCHEMA {schema}"))
+        await connection.execute(text(f"SET LOCAL search_path TO {schema}"))
+        await connection.run_sync(Base.metadata.create_all)
+        await seed_game_data(connection)
+
+        yield connection
+
+        await transaction.rollback()
+    finally:
+        await connection.close()
+        await engine.dispose()
+
+
+@pytest.fixture
+async def scratch_url(monkeypatch):
+    """URL of a new empty database, the application settings pointing at it."""
+    engine = create_async_engine(
+        settings.DATABASE_URL, poolclass=NullPool, isolation_level="AUTOCOMMIT"
+    )
+    name = f"scratch_{uuid4().hex}"
+
+    try:
+        async with engine.connect() as connection:
+            await connection.execute(text(f"CREATE DATABASE {name}"))
+    except (OSError, DBAPIError) as error:
+        await engine.dispose()
+        pytest.skip(f"Database is unavailable: {error}")
+
+    url = make_url(settings.DATABASE_URL).set(database=name)
+    monkeypatch.setattr(
+        settings, "DATABASE_URL", url.render_as_string(hide_password=False)
+    )
+
+    try:
+        yield url
+    finally:
+        async with engine.connect() as connection:
+            await connection.execute(text(f"DROP DATABASE {name} WITH (FORCE)"))
+
+        await engine.dispose()
+
+
+@pytest.fixture
+def session_maker(database) -> async_sessionmaker:
+    """Factory of the sessions working in the transaction of ``database``.
+
+    A session joins the transaction with a savepoint, so whatever it commits
+    is still rolled back at the end of the test.
+    """
+    return async_sessionmaker(
+        bind=database,
+        class_=AsyncSession,
+        sync_session_class=UnitOfWorkSession,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    )
+
+
+@pytest.fixture
+async def client(session_maker, monkeypatch):
+    """Client of the application serving every request from ``database``."""
+
+    async def get_test_session(request: Request) -> AsyncSession:
+        async with session_maker() as session:
+            request.state.session = session
+
+            yield session
+
+    async def get_test_snapshot_session() -> AsyncSession:
+        # the transaction of ``database`` is joined, so its isolation level is kept
+        async with session_maker() as session:
+            yield session
+
+    # the recommendations are refreshed in the background, by a session of their own
+    monkeypatch.setattr(farm_service, "schedule_refresh", lambda user_id: None)
+
+    characters_analyzer.dependency_overrides[get_session] = get_test_session
+    characters_analyzer.dependency_overrides[
+        get_snapshot_session
+    ] = get_test_snapshot_session
+
+    try:
+        async with AsyncClient(app=characters_analyzer, base_url=api_url) as ac:
+            yield ac
+    finally:
+        del characters_analyzer.dependency_overrides[get_session]
+        del characters_analyzer.dependency_overrides[get_snapshot_session]
+
+
+@pytest.fixture
+def add_user(database):
+    """Adds a user and returns the headers authorizing the requests on their behalf."""
+
+    async def add_user(username: AnyStr) -> Dict[str, str]:
+        await database.execute(insert(User).values(username=username, password=""))
+        token = create_jwt({"sub": username}, timedelta(minutes=5))
+
+        return {"Authorization": f"Bearer {token}"}
+
+    return add_user
@@ -0,0 +1,164 @@
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import delete, select, update
+
+from characters_analyzer.database.game_data import load_game_data
+from characters_analyzer.database.tables.entities import CharacterSetUsage
+from characters_analyzer.database.tables.junctions import ArtifactScore, UserCharacter
+from characters_analyzer.engine.artifacts import get_stat_keys
+
+stat_ids = {key: str(id_) for id_, key in get_stat_keys().items()}
+
+LEVELS = {
+    "level": 90,
+    "constellations": 0,
+    "attack_level": 9,
+    "skill_level": 9,
+    "burst_level": 9,
+}
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def _artifact(user_character_id=None, **changes):
+    return {
+        "set_id": load_game_data()["set"][0]["id"],
+        "slot": "sands",
+        "rarity": 5,
+        "level": 20,
+        "main_stat_id": stat_ids["atk_percent"],
+        "main_stat_value": 46.6,
+        "user_character_id": user_character_id,
+        "sub_stats": [
+            {"sub_stat_id": stat_ids["crit_rate"], "sub_stat_value": 7.8},
+            {"sub_stat_id": stat_ids["crit_dmg"], "sub_stat_value": 14.0},
+        ],
+        **changes,
+    }
+
+
+async def _add_character(client, headers, character):
+    response = await client.post(
+        "/characters/append",
+        headers=headers,
+        json={"character_id": character["id"], **LEVELS},
+    )
+    assert response.status_code == 200
+
+    response = await client.get("/characters/get", headers=headers)
+
+    return response.json()["characters"][0]["id"]
+
+
+@pytest.fixture
+async def accounts(client, add_user):
+    """Two users with a character each: headers and the user character's UUID."""
+    characters = load_game_data()["character"]
+    owner, other = await add_user("owner"), await add_user("other")
+
+    return (
+        (owner, await _add_character(client, owner, characters[0])),
+        (other, await _add_character(client, other, characters[1])),
+    )
+
+
+@pytest.mark.anyio
+async def test_artifact_is_equipped_by_own_character_only(client, accounts):
+    (owner, own_character), (other, foreign_character) = accounts
+
+    foreign = await client.post(
+        "/artifacts/append", headers=owner, json=_artifact(foreign_character)
+    )
+    unknown = await client.post(
+        "/artifacts/append", headers=owner, json=_artifact(str(uuid4()))
+    )
+    own = await client.post(
+        "/artifacts/append", headers=owner, json=_artifact(own_character)
+    )
+
+    inventory = (await client.get("/artifacts/get", headers=owner)).json()
+    others = (await client.get("/artifacts/get", headers=other)).json()
+
+    assert foreign.status_code == 403
+    assert unknown.status_code == 404
+    assert own.status_code == 201
+    assert [artifact["user_character_id"] for artifact in inventory["artifacts"]] == [
+        own_character
+    ]
+    assert others["artifacts"] == []
+
+
+@pytest.mark.anyio
+async def test_upgrade_trials_are_capped(client, accounts):
+    (owner, _), _ = accounts
+
+    await client.post(
+        "/artifacts/append", headers=owner, json=_artifact(level=0, sub_stats=[])
+    )
+    inventory = (await client.get("/artifacts/get", headers=owner)).json()
+    url = f"/artifacts/upgrade/{inventory['artifacts'][0]['id']}"
+
+    too_many = await client.get(url, headers=owner, params={"trials": 1000000})
+    estimate = await client.get(url, headers=owner, params={"trials": 100000})
+
+    assert too_many.status_code == 422
+    assert estimate.status_code == 200
+    assert estimate.json()["trials"] == 100000
+
+
+@pytest.mark.anyio
+async def test_older_artifacts_are_scored_with_a_new_one(client, accounts, database):
+    (owner, own_character), _ = accounts
+
+    await client.post("/artifacts/append", headers=owner, json=_artifact(slot="goblet"))
+
+    # as if the character had been created before the scores were stored
+    await database.execute(delete(ArtifactScore))
+    await database.execute(update(UserCharacter).values(artifacts_scored=False))
+
+    await client.post("/artifacts/append", headers=owner, json=_artifact())
+    top = await client.get(f"/artifacts/top/{own_character}", headers=owner)
+    again = await client.get(f"/artifacts/top/{own_character}", headers=owner)
+
+    assert top.status_code == 200
+    assert sorted(artifact["slot"] for artifact in top.json()["artifacts"]) == [
+        "goblet",
+        "sands",
+    ]
+    assert again.json() == top.json()
+
+
+@pytest.mark.anyio
+async def test_appended_artifact_takes_off_the_piece_of_its_slot(
+    client, accounts, database
+):
+    (owner, own_character), _ = accounts
+    sub_stats = [{"sub_stat_id": stat_ids["crit_rate"], "sub_stat_value": 3.9}]
+
+    first = await client.post(
+        "/artifacts/append", headers=owner, json=_artifact(own_character)
+    )
+    second = await client.post(
+        "/artifacts/append",
+        headers=owner,
+        json=_artifact(own_character, sub_stats=sub_stats),
+    )
+
+    inventory = (await client.get("/artifacts/get", headers=owner)).json()
+    ranks = (
+        await client.get(f"/characters/rank/{own_character}", headers=owner)
+    ).json()
+    counts = await database.scalars(select(CharacterSetUsage.count))
+
+    assert first.status_code == second.status_code == 201
+    assert [
+        [sub_stat["sub_stat_value"] for sub_stat in artifact["sub_stats"]]
+        for artifact in inventory["artifacts"]
+        if artifact["user_character_id"] == own_character
+    ] == [[3.9]]
+    assert ranks["ranks"][0]["value"] == pytest.approx(7.8)
+    assert counts.all() == [1]
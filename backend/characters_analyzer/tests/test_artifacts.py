@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+
+from characters_analyzer.engine.artifacts import (
+    DEFAULT_SCORE_FORMULA,
+    Piece,
+    estimate_upgrade,
+    fingerprint_artifact,
+    get_stat_keys,
+    get_sub_stat_ids,
+    get_upgrade_rules,
+    pack_sub_stats,
+    simulate_upgrades,
+)
+from characters_analyzer.engine.formula import compile_formula
+
+rules = get_upgrade_rules()
+formula = compile_formula(DEFAULT_SCORE_FORMULA)
+piece = Piece(
+    set_id="c753c916-24ba-57fe-ad48-81a03d6a7810",
+    slot="circlet",
+    rarity=5,
+    level=0,
+    main_stat="crit_rate",
+    main_stat_value=7.0,
+    sub_stats=(("atk", 16.0), ("crit_dmg", 7.0), ("hp_percent", 5.3)),
+)
+
+
+def test_same_seed_same_result():
+    first = simulate_upgrades(piece, 1000, 7)
+    second = simulate_upgrades(piece, 1000, 7)
+    other = simulate_upgrades(piece, 1000, 8)
+
+    assert all(np.array_equal(a, b) for a, b in zip(first, second))
+    assert not np.array_equal(first[1], other[1])
+
+
+def test_new_sub_stat():
+    indices, values = simulate_upgrades(piece, 10000, 0)
+    new = indices[:, 3]
+
+    assert (new >= 0).all()
+    # the new sub stat differs from the others and the main stat
+    assert not np.isin(new, [rules.index[key] for key, _ in piece.sub_stats]).any()
+    assert not (new == rules.index["crit_rate"]).any()
+    # one roll adds the sub stat, four rolls are spread over all four
+    rolls = values / rules.max_rolls[indices]
+    rolls[:, :3] -= np.array([16.0, 7.0, 5.3]) / rules.max_rolls[indices[0, :3]]
+    assert rolls.sum(axis=1).min() == pytest.approx(5 * 0.7)
+    assert rolls.sum(axis=1).max() == pytest.approx(5 * 1.0)
+
+
+def test_maximal_level():
+    maxed = piece._replace(level=20, sub_stats=piece.sub_stats + (("def", 19.0),))
+    indices, values = simulate_upgrades(maxed, 100, 0)
+
+    assert (values == [16.0, 7.0, 5.3, 19.0]).all()
+
+    estimate = estimate_upgrade(maxed, formula, 100, 0)
+
+    assert estimate.score["p5"] == estimate.score["p95"]
+    assert estimate.score["expected"] == pytest.approx(100 * (2 * 0.311 + 0.07))
+
+
+def test_beat_probability():
+    worse = piece._replace(level=20, main_stat="atk_percent", main_stat_value=46.6)
+    better = piece._replace(
+        level=20, main_stat="crit_dmg", sub_stats=(("crit_rate", 10.5),)
+    )
+
+    assert estimate_upgrade(piece, formula, 10000, 0, worse).beat_probability == 1
+    assert estimate_upgrade(piece, formula, 10000, 0).beat_probability is None
+    assert estimate_upgrade(piece, formula, 10000, 0, better).beat_probability < 0.5
+
+
+def test_fingerprint():
+    shuffled = piece._replace(sub_stats=tuple(reversed(piece.sub_stats)))
+
+    assert piece.fingerprint() == shuffled.fingerprint()
+    assert piece.fingerprint() != piece._replace(level=4).fingerprint()
+
+
+def test_fingerprint_artifact():
+    ids = {key: id_ for id_, key in get_stat_keys().items()}
+    record = {
+        "set_id": piece.set_id,
+        "slot": piece.slot,
+        "rarity": piece.rarity,
+        "level": piece.level,
+        "main_stat_id": ids[piece.main_stat],
+        "main_stat_value": piece.main_stat_value,
+        "sub_stat_values": pack_sub_stats(
+            (ids[key], value) for key, value in piece.sub_stats
+        ),
+    }
+
+    # the record of an artifact has the fingerprint of its content
+    assert fingerprint_artifact(record) == piece.fingerprint()
+
+
+def test_pack_sub_stats():
+    ids = {key: id_ for id_, key in get_stat_keys().items()}
+    packed = pack_sub_stats([(ids["crit_dmg"], 7.0), (ids["atk"], 16.0)])
+
+    assert len(packed) == len(get_sub_stat_ids()) == len(rules.sub_stats)
+    assert packed[rules.sub_stats.index("crit_dmg")] == 7.0
+    assert packed[rules.sub_stats.index("atk")] == 16.0
+    assert sum(packed) == 23.0
+
+    # main stats only, e.g. elemental damage bonuses, have no column
+    with pytest.raises(KeyError):
+        pack_sub_stats([(ids["pyro_dmg_bonus"], 46.6)])
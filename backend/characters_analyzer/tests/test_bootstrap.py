@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+from alembic import command
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from characters_analyzer.database import bootstrap
+from characters_analyzer.database.migrations import get_config, stamp
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+async def _build_baseline(url):
+    """Creates the schema the first migration was written against."""
+    engine = create_async_engine(url, poolclass=NullPool)
+
+    async with engine.begin() as connection:
+        await connection.run_sync(bootstrap.create_missing)
+        await connection.run_sync(stamp)
+
+    await engine.dispose()
+
+    # the migrations run their own event loop
+    await asyncio.to_thread(command.downgrade, get_config(), "base")
+
+
+@pytest.mark.anyio
+async def test_baseline_schema_is_migrated(scratch_url):
+    await _build_baseline(scratch_url)
+    await bootstrap.bootstrap()
+
+    engine = create_async_engine(scratch_url, poolclass=NullPool)
+
+    async with engine.connect() as connection:
+        revision = await connection.scalar(
+            text("SELECT version_num FROM alembic_version")
+        )
+        indexes = await connection.run_sync(
+            lambda sync: {
+                index["name"] for index in inspect(sync).get_indexes("artifact")
+            }
+        )
+        datasets = await connection.scalar(text("SELECT count(*) FROM game_data"))
+
+    await engine.dispose()
+
+    assert revision == ScriptDirectory.from_config(get_config()).get_current_head()
+    assert {"artifact_user_id_idx", "artifact_fingerprint_user_id_idx"} <= indexes
+    assert datasets == len(bootstrap.DATASETS)
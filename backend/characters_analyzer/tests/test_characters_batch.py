@@ -0,0 +1,155 @@
+from uuid import uuid4
+
+import pytest
+
+from characters_analyzer.database.game_data import load_game_data
+
+LEVELS = {
+    "level": 80,
+    "constellations": 1,
+    "attack_level": 6,
+    "skill_level": 8,
+    "burst_level": 8,
+}
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+async def _append_characters(client, headers, characters):
+    for character in characters:
+        response = await client.post(
+            "/characters/append",
+            headers=headers,
+            json={"character_id": character["id"], **LEVELS},
+        )
+        assert response.status_code == 200
+
+    response = await client.get("/characters/get", headers=headers)
+
+    return {character["name"]: character for character in response.json()["characters"]}
+
+
+@pytest.fixture
+async def rosters(client, add_user):
+    characters = load_game_data()["character"]
+
+    owner, other = await add_user("owner"), await add_user("other")
+
+    return (
+        owner,
+        await _append_characters(client, owner, characters[:3]),
+        await _append_characters(client, other, characters[3:4]),
+    )
+
+
+def _update(character, **levels):
+    return {
+        "user_character_id": character["id"],
+        "action": "update",
+        "data": {**LEVELS, **levels},
+    }
+
+
+def _delete(character):
+    return {"user_character_id": character["id"], "action": "delete"}
+
+
+@pytest.mark.anyio
+async def test_batch_updates_and_deletes(client, rosters):
+    headers, roster, _ = rosters
+    first, second, third = roster.values()
+
+    response = await client.post(
+        "/characters/batch",
+        headers=headers,
+        json={
+            "operations": [
+                _update(first, level=90, constellations=6),
+                _update(second, burst_level=10),
+                _delete(third),
+            ]
+        },
+    )
+    after = await client.get("/characters/get", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["message"] == "2 characters updated, 1 deleted successfully."
+
+    characters = {
+        character["id"]: character for character in after.json()["characters"]
+    }
+
+    assert set(characters) == {first["id"], second["id"]}
+    assert characters[first["id"]]["level"] == 90
+    assert characters[first["id"]]["constellations"] == 6
+    assert characters[second["id"]]["burst_level"] == 10
+    assert characters[second["id"]]["level"] == LEVELS["level"]
+
+
+@pytest.mark.anyio
+async def test_batch_is_refused_as_a_whole(client, rosters):
+    headers, roster, others = rosters
+    first = next(iter(roster.values()))
+    stranger = next(iter(others.values()))
+    unknown = {"id": str(uuid4())}
+
+    missing = await client.post(
+        "/characters/batch",
+        headers=headers,
+        json={"operations": [_update(first, level=90), _delete(unknown)]},
+    )
+    foreign = await client.post(
+        "/characters/batch",
+        headers=headers,
+        json={"operations": [_update(first, level=90), _delete(stranger)]},
+    )
+    after = await client.get("/characters/get", headers=headers)
+
+    assert missing.status_code == 404
+    assert unknown["id"] in missing.json()["detail"]
+    assert foreign.status_code == 403
+    # nothing of a refused batch is applied
+    assert {
+        character["id"]: character["level"] for character in after.json()["characters"]
+    } == {character["id"]: LEVELS["level"] for character in roster.values()}
+
+
+@pytest.mark.anyio
+async def test_batch_is_validated(client, rosters):
+    headers, roster, _ = rosters
+    first = next(iter(roster.values()))
+
+    duplicated = await client.post(
+        "/characters/batch",
+        headers=headers,
+        json={"operations": [_update(first, level=90), _delete(first)]},
+    )
+    longest = await client.post(
+        "/characters/batch",
+        headers=headers,
+        json={"operations": [_delete({"id": str(uuid4())}) for _ in range(200)]},
+    )
+    too_long = await client.post(
+        "/characters/batch",
+        headers=headers,
+        json={"operations": [_delete({"id": str(uuid4())}) for _ in range(201)]},
+    )
+    empty = await client.post(
+        "/characters/batch", headers=headers, json={"operations": []}
+    )
+    without_data = await client.post(
+        "/characters/batch",
+        headers=headers,
+        json={"operations": [{"user_character_id": first["id"], "action": "update"}]},
+    )
+
+    assert duplicated.status_code == 422
+    assert "only once" in duplicated.text
+    # the longest batch is accepted and only then refused for its unknown ids
+    assert longest.status_code == 404
+    assert too_long.status_code == 422
+    assert empty.status_code == 422
+    assert without_data.status_code == 422
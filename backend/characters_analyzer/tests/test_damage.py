@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+from uuid import UUID
+
+import numpy as np
+import pytest
+
+from characters_analyzer.database.game_data import load_game_data
+from characters_analyzer.engine.damage import (
+    amplifying_multiplier,
+    artifact_bonuses,
+    defense_multiplier,
+    expected_damage,
+    final_stats,
+    resistance_multiplier,
+)
+from characters_analyzer.engine.stats import get_stat_table
+
+table = get_stat_table()
+stat_ids = {stat["key"]: UUID(stat["id"]) for stat in load_game_data()["stat"]}
+
+
+def _stats(**values) -> np.ndarray:
+    stats = np.zeros(len(table.stats))
+
+    for key, value in values.items():
+        stats[table.columns[key]] = value
+
+    return stats
+
+
+def test_artifact_bonuses_convert_percentages():
+    artifact = SimpleNamespace(
+        main_stat_id=stat_ids["atk_percent"],
+        main_stat_value=46.6,
+        stats=[
+            SimpleNamespace(sub_stat_id=stat_ids["atk"], sub_stat_value=19),
+            SimpleNamespace(sub_stat_id=stat_ids["crit_rate"], sub_stat_value=3.9),
+        ],
+    )
+
+    bonuses = artifact_bonuses([artifact, artifact])
+
+    assert bonuses == pytest.approx(_stats(atk_percent=0.932, atk=38, crit_rate=0.078))
+
+
+def test_final_stats_scale_base_values():
+    base = _stats(atk=100, crit_rate=0.05)
+    bonuses = np.stack([_stats(atk_percent=0.5, atk=10), _stats(crit_rate=0.2)])
+
+    stats = final_stats(base, bonuses, weapon_atk=500)
+
+    assert stats[:, table.columns["atk"]] == pytest.approx([910, 600])
+    assert stats[:, table.columns["crit_rate"]] == pytest.approx([0.05, 0.25])
+
+
+def test_multipliers():
+    assert defense_multiplier(90, 90) == pytest.approx(0.5)
+    assert defense_multiplier(90, 90, defense_reduction=0.5) == pytest.approx(190 / 285)
+    assert resistance_multiplier([-0.2, 0.1, 0.75]) == pytest.approx([1.1, 0.9, 0.25])
+    assert amplifying_multiplier(None, 100) == 1
+    assert amplifying_multiplier("melt_pyro", 0) == pytest.approx(2)
+
+    with pytest.raises(ValueError):
+        amplifying_multiplier("overload", 0)
+
+
+def test_expected_damage():
+    stats = np.stack(
+        [
+            _stats(atk=1000, crit_rate=0.5, crit_dmg=1.0, pyro_dmg_bonus=0.5),
+            _stats(atk=1000, crit_rate=1.5, crit_dmg=1.0),
+        ]
+    )
+
+    damage = expected_damage(stats, 2.0, element="pyro", enemy_resistance=0)
+
+    assert damage == pytest.approx([2000 * 1.5 * 1.5 * 0.5, 2000 * 2 * 0.5])
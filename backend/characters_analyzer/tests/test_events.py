@@ -0,0 +1,200 @@
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+
+from characters_analyzer.api.dependencies import validate_access_token
+from characters_analyzer.core import events
+from characters_analyzer.core.config import Settings, get_settings
+from characters_analyzer.core.jwt import create_jwt
+from characters_analyzer.core.lifecycle import Phase, lifecycle
+from characters_analyzer.main import characters_analyzer
+
+settings: Settings = get_settings()
+
+api_url = f"http://{settings.DOMAIN}:{settings.BACKEND_PORT}/{settings.CURRENT_API_URL}"
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class FakeDriverConnection:
+    """asyncpg connection lost as soon as ``terminate`` is called."""
+
+    def __init__(self):
+        self.listeners = {}
+        self.on_termination = None
+
+    def add_termination_listener(self, callback):
+        self.on_termination = callback
+
+    async def add_listener(self, channel, callback):
+        self.listeners[channel] = callback
+
+    async def remove_listener(self, channel, callback):
+        del self.listeners[channel]
+
+    def is_closed(self):
+        return self.on_termination is None
+
+    def terminate(self):
+        callback, self.on_termination = self.on_termination, None
+        callback(self)
+
+
+class FakeEngine:
+    """Engine failing the given number of connection attempts first."""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.attempts = 0
+        self.connections = []
+
+    @asynccontextmanager
+    async def connect(self):
+        self.attempts += 1
+
+        if self.attempts <= self.failures:
+            raise OSError("connection refused")
+
+        driver_connection = FakeDriverConnection()
+        self.connections.append(driver_connection)
+
+        async def get_raw_connection():
+            return SimpleNamespace(driver_connection=driver_connection)
+
+        yield SimpleNamespace(get_raw_connection=get_raw_connection)
+
+    async def listening(self, connections: int) -> FakeDriverConnection:
+        while len(self.connections) < connections or not self.connections[-1].listeners:
+            await asyncio.sleep(0)
+
+        return self.connections[-1]
+
+
+@pytest.mark.anyio
+async def test_slow_subscription_drops_oldest():
+    subscription = events.Subscription(uuid4(), maxsize=2)
+
+    for number in range(3):
+        subscription.put({"number": number})
+
+    assert subscription.dropped == 1
+    assert await subscription.get(timeout=0) == {"number": 1}
+    assert await subscription.get(timeout=0) == {"number": 2}
+    assert await subscription.get(timeout=0.01) is None
+
+
+@pytest.mark.anyio
+async def test_closed_subscription_wakes_up():
+    subscription = events.Subscription(uuid4(), maxsize=2)
+    waiting = asyncio.ensure_future(subscription.get(timeout=1))
+
+    await asyncio.sleep(0)
+    subscription.close()
+
+    assert await asyncio.wait_for(waiting, 0.1) is None
+    assert subscription.closed
+
+
+def test_hub_fans_out_to_user_subscriptions():
+    hub, user_id = events.Hub(), uuid4()
+    received = []
+
+    hub.add_listener(lambda user, message: received.append((user, message)))
+    first, second = hub.subscribe(user_id, 4), hub.subscribe(user_id, 4)
+    other = hub.subscribe(uuid4(), 4)
+
+    hub.publish(user_id, {"entity": "character"})
+
+    assert list(first._buffer) == list(second._buffer) == [{"entity": "character"}]
+    assert not other._buffer
+    assert received == [(user_id, {"entity": "character"})]
+    assert hub.connections == 3
+
+    hub.unsubscribe(first)
+    hub.unsubscribe(second)
+    hub.unsubscribe(second)
+
+    assert hub.connections == 1
+
+
+@pytest.mark.anyio
+async def test_bridge_reconnects_with_backoff(monkeypatch, caplog):
+    sleep, delays = asyncio.sleep, []
+
+    async def fast_sleep(delay):
+        if delay:
+            delays.append(delay)
+
+        await sleep(0)
+
+    monkeypatch.setattr(events.asyncio, "sleep", fast_sleep)
+
+    hub, engine, user_id = events.Hub(), FakeEngine(failures=2), uuid4()
+    bridge = events.PostgresBridge(hub)
+    subscription = hub.subscribe(user_id, 4)
+
+    with caplog.at_level(logging.ERROR, logger=events.__name__):
+        await bridge.start(engine)
+        connection = await asyncio.wait_for(engine.listening(1), 1)
+
+        connection.listeners[events.CHANNEL](
+            None, 0, events.CHANNEL, json.dumps({"user_id": str(user_id), "id": 1})
+        )
+        connection.terminate()
+
+        await asyncio.wait_for(engine.listening(2), 1)
+        await bridge.stop()
+
+    assert await subscription.get(timeout=0) == {"user_id": str(user_id), "id": 1}
+    # the delay grows while connecting fails and is reset once connected
+    assert delays == [1, 2, 1]
+    assert [record.message for record in caplog.records] == [
+        "Events bridge disconnected"
+    ] * 2
+
+
+@pytest.mark.anyio
+async def test_stream_requires_valid_token():
+    expired = create_jwt({"sub": "someone"}, timedelta(minutes=-1))
+
+    async with AsyncClient(app=characters_analyzer, base_url=api_url) as ac:
+        anonymous = await ac.get("/events/stream")
+        forged = await ac.get(
+            "/events/stream", headers={"Authorization": "Bearer not-a-token"}
+        )
+        outdated = await ac.get(
+            "/events/stream", headers={"Authorization": f"Bearer {expired}"}
+        )
+
+    assert anonymous.status_code == 401
+    assert forged.status_code == 401
+    assert outdated.status_code == 403
+
+
+@pytest.mark.anyio
+async def test_stream_of_draining_worker_ends_after_retry():
+    characters_analyzer.dependency_overrides[validate_access_token] = lambda: (
+        SimpleNamespace(id=uuid4())
+    )
+    lifecycle.start_draining()
+
+    try:
+        async with AsyncClient(app=characters_analyzer, base_url=api_url) as ac:
+            response = await ac.get("/events/stream")
+    finally:
+        lifecycle.phase = Phase.STARTING
+        del characters_analyzer.dependency_overrides[validate_access_token]
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text == f"retry: {settings.EVENTS_KEEPALIVE_SECONDS * 1000}\n\n"
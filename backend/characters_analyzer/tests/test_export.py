@@ -0,0 +1,172 @@
+import io
+import json
+import zipfile
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+
+from characters_analyzer.api.dependencies import get_snapshot_session
+from characters_analyzer.database.engine import dispose_engine
+from characters_analyzer.engine.export import ArchiveWriter, ExportWriter
+
+COLUMNS = [("id", "uuid"), ("slot", "str"), ("level", "int"), ("value", "float")]
+ROWS = [(uuid4(), "flower", 20, 4780.0), (uuid4(), None, 0, 7.5)]
+
+ACCOUNT = {
+    "format": "GOOD",
+    "version": 2,
+    "source": "test",
+    "characters": [{"key": "Bennett", "level": 80, "constellation": 5, "talent": {}}],
+    "artifacts": [
+        {
+            "setKey": "GladiatorsFinale",
+            "slotKey": slot,
+            "level": 20,
+            "rarity": 5,
+            "mainStatKey": "atk_",
+            "location": "Bennett",
+            "substats": [{"key": "critRate_", "value": 3.9}],
+        }
+        for slot in ("sands", "goblet")
+    ],
+}
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def exporter(client, add_user):
+    """Headers of a user with a character wearing two artifacts."""
+    headers = await add_user("exporter")
+
+    response = await client.post(
+        "/users/me/import", headers=headers, content=json.dumps(ACCOUNT)
+    )
+    assert response.status_code == 200
+
+    return headers
+
+
+def _export(format_, batches):
+    writer = ExportWriter(format_, COLUMNS)
+
+    return b"".join([*(writer.write(rows) for rows in batches), writer.close()])
+
+
+def test_ndjson_is_a_line_per_row():
+    content = _export("ndjson", [ROWS[:1], [], ROWS[1:]])
+
+    assert [json.loads(line) for line in content.splitlines()] == [
+        {"id": str(ROWS[0][0]), "slot": "flower", "level": 20, "value": 4780.0},
+        {"id": str(ROWS[1][0]), "slot": None, "level": 0, "value": 7.5},
+    ]
+
+
+def test_arrow_stream_holds_the_batches():
+    pa = pytest.importorskip("pyarrow")
+
+    table = pa.ipc.open_stream(_export("arrow", [ROWS[:1], ROWS[1:]])).read_all()
+
+    assert table.column_names == ["id", "slot", "level", "value"]
+    assert table.column("id").to_pylist() == [str(row[0]) for row in ROWS]
+    assert table.column("slot").to_pylist() == ["flower", None]
+    assert table.column("value").type == pa.float32()
+
+    empty = pa.ipc.open_stream(_export("arrow", [])).read_all()
+
+    assert empty.num_rows == 0 and empty.column_names == table.column_names
+
+
+def test_parquet_file_has_a_row_group_per_batch():
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    file = pq.ParquetFile(io.BytesIO(_export("parquet", [ROWS[:1], ROWS[1:]])))
+
+    assert file.num_row_groups == 2
+    assert file.read().column("level").to_pylist() == [20, 0]
+
+
+def test_archive_holds_a_file_per_table():
+    archive = ArchiveWriter()
+    content = b"".join(
+        [
+            archive.open("characters.ndjson"),
+            archive.write(b'{"level": 80}\n'),
+            archive.write(b""),
+            archive.open("artifacts.ndjson"),
+            archive.close(),
+        ]
+    )
+
+    with zipfile.ZipFile(io.BytesIO(content)) as file:
+        assert file.testzip() is None
+        assert file.namelist() == ["characters.ndjson", "artifacts.ndjson"]
+        assert file.read("characters.ndjson") == b'{"level": 80}\n'
+        assert file.read("artifacts.ndjson") == b""
+
+
+@pytest.mark.anyio
+async def test_ndjson_account_names_the_table_of_every_line(client, exporter):
+    response = await client.get("/users/me/export", headers=exporter)
+    lines = [json.loads(line) for line in response.text.splitlines()]
+
+    assert response.status_code == 200
+    assert response.headers["content-disposition"].endswith('"account.ndjson"')
+    assert [line["table"] for line in lines] == ["characters"] + ["artifacts"] * 2
+    assert lines[0]["level"] == 80
+    assert {line["user_character_id"] for line in lines[1:]} == {lines[0]["id"]}
+    assert [line["crit_rate"] for line in lines[1:]] == [3.9, 3.9]
+
+
+@pytest.mark.anyio
+async def test_columnar_account_is_an_archive_of_the_tables(client, exporter):
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    response = await client.get(
+        "/users/me/export", headers=exporter, params={"format": "parquet"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+
+    with zipfile.ZipFile(io.BytesIO(response.content)) as file:
+        assert file.namelist() == ["characters.parquet", "artifacts.parquet"]
+
+        characters = pq.read_table(io.BytesIO(file.read("characters.parquet")))
+        artifacts = pq.read_table(io.BytesIO(file.read("artifacts.parquet")))
+
+    assert characters.column("level").to_pylist() == [80]
+    assert artifacts.column("user_character_id").to_pylist() == (
+        characters.column("id").to_pylist() * 2
+    )
+
+
+@pytest.mark.anyio
+async def test_single_table_is_exported_alone(client, exporter):
+    response = await client.get(
+        "/users/me/export", headers=exporter, params={"table": "artifacts"}
+    )
+    lines = [json.loads(line) for line in response.text.splitlines()]
+
+    assert response.headers["content-disposition"].endswith('"artifacts.ndjson"')
+    assert len(lines) == 2 and "table" not in lines[0]
+
+
+@pytest.mark.anyio
+async def test_snapshot_session_is_read_only_and_repeatable(database):
+    sessions = get_snapshot_session()
+
+    try:
+        session = await anext(sessions)
+
+        isolation = await session.scalar(text("SHOW transaction_isolation"))
+        read_only = await session.scalar(text("SHOW transaction_read_only"))
+    finally:
+        await sessions.aclose()
+        await dispose_engine()
+
+    assert (isolation, read_only) == ("repeatable read", "on")
@@ -0,0 +1,97 @@
+from uuid import uuid4
+
+import numpy as np
+
+from characters_analyzer.api.services.artifact_service import (
+    get_facet_cache,
+    on_inventory_event,
+)
+from characters_analyzer.engine.artifacts import get_upgrade_rules
+from characters_analyzer.engine.facets import FacetCache, FacetIndex
+from characters_analyzer.engine.filters import parse_filter
+
+rules = get_upgrade_rules()
+
+
+def _columns(set_ids, slots, equipped, crit_rates):
+    sub_stat_values = np.zeros((len(set_ids), len(rules.sub_stats)))
+    sub_stat_values[:, rules.index["crit_rate"]] = crit_rates
+
+    return {
+        "set_id": np.array(set_ids, dtype=object),
+        "slot": np.array(slots, dtype=object),
+        "main_stat_id": np.array(["1"] * len(set_ids), dtype=object),
+        "user_character_id": np.array(equipped, dtype=object),
+        "level": np.full(len(set_ids), 20),
+        "rarity": np.full(len(set_ids), 5),
+        "sub_stat_values": sub_stat_values,
+    }
+
+
+def _index(ids=None):
+    return FacetIndex(
+        ids or [uuid4() for _ in range(3)],
+        _columns(["a", "b", "a"], ["sands", "sands", "plume"], [None, "c", None], 0),
+    )
+
+
+def test_counts():
+    counts = _index().counts()
+
+    assert counts["set"] == {"a": 2, "b": 1}
+    assert counts["slot"] == {"plume": 1, "sands": 2}
+    assert counts["equipped"] == {"equipped": 1, "unequipped": 2}
+    assert counts["main"] == {"1": 3}
+
+
+def test_counts_within_a_filter():
+    counts = _index().counts(parse_filter("unequipped slot:sands"))
+
+    assert counts["set"] == {"a": 1, "b": 0}
+    assert counts["equipped"] == {"equipped": 0, "unequipped": 1}
+
+
+def test_artifacts_are_appended():
+    index = _index()
+    ids = [uuid4() for _ in range(100)]
+
+    index.add(ids, _columns(["d"] * 100, ["goblet"] * 100, ["c"] * 100, 5))
+
+    assert len(index) == 103 and ids[-1] in index
+    assert index.counts()["set"] == {"a": 2, "b": 1, "d": 100}
+    assert index.counts(parse_filter("sub.crit_rate>=5"))["slot"] == {
+        "goblet": 100,
+        "plume": 0,
+        "sands": 0,
+    }
+
+
+def test_least_recently_used_indexes_are_evicted():
+    cache = FacetCache(2)
+
+    cache.put("a", first := _index())
+    cache.put("b", _index())
+    assert cache.get("a") is first
+
+    cache.put("c", _index())
+
+    assert len(cache) == 2
+    assert cache.get("b") is None and cache.get("a") is first
+
+
+def test_indexes_are_dropped_on_changes():
+    user_id, known, unknown = uuid4(), uuid4(), uuid4()
+    index = _index([known, uuid4(), uuid4()])
+
+    get_facet_cache().put(user_id, index)
+
+    on_inventory_event(user_id, {"entity": "character", "action": "updated"})
+    on_inventory_event(
+        user_id, {"entity": "artifact", "action": "created", "id": str(known)}
+    )
+    assert get_facet_cache().get(user_id) is index
+
+    on_inventory_event(
+        user_id, {"entity": "artifact", "action": "created", "id": str(unknown)}
+    )
+    assert get_facet_cache().get(user_id) is None
@@ -0,0 +1,128 @@
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from characters_analyzer.core.jobs import Debouncer
+from characters_analyzer.engine.artifacts import DEFAULT_SCORE_FORMULA, get_stat_keys
+from characters_analyzer.engine.farm import (
+    SLOTS,
+    domain_gains,
+    get_domain_sets,
+    recommend,
+)
+from characters_analyzer.engine.formula import compile_formula
+
+formula = compile_formula(DEFAULT_SCORE_FORMULA)
+stat_ids = {key: id_ for id_, key in get_stat_keys().items()}
+sets = get_domain_sets()
+main_stats = ("hp", "atk", "atk_percent", "pyro_dmg_bonus", "crit_rate")
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def _artifact(set_id: str, slot: str, main_stat: str, crit_dmg: float):
+    return SimpleNamespace(
+        set_id=set_id,
+        slot=slot,
+        rarity=5,
+        level=20,
+        main_stat_id=stat_ids[main_stat],
+        main_stat_value=0,
+        stats=[
+            SimpleNamespace(sub_stat_id=stat_ids["crit_dmg"], sub_stat_value=crit_dmg)
+        ],
+    )
+
+
+def _character(set_id: str, crit_dmg: float):
+    return SimpleNamespace(
+        id=uuid4(),
+        artifacts=[
+            _artifact(set_id, slot, main_stat, crit_dmg)
+            for slot, main_stat in zip(SLOTS, main_stats)
+        ],
+    )
+
+
+def test_weak_artifacts_are_worth_replacing():
+    weak, strong = _character(sets[0][0], 0.1), _character(sets[1][0], 15)
+
+    gains = {
+        set_gain.set_id: set_gain for set_gain in recommend([weak, strong], formula)
+    }
+
+    assert gains[sets[0][0]].gain > gains[sets[1][0]].gain > 0
+    assert gains[sets[0][0]].user_character_id == str(weak.id)
+    # nobody wears the other sets
+    assert gains[sets[2][0]].gain == 0
+    assert gains[sets[2][0]].user_character_id is None
+
+
+def test_characters_without_artifacts_wear_any_set():
+    naked = SimpleNamespace(id=uuid4(), artifacts=[])
+
+    set_gains = recommend([naked], formula)
+
+    assert len({set_gain.gain for set_gain in set_gains}) == 1
+    assert all(set_gain.user_character_id == str(naked.id) for set_gain in set_gains)
+    assert all(set_gain.gain == 0 for set_gain in recommend([], formula))
+
+
+def test_domain_gains():
+    set_gains = recommend([_character(sets[0][0], 0.1)], formula)
+    domains = domain_gains(set_gains)
+
+    # a domain drops either of its sets
+    assert domains[sets[0][1]] == pytest.approx(
+        sum(set_gain.gain for set_gain in set_gains if set_gain.domain == sets[0][1])
+        / 2
+    )
+    assert list(domains)[0] == sets[0][1]
+
+
+@pytest.mark.anyio
+async def test_debouncer_runs_once_per_burst():
+    runs = []
+
+    async def job(key):
+        runs.append(key)
+
+    debouncer = Debouncer(job, 0.05)
+
+    for _ in range(5):
+        debouncer.schedule("a")
+
+    debouncer.schedule("b")
+    await asyncio.sleep(0.1)
+
+    assert sorted(runs) == ["a", "b"]
+
+    debouncer.schedule("a")
+    await debouncer.shutdown()
+
+    assert runs[-1] == "a" and len(runs) == 3
+
+
+@pytest.mark.anyio
+async def test_debouncer_does_not_overlap_runs():
+    running, overlaps = set(), []
+
+    async def job(key):
+        overlaps.append(key in running)
+        running.add(key)
+        await asyncio.sleep(0.05)
+        running.discard(key)
+
+    debouncer = Debouncer(job, 0.01)
+
+    debouncer.schedule("a")
+    await asyncio.sleep(0.02)
+    debouncer.schedule("a")
+    await asyncio.sleep(0.15)
+
+    assert overlaps == [False, False]
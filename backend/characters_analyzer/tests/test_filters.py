@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from characters_analyzer.engine.artifacts import get_stat_keys, get_upgrade_rules
+from characters_analyzer.engine.filters import FilterError, parse_filter
+
+rules = get_upgrade_rules()
+stat_ids = {key: str(id_) for id_, key in get_stat_keys().items()}
+
+
+def _columns():
+    sub_stat_values = np.zeros((3, len(rules.sub_stats)))
+    sub_stat_values[0, rules.index["crit_rate"]] = 7.8
+    sub_stat_values[1, rules.index["crit_rate"]] = 3.1
+    sub_stat_values[1, rules.index["crit_dmg"]] = 14.0
+
+    return {
+        "set_id": np.array(["a", "b", "a"]),
+        "slot": np.array(["sands", "sands", None], dtype=object),
+        "main_stat_id": np.array(
+            [stat_ids["energy_recharge"], stat_ids["atk_percent"], stat_ids["hp"]]
+        ),
+        "user_character_id": np.array([None, "c", None], dtype=object),
+        "level": np.array([20, 16, 0]),
+        "rarity": np.array([5, 5, 4]),
+        "sub_stat_values": sub_stat_values,
+    }
+
+
+def _sql(text: str) -> str:
+    return str(parse_filter(text).clause.compile(dialect=postgresql.dialect()))
+
+
+def test_normalized_filters_are_compiled_once():
+    first = parse_filter('set:"Emblem" main:ER sub.crit_rate>=7 level>=16 unequipped')
+    second = parse_filter(
+        "unequipped  LEVEL>=16.0 sub.cr>=7 main:energy_recharge set:emblem"
+    )
+
+    assert first is second
+    assert first.source == (
+        "level>=16 main:energy_recharge set:emblem sub.crit_rate>=7 unequipped"
+    )
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["foo:1", "weird", "set:nothing", "slot:hat", "sub.pyro_dmg_bonus>1", "level>=x"],
+)
+def test_invalid_filters(text):
+    with pytest.raises(FilterError):
+        parse_filter(text)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("", [True, True, True]),
+        ("sub.crit_rate>=7", [True, False, False]),
+        # an absent sub stat counts as zero
+        ("sub.crit_rate<5", [False, True, True]),
+        ("sub:crit_dmg", [False, True, False]),
+        ("main:er unequipped", [True, False, False]),
+        ("-slot:sands", [False, False, True]),
+        ("equipped level>=16", [False, True, False]),
+        ("rarity=5 -sub.cd>0", [True, False, False]),
+    ],
+)
+def test_evaluate(text, expected):
+    assert parse_filter(text).evaluate(_columns()).tolist() == expected
+
+
+def test_sub_stats_are_filtered_with_exists():
+    assert "EXISTS" in _sql("sub.crit_rate>=7")
+    assert "NOT" not in _sql("sub.crit_rate>=7")
+    # matching absent sub stats, so no sub stat may fail the comparison
+    assert "NOT (EXISTS" in _sql("sub.crit_rate<5")
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from characters_analyzer.engine.formula import FormulaError, compile_formula
+from characters_analyzer.engine.stats import get_stat_table
+
+table = get_stat_table()
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "__import__('os').system('true')",
+        "atk.__class__",
+        "atk[0]",
+        "(lambda: atk)()",
+        "unknown * 2",
+        "max(atk)",
+        "True + atk",
+        "'atk'",
+        "atk if crit_rate",
+        "-" * 300 + "atk",
+        "atk +",
+    ],
+)
+def test_rejects_formula(text):
+    with pytest.raises(FormulaError):
+        compile_formula(text)
+
+
+def test_formulas_are_cached_by_normalized_text():
+    formula = compile_formula("atk*(1+crit_rate*crit_dmg)")
+
+    assert compile_formula("atk * (1 + (crit_rate * crit_dmg))") is formula
+    assert formula.variables == {"atk", "crit_rate", "crit_dmg"}
+
+
+def test_evaluates_builds_at_once():
+    text = "atk * (1 + min(crit_rate, 1) * crit_dmg) + (100 if elemental_mastery > 50 else 0)"
+    stats = np.random.default_rng(0).random((1000, len(table.stats))) * 100
+
+    scores = compile_formula(text).evaluate(stats)
+
+    expected = [
+        eval(text, {"min": min}, dict(zip(table.stats, row))) for row in stats.tolist()
+    ]
+
+    assert scores.shape == (1000,)
+    assert scores == pytest.approx(expected)
+
+
+def test_constant_formula_broadcasts():
+    assert (
+        compile_formula("1 / 0").evaluate(np.zeros((3, len(table.stats)))).tolist()
+        == [np.inf] * 3
+    )
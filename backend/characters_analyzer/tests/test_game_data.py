@@ -0,0 +1,37 @@
+from collections import Counter
+
+import pytest
+
+from characters_analyzer.database.bootstrap import DATASETS
+from characters_analyzer.database.game_data import load_game_data
+from characters_analyzer.database.tables import entities, junctions  # noqa: F401
+from characters_analyzer.database.tables.base import Base
+
+game_data = load_game_data()
+
+
+@pytest.mark.parametrize("dataset", DATASETS)
+def test_records_fill_table_columns(dataset):
+    table = Base.metadata.tables[dataset]
+    required = {column.name for column in table.columns}
+
+    for record in game_data[dataset]:
+        assert required <= record.keys(), record
+
+    ids = Counter(record["id"] for record in game_data[dataset])
+    assert max(ids.values()) == 1
+
+
+@pytest.mark.parametrize("dataset", DATASETS)
+def test_foreign_keys_point_backwards(dataset):
+    table = Base.metadata.tables[dataset]
+
+    for foreign_key in table.foreign_keys:
+        referenced = foreign_key.column.table.name
+
+        assert DATASETS.index(referenced) < DATASETS.index(dataset)
+
+        ids = {record["id"] for record in game_data[referenced]}
+        column = foreign_key.parent.name
+
+        assert {record[column] for record in game_data[dataset]} <= ids
@@ -0,0 +1,115 @@
+import json
+from uuid import UUID
+
+import pytest
+
+from characters_analyzer.database.game_data import load_game_data
+from characters_analyzer.engine.good import (
+    GoodError,
+    GoodReader,
+    read_artifact,
+    read_character,
+)
+
+ARTIFACT = {
+    "setKey": "GladiatorsFinale",
+    "slotKey": "sands",
+    "level": 20,
+    "rarity": 5,
+    "mainStatKey": "atk_",
+    "location": "Bennett",
+    "lock": True,
+    "substats": [
+        {"key": "critRate_", "value": 3.9},
+        {"key": "critDMG_", "value": 14.8},
+        {"key": "", "value": 0},
+    ],
+}
+
+
+def _ids(dataset):
+    return {
+        record["good_key"]: UUID(record["id"]) for record in load_game_data()[dataset]
+    }
+
+
+def _read(document, size):
+    reader = GoodReader()
+    items = []
+
+    for start in range(0, len(document), size):
+        chunk = slice(start, start + size)
+        items.extend(reader.feed(document[chunk]))
+
+    return reader, items + reader.close()
+
+
+def test_reader_yields_the_items_whatever_the_chunks():
+    document = json.dumps(
+        {
+            "format": "GOOD",
+            "version": 2,
+            "characters": [{"key": "Amber", "talent": {"auto": 2}}],
+            "weapons": [{"key": "DullBlade", "location": "Amber"}],
+            "artifacts": [ARTIFACT, ARTIFACT],
+        }
+    ).encode()
+
+    for size in (1, 7, len(document)):
+        reader, items = _read(document, size)
+
+        assert reader.format == "GOOD"
+        assert [section for section, _ in items] == [
+            "characters",
+            "artifacts",
+            "artifacts",
+        ]
+        assert items[1][1]["substats"][1] == {"key": "critDMG_", "value": 14.8}
+
+
+def test_reader_rejects_invalid_json():
+    with pytest.raises(GoodError, match="Invalid JSON"):
+        _read(b'{"format": "GOOD", "characters": [}', 4)
+
+
+def test_read_character_and_artifact():
+    character = read_character(
+        {"key": "Bennett", "level": 80, "constellation": 5, "talent": {"burst": 9}}
+    )
+
+    assert character == {
+        "character_id": _ids("character")["Bennett"],
+        "level": 80,
+        "constellations": 5,
+        "attack_level": 1,
+        "skill_level": 1,
+        "burst_level": 9,
+    }
+
+    artifact, location = read_artifact(ARTIFACT)
+
+    assert location == _ids("character")["Bennett"]
+    assert artifact["set_id"] == _ids("set")["GladiatorsFinale"]
+    assert artifact["main_stat_value"] == 46.6
+    assert [sub_stat["sub_stat_id"] for sub_stat in artifact["sub_stats"]] == [
+        _ids("stat")["critRate_"],
+        _ids("stat")["critDMG_"],
+    ]
+
+    artifact, location = read_artifact({**ARTIFACT, "level": 0, "location": ""})
+
+    assert location is None
+    assert artifact["main_stat_value"] == 7.0
+
+
+@pytest.mark.parametrize(
+    "item, message",
+    [
+        ({"setKey": "Unknown"}, "Unknown set"),
+        ({"mainStatKey": "pyro"}, "Unknown stat"),
+        ({"location": "Nobody"}, "Unknown character"),
+    ],
+)
+def test_read_artifact_rejects_unknown_keys(item, message):
+    with pytest.raises(GoodError, match=message):
+        read_artifact({**ARTIFACT, **item})
@@ -0,0 +1,93 @@
+import json
+
+import pytest
+from sqlalchemy import select
+
+from characters_analyzer.database.tables.entities import CharacterSetUsage
+
+CHARACTER = {"key": "Bennett", "level": 80, "constellation": 5, "talent": {}}
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def _artifact(slot, crit_rate, location="Bennett"):
+    return {
+        "setKey": "GladiatorsFinale",
+        "slotKey": slot,
+        "level": 20,
+        "rarity": 5,
+        "mainStatKey": "atk_",
+        "location": location,
+        "substats": [{"key": "critRate_", "value": crit_rate}],
+    }
+
+
+async def _import(client, headers, **sections):
+    # the sections are read in this order
+    document = {"format": "GOOD", "version": 2, "source": "test", **sections}
+    response = await client.post(
+        "/users/me/import", headers=headers, content=json.dumps(document)
+    )
+    assert response.status_code == 200
+
+    return response.json()
+
+
+async def _worn(client, headers):
+    inventory = (await client.get("/artifacts/get", headers=headers)).json()
+
+    return sorted(
+        (artifact["slot"], artifact["sub_stats"][0]["sub_stat_value"])
+        for artifact in inventory["artifacts"]
+        if artifact["user_character_id"] is not None
+    )
+
+
+@pytest.mark.anyio
+async def test_reimport_takes_off_the_pieces_of_the_same_slots(
+    client, add_user, database
+):
+    headers = await add_user("importer")
+
+    await _import(
+        client,
+        headers,
+        characters=[CHARACTER],
+        artifacts=[_artifact("sands", 3.1), _artifact("goblet", 3.5)],
+    )
+    report = await _import(
+        client,
+        headers,
+        artifacts=[
+            _artifact("sands", 3.9),
+            _artifact("sands", 7.0),
+            _artifact("sands", 6.2),
+        ],
+    )
+    counts = await database.scalars(select(CharacterSetUsage.count))
+
+    assert report["artifacts"] == 3
+    assert await _worn(client, headers) == [("goblet", 3.5), ("sands", 6.2)]
+    assert counts.all() == [2]
+
+
+@pytest.mark.anyio
+async def test_pieces_read_before_their_character_fill_a_slot_once(
+    client, add_user, database
+):
+    headers = await add_user("importer")
+
+    report = await _import(
+        client,
+        headers,
+        artifacts=[_artifact("sands", 3.9), _artifact("sands", 7.0)],
+        characters=[CHARACTER],
+    )
+    counts = await database.scalars(select(CharacterSetUsage.count))
+
+    assert report["artifacts"] == 2
+    assert await _worn(client, headers) == [("sands", 7.0)]
+    assert counts.all() == [1]
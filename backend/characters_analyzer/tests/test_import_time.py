@@ -0,0 +1,95 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Set, Tuple
+
+import pytest
+
+BACKEND_ROOT = Path(__file__).parents[2]
+
+# cumulative import time of the application, microseconds, about 1.1 s
+# measured; may be raised on slow machines with the IMPORT_TIME_BUDGET_US variable
+IMPORT_TIME_BUDGET_US = int(os.getenv("IMPORT_TIME_BUDGET_US", 1_500_000))
+
+# loaded on first use: migrations, password hashing, JWT crypto and database driver
+DEFERRED_MODULES = ("alembic", "passlib", "bcrypt", "cryptography", "asyncpg")
+
+# loaded by the validators of the schemas on first use: numpy and the game data
+DEFERRED_BY_SCHEMAS = (
+    "numpy",
+    "characters_analyzer.engine.artifacts",
+    "characters_analyzer.engine.stats",
+)
+
+
+def _import_report(module: str) -> Tuple[Set[str], List[Tuple[int, int, str]]]:
+    """Imports the module in a fresh interpreter with ``-X importtime``.
+
+    Parameters
+    ----------
+    module : str
+        Name of the module to import.
+
+    Returns
+    -------
+    report : Tuple[Set[str], List[Tuple[int, int, str]]]
+        Names of the loaded modules and ``(self, cumulative, name)``
+        import times in microseconds.
+    """
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"import sys, {module}; print(*sys.modules)",
+        ],
+        cwd=BACKEND_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    timings = []
+
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        timings.append((int(self_us), int(cumulative_us), name.strip()))
+
+    return set(completed.stdout.split()), timings
+
+
+@pytest.fixture(scope="module")
+def report():
+    return _import_report("characters_analyzer.main")
+
+
+def test_heavy_modules_are_deferred(report):
+    modules, _ = report
+
+    assert not modules.intersection(DEFERRED_MODULES)
+
+
+def test_schemas_defer_the_engine():
+    modules, _ = _import_report("characters_analyzer.schemas")
+
+    assert not modules.intersection(DEFERRED_BY_SCHEMAS)
+
+
+def test_import_time_budget(report):
+    _, timings = report
+
+    total = next(
+        cumulative
+        for _, cumulative, name in timings
+        if name == "characters_analyzer.main"
+    )
+    slowest = "\n".join(
+        f"{self_us:>8} us  {name}" for self_us, _, name in sorted(timings)[-10:]
+    )
+
+    assert total <= IMPORT_TIME_BUDGET_US, f"slowest imports:\n{slowest}"
@@ -0,0 +1,143 @@
+import json
+from importlib import import_module
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from characters_analyzer.core.config import Settings, get_settings
+from characters_analyzer.database.tables import entities, junctions  # noqa: F401
+from characters_analyzer.database.tables.base import Base
+
+settings: Settings = get_settings()
+
+migration = import_module(
+    "characters_analyzer.database.migrations.versions.0001_access_path_indexes"
+)
+
+ACCESS_PATHS = {
+    "artifact_user_id_idx": "SELECT set_id, main_stat_id FROM artifact WHERE user_id = :id",
+    "artifact_user_character_id_idx": "SELECT * FROM artifact WHERE user_character_id = :id",
+    "artifact_set_id_idx": "SELECT id FROM artifact WHERE set_id = :id",
+    "artifact_main_stat_id_idx": "SELECT id FROM artifact WHERE main_stat_id = :id",
+    "artifact_sub_stat_sub_stat_id_idx": "SELECT artifact_id FROM artifact_sub_stat "
+    "WHERE sub_stat_id = :id AND sub_stat_value >= 7",
+    "user_character_character_id_idx": "SELECT id FROM user_character "
+    "WHERE character_id = :id",
+}
+
+# the best artifacts of a character come from the index already sorted
+TOP_ARTIFACTS = {
+    "artifact_score_user_character_id_score_idx": "SELECT artifact_id FROM artifact_score "
+    "WHERE user_character_id = :id ORDER BY score DESC LIMIT 20",
+    "artifact_score_user_character_id_slot_score_idx": "SELECT artifact_id "
+    "FROM artifact_score WHERE user_character_id = :id AND slot = 'sands' "
+    "ORDER BY score DESC LIMIT 20",
+}
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def connection():
+    """Connection to an empty copy of the schema.
+
+    The schema is created in a separate namespace inside a transaction,
+    which is rolled back afterwards. Sequential scans are disabled, so
+    the planner falls back to them only if no index fits the query.
+    """
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+
+    try:
+        connection = await engine.connect()
+    except (OSError, DBAPIError) as error:
+        pytest.skip(f"Database is unavailable: {error}")
+
+    try:
+        transaction = await connection.begin()
+
+        schema = f"explain_{uuid4().hex}"
+
+        await connection.execute(text(f"CREATE SCHEMA {schema}"))
+        await connection.execute(text(f"SET LOCAL search_path TO {schema}"))
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(text("SET LOCAL enable_seqscan = off"))
+
+        yield connection
+
+        await transaction.rollback()
+    finally:
+        await connection.close()
+        await engine.dispose()
+
+
+def _index_names(plan: dict) -> set:
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+
+    for subplan in plan.get("Plans", ()):
+        names |= _index_names(subplan)
+
+    return names
+
+
+def _node_types(plan: dict) -> set:
+    types = {plan["Node Type"]}
+
+    for subplan in plan.get("Plans", ()):
+        types |= _node_types(subplan)
+
+    return types
+
+
+async def _explain(connection, query: str) -> dict:
+    result = await connection.execute(
+        text(f"EXPLAIN (FORMAT JSON) {query}"), {"id": uuid4()}
+    )
+    plan = result.scalar()
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return plan[0]["Plan"]
+
+
+def test_migration_matches_models():
+    declared = {
+        (index.name, table.name, tuple(column.name for column in index.columns))
+        for table in Base.metadata.tables.values()
+        for index in table.indexes
+        if index.name in ACCESS_PATHS
+    }
+    migrated = {
+        (name, table_name, tuple(columns))
+        for name, table_name, columns, _ in migration.INDEXES
+    }
+
+    assert declared == migrated
+    assert set(ACCESS_PATHS) == {name for name, _, _ in migrated}
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("index_name", sorted(ACCESS_PATHS))
+async def test_access_path_uses_index(connection, index_name):
+    plan = await _explain(connection, ACCESS_PATHS[index_name])
+
+    assert index_name in _index_names(plan)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("index_name", sorted(TOP_ARTIFACTS))
+async def test_top_artifacts_are_not_sorted(connection, index_name):
+    # sorting is still chosen if no index yields the order
+    await connection.execute(text("SET LOCAL enable_sort = off"))
+
+    plan = await _explain(connection, TOP_ARTIFACTS[index_name])
+
+    assert index_name in _index_names(plan)
+    assert "Sort" not in _node_types(plan)
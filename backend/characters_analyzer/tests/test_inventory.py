@@ -0,0 +1,87 @@
+from uuid import uuid4
+
+import numpy as np
+
+from characters_analyzer.engine.artifacts import get_upgrade_rules
+from characters_analyzer.engine.filters import parse_filter
+from characters_analyzer.engine.inventory import Inventory, InventoryCache
+
+rules = get_upgrade_rules()
+
+
+def _columns(count, set_id="a", character=None, crit_rate=0.0):
+    sub_stat_values = np.zeros((count, len(rules.sub_stats)))
+    sub_stat_values[:, rules.index["crit_rate"]] = crit_rate
+
+    return {
+        "set_id": np.array([set_id] * count, dtype=object),
+        "slot": np.array(["sands"] * count, dtype=object),
+        "main_stat_id": np.array(["1"] * count, dtype=object),
+        "main_stat_value": np.full(count, 46.6),
+        "user_character_id": np.array([character] * count, dtype=object),
+        "level": np.full(count, 20),
+        "rarity": np.full(count, 5),
+        "sub_stat_values": sub_stat_values,
+    }
+
+
+def test_columns_are_decoded():
+    ids = [uuid4() for _ in range(3)]
+    inventory = Inventory(ids, _columns(3, character="c", crit_rate=7.8))
+
+    columns = inventory.columns
+
+    assert inventory.ids == ids and ids[1] in inventory
+    assert columns["set_id"].tolist() == ["a"] * 3
+    assert columns["user_character_id"].tolist() == ["c"] * 3
+    assert columns["main_stat_value"].tolist() == [np.float32(46.6)] * 3
+    assert parse_filter("sub.crit_rate<=7.8 equipped").evaluate(columns).all()
+
+
+def test_artifacts_are_patched_in_place():
+    ids = [uuid4() for _ in range(3)]
+    inventory = Inventory(ids, _columns(3))
+
+    inventory.put(new := [uuid4() for _ in range(100)], _columns(100, set_id="b"))
+    inventory.put(ids[:1], _columns(1, set_id="c", character="x"))
+
+    assert len(inventory) == 103
+    assert inventory.columns["set_id"][:4].tolist() == ["c", "a", "a", "b"]
+
+    assert inventory.remove([ids[1], uuid4()]) == 1
+    assert inventory.ids == [ids[0], ids[2], *new]
+
+    inventory.unequip(uuid4())
+    assert inventory.columns["user_character_id"][0] == "x"
+
+    inventory.unequip("x")
+    assert inventory.columns["user_character_id"][0] is None
+
+
+def test_least_recently_used_inventories_are_evicted_within_the_budget():
+    inventories = [Inventory([uuid4()], _columns(1)) for _ in range(3)]
+    cache = InventoryCache(2 * inventories[0].nbytes)
+
+    cache.put("a", inventories[0])
+    cache.put("b", inventories[1])
+    assert cache.get("a") is inventories[0]
+
+    cache.put("c", inventories[2])
+
+    assert cache.get("b") is None
+    assert cache.nbytes <= cache.max_bytes
+    assert cache.stats() == {
+        "entries": 2,
+        "nbytes": 2 * inventories[0].nbytes,
+        "max_bytes": cache.max_bytes,
+        "hits": 1,
+        "misses": 1,
+        "evictions": 1,
+        "hit_rate": 0.5,
+    }
+
+    # an inventory outgrowing the whole budget is not kept either
+    inventories[2].put([uuid4() for _ in range(200)], _columns(200))
+    cache.trim()
+
+    assert len(cache) == 0 and cache.evictions == 3
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+
+from characters_analyzer.core.config import Settings, get_settings
+from characters_analyzer.core.lifecycle import Phase, lifecycle
+from characters_analyzer.main import characters_analyzer
+
+settings: Settings = get_settings()
+
+api_url = f"http://{settings.DOMAIN}:{settings.BACKEND_PORT}/{settings.CURRENT_API_URL}"
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def phase():
+    yield
+
+    lifecycle.phase = Phase.STARTING
+
+
+@pytest.mark.anyio
+async def test_readiness_follows_phase():
+    async with AsyncClient(app=characters_analyzer, base_url=api_url) as ac:
+        starting = await ac.get("/health/ready")
+
+        lifecycle.set_ready()
+        ready = await ac.get("/health/ready")
+
+        lifecycle.start_draining()
+        draining = await ac.get("/health/ready")
+        live = await ac.get("/health/live")
+
+    assert starting.status_code == 503
+    assert ready.status_code == 200
+    assert ready.headers.get("connection") != "close"
+    assert draining.status_code == 503
+    assert draining.json()["phase"] == "draining"
+    assert draining.headers["connection"] == "close"
+    assert live.status_code == 200
+
+
+@pytest.mark.anyio
+async def test_drain_waits_for_requests_in_flight():
+    async def request():
+        with lifecycle.track():
+            await asyncio.sleep(0.2)
+
+    task = asyncio.ensure_future(request())
+    await asyncio.sleep(0)
+
+    assert lifecycle.in_flight == 1
+    assert await lifecycle.drain(timeout=1)
+    assert lifecycle.in_flight == 0
+
+    await task
+
+
+@pytest.mark.anyio
+async def test_drain_gives_up_at_deadline():
+    with lifecycle.track():
+        assert not await lifecycle.drain(timeout=0.1)
+
+
+@pytest.mark.anyio
+async def test_caches_are_reported_to_authorized_users(client, add_user):
+    headers = await add_user("operator")
+
+    anonymous = await client.get("/health/caches")
+    authorized = await client.get("/health/caches", headers=headers)
+
+    assert anonymous.status_code == 401
+    assert authorized.status_code == 200
+    assert "inventory" in authorized.json()
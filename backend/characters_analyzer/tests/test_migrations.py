@@ -0,0 +1,192 @@
+import asyncio
+from importlib import import_module
+
+import pytest
+from alembic import command
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from characters_analyzer.database import bootstrap
+from characters_analyzer.database.game_data import load_game_data
+from characters_analyzer.database.migrations import get_config
+from characters_analyzer.engine.artifacts import (
+    get_stat_keys,
+    get_sub_stat_ids,
+    pack_sub_stats,
+)
+
+stat_ids = {key: id_ for id_, key in get_stat_keys().items()}
+
+sub_stat_values = import_module(
+    "characters_analyzer.database.migrations.versions.0005_artifact_sub_stat_values"
+)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+async def _add_artifacts(url, sub_stats, packed=False):
+    """Adds an artifact with every given set of sub stats to a new user.
+
+    With ``packed``, the copy of the sub stats in the artifact is filled too.
+    """
+    engine = create_async_engine(url, poolclass=NullPool)
+
+    async with engine.begin() as connection:
+        user_id = await connection.scalar(
+            text(
+                'INSERT INTO "user" (id, username, password) '
+                "VALUES (gen_random_uuid(), 'owner', '') RETURNING id"
+            )
+        )
+
+        for stats in sub_stats:
+            artifact_id = await connection.scalar(
+                text(
+                    "INSERT INTO artifact "
+                    "(user_id, set_id, slot, rarity, level, main_stat_id, main_stat_value"
+                    + (", sub_stat_values" if packed else "")
+                    + ") VALUES (:user_id, :set_id, 'sands', 5, 20, :main_stat_id, 46.6"
+                    + (", :sub_stat_values" if packed else "")
+                    + ") RETURNING id"
+                ),
+                {
+                    "user_id": user_id,
+                    "set_id": load_game_data()["set"][0]["id"],
+                    "main_stat_id": stat_ids["atk_percent"],
+                    "sub_stat_values": pack_sub_stats(
+                        (stat_ids[key], value) for key, value in stats.items()
+                    ),
+                },
+            )
+
+            for key, value in stats.items():
+                await connection.execute(
+                    text(
+                        "INSERT INTO artifact_sub_stat "
+                        "(artifact_id, sub_stat_id, sub_stat_value) "
+                        "VALUES (:artifact_id, :sub_stat_id, :value)"
+                    ),
+                    {
+                        "artifact_id": artifact_id,
+                        "sub_stat_id": stat_ids[key],
+                        "value": value,
+                    },
+                )
+
+    await engine.dispose()
+
+
+async def _upgrade(url, revision):
+    """Applies the migrations, recording the statements and the commits.
+
+    Returns
+    -------
+    log : List[Tuple[str, str | None]]
+        Statements with the isolation level they ran with, and commits.
+    """
+    engine = create_async_engine(url, poolclass=NullPool)
+    log = []
+
+    def upgrade(connection):
+        @event.listens_for(connection, "before_cursor_execute")
+        def execute(connection, cursor, statement, *args):
+            log.append(
+                (statement, connection.get_execution_options().get("isolation_level"))
+            )
+
+        @event.listens_for(connection, "commit")
+        def commit(connection):
+            log.append(("COMMIT", None))
+
+        config = get_config()
+        config.attributes["connection"] = connection
+
+        command.upgrade(config, revision)
+
+    async with engine.connect() as connection:
+        await connection.run_sync(upgrade)
+
+    await engine.dispose()
+
+    return log
+
+
+def _assert_backfilled_in_committed_batches(log, column):
+    # the column is added and committed before any row is updated
+    added = _position(log, f"ALTER TABLE artifact ADD COLUMN {column}")
+    assert added < _position(log, "COMMIT") < _position(log, "UPDATE artifact")
+    assert {
+        isolation_level
+        for statement, isolation_level in log
+        if statement.startswith("UPDATE artifact")
+    } == {"AUTOCOMMIT"}
+
+
+def _position(log, prefix):
+    return next(
+        position
+        for position, (statement, _) in enumerate(log)
+        if statement.startswith(prefix)
+    )
+
+
+def test_sub_stat_order_is_frozen():
+    assert sub_stat_values.SUB_STAT_IDS == tuple(map(str, get_sub_stat_ids()))
+
+
+@pytest.mark.anyio
+async def test_sub_stat_values_are_backfilled_in_committed_batches(scratch_url):
+    await bootstrap.bootstrap()
+    await asyncio.to_thread(command.downgrade, get_config(), "0004")
+
+    sub_stats = [{"crit_rate": 3.9, "crit_dmg": 7.8}, {"hp": 299.0}, {}]
+    await _add_artifacts(scratch_url, sub_stats)
+
+    log = await _upgrade(scratch_url, "0005")
+
+    _assert_backfilled_in_committed_batches(log, "sub_stat_values")
+
+    engine = create_async_engine(scratch_url, poolclass=NullPool)
+
+    async with engine.connect() as connection:
+        result = await connection.execute(text("SELECT sub_stat_values FROM artifact"))
+        values = sorted(row.sub_stat_values for row in result)
+
+    await engine.dispose()
+
+    # the application reads the copy in its own order
+    expected = [
+        pack_sub_stats((stat_ids[key], value) for key, value in stats.items())
+        for stats in sub_stats
+    ]
+
+    assert values == sorted(expected)
+
+
+@pytest.mark.anyio
+async def test_fingerprints_are_backfilled_in_committed_batches(scratch_url):
+    await bootstrap.bootstrap()
+    await asyncio.to_thread(command.downgrade, get_config(), "0008")
+
+    sub_stats = [{"crit_rate": 3.9}, {"crit_rate": 3.9}, {"hp": 299.0}]
+    await _add_artifacts(scratch_url, sub_stats, packed=True)
+
+    log = await _upgrade(scratch_url, "0009")
+
+    _assert_backfilled_in_committed_batches(log, "fingerprint")
+
+    engine = create_async_engine(scratch_url, poolclass=NullPool)
+
+    async with engine.connect() as connection:
+        result = await connection.execute(text("SELECT fingerprint FROM artifact"))
+        fingerprints = [row.fingerprint for row in result]
+
+    await engine.dispose()
+
+    # of the two copies, only one gets a fingerprint
+    assert fingerprints.count(None) == 1
+    assert len(set(fingerprints) - {None}) == 2
@@ -0,0 +1,70 @@
+import numpy as np
+
+from characters_analyzer.engine.neighbors import IVFIndex
+
+
+def _clusters(rng, n, dimensions=10):
+    centers = rng.gamma(2, 1.5, (30, dimensions))
+
+    return centers[rng.integers(0, 30, n)] + rng.normal(0, 0.8, (n, dimensions))
+
+
+def test_search_finds_most_of_the_nearest_neighbours():
+    rng = np.random.default_rng(0)
+    vectors = _clusters(rng, 20000)
+
+    index = IVFIndex(10)
+    index.build(list(range(len(vectors))), vectors)
+
+    recall = 0
+
+    for vector in vectors[rng.integers(0, len(vectors), 20)]:
+        found = [key for key, _ in index.search(vector, 10)]
+        exact = np.argsort(((vectors - vector) ** 2).sum(axis=1))[:10]
+
+        recall += len(set(found) & set(exact.tolist())) / 10
+
+    assert recall / 20 > 0.9
+
+
+def test_search_returns_the_closest_first():
+    vectors = np.eye(4) * np.arange(1, 5)[:, None]
+
+    index = IVFIndex(4)
+    index.build(["a", "b", "c", "d"], vectors)
+
+    neighbours = index.search(np.zeros(4), 4, probes=4)
+
+    assert [key for key, _ in neighbours] == ["a", "b", "c", "d"]
+    assert [round(distance) for _, distance in neighbours] == [1, 2, 3, 4]
+
+
+def test_put_replaces_and_remove_forgets_vectors():
+    rng = np.random.default_rng(1)
+    vectors = _clusters(rng, 1000)
+
+    index = IVFIndex(10)
+    index.build(list(range(1000)), vectors)
+
+    index.put(5, vectors[7])
+    index.remove(7)
+    index.put("new", vectors[9] + 0.01)
+
+    assert len(index) == 1000 and 7 not in index and index.tail == 2
+    assert index.search(vectors[7], 1)[0][0] == 5
+    assert [key for key, _ in index.search(vectors[9], 2)] == [9, "new"]
+
+
+def test_tail_is_folded_into_the_cells():
+    rng = np.random.default_rng(2)
+    vectors = _clusters(rng, 3000)
+
+    index = IVFIndex(10)
+
+    for key, vector in enumerate(vectors):
+        index.put(key, vector)
+
+    assert len(index) == 3000
+    assert index.tail < 3000 and len(index.centroids) > 1
+    assert index.search(vectors[123], 1)[0][0] == 123
+    assert IVFIndex(10).search(vectors[0], 5) == []
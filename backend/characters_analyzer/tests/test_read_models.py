@@ -0,0 +1,163 @@
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import update
+from sqlalchemy.dialects import postgresql
+
+from characters_analyzer.api.dependencies import (
+    validate_access_token,
+    validate_access_token_record,
+)
+from characters_analyzer.api.read_models import character_read_model, user_read_model
+from characters_analyzer.api.services import character_service, user_service
+from characters_analyzer.core.jwt import create_jwt
+from characters_analyzer.database.game_data import load_game_data
+from characters_analyzer.database.tables.entities import User
+from characters_analyzer.schemas import FullCharacterSchema, UserCharacterSchema
+from characters_analyzer.schemas.responses import FullCharactersResponse, UserResponse
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def accounts(client, add_user, database):
+    """A reader with a couple of characters and a person with contacts."""
+    reader = await add_user("reader")
+    await add_user("person")
+    await database.execute(
+        update(User)
+        .where(User.username == "person")
+        .values(email="person@example.com", phone="+14155552671")
+    )
+
+    for character in load_game_data()["character"][:2]:
+        response = await client.post(
+            "/characters/append",
+            headers=reader,
+            json={
+                "character_id": character["id"],
+                "level": 80,
+                "constellations": 1,
+                "attack_level": 6,
+                "skill_level": 8,
+                "burst_level": 9,
+            },
+        )
+        assert response.status_code == 200
+
+    return reader
+
+
+async def _orm_user(session_maker, username):
+    async with session_maker() as session:
+        user = await user_service.get_user_by_username(session, username)
+
+        return UserResponse.model_validate(user, from_attributes=True)
+
+
+async def _orm_characters(session_maker, username):
+    """The characters as read through the ORM before the read models."""
+    async with session_maker() as session:
+        user = await user_service.get_user_by_username(session, username)
+        characters = []
+
+        for user_character in await character_service.get_user_characters_by_user(user):
+            character = await user_character.awaitable_attrs.character
+            info = UserCharacterSchema.model_validate(user_character).model_dump()
+            info.update(
+                {
+                    "name": character.name,
+                    "legendary": character.legendary,
+                    "weapon": (await character.awaitable_attrs.weapon).title,
+                    "element": (await character.awaitable_attrs.element).title,
+                    "region": (await character.awaitable_attrs.region).title,
+                }
+            )
+            characters.append(FullCharacterSchema(**info))
+
+        return FullCharactersResponse(characters=characters)
+
+
+def test_statements_are_built_once():
+    assert user_read_model._user_statement() is user_read_model._user_statement()
+    assert (
+        character_read_model._full_characters_statement()
+        is character_read_model._full_characters_statement()
+    )
+
+
+def test_rows_fit_response_models():
+    user = user_read_model._user_statement()
+    characters = character_read_model._full_characters_statement()
+
+    assert set(user.selected_columns.keys()) == set(UserResponse.model_fields) - {
+        "code",
+        "message",
+    }
+    assert set(characters.selected_columns.keys()) == set(
+        FullCharacterSchema.model_fields
+    ) - {"stats"}
+
+
+def test_characters_are_read_with_one_statement():
+    compiled = character_read_model._full_characters_statement().compile(
+        dialect=postgresql.dialect()
+    )
+
+    assert str(compiled).count("JOIN") == 4
+    assert list(compiled.params) == ["user_id"]
+
+
+@pytest.mark.anyio
+async def test_token_record_matches_the_user(session_maker, accounts):
+    token = create_jwt({"sub": "reader"}, timedelta(minutes=5))
+    stranger = create_jwt({"sub": "stranger"}, timedelta(minutes=5))
+
+    async with session_maker() as session:
+        record = await validate_access_token_record(token, session)
+        user = await validate_access_token(token, session)
+
+        with pytest.raises(HTTPException) as error:
+            await validate_access_token_record(stranger, session)
+
+    assert dict(record) == {
+        "id": user.id,
+        "username": user.username,
+        "email": user.email,
+        "phone": user.phone,
+    }
+    assert error.value.status_code == 401
+
+
+@pytest.mark.anyio
+async def test_user_pages_match_the_orm(client, session_maker, accounts):
+    me = await client.get("/users/me", headers=accounts)
+    person = await client.get("/users/person", headers=accounts)
+    own = await client.get("/users/reader", headers=accounts)
+    unknown = await client.get("/users/nobody", headers=accounts)
+
+    assert me.json() == (await _orm_user(session_maker, "reader")).model_dump(
+        mode="json"
+    )
+    assert person.json() == (await _orm_user(session_maker, "person")).model_dump(
+        mode="json"
+    )
+    assert person.json()["email"] == "person@example.com"
+    assert own.status_code == 307
+    assert unknown.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_characters_match_the_orm(client, session_maker, accounts):
+    response = await client.get("/characters/get", headers=accounts)
+    expected = await _orm_characters(session_maker, "reader")
+
+    def by_id(payload):
+        return sorted(payload["characters"], key=lambda character: character["id"])
+
+    assert len(response.json()["characters"]) == 2
+    assert by_id(response.json()) == by_id(expected.model_dump(mode="json"))
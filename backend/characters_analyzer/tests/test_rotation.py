@@ -0,0 +1,119 @@
+import asyncio
+import pickle
+from uuid import UUID
+
+import numpy as np
+import pytest
+
+from characters_analyzer.database.game_data import load_game_data
+from characters_analyzer.engine.damage import expected_damage, final_stats
+from characters_analyzer.engine.pool import SimulationPool
+from characters_analyzer.engine.rotation import (
+    Action,
+    Buff,
+    Member,
+    Simulation,
+    get_character_elements,
+    simulate,
+)
+from characters_analyzer.engine.stats import get_stat_table
+
+table = get_stat_table()
+character_id = UUID(load_game_data()["character"][0]["id"])
+member = Member(
+    character_id=str(character_id),
+    element=get_character_elements()[character_id],
+    level=90,
+    base=tuple(table.lookup(character_id, 90).values()),
+    bonuses=(0.0,) * len(table.stats),
+    weapon_atk=500,
+)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def _hit_damage(buff: float = 0.0) -> float:
+    bonuses = np.zeros(len(table.stats))
+    bonuses[table.columns["atk_percent"]] = buff
+
+    stats = final_stats(np.array(member.base), bonuses, member.weapon_atk)
+
+    return float(expected_damage(stats, 1.0, element=member.element))
+
+
+def test_buff_window():
+    simulation = Simulation(
+        (member,),
+        (
+            Action(0, "skill", 1, 1.0, buff=Buff("atk_percent", 0.5, 2)),
+            Action(0, "normal", 2, 1.0),
+        ),
+    )
+
+    result = simulate(simulation)
+
+    # the hit of the skill is buffed, the hit landing after 2s is not
+    assert result.damage == pytest.approx(2 * _hit_damage(0.5))
+    assert result.duration == 3
+    assert result.dps == pytest.approx(result.damage / 3)
+
+    # a buff ends before a hit landing at the same moment
+    simulation = simulation._replace(
+        rotation=(
+            Action(0, "skill", 2, 1.0, buff=Buff("atk_percent", 0.5, 2)),
+            Action(0, "normal", 1, 1.0),
+        )
+    )
+
+    assert simulate(simulation).damage == pytest.approx(
+        _hit_damage(0.5) + _hit_damage()
+    )
+
+
+def test_bursts_need_energy():
+    burst = Action(0, "burst", 1, 1.0, energy_cost=60)
+    skill = Action(0, "skill", 1, particles=5)
+
+    result = simulate(Simulation((member,), (burst, burst)))
+
+    assert result.missing_energy == 1
+    assert result.damage == pytest.approx(_hit_damage())
+
+    # 5 particles of the same element give 15 energy, 4 skills are enough
+    # once the particles of the last one have arrived
+    wait = Action(0, "normal", 1)
+    result = simulate(Simulation((member,), (burst, *[skill] * 4, wait, burst)))
+
+    assert result.missing_energy == 0
+    assert result.energy == (0.0,)
+
+
+def test_simulation_is_compact():
+    simulation = Simulation((member,) * 4, (Action(0, "normal", 1, 1.0),) * 20)
+
+    assert pickle.loads(pickle.dumps(simulation)) == simulation
+    assert len(pickle.dumps(simulation)) < 8192
+
+
+@pytest.mark.anyio
+async def test_pool_memoizes_results():
+    pool = SimulationPool(workers=1, cache_size=1)
+    simulation = Simulation((member,), (Action(0, "normal", 1, 1.0),))
+
+    try:
+        first, second = await asyncio.gather(
+            pool.run(simulation, 60), pool.run(simulation, 60)
+        )
+
+        assert first == second == simulate(simulation)
+        assert await pool.run(simulation, 60) is first
+
+        other = simulation._replace(rotation=(Action(0, "normal", 2, 1.0),))
+        await pool.run(other, 60)
+
+        assert list(pool._cache) == [other]
+    finally:
+        await pool.shutdown()
@@ -0,0 +1,45 @@
+from io import StringIO
+
+import pytest
+
+from characters_analyzer import server
+from characters_analyzer.core.config import Settings, get_settings
+
+settings: Settings = get_settings()
+
+
+def _options(**changes) -> dict:
+    return server.Server(settings.model_copy(update=changes)).options()
+
+
+def test_workers_default_to_cpu_count(monkeypatch):
+    monkeypatch.setattr(server, "cpu_count", lambda: 3)
+
+    assert _options(WORKERS=0)["workers"] == 3
+    assert _options(WORKERS=5)["workers"] == 5
+
+
+def test_graceful_timeout_covers_drain_and_shutdown():
+    options = _options(DRAIN_DELAY_SECONDS=5, GRACEFUL_TIMEOUT_SECONDS=30)
+
+    assert options["graceful_timeout"] == 35 + server.SHUTDOWN_MARGIN_SECONDS
+    assert options["preload_app"]
+    assert options["worker_class"] == "characters_analyzer.server.Worker"
+
+
+def test_options_are_applied_to_gunicorn():
+    application = server.Server(settings.model_copy(update={"WORKERS": 2}))
+
+    assert application.cfg.workers == 2
+    assert application.cfg.graceful_timeout == application.options()["graceful_timeout"]
+    assert application.cfg.worker_class_str == "characters_analyzer.server.Worker"
+
+
+@pytest.mark.parametrize(
+    "quota, expected", [("max 100000", 8), ("150000 100000", 2), ("50000 100000", 1)]
+)
+def test_cpu_count_follows_cgroup_quota(monkeypatch, quota, expected):
+    monkeypatch.setattr(server.os, "sched_getaffinity", lambda pid: set(range(8)))
+    monkeypatch.setattr("builtins.open", lambda path, *args, **kwargs: StringIO(quota))
+
+    assert server.cpu_count() == expected
@@ -0,0 +1,118 @@
+import asyncio
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from characters_analyzer.api.services import sketch_service
+from characters_analyzer.core.jobs import Debouncer
+from characters_analyzer.engine.sketch import Distribution, TDigest
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def test_digest_approximates_the_distribution():
+    values = np.random.default_rng(0).gamma(4, 30, 20000)
+
+    digest = TDigest()
+    digest.update(values)
+
+    assert digest.count == len(values)
+    assert len(digest.means) < 100
+
+    for quantile in (0.01, 0.1, 0.5, 0.9, 0.99):
+        value = np.quantile(values, quantile)
+        assert digest.cdf(value) == pytest.approx(quantile, abs=0.01)
+
+    assert digest.cdf(values.min() - 1) == 0 and digest.cdf(values.max() + 1) == 1
+
+
+def test_merged_digests_match_a_single_one():
+    values = np.random.default_rng(1).normal(150, 40, 10000)
+
+    first, second = TDigest(), TDigest()
+    first.update(values[:3000])
+    second.update(values[3000:])
+
+    merged = TDigest.from_dict(first.merge(second).to_dict())
+
+    assert merged.count == len(values)
+    assert merged.low == values.min() and merged.high == values.max()
+
+    for quantile in (0.05, 0.5, 0.95):
+        value = np.quantile(values, quantile)
+        assert merged.cdf(value) == pytest.approx(quantile, abs=0.01)
+
+
+def test_distribution_forgets_removed_values():
+    rng = np.random.default_rng(2)
+    kept, removed = rng.uniform(0, 100, 5000), rng.uniform(50, 100, 5000)
+
+    distribution = Distribution()
+    distribution.update(added=kept)
+    distribution.update(added=removed)
+    distribution.update(removed=removed)
+
+    distribution = Distribution.from_dict(distribution.to_dict())
+
+    assert distribution.count == len(kept)
+    assert distribution.share_below(75) == pytest.approx(0.75, abs=0.02)
+    assert Distribution().share_below(75) == 0
+
+
+@pytest.mark.anyio
+async def test_debouncer_without_postponing_runs_periodically():
+    runs = []
+
+    async def job(key):
+        runs.append(key)
+
+    debouncer = Debouncer(job, 0.05, postpone=False)
+
+    for _ in range(8):
+        debouncer.schedule("a")
+        await asyncio.sleep(0.02)
+
+    await debouncer.shutdown()
+
+    assert len(runs) >= 3
+
+
+@pytest.mark.anyio
+async def test_failed_merge_keeps_the_changes(monkeypatch):
+    character_id = uuid4()
+    scheduled = []
+
+    @asynccontextmanager
+    async def session():
+        yield None
+
+    async def merge_changes(session, character_id, changes):
+        # a build changed while the merge is running
+        late = sketch_service.get_sketch_changes().setdefault(character_id, {})
+        late.setdefault("crit_value", Distribution()).update(added=[200])
+
+        raise ConnectionError("the database is gone")
+
+    class Jobs:
+        def schedule(self, key):
+            scheduled.append(key)
+
+    monkeypatch.setattr(sketch_service, "get_session_maker", lambda: session)
+    monkeypatch.setattr(sketch_service, "merge_changes", merge_changes)
+    monkeypatch.setattr(sketch_service, "get_sketch_jobs", lambda: Jobs())
+    monkeypatch.setattr(sketch_service, "get_sketch_changes", lambda: changes)
+
+    changes = {character_id: {"crit_value": Distribution()}}
+    changes[character_id]["crit_value"].update(added=[100, 150])
+
+    with pytest.raises(ConnectionError):
+        await sketch_service._merge(character_id)
+
+    assert changes[character_id]["crit_value"].count == 3
+    assert changes[character_id]["crit_value"].share_below(175) == pytest.approx(2 / 3)
+    assert scheduled == [character_id]
@@ -0,0 +1,93 @@
+from uuid import UUID, uuid4
+
+import numpy as np
+import pytest
+
+from characters_analyzer.database.game_data import load_game_data
+from characters_analyzer.engine.stats import MAX_LEVEL, get_stat_table
+
+game_data = load_game_data()
+table = get_stat_table()
+
+
+def test_stats_match_game_data():
+    stats = {record["key"] for record in game_data["stat"]}
+
+    assert set(table.stats) == stats
+
+    for character in game_data["character"]:
+        assert character["ascension"]["stat"] in stats
+
+        first = table.lookup(UUID(character["id"]), 1)
+
+        for key in ("hp", "atk", "def"):
+            assert first[key] == pytest.approx(character["base"][key])
+
+
+def test_stats_grow_with_level():
+    base = [table.stats.index(key) for key in ("hp", "atk", "def")]
+    values = table.table[:-1, 1:, base]
+
+    assert (np.diff(values, axis=1) > 0).all()
+
+
+def test_ascension_applies_past_the_cap():
+    character = game_data["character"][0]
+    character_id = UUID(character["id"])
+    key, value = character["ascension"]["stat"], character["ascension"]["value"]
+
+    first = table.lookup(character_id, 1)[key]
+
+    assert table.lookup(character_id, 40)[key] == first
+    assert table.lookup(character_id, 41)[key] > first
+    assert table.lookup(character_id, MAX_LEVEL)[key] == pytest.approx(first + value)
+
+
+def test_compute_matches_lookup():
+    ids = [UUID(character["id"]) for character in game_data["character"]]
+    levels = np.random.default_rng(0).integers(1, MAX_LEVEL + 1, len(ids)).tolist()
+
+    rows = table.to_dicts(table.compute(ids + [uuid4()], levels + [MAX_LEVEL]))
+
+    assert rows[-1] is None
+
+    for character_id, level, row in zip(ids, levels, rows):
+        assert row == pytest.approx(table.lookup(character_id, level), abs=1e-4)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_characters_keep_their_empty_fields(client, add_user):
+    headers = await add_user("owner")
+    character = game_data["character"][0]
+
+    await client.post(
+        "/characters/append",
+        headers=headers,
+        json={
+            "character_id": character["id"],
+            "level": 90,
+            "constellations": 0,
+            "attack_level": 1,
+            "skill_level": 1,
+            "burst_level": 1,
+        },
+    )
+
+    (plain,) = (await client.get("/characters/get", headers=headers)).json()[
+        "characters"
+    ]
+    (with_stats,) = (
+        await client.get(
+            "/characters/get", headers=headers, params={"with_stats": True}
+        )
+    ).json()["characters"]
+
+    assert plain["score_formula"] is None
+    assert "stats" not in plain
+    assert with_stats["score_formula"] is None
+    assert with_stats["stats"] == pytest.approx(table.lookup(UUID(character["id"]), 90))
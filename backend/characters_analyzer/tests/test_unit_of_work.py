@@ -0,0 +1,137 @@
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Table, event, insert, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from characters_analyzer.api.services import farm_service, sketch_service
+from characters_analyzer.core.config import Settings, get_settings
+from characters_analyzer.database import unit_of_work
+from characters_analyzer.database.game_data import load_game_data
+from characters_analyzer.database.tables.entities import User
+from characters_analyzer.database.tables.junctions import UserCharacter
+
+settings: Settings = get_settings()
+
+# created in every test, dropped at the end of its transaction
+scratch = Table("unit_of_work_scratch", MetaData(), Column("value", Integer()))
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+
+    try:
+        async with engine.connect():
+            pass
+    except (OSError, DBAPIError) as error:
+        pytest.skip(f"Database is unavailable: {error}")
+
+    yield engine
+
+    await engine.dispose()
+
+
+@pytest.fixture
+def commits(engine):
+    """Commits of the engine, appended as they happen."""
+    commits = []
+
+    event.listen(engine.sync_engine, "commit", lambda connection: commits.append(1))
+
+    return commits
+
+
+@pytest.fixture
+async def session(engine):
+    sessions = async_sessionmaker(
+        engine,
+        sync_session_class=unit_of_work.UnitOfWorkSession,
+        expire_on_commit=False,
+    )
+
+    async with sessions() as session:
+        await session.execute(
+            text(
+                "CREATE TEMPORARY TABLE unit_of_work_scratch (value integer) "
+                "ON COMMIT DROP"
+            )
+        )
+
+        yield session
+
+
+@pytest.mark.anyio
+async def test_read_only_request_is_not_committed(commits, session):
+    assert (await session.execute(select(1))).scalar() == 1
+    assert not unit_of_work.is_staged(session)
+
+    await unit_of_work.complete(session)
+
+    assert commits == []
+    assert not session.in_transaction()
+
+
+@pytest.mark.anyio
+async def test_staged_changes_are_committed_once(commits, session):
+    calls = []
+
+    await session.execute(insert(scratch).values(value=1))
+    unit_of_work.on_commit(session, lambda: calls.append("commit"))
+    await session.execute(insert(scratch).values(value=2))
+    unit_of_work.on_rollback(session, lambda: calls.append("rollback"))
+
+    assert unit_of_work.is_staged(session)
+
+    await unit_of_work.complete(session)
+
+    assert commits == [1]
+    assert calls == ["commit"]
+    assert not unit_of_work.is_staged(session)
+
+
+@pytest.mark.anyio
+async def test_rollback_drops_commit_callbacks(session):
+    calls = []
+
+    await session.execute(insert(scratch).values(value=1))
+    unit_of_work.on_commit(session, lambda: calls.append("commit"))
+    unit_of_work.on_rollback(session, lambda: calls.append("rollback"))
+
+    await session.rollback()
+    await session.commit()
+
+    assert calls == ["rollback"]
+    assert not unit_of_work.is_staged(session)
+
+
+@pytest.mark.anyio
+async def test_lazy_builds_are_left_to_the_unit_of_work(session_maker, database):
+    character_id = load_game_data()["character"][0]["id"]
+    user_id = await database.scalar(
+        insert(User).values(username="reader", password="").returning(User.id)
+    )
+    await database.execute(
+        insert(UserCharacter).values(
+            user_id=user_id,
+            character_id=character_id,
+            level=90,
+            constellations=0,
+            attack_level=1,
+            skill_level=1,
+            burst_level=1,
+        )
+    )
+
+    async with session_maker() as session:
+        # the services behind the first requests of ranks and recommendations
+        await sketch_service.build_sketches(session, character_id)
+        await farm_service.refresh_recommendations(session, user_id)
+
+        assert session.in_transaction()
+        assert unit_of_work.is_staged(session)
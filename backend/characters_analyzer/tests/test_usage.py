@@ -0,0 +1,64 @@
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from characters_analyzer.api.services import usage_service
+from characters_analyzer.api.services.usage_service import UsageCache, character_counts
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def _user_character(character_id, **levels):
+    data = {"constellations": 0, "attack_level": 1, "skill_level": 1, "burst_level": 1}
+
+    return SimpleNamespace(character_id=character_id, **{**data, **levels})
+
+
+def test_updates_move_characters_between_counters():
+    character_id = uuid4()
+
+    counts = character_counts([_user_character(character_id, constellations=2)], -1)
+    counts.update(character_counts([_user_character(character_id, constellations=3)]))
+
+    assert {key: count for key, count in counts.items() if count} == {
+        (character_id, "constellations", 2): -1,
+        (character_id, "constellations", 3): 1,
+    }
+
+
+def test_characters_are_counted_once_per_metric():
+    first, second = uuid4(), uuid4()
+
+    counts = character_counts(
+        [_user_character(first), _user_character(first), _user_character(second)]
+    )
+
+    assert len(counts) == 2 * len(usage_service.METRICS)
+    assert counts[first, "skill_level", 1] == 2
+    assert counts[second, "burst_level", 1] == 1
+
+
+@pytest.mark.anyio
+async def test_expired_usage_is_recomputed_once(monkeypatch):
+    computed = []
+
+    async def get_usage(session):
+        computed.append(session)
+        await asyncio.sleep(0.01)
+
+        return {"users": len(computed)}
+
+    monkeypatch.setattr(usage_service, "get_usage", get_usage)
+    cache = UsageCache(0.05)
+
+    first = await asyncio.gather(*(cache.get("session") for _ in range(5)))
+    assert first == [{"users": 1}] * 5
+
+    await asyncio.sleep(0.06)
+
+    assert await cache.get("session") == {"users": 2}
@@ -4,6 +4,7 @@ import uvicorn
 
 from characters_analyzer.core.config import get_settings
 from characters_analyzer.database import initialize
+from characters_analyzer.database.bootstrap import bootstrap
 
 if __name__ == "__main__":
     settings = get_settings()
@@ -11,9 +12,18 @@ if __name__ == "__main__":
     if settings.INITIALIZE_DB:
         asyncio.run(initialize())
 
-    uvicorn.run(
-        app="characters_analyzer.main:characters_analyzer",
-        host=settings.DOMAIN,
-        port=settings.BACKEND_PORT,
-        reload=settings.DEV_MODE,
-    )
+    if settings.MIGRATE_DB:
+        asyncio.run(bootstrap(seed=settings.SEED_DB))
+
+    if settings.DEV_MODE:
+        uvicorn.run(
+            app="characters_analyzer.main:characters_analyzer",
+            host=settings.DOMAIN,
+            port=settings.BACKEND_PORT,
+            reload=True,
+        )
+    else:
+        # gunicorn is unavailable on Windows, where only the development mode works
+        from characters_analyzer.server import run
+
+        run()